@@ -0,0 +1,4518 @@
+#!/usr/bin/env python
+"""Create a "virtual" Python installation"""
+
+# fmt: off
+import os  # isort:skip
+import sys  # isort:skip
+
+# If we are running in a new interpreter to create a virtualenv,
+# we do NOT want paths from our existing location interfering with anything,
+# So we remove this file's directory from sys.path - most likely to be
+# the previous interpreter's site-packages. Solves #705, #763, #779
+if os.environ.get("VIRTUALENV_INTERPRETER_RUNNING"):
+    for path in sys.path[:]:
+        if os.path.realpath(os.path.dirname(__file__)) == os.path.realpath(path):
+            sys.path.remove(path)
+# fmt: on
+
+import ast
+import base64
+import codecs
+import contextlib
+import distutils.spawn
+import distutils.sysconfig
+import errno
+import glob
+import hashlib
+import json
+import logging
+import marshal
+import optparse
+import os
+import re
+import shutil
+import struct
+import subprocess
+import sys
+import tempfile
+import textwrap
+import threading
+import time
+import zipfile
+import zlib
+from distutils.util import strtobool
+from os.path import join
+
+try:
+    import ConfigParser
+except ImportError:
+    # noinspection PyPep8Naming
+    import configparser as ConfigParser
+
+__version__ = "16.4.4.dev0"
+virtualenv_version = __version__  # legacy
+DEBUG = os.environ.get("_VIRTUALENV_DEBUG", None) == "1"
+if sys.version_info < (2, 7):
+    print("ERROR: {}".format(sys.exc_info()[1]))
+    print("ERROR: this script requires Python 2.7 or greater.")
+    sys.exit(101)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+IS_ZIPAPP = os.path.isfile(HERE)
+
+try:
+    # noinspection PyUnresolvedReferences,PyUnboundLocalVariable
+    basestring
+except NameError:
+    basestring = str
+
+PY_VERSION = "python{}.{}".format(sys.version_info[0], sys.version_info[1])
+
+IS_JYTHON = sys.platform.startswith("java")
+IS_PYPY = hasattr(sys, "pypy_version_info")
+IS_WIN = sys.platform == "win32"
+IS_CYGWIN = sys.platform == "cygwin"
+IS_DARWIN = sys.platform == "darwin"
+ABI_FLAGS = getattr(sys, "abiflags", "")
+
+USER_DIR = os.path.expanduser("~")
+if IS_WIN:
+    DEFAULT_STORAGE_DIR = os.path.join(USER_DIR, "virtualenv")
+else:
+    DEFAULT_STORAGE_DIR = os.path.join(USER_DIR, ".virtualenv")
+DEFAULT_CONFIG_FILE = os.path.join(DEFAULT_STORAGE_DIR, "virtualenv.ini")
+# the recorded installations of interpreters, replayed into new environments
+PLAN_CACHE_DIR = os.path.join(DEFAULT_STORAGE_DIR, "plans")
+
+if IS_PYPY:
+    EXPECTED_EXE = "pypy"
+elif IS_JYTHON:
+    EXPECTED_EXE = "jython"
+else:
+    EXPECTED_EXE = "python"
+
+# Return a mapping of version -> Python executable
+# Only provided for Windows, where the information in the registry is used
+if not IS_WIN:
+
+    def get_installed_pythons():
+        return {}
+
+
+else:
+    try:
+        import winreg
+    except ImportError:
+        # noinspection PyUnresolvedReferences
+        import _winreg as winreg
+
+    def get_installed_pythons():
+        final_exes = dict()
+
+        # Grab exes from 32-bit registry view
+        exes = _get_installed_pythons_for_view("-32", winreg.KEY_WOW64_32KEY)
+        # Grab exes from 64-bit registry view
+        exes_64 = _get_installed_pythons_for_view("-64", winreg.KEY_WOW64_64KEY)
+        # Check if exes are unique
+        if set(exes.values()) != set(exes_64.values()):
+            exes.update(exes_64)
+
+        # Create dict with all versions found
+        for version, bitness in sorted(exes):
+            exe = exes[(version, bitness)]
+            # Add minor version (X.Y-32 or X.Y-64)
+            final_exes[version + bitness] = exe
+            # Add minor extensionless version (X.Y); 3.2-64 wins over 3.2-32
+            final_exes[version] = exe
+            # Add major version (X-32 or X-64)
+            final_exes[version[0] + bitness] = exe
+            # Add major extensionless version (X); 3.3-32 wins over 3.2-64
+            final_exes[version[0]] = exe
+
+        return final_exes
+
+    def _get_installed_pythons_for_view(bitness, view):
+        exes = dict()
+        # If both system and current user installations are found for a
+        # particular Python version, the current user one is used
+        for key in (winreg.HKEY_LOCAL_MACHINE, winreg.HKEY_CURRENT_USER):
+            try:
+                python_core = winreg.OpenKey(key, "Software\\Python\\PythonCore", 0, view | winreg.KEY_READ)
+            except WindowsError:
+                # No registered Python installations
+                continue
+            i = 0
+            while True:
+                try:
+                    version = winreg.EnumKey(python_core, i)
+                    i += 1
+                    try:
+                        at_path = winreg.QueryValue(python_core, "{}\\InstallPath".format(version))
+                    except WindowsError:
+                        continue
+                    # Remove bitness from version
+                    if version.endswith(bitness):
+                        version = version[: -len(bitness)]
+                    exes[(version, bitness)] = join(at_path, "python.exe")
+                except WindowsError:
+                    break
+            winreg.CloseKey(python_core)
+
+        return exes
+
+
+REQUIRED_MODULES = [
+    "os",
+    "posix",
+    "posixpath",
+    "nt",
+    "ntpath",
+    "genericpath",
+    "fnmatch",
+    "locale",
+    "encodings",
+    "codecs",
+    "stat",
+    "UserDict",
+    "readline",
+    "copy_reg",
+    "types",
+    "re",
+    "sre",
+    "sre_parse",
+    "sre_constants",
+    "sre_compile",
+    "zlib",
+]
+
+REQUIRED_FILES = ["lib-dynload", "config"]
+
+MAJOR, MINOR = sys.version_info[:2]
+if MAJOR == 2:
+    if MINOR >= 6:
+        REQUIRED_MODULES.extend(["warnings", "linecache", "_abcoll", "abc"])
+    if MINOR >= 7:
+        REQUIRED_MODULES.extend(["_weakrefset"])
+elif MAJOR == 3:
+    # Some extra modules are needed for Python 3, but different ones
+    # for different versions.
+    REQUIRED_MODULES.extend(
+        [
+            "_abcoll",
+            "warnings",
+            "linecache",
+            "abc",
+            "io",
+            "_weakrefset",
+            "copyreg",
+            "tempfile",
+            "random",
+            "__future__",
+            "collections",
+            "keyword",
+            "tarfile",
+            "shutil",
+            "struct",
+            "copy",
+            "tokenize",
+            "token",
+            "functools",
+            "heapq",
+            "bisect",
+            "weakref",
+            "reprlib",
+        ]
+    )
+    if MINOR >= 2:
+        REQUIRED_FILES[-1] = "config-{}".format(MAJOR)
+    if MINOR >= 3:
+        import sysconfig
+
+        platform_dir = sysconfig.get_config_var("PLATDIR")
+        REQUIRED_FILES.append(platform_dir)
+        REQUIRED_MODULES.extend(["base64", "_dummy_thread", "hashlib", "hmac", "imp", "importlib", "rlcompleter"])
+    if MINOR >= 4:
+        REQUIRED_MODULES.extend(["operator", "_collections_abc", "_bootlocale"])
+    if MINOR >= 6:
+        REQUIRED_MODULES.extend(["enum"])
+
+if IS_PYPY:
+    # these are needed to correctly display the exceptions that may happen
+    # during the bootstrap
+    REQUIRED_MODULES.extend(["traceback", "linecache"])
+
+    if MAJOR == 3:
+        # _functools is needed to import locale during stdio initialization and
+        # needs to be copied on PyPy because it's not built in
+        REQUIRED_MODULES.append("_functools")
+
+
+class Logger(object):
+
+    """
+    Logging object for use in command-line script.  Allows ranges of
+    levels, to avoid some redundancy of displayed information.
+    """
+
+    DEBUG = logging.DEBUG
+    INFO = logging.INFO
+    NOTIFY = (logging.INFO + logging.WARN) / 2
+    WARN = WARNING = logging.WARN
+    ERROR = logging.ERROR
+    FATAL = logging.FATAL
+
+    LEVELS = [DEBUG, INFO, NOTIFY, WARN, ERROR, FATAL]
+
+    def __init__(self, consumers):
+        self.consumers = consumers
+        self.indent = 0
+        self.in_progress = None
+        self.in_progress_hanging = False
+
+    def debug(self, msg, *args, **kw):
+        self.log(self.DEBUG, msg, *args, **kw)
+
+    def info(self, msg, *args, **kw):
+        self.log(self.INFO, msg, *args, **kw)
+
+    def notify(self, msg, *args, **kw):
+        self.log(self.NOTIFY, msg, *args, **kw)
+
+    def warn(self, msg, *args, **kw):
+        self.log(self.WARN, msg, *args, **kw)
+
+    def error(self, msg, *args, **kw):
+        self.log(self.ERROR, msg, *args, **kw)
+
+    def fatal(self, msg, *args, **kw):
+        self.log(self.FATAL, msg, *args, **kw)
+
+    def log(self, level, msg, *args, **kw):
+        if args:
+            if kw:
+                raise TypeError("You may give positional or keyword arguments, not both")
+        args = args or kw
+        rendered = None
+        for consumer_level, consumer in self.consumers:
+            if self.level_matches(level, consumer_level):
+                if self.in_progress_hanging and consumer in (sys.stdout, sys.stderr):
+                    self.in_progress_hanging = False
+                    print("")
+                    sys.stdout.flush()
+                if rendered is None:
+                    if args:
+                        rendered = msg % args
+                    else:
+                        rendered = msg
+                    rendered = " " * self.indent + rendered
+                if hasattr(consumer, "write"):
+                    consumer.write(rendered + "\n")
+                else:
+                    consumer(rendered)
+
+    def start_progress(self, msg):
+        assert not self.in_progress, "Tried to start_progress({!r}) while in_progress {!r}".format(
+            msg, self.in_progress
+        )
+        if self.level_matches(self.NOTIFY, self._stdout_level()):
+            print(msg)
+            sys.stdout.flush()
+            self.in_progress_hanging = True
+        else:
+            self.in_progress_hanging = False
+        self.in_progress = msg
+
+    def end_progress(self, msg="done."):
+        assert self.in_progress, "Tried to end_progress without start_progress"
+        if self.stdout_level_matches(self.NOTIFY):
+            if not self.in_progress_hanging:
+                # Some message has been printed out since start_progress
+                print("...{}{}".format(self.in_progress, msg))
+                sys.stdout.flush()
+            else:
+                print(msg)
+                sys.stdout.flush()
+        self.in_progress = None
+        self.in_progress_hanging = False
+
+    def show_progress(self):
+        """If we are in a progress scope, and no log messages have been
+        shown, write out another '.'"""
+        if self.in_progress_hanging:
+            print(".")
+            sys.stdout.flush()
+
+    def stdout_level_matches(self, level):
+        """Returns true if a message at this level will go to stdout"""
+        return self.level_matches(level, self._stdout_level())
+
+    def _stdout_level(self):
+        """Returns the level that stdout runs at"""
+        for level, consumer in self.consumers:
+            if consumer is sys.stdout:
+                return level
+        return self.FATAL
+
+    @staticmethod
+    def level_matches(level, consumer_level):
+        """
+        >>> l = Logger([])
+        >>> l.level_matches(3, 4)
+        False
+        >>> l.level_matches(3, 2)
+        True
+        >>> l.level_matches(slice(None, 3), 3)
+        False
+        >>> l.level_matches(slice(None, 3), 2)
+        True
+        >>> l.level_matches(slice(1, 3), 1)
+        True
+        >>> l.level_matches(slice(2, 3), 1)
+        False
+        """
+        if isinstance(level, slice):
+            start, stop = level.start, level.stop
+            if start is not None and start > consumer_level:
+                return False
+            if stop is not None and stop <= consumer_level:
+                return False
+            return True
+        else:
+            return level >= consumer_level
+
+    @classmethod
+    def level_for_integer(cls, level):
+        levels = cls.LEVELS
+        if level < 0:
+            return levels[0]
+        if level >= len(levels):
+            return levels[-1]
+        return levels[level]
+
+
+# the state of the EnvironmentBuilder creating an environment in the current thread
+_building = threading.local()
+
+
+def cached(key, compute):
+    """
+    Return ``compute()``, kept under ``key`` by the EnvironmentBuilder at work
+    in this thread for its later creations (a None result is not kept)
+    """
+    context = getattr(_building, "context", None)
+    if context is None:
+        return compute()
+    return context.builder.cached(key, compute)
+
+
+def forget(key):
+    """Drop what the EnvironmentBuilder at work in this thread keeps under ``key``"""
+    context = getattr(_building, "context", None)
+    if context is not None:
+        context.builder.forget(key)
+
+
+class ThreadLogger(object):
+    """
+    The module logger: stands for the logger of the EnvironmentBuilder creating
+    an environment in the current thread, or else for the ``default`` one
+    """
+
+    def __init__(self, default):
+        object.__setattr__(self, "default", default)
+
+    def _current(self):
+        context = getattr(_building, "context", None)
+        return self.default if context is None else context.logger
+
+    def __getattr__(self, name):
+        return getattr(self._current(), name)
+
+    def __setattr__(self, name, value):
+        if name == "default":
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._current(), name, value)
+
+
+# create a silent logger just to prevent this from being undefined
+# will be overridden with requested verbosity main() is called.
+logger = ThreadLogger(Logger([(Logger.LEVELS[-1], sys.stdout)]))
+
+
+class Plan(object):
+    """
+    The filesystem operations a dry run would have performed (or, with
+    ``perform``, a recording did perform), in order: each one an ``op`` on a
+    ``path`` with its details, like the ``src`` of a copy or symlink and the
+    (estimated) ``bytes`` it writes.
+    """
+
+    def __init__(self, perform=False):
+        self.perform = perform
+        self.operations = []
+        self.directories = set()
+        self.files = {}  # path -> bytes, of the files that would be there
+
+    def record(self, op, path, **details):
+        # nothing gets created, so the same directory is found missing again and again
+        if op == "mkdir":
+            if path in self.directories:
+                return
+            self.directories.add(path)
+        elif op in ("copy", "write", "symlink"):
+            self.files[path] = details.get("bytes", 0)
+        details.update(op=op, path=path)
+        self.operations.append(details)
+        if not self.perform:
+            logger.info("Would %s %s", op, path)
+
+    def as_dict(self):
+        counts = {}
+        for operation in self.operations:
+            counts[operation["op"]] = counts.get(operation["op"], 0) + 1
+        return {
+            "operations": self.operations,
+            "counts": counts,
+            "bytes": sum(operation.get("bytes", 0) for operation in self.operations),
+            "links": counts.get("symlink", 0),
+            "copies": counts.get("copy", 0),
+        }
+
+
+_planning = threading.local()
+
+
+@contextlib.contextmanager
+def dry_run(enabled=True):
+    """
+    Within this context the filesystem primitives record their operations into
+    the yielded ``Plan`` instead of performing them (unless not ``enabled``,
+    then None is yielded)
+    """
+    if not enabled:
+        yield None
+        return
+    _planning.plan = plan = Plan()
+    try:
+        yield plan
+    finally:
+        _planning.plan = None
+
+
+@contextlib.contextmanager
+def recording():
+    """Within this context the filesystem primitives also record the operations they perform into the yielded Plan"""
+    _planning.recording = plan = Plan(perform=True)
+    try:
+        yield plan
+    finally:
+        _planning.recording = None
+
+
+def current_plan():
+    """The ``Plan`` of the dry run in progress in this thread, or None"""
+    return getattr(_planning, "plan", None)
+
+
+def planned(op, path, **details):
+    """Record the operation when in a dry run and return True, return False otherwise: it is to be performed"""
+    recorded = getattr(_planning, "recording", None)
+    if recorded is not None:
+        recorded.record(op, path, **details)
+    plan = current_plan()
+    if plan is None:
+        return False
+    plan.record(op, path, **details)
+    return True
+
+
+def tree_size(path):
+    """Bytes of the files in the ``path`` tree, the estimate of what copying it writes"""
+    plan = current_plan()
+    if plan is not None and path in plan.files:
+        return plan.files[path]
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            filename = join(root, name)
+            if not os.path.islink(filename):
+                total += os.path.getsize(filename)
+    return total
+
+
+def mkdir(at_path):
+    if not os.path.exists(at_path):
+        if planned("mkdir", at_path):
+            return
+        logger.info("Creating %s", at_path)
+        os.makedirs(at_path)
+    else:
+        logger.info("Directory %s already exists", at_path)
+
+
+def copy_file_or_folder(src, dest, symlink=True):
+    if os.path.isdir(src):
+        shutil.copytree(src, dest, symlink)
+    else:
+        shutil.copy2(src, dest)
+
+
+def copyfile(src, dest, symlink=True):
+    plan = current_plan()
+    if not os.path.exists(src) and (plan is None or src not in plan.files):
+        # Some bad symlink in the src
+        logger.warn("Cannot find file %s (bad symlink)", src)
+        return
+    if os.path.exists(dest):
+        logger.debug("File %s already exists", dest)
+        return
+    if not os.path.exists(os.path.dirname(dest)) and not planned("mkdir", os.path.dirname(dest)):
+        logger.info("Creating parent directories for %s", os.path.dirname(dest))
+        os.makedirs(os.path.dirname(dest))
+    if symlink and hasattr(os, "symlink") and not IS_WIN:
+        if planned("symlink", dest, src=os.path.realpath(src)):
+            return
+        logger.info("Symlinking %s", dest)
+        try:
+            os.symlink(os.path.realpath(src), dest)
+        except (OSError, NotImplementedError):
+            logger.info("Symlinking failed, copying to %s", dest)
+            copy_file_or_folder(src, dest, symlink)
+    else:
+        if planned("copy", dest, src=src, bytes=tree_size(src) if plan is not None else 0):
+            return
+        logger.info("Copying to %s", dest)
+        copy_file_or_folder(src, dest, symlink)
+
+
+def writefile(dest, content, overwrite=True):
+    if not os.path.exists(dest):
+        if planned("write", dest, bytes=len(content.encode("utf-8"))):
+            return
+        logger.info("Writing %s", dest)
+        with open(dest, "wb") as f:
+            f.write(content.encode("utf-8"))
+        return
+    else:
+        with open(dest, "rb") as f:
+            c = f.read()
+        if c != content.encode("utf-8"):
+            if not overwrite:
+                logger.notify("File %s exists with different content; not overwriting", dest)
+                return
+            if planned("write", dest, bytes=len(content.encode("utf-8"))):
+                return
+            logger.notify("Overwriting %s with new content", dest)
+            with open(dest, "wb") as f:
+                f.write(content.encode("utf-8"))
+        else:
+            logger.info("Content %s already in place", dest)
+
+
+def replace_file(dest, content):
+    """Write the bytes ``content`` to a temporary file next to ``dest`` and
+    rename it over ``dest``, keeping its mode"""
+    tmp = os.path.join(os.path.dirname(dest), ".{}.{}.tmp".format(os.path.basename(dest), os.getpid()))
+    try:
+        with open(tmp, "wb") as f:
+            f.write(content)
+        shutil.copymode(dest, tmp)
+        if hasattr(os, "replace"):
+            os.replace(tmp, dest)
+        else:
+            if IS_WIN:
+                os.remove(dest)
+            os.rename(tmp, dest)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def threaded_map(func, items, workers=8):
+    """Return the list of ``func`` applied to ``items``, computed by up to
+    ``workers`` threads; the first exception raised by ``func`` is re-raised"""
+    if len(items) < 2 or workers < 2:
+        return [func(item) for item in items]
+    results = [None] * len(items)
+    pending = iter(enumerate(items))
+    lock = threading.Lock()
+    errors = []
+
+    def work():
+        while not errors:
+            with lock:
+                try:
+                    at, item = next(pending)
+                except StopIteration:
+                    return
+            try:
+                results[at] = func(item)
+            except BaseException as exception:
+                errors.append(exception)
+
+    threads = [threading.Thread(target=work) for _ in range(min(workers, len(items)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
+
+
+def rm_tree(folder, background=False):
+    """Delete the ``folder`` tree; with ``background`` it is renamed out of the
+    way right away and deleted by a detached process, together with what
+    earlier runs left behind when interrupted"""
+    if os.path.exists(folder):
+        if planned("rmtree", folder):
+            return
+        logger.notify("Deleting tree %s", folder)
+        if background and move_to_trash(folder):
+            trash = find_trash(folder)
+            if delete_in_background(trash):
+                return
+            for path in trash:
+                shutil.rmtree(path)
+            return
+        shutil.rmtree(folder)
+    else:
+        logger.info("Do not need to delete %s; already gone", folder)
+
+
+# the sibling directories trees deleted in the background are renamed into are named .NAME.virtualenv-trash-*
+TRASH_MARKER = ".virtualenv-trash-"
+# and those new environments are built in .NAME.virtualenv-staging-*
+STAGING_MARKER = ".virtualenv-staging-"
+
+
+def move_to_trash(folder):
+    """Rename ``folder`` into a new trash directory next to it, return whether that worked"""
+    parent, name = os.path.split(os.path.abspath(folder))
+    trash = tempfile.mkdtemp(prefix=".{}{}".format(name, TRASH_MARKER), dir=parent)
+    try:
+        os.rename(folder, join(trash, name))
+    except OSError as error:
+        logger.info("Could not move %s out of the way (%s), deleting it in place", folder, error)
+        os.rmdir(trash)
+        return False
+    return True
+
+
+def find_trash(folder, marker=TRASH_MARKER):
+    """Return the trash (or with ``marker=STAGING_MARKER`` staging) directories next to ``folder``"""
+    parent, name = os.path.split(os.path.abspath(folder))
+    prefix = ".{}{}".format(name, marker)
+    return sorted(join(parent, entry) for entry in os.listdir(parent) if entry.startswith(prefix))
+
+
+def delete_in_background(folders):
+    """Delete the ``folders`` trees in a process detached from this one, return whether it could be started"""
+    script = "import shutil, sys\nfor path in sys.argv[1:]:\n    shutil.rmtree(path, ignore_errors=True)\n"
+    if IS_WIN:
+        # DETACHED_PROCESS | CREATE_NEW_PROCESS_GROUP
+        kwargs = {"creationflags": 0x00000008 | 0x00000200}
+    else:
+        kwargs = {"preexec_fn": os.setsid, "close_fds": True}
+    try:
+        with open(os.devnull, "r+b") as devnull:
+            subprocess.Popen(
+                [sys.executable, "-S", "-c", script] + list(folders),
+                stdin=devnull,
+                stdout=devnull,
+                stderr=devnull,
+                cwd=os.path.dirname(folders[0]),
+                **kwargs
+            )
+    except OSError as error:
+        logger.info("Could not start the background deletion (%s)", error)
+        return False
+    logger.info("Deleting %s in the background", ", ".join(folders))
+    return True
+
+
+def make_exe(fn):
+    if hasattr(os, "chmod"):
+        if planned("chmod", fn):
+            return
+        old_mode = os.stat(fn).st_mode & 0xFFF  # 0o7777
+        new_mode = (old_mode | 0x16D) & 0xFFF  # 0o555, 0o7777
+        os.chmod(fn, new_mode)
+        logger.info("Changed mode of %s to %s", fn, oct(new_mode))
+
+
+def copy_executable(src, dest):
+    """Copy the interpreter (or one of its libraries) ``src`` to ``dest``"""
+    if not planned("copy", dest, src=src, bytes=os.path.getsize(src)):
+        shutil.copyfile(src, dest)
+
+
+def remove_file(path):
+    if not planned("remove", path):
+        os.unlink(path)
+
+
+def make_symlink(src, dest):
+    if not planned("symlink", dest, src=src):
+        os.symlink(src, dest)
+
+
+def _find_file(filename, folders):
+    for folder in reversed(folders):
+        files = glob.glob(os.path.join(folder, filename))
+        if files and os.path.isfile(files[0]):
+            return True, files[0]
+    return False, filename
+
+
+@contextlib.contextmanager
+def virtualenv_support_dirs():
+    """Context manager yielding either [virtualenv_support_dir] or []"""
+
+    # normal filesystem installation
+    if os.path.isdir(join(HERE, "virtualenv_support")):
+        yield [join(HERE, "virtualenv_support")]
+    elif IS_ZIPAPP:
+        tmpdir = tempfile.mkdtemp()
+        try:
+            with zipfile.ZipFile(HERE) as zipf:
+                for member in zipf.namelist():
+                    if os.path.dirname(member) == "virtualenv_support":
+                        zipf.extract(member, tmpdir)
+            yield [join(tmpdir, "virtualenv_support")]
+        finally:
+            shutil.rmtree(tmpdir)
+    # probably a bootstrap script
+    elif os.path.splitext(os.path.dirname(__file__))[0] != "virtualenv":
+        try:
+            # noinspection PyUnresolvedReferences
+            import virtualenv
+        except ImportError:
+            yield []
+        else:
+            yield [join(os.path.dirname(virtualenv.__file__), "virtualenv_support")]
+    # we tried!
+    else:
+        yield []
+
+
+class UpdatingDefaultsHelpFormatter(optparse.IndentedHelpFormatter):
+    """
+    Custom help formatter for use in ConfigOptionParser that updates
+    the defaults before expanding them, allowing them to show up correctly
+    in the help listing
+    """
+
+    def expand_default(self, option):
+        if self.parser is not None:
+            self.parser.update_defaults(self.parser.defaults)
+        return optparse.IndentedHelpFormatter.expand_default(self, option)
+
+
+class ConfigOptionParser(optparse.OptionParser):
+    """
+    Custom option parser which updates its defaults by checking the
+    configuration files and environmental variables
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.config = ConfigParser.RawConfigParser()
+        self.files = self.get_config_files()
+        self.config.read(self.files)
+        optparse.OptionParser.__init__(self, *args, **kwargs)
+
+    @staticmethod
+    def get_config_files():
+        config_file = os.environ.get("VIRTUALENV_CONFIG_FILE", False)
+        if config_file and os.path.exists(config_file):
+            return [config_file]
+        return [DEFAULT_CONFIG_FILE]
+
+    def update_defaults(self, defaults):
+        """
+        Updates the given defaults with values from the config files and
+        the environ. Does a little special handling for certain types of
+        options (lists).
+        """
+        # Then go and look for the other sources of configuration:
+        config = {}
+        # 1. config files
+        config.update(dict(self.get_config_section("virtualenv")))
+        # 2. environmental variables
+        config.update(dict(self.get_environ_vars()))
+        return self.apply_config(defaults, config)
+
+    def apply_config(self, defaults, config):
+        """
+        Set the options named by the keys of ``config`` to its (string)
+        values, converted like the command line ones, into ``defaults``
+        """
+        for key, val in config.items():
+            key = key.replace("_", "-")
+            if not key.startswith("--"):
+                key = "--{}".format(key)  # only prefer long opts
+            option = self.get_option(key)
+            if option is not None:
+                # ignore empty values
+                if not val:
+                    continue
+                # handle multiline configs
+                if option.action == "append":
+                    val = val.split()
+                else:
+                    option.nargs = 1
+                if option.action == "store_false":
+                    val = not strtobool(val)
+                elif option.action in ("store_true", "count"):
+                    val = strtobool(val)
+                try:
+                    val = option.convert_value(key, val)
+                except optparse.OptionValueError:
+                    e = sys.exc_info()[1]
+                    print("An error occurred during configuration: {!r}".format(e))
+                    sys.exit(3)
+                defaults[option.dest] = val
+        return defaults
+
+    def get_config_section(self, name):
+        """
+        Get a section of a configuration
+        """
+        if self.config.has_section(name):
+            return self.config.items(name)
+        return []
+
+    def get_environ_vars(self, prefix="VIRTUALENV_"):
+        """
+        Returns a generator with all environmental vars with prefix VIRTUALENV
+        """
+        for key, val in os.environ.items():
+            if key.startswith(prefix):
+                yield (key.replace(prefix, "").lower(), val)
+
+    def get_default_values(self):
+        """
+        Overriding to make updating the defaults after instantiation of
+        the option parser possible, update_defaults() does the dirty work.
+        """
+        if not self.process_default_values:
+            # Old, pre-Optik 1.5 behaviour.
+            return optparse.Values(self.defaults)
+
+        defaults = self.update_defaults(self.defaults.copy())  # ours
+        for option in self._get_all_options():
+            default = defaults.get(option.dest)
+            if isinstance(default, basestring):
+                opt_str = option.get_opt_string()
+                defaults[option.dest] = option.check_value(opt_str, default)
+        return optparse.Values(defaults)
+
+
+def main():
+    parser = ConfigOptionParser(
+        version=virtualenv_version,
+        usage="%prog [OPTIONS] DEST_DIR\n"
+        "       %prog run DEST_DIR -- COMMAND [ARGS...]\n"
+        "       %prog --move SRC_DIR DEST_DIR\n"
+        "       %prog [OPTIONS] --batch MANIFEST",
+        formatter=UpdatingDefaultsHelpFormatter(),
+    )
+
+    parser.add_option(
+        "-v", "--verbose", action="count", dest="verbose", default=5 if DEBUG else 0, help="Increase verbosity."
+    )
+
+    parser.add_option("-q", "--quiet", action="count", dest="quiet", default=0, help="Decrease verbosity.")
+
+    parser.add_option(
+        "-p",
+        "--python",
+        dest="python",
+        metavar="PYTHON_EXE",
+        help="The Python interpreter to use, e.g., --python=python3.5 will use the python3.5 "
+        "interpreter to create the new environment.  The default is the interpreter that "
+        "virtualenv was installed with ({}).  A comma separated list creates an environment "
+        "with each of them at the same time, DEST_DIR then names them apart with {{version}}, "
+        "e.g., -p python2.7,python3.7 env-{{version}}".format(sys.executable),
+    )
+
+    parser.add_option(
+        "--clear", dest="clear", action="store_true", help="Clear out the non-root install and start from scratch."
+    )
+
+    parser.set_defaults(system_site_packages=False)
+    parser.add_option(
+        "--no-site-packages",
+        dest="system_site_packages",
+        action="store_false",
+        help="DEPRECATED. Retained only for backward compatibility. "
+        "Not having access to global site-packages is now the default behavior.",
+    )
+
+    parser.add_option(
+        "--system-site-packages",
+        dest="system_site_packages",
+        action="store_true",
+        help="Give the virtual environment access to the global site-packages.",
+    )
+
+    parser.add_option(
+        "--always-copy",
+        dest="symlink",
+        action="store_false",
+        default=True,
+        help="Always copy files rather than symlinking.",
+    )
+
+    parser.add_option(
+        "--venv-style",
+        dest="venv_style",
+        action="store_true",
+        help="Create the environment like the venv module does (Python 3.3+): "
+        "write a pyvenv.cfg and use the interpreter's own site module and standard library.",
+    )
+
+    parser.add_option(
+        "--relocatable",
+        dest="relocatable",
+        action="store_true",
+        help="Make an EXISTING virtualenv environment relocatable, or create a new one relocatable. "
+        "This fixes up scripts and makes all .pth files relative; new environments also get "
+        "activation scripts that find the environment from their own location.",
+    )
+
+    parser.add_option(
+        "--move",
+        dest="move",
+        action="store_true",
+        help="Move the EXISTING environment SRC_DIR to DEST_DIR, rewriting the paths that point into it.",
+    )
+
+    parser.add_option(
+        "--batch",
+        dest="batch",
+        metavar="MANIFEST",
+        help="Create all the environments listed in the ini file MANIFEST from this one process: each section is "
+        "a DEST_DIR (relative to the file) with the options for it, named as in virtualenv.ini, over the "
+        "command line ones.",
+    )
+
+    parser.add_option(
+        "--jobs",
+        dest="jobs",
+        type="int",
+        default=4,
+        metavar="N",
+        help="With --batch, create up to N environments at the same time.",
+    )
+
+    parser.add_option(
+        "--dry-run",
+        dest="dry_run",
+        action="store_true",
+        help="Do not create the environment, print the JSON plan of the filesystem operations creating it takes: "
+        "each one with its estimated bytes, their counts and how many files are linked or copied.",
+    )
+
+    parser.add_option(
+        "--no-setuptools",
+        dest="no_setuptools",
+        action="store_true",
+        help="Do not install setuptools in the new virtualenv.",
+    )
+
+    parser.add_option("--no-pip", dest="no_pip", action="store_true", help="Do not install pip in the new virtualenv.")
+
+    parser.add_option(
+        "--no-wheel", dest="no_wheel", action="store_true", help="Do not install wheel in the new virtualenv."
+    )
+
+    parser.add_option(
+        "--extra-search-dir",
+        dest="search_dirs",
+        action="append",
+        metavar="DIR",
+        default=[],
+        help="Directory to look for setuptools/pip distributions in. " "This option can be used multiple times.",
+    )
+
+    parser.add_option(
+        "--download",
+        dest="download",
+        default=True,
+        action="store_true",
+        help="Download pre-installed packages from PyPI.",
+    )
+
+    parser.add_option(
+        "--no-download",
+        "--never-download",
+        dest="download",
+        action="store_false",
+        help="Do not download pre-installed packages from PyPI.",
+    )
+
+    parser.add_option("--prompt", dest="prompt", help="Provides an alternative prompt prefix for this environment.")
+
+    parser.add_option(
+        "--setuptools",
+        dest="setuptools",
+        action="store_true",
+        help="DEPRECATED. Retained only for backward compatibility. This option has no effect.",
+    )
+
+    parser.add_option(
+        "--distribute",
+        dest="distribute",
+        action="store_true",
+        help="DEPRECATED. Retained only for backward compatibility. This option has no effect.",
+    )
+
+    parser.add_option(
+        "--unzip-setuptools",
+        action="store_true",
+        help="DEPRECATED.  Retained only for backward compatibility. This option has no effect.",
+    )
+
+    if "extend_parser" in globals():
+        # noinspection PyUnresolvedReferences
+        extend_parser(parser)  # noqa: F821
+
+    options, args = parser.parse_args()
+
+    if "adjust_options" in globals():
+        # noinspection PyUnresolvedReferences
+        adjust_options(options, args)  # noqa: F821
+
+    verbosity = options.verbose - options.quiet
+    # the plan of a dry run is the output, the log goes out of its way
+    logger.default = Logger([(Logger.level_for_integer(2 - verbosity), sys.stderr if options.dry_run else sys.stdout)])
+
+    if len(args) > 1 and args[0] == "run":
+        if len(args) < 3:
+            print("You must provide a COMMAND to run in {}".format(args[1]))
+            parser.print_help()
+            sys.exit(2)
+        run_in_environment(args[1], args[2:])
+        return
+
+    if options.python and "," in options.python and not os.environ.get("VIRTUALENV_INTERPRETER_RUNNING"):
+        if options.move or options.batch or options.dry_run or len(args) != 1:
+            print("Several interpreters only create the environments of one DEST_DIR template")
+            parser.print_help()
+            sys.exit(2)
+        if not fan_out([python for python in options.python.split(",") if python], args[0]):
+            sys.exit(3)
+        return
+
+    if options.python and not os.environ.get("VIRTUALENV_INTERPRETER_RUNNING"):
+        env = os.environ.copy()
+        interpreter = resolve_interpreter(options.python)
+        if interpreter == sys.executable:
+            logger.warn("Already using interpreter {}".format(interpreter))
+        else:
+            logger.notify("Running virtualenv with interpreter {}".format(interpreter))
+            env["VIRTUALENV_INTERPRETER_RUNNING"] = "true"
+            sub_process_call = subprocess.Popen([interpreter, virtualenv_script()] + sys.argv[1:], env=env)
+            raise SystemExit(sub_process_call.wait())
+
+    if options.dry_run and (options.move or options.batch or args[:1] == ["run"]):
+        print("--dry-run only plans the creation of environments")
+        parser.print_help()
+        sys.exit(2)
+
+    if options.move:
+        if len(args) != 2:
+            print("--move needs two arguments: SRC_DIR DEST_DIR (you gave {})".format(" ".join(args)))
+            parser.print_help()
+            sys.exit(2)
+        move_environment(args[0], args[1])
+        return
+
+    if options.batch:
+        if args:
+            print("--batch takes the environments from MANIFEST, not DEST_DIR (you gave {})".format(" ".join(args)))
+            parser.print_help()
+            sys.exit(2)
+        if not create_batch(parser, options, options.batch):
+            sys.exit(3)
+        return
+
+    if not args:
+        print("You must provide a DEST_DIR")
+        parser.print_help()
+        sys.exit(2)
+    if len(args) > 1:
+        print("There must be only one argument: DEST_DIR (you gave {})".format(" ".join(args)))
+        parser.print_help()
+        sys.exit(2)
+
+    home_dir = args[0]
+
+    if os.path.exists(home_dir) and os.path.isfile(home_dir):
+        logger.fatal("ERROR: File already exists and is not a directory.")
+        logger.fatal("Please provide a different path or delete the file.")
+        sys.exit(3)
+
+    if os.environ.get("WORKING_ENV"):
+        logger.fatal("ERROR: you cannot run virtualenv while in a working env")
+        logger.fatal("Please deactivate your working env, then re-run this script")
+        sys.exit(3)
+
+    if "PYTHONHOME" in os.environ:
+        logger.warn("PYTHONHOME is set.  You *must* activate the virtualenv before using it")
+        del os.environ["PYTHONHOME"]
+
+    if options.relocatable and os.path.exists(
+        os.path.join(path_locations(home_dir, dry_run=True)[3], "activate_this.py")
+    ):
+        if options.dry_run:
+            logger.fatal("ERROR: --dry-run can not plan making an existing environment relocatable")
+            sys.exit(2)
+        make_environment_relocatable(home_dir)
+        return
+
+    if options.venv_style and (sys.version_info < (3, 3) or IS_PYPY or IS_JYTHON):
+        logger.fatal("ERROR: --venv-style requires CPython 3.3 or later")
+        sys.exit(2)
+
+    with virtualenv_support_dirs() as search_dirs, dry_run(options.dry_run) as plan:
+        create_environment(
+            home_dir,
+            site_packages=options.system_site_packages,
+            clear=options.clear,
+            prompt=options.prompt,
+            search_dirs=search_dirs + options.search_dirs,
+            download=options.download,
+            no_setuptools=options.no_setuptools,
+            no_pip=options.no_pip,
+            no_wheel=options.no_wheel,
+            symlink=options.symlink,
+            venv_style=options.venv_style,
+            relocatable=options.relocatable,
+        )
+    if plan is not None:
+        result = plan.as_dict()
+        result["home_dir"] = os.path.abspath(home_dir)
+        print(json.dumps(result, indent=2, separators=(",", ": "), sort_keys=True))
+        return
+    if "after_install" in globals():
+        # noinspection PyUnresolvedReferences
+        after_install(options, home_dir)  # noqa: F821
+
+
+# what the whole batch shares, the environments of a manifest can not set it each
+BATCH_SHARED_OPTIONS = ("python", "batch", "jobs", "move", "dry_run", "verbose", "quiet")
+
+
+def create_batch(parser, options, manifest):
+    """
+    Create the environments listed in the ini file ``manifest`` from this
+    process, up to ``options.jobs`` at the same time, sharing what the
+    interpreter and the wheels they are seeded from take to look up. Each
+    section is a DEST_DIR (relative to the manifest) holding the options for
+    it, named and converted like in virtualenv.ini, over the command line
+    ``options`` parsed by ``parser``. Logs a summary and returns whether all
+    of them were created.
+    """
+    config = ConfigParser.RawConfigParser()
+    if not config.read([manifest]) or not config.sections():
+        logger.fatal("ERROR: No environments found in the batch manifest %s", manifest)
+        sys.exit(2)
+    base_dir = os.path.dirname(os.path.abspath(manifest))
+    environments = []
+    for section in config.sections():
+        items = dict(config.items(section))
+        options_of = {key: parser.get_option("--{}".format(key.replace("_", "-"))) for key in items}
+        invalid = [key for key, option in options_of.items() if option is None or option.dest in BATCH_SHARED_OPTIONS]
+        if invalid:
+            logger.fatal(
+                "ERROR: Unknown or batch wide options for %s in %s: %s", section, manifest, ", ".join(sorted(invalid))
+            )
+            sys.exit(2)
+        values = parser.apply_config(dict(vars(options)), items)
+        environments.append((os.path.join(base_dir, os.path.expanduser(section)), optparse.Values(values)))
+
+    # the summary tells what became of each environment, their creation logs one level quieter
+    level = Logger.level_for_integer(3 - options.verbose + options.quiet)
+    start = time.time()
+    with EnvironmentBuilder(logger=Logger([(level, sys.stdout)])) as builder:
+
+        def create(environment):
+            home_dir, values = environment
+            started = time.time()
+            try:
+                result = builder.create(
+                    home_dir,
+                    site_packages=values.system_site_packages,
+                    clear=values.clear,
+                    prompt=values.prompt,
+                    search_dirs=builder.search_dirs + values.search_dirs,
+                    download=values.download,
+                    no_setuptools=values.no_setuptools,
+                    no_pip=values.no_pip,
+                    no_wheel=values.no_wheel,
+                    symlink=values.symlink,
+                    venv_style=values.venv_style,
+                    relocatable=values.relocatable,
+                )
+                if "after_install" in globals():
+                    # noinspection PyUnresolvedReferences
+                    after_install(values, home_dir)  # noqa: F821
+            except (Exception, SystemExit) as error:
+                if isinstance(error, SystemExit):
+                    error = "exited with {}".format(error.code)
+                return time.time() - started, error
+            return result, None
+
+        outcomes = threaded_map(create, environments, workers=options.jobs)
+
+    failed = 0
+    for (home_dir, _), (result, error) in zip(environments, outcomes):
+        if error is not None:
+            failed += 1
+            logger.error("FAILED  %s after %.2fs: %s", home_dir, result, error)
+            continue
+        steps = ", ".join(
+            "{} {:.2f}s".format(name, result.timings[name])
+            for name in ("python", "seed", "activate", "python-config")
+            if name in result.timings
+        )
+        seeds = ", ".join("{} {}".format(name, version) for name, version in sorted(result.seed_versions.items()))
+        logger.notify("created %s in %.2fs (%s)%s", home_dir, result.timings["total"], steps, seeds and "; " + seeds)
+    logger.notify(
+        "%d of %d environments created in %.2fs", len(environments) - failed, len(environments), time.time() - start
+    )
+    return not failed
+
+
+def virtualenv_script():
+    """The path another interpreter runs this virtualenv with"""
+    file = __file__
+    if file.endswith(".pyc"):
+        file = file[:-1]
+    elif IS_ZIPAPP:
+        file = HERE
+    return file
+
+
+def fan_out(pythons, dest_dir):
+    """
+    Create an environment with each of the interpreters ``pythons`` at the
+    same time, one virtualenv process running under each, at ``dest_dir``
+    with ``{version}`` replaced by the interpreter's major.minor version. The
+    rest of the command line is the same for all of them. Logs a summary
+    (and the output of the failed ones) and returns whether all of them were
+    created.
+    """
+    interpreters = []
+    for python in pythons:
+        interpreter = resolve_interpreter(python)
+        version = subprocess.check_output(
+            [interpreter, "-c", "import sys; print('{}.{}'.format(*sys.version_info))"], universal_newlines=True
+        ).strip()
+        interpreters.append((interpreter, dest_dir.replace("{version}", version)))
+    destinations = [destination for _, destination in interpreters]
+    if len(set(destinations)) != len(destinations):
+        logger.fatal(
+            "ERROR: The environments of %s would share a DEST_DIR, name them apart with {version}", ", ".join(pythons)
+        )
+        sys.exit(2)
+
+    env = os.environ.copy()
+    env["VIRTUALENV_INTERPRETER_RUNNING"] = "true"
+
+    def create(job):
+        interpreter, destination = job
+        arguments = [destination if arg == dest_dir else arg for arg in sys.argv[1:]]
+        start = time.time()
+        process = subprocess.Popen(
+            [interpreter, virtualenv_script()] + arguments,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        )
+        output = process.communicate()[0]
+        return process.returncode, time.time() - start, output
+
+    start = time.time()
+    outcomes = threaded_map(create, interpreters, workers=len(interpreters))
+    failed = 0
+    for (interpreter, destination), (code, elapsed, output) in zip(interpreters, outcomes):
+        if code:
+            failed += 1
+            logger.error("FAILED  %s with %s after %.2fs (exit code %s):", destination, interpreter, elapsed, code)
+        else:
+            logger.notify("created %s with %s in %.2fs", destination, interpreter, elapsed)
+        # what the failed ones had to say is shown, the rest with --verbose
+        logger.indent += 2
+        try:
+            for line in output.splitlines():
+                logger.log(Logger.ERROR if code else Logger.INFO, line)
+        finally:
+            logger.indent -= 2
+    logger.notify(
+        "%d of %d environments created in %.2fs", len(interpreters) - failed, len(interpreters), time.time() - start
+    )
+    return not failed
+
+
+def call_subprocess(
+    cmd,
+    show_stdout=True,
+    filter_stdout=None,
+    cwd=None,
+    raise_on_return_code=True,
+    extra_env=None,
+    remove_from_env=None,
+    stdin=None,
+):
+    cmd_parts = []
+    for part in cmd:
+        if len(part) > 45:
+            part = part[:20] + "..." + part[-20:]
+        if " " in part or "\n" in part or '"' in part or "'" in part:
+            part = '"{}"'.format(part.replace('"', '\\"'))
+        if hasattr(part, "decode"):
+            try:
+                part = part.decode(sys.getdefaultencoding())
+            except UnicodeDecodeError:
+                part = part.decode(sys.getfilesystemencoding())
+        cmd_parts.append(part)
+    cmd_desc = " ".join(cmd_parts)
+    if show_stdout:
+        stdout = None
+    else:
+        stdout = subprocess.PIPE
+    logger.debug("Running command {}".format(cmd_desc))
+    if extra_env or remove_from_env:
+        env = os.environ.copy()
+        if extra_env:
+            env.update(extra_env)
+        if remove_from_env:
+            for var_name in remove_from_env:
+                env.pop(var_name, None)
+    else:
+        env = None
+    try:
+        proc = subprocess.Popen(
+            cmd,
+            stderr=subprocess.STDOUT,
+            stdin=None if stdin is None else subprocess.PIPE,
+            stdout=stdout,
+            cwd=cwd,
+            env=env,
+        )
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.fatal("Error {} while executing command {}".format(e, cmd_desc))
+        raise
+    all_output = []
+    if stdout is not None:
+        if stdin is not None:
+            with proc.stdin:
+                proc.stdin.write(stdin)
+
+        encoding = sys.getdefaultencoding()
+        fs_encoding = sys.getfilesystemencoding()
+        with proc.stdout as stdout:
+            while 1:
+                line = stdout.readline()
+                try:
+                    line = line.decode(encoding)
+                except UnicodeDecodeError:
+                    line = line.decode(fs_encoding)
+                if not line:
+                    break
+                line = line.rstrip()
+                all_output.append(line)
+                if filter_stdout:
+                    level = filter_stdout(line)
+                    if isinstance(level, tuple):
+                        level, line = level
+                    logger.log(level, line)
+                    if not logger.stdout_level_matches(level):
+                        logger.show_progress()
+                else:
+                    logger.info(line)
+    else:
+        proc.communicate(stdin)
+    proc.wait()
+    if proc.returncode:
+        if raise_on_return_code:
+            if all_output:
+                logger.notify("Complete output from command {}:".format(cmd_desc))
+                logger.notify("\n".join(all_output) + "\n----------------------------------------")
+            raise OSError("Command {} failed with error code {}".format(cmd_desc, proc.returncode))
+        else:
+            logger.warn("Command {} had error code {}".format(cmd_desc, proc.returncode))
+    return all_output
+
+
+def filter_install_output(line):
+    if line.strip().startswith("running"):
+        return Logger.INFO
+    return Logger.DEBUG
+
+
+def find_wheels(projects, search_dirs):
+    """Find wheels from which we can import PROJECTS.
+
+    Scan through SEARCH_DIRS for a wheel for each PROJECT in turn. Return
+    a list of the first wheel found for each PROJECT
+    """
+
+    wheels = []
+
+    # Look through SEARCH_DIRS for the first suitable wheel. Don't bother
+    # about version checking here, as this is simply to get something we can
+    # then use to install the correct version.
+    for project in projects:
+        for dirname in search_dirs:
+            # This relies on only having "universal" wheels available.
+            # The pattern could be tightened to require -py2.py3-none-any.whl.
+            files = glob.glob(os.path.join(dirname, project + "-*.whl"))
+            if files:
+                wheels.append(os.path.abspath(files[0]))
+                break
+        else:
+            # We're out of luck, so quit with a suitable error
+            logger.fatal("Cannot find a wheel for {}".format(project))
+
+    return wheels
+
+
+def install_wheel(project_names, py_executable, search_dirs=None, download=False):
+    if search_dirs is None:
+        search_dirs_context = virtualenv_support_dirs
+    else:
+
+        @contextlib.contextmanager
+        def search_dirs_context():
+            yield search_dirs
+
+    with search_dirs_context() as search_dirs:
+        if current_plan() is not None:
+            # pip is not run, the unpacked size of the local wheels estimates what it would install
+            for wheel in find_wheels(project_names, search_dirs):
+                with zipfile.ZipFile(wheel) as archive:
+                    size = sum(info.file_size for info in archive.infolist())
+                planned("install", wheel, by=py_executable, bytes=size, download=download)
+            return
+        _install_wheel_with_search_dir(download, project_names, py_executable, search_dirs)
+
+
+def _install_wheel_with_search_dir(download, project_names, py_executable, search_dirs):
+    wheels = cached(("wheels", tuple(search_dirs)), lambda: find_wheels(["setuptools", "pip"], search_dirs))
+    python_path = os.pathsep.join(wheels)
+
+    # PIP_FIND_LINKS uses space as the path separator and thus cannot have paths
+    # with spaces in them. Convert any of those to local file:// URL form.
+    try:
+        from urlparse import urljoin
+        from urllib import pathname2url
+    except ImportError:
+        from urllib.parse import urljoin
+        from urllib.request import pathname2url
+
+    def space_path2url(p):
+        if " " not in p:
+            return p
+        return urljoin("file:", pathname2url(os.path.abspath(p)))
+
+    find_links = " ".join(space_path2url(d) for d in search_dirs)
+
+    extra_args = ["--ignore-installed"]
+    if DEBUG:
+        extra_args.append("-v")
+    if IS_JYTHON:
+        extra_args.append("--no-cache")
+
+    # read by the new interpreter, but the same for every new environment
+    config = cached(("pip-config", python_path), lambda: _pip_config(py_executable, python_path))
+    defined_cert = bool(config.get("install.cert") or config.get(":env:.cert") or config.get("global.cert"))
+
+    script = textwrap.dedent(
+        """
+        import sys
+        import pkgutil
+        import tempfile
+        import os
+
+        defined_cert = {defined_cert}
+
+        try:
+            from pip._internal import main as _main
+            cert_data = pkgutil.get_data("pip._vendor.certifi", "cacert.pem")
+        except ImportError:
+            from pip import main as _main
+            cert_data = pkgutil.get_data("pip._vendor.requests", "cacert.pem")
+        except IOError:
+            cert_data = None
+
+        if not defined_cert and cert_data is not None:
+            cert_file = tempfile.NamedTemporaryFile(delete=False)
+            cert_file.write(cert_data)
+            cert_file.close()
+        else:
+            cert_file = None
+
+        try:
+            args = ["install"] + [{extra_args}]
+            if cert_file is not None:
+                args += ["--cert", cert_file.name]
+            args += sys.argv[1:]
+
+            sys.exit(_main(args))
+        finally:
+            if cert_file is not None:
+                os.remove(cert_file.name)
+    """.format(
+            defined_cert=defined_cert, extra_args=", ".join(repr(i) for i in extra_args)
+        )
+    ).encode("utf8")
+
+    cmd = [py_executable, "-"] + project_names
+    logger.start_progress("Installing {}...".format(", ".join(project_names)))
+    logger.indent += 2
+
+    env = {
+        "PYTHONPATH": python_path,
+        "JYTHONPATH": python_path,  # for Jython < 3.x
+        "PIP_FIND_LINKS": find_links,
+        "PIP_USE_WHEEL": "1",
+        "PIP_ONLY_BINARY": ":all:",
+        "PIP_USER": "0",
+        "PIP_NO_INPUT": "1",
+    }
+
+    if not download:
+        env["PIP_NO_INDEX"] = "1"
+
+    try:
+        call_subprocess(cmd, show_stdout=False, extra_env=env, stdin=script)
+    finally:
+        logger.indent -= 2
+        logger.end_progress()
+
+
+def _pip_config(py_executable, python_path):
+    cmd = [py_executable, "-m", "pip", "config", "list"]
+    config = {}
+    for line in call_subprocess(
+        cmd,
+        show_stdout=False,
+        extra_env={"PYTHONPATH": python_path, "JYTHONPATH": python_path},
+        remove_from_env=["PIP_VERBOSE", "PIP_QUIET"],
+        raise_on_return_code=False,
+    ):
+        key, _, value = line.partition("=")
+        if value:
+            config[key] = ast.literal_eval(value)
+    return config
+
+
+def create_environment(
+    home_dir,
+    site_packages=False,
+    clear=False,
+    prompt=None,
+    search_dirs=None,
+    download=False,
+    no_setuptools=False,
+    no_pip=False,
+    no_wheel=False,
+    symlink=True,
+    venv_style=False,
+    relocatable=False,
+):
+    """
+    Creates a new environment in ``home_dir``.
+
+    If ``site_packages`` is true, then the global ``site-packages/``
+    directory will be on the path.
+
+    If ``clear`` is true (default False) then the environment will
+    first be cleared.
+
+    If ``venv_style`` is true the environment is laid out like the venv
+    module does it (Python 3 only): a ``pyvenv.cfg`` instead of a custom
+    ``site.py`` and links to the standard library.
+
+    If ``relocatable`` is true the environment keeps working after being
+    moved: the activation scripts find it from their own location and the
+    scripts and ``.pth`` files of the seeded packages are made relative.
+
+    A new environment is built in a staging directory next to ``home_dir``
+    and renamed into place once complete, under a lock on ``home_dir``: a
+    concurrent creation of the same environment waits for it and then uses
+    it, an interrupted one leaves no partial environment behind: the next
+    creation with the same options resumes it after its last completed step.
+    """
+    options = dict(
+        site_packages=site_packages,
+        clear=clear,
+        prompt=prompt,
+        search_dirs=search_dirs,
+        download=download,
+        no_setuptools=no_setuptools,
+        no_pip=no_pip,
+        no_wheel=no_wheel,
+        symlink=symlink,
+        venv_style=venv_style,
+        relocatable=relocatable,
+    )
+    target, _, _, bin_dir = path_locations(home_dir, dry_run=True)
+    if current_plan() is not None:
+        # a dry run plans the creation right at its target, with no lock, staging directory or journal
+        _build_environment(target, None, **options)
+        return
+    with environment_lock(target) as waited:
+        if waited and not clear and os.path.exists(join(bin_dir, "activate_this.py")):
+            logger.notify("Using %s, created by another virtualenv meanwhile", target)
+            return
+        digest = journal_digest(options)
+        parent, name = os.path.split(target)
+        orphans = find_trash(target, STAGING_MARKER)
+        # the staging directory of an interrupted creation with the same options is resumed, the others are deleted
+        staging = None
+        if not clear and not os.path.exists(target):
+            for orphan in orphans:
+                if Journal.read(join(orphan, name, JOURNAL_NAME), digest):
+                    staging = orphan
+                    orphans.remove(orphan)
+                    break
+        if orphans and not delete_in_background(orphans):
+            for orphan in orphans:
+                shutil.rmtree(orphan, ignore_errors=True)
+        if os.path.exists(target):
+            _build_environment(target, digest, **options)
+            return
+        if staging is None:
+            staging = tempfile.mkdtemp(prefix=".{}{}".format(name, STAGING_MARKER), dir=parent)
+        # on failure the staging directory is left for the next creation to resume
+        staging_home = _build_environment(join(staging, name), digest, **options)
+        logger.info("Moving the new environment from %s to %s", staging_home, target)
+        os.rename(staging_home, target)
+        os.rmdir(staging)
+        home_dir, lib_dir, inc_dir, bin_dir = path_locations(target)
+        rewrite_prefix(staging_home, home_dir, bin_dir)
+
+
+def _build_environment(
+    home_dir,
+    digest,
+    site_packages,
+    clear,
+    prompt,
+    search_dirs,
+    download,
+    no_setuptools,
+    no_pip,
+    no_wheel,
+    symlink,
+    venv_style,
+    relocatable,
+):
+    """
+    Create the environment in ``home_dir`` in place, return its (normalized)
+    location. The steps are journaled so that an interrupted creation with
+    the options of ``digest`` resumes at the first step it did not complete
+    (with no ``digest`` they are not).
+    """
+    home_dir, lib_dir, inc_dir, bin_dir = path_locations(home_dir)
+    mkdir(home_dir)
+    # the installation of the interpreter into an empty directory is recorded, to be replayed by later creations
+    replayable = current_plan() is None and not IS_JYTHON and not os.listdir(home_dir)
+    journal = Journal(home_dir, digest, clear=clear)
+
+    def install():
+        if venv_style:
+            return os.path.abspath(
+                install_venv_python(
+                    home_dir, lib_dir, bin_dir, site_packages=site_packages, clear=clear, symlink=symlink
+                )
+            )
+        if not replayable:
+            py_executable = os.path.abspath(
+                install_python(
+                    home_dir, lib_dir, inc_dir, bin_dir, site_packages=site_packages, clear=clear, symlink=symlink
+                )
+            )
+            install_distutils(home_dir)
+            return py_executable
+        plan_filename = cached(("plan", site_packages, symlink), lambda: python_plan_filename(site_packages, symlink))
+        try:
+            py_executable = replay_python(plan_filename, home_dir, symlink)
+        except (IOError, OSError) as error:
+            # what the recording refers to changed, the installation is completed the usual way
+            logger.notify("Could not replay the recorded installation (%s), installing %s", error, sys.executable)
+            forget(("recording", plan_filename))
+            if os.path.exists(plan_filename):
+                os.remove(plan_filename)
+            py_executable = None
+        if py_executable is not None:
+            return py_executable
+        with recording() as plan:
+            py_executable = os.path.abspath(
+                install_python(
+                    home_dir, lib_dir, inc_dir, bin_dir, site_packages=site_packages, clear=clear, symlink=symlink
+                )
+            )
+            install_distutils(home_dir)
+        record_python(plan, home_dir, py_executable, plan_filename)
+        return py_executable
+
+    def installed(py_executable):
+        if venv_style:
+            return [py_executable, join(home_dir, "pyvenv.cfg")]
+        return [py_executable, join(lib_dir, "site.py"), join(lib_dir, "orig-prefix.txt"), join(lib_dir, "distutils")]
+
+    py_executable = journal.run(0, "python", installed, install)
+
+    to_install = []
+
+    if not no_setuptools:
+        to_install.append("setuptools")
+
+    if not no_pip:
+        to_install.append("pip")
+
+    if not no_wheel:
+        to_install.append("wheel")
+
+    def seeded(_):
+        return [join(lib_dir, "site-packages")]
+
+    def activated(_):
+        return [join(bin_dir, name) for name in sorted(os.listdir(bin_dir)) if name.startswith("activate")]
+
+    def configured(_):
+        return [join(bin_dir, "python-config")]
+
+    if to_install:
+        journal.run(1, "seed", seeded, install_wheel, to_install, py_executable, search_dirs, download=download)
+
+    journal.run(2, "activate", activated, install_activate, home_dir, bin_dir, prompt, relocatable=relocatable)
+
+    # the precomputed python-config answers hold the absolute paths of the environment
+    config_executable = None if relocatable else py_executable
+    journal.run(3, "python-config", configured, install_python_config, home_dir, bin_dir, prompt, config_executable)
+
+    if relocatable and not planned("relocate", home_dir):
+        fixup_scripts(home_dir, bin_dir, sh_launcher=True)
+        fixup_pth_and_egg_link(home_dir)
+    journal.complete()
+    return home_dir
+
+
+class EnvironmentBuilder(object):
+    """
+    Creates any number of environments for the running interpreter, from one
+    or more threads. What does not depend on the environment (the prefixes of
+    the interpreter, its bootstrap modules and recorded installation, the
+    wheels found in ``search_dirs`` and the pip configuration) is looked up
+    once and kept for later creations. ``search_dirs`` defaults to the wheels
+    bundled with virtualenv, the keyword arguments to the options of
+    ``create_environment`` every creation uses. It logs to its own ``logger``
+    (warnings on stderr by default) and leaves the module logger, the working
+    directory and the environment variables of the process alone.
+    """
+
+    def __init__(self, search_dirs=None, logger=None, **defaults):
+        self.logger = Logger([(Logger.WARN, sys.stderr)]) if logger is None else logger
+        self.defaults = defaults
+        self._search_dirs = search_dirs
+        self._support_dirs = None
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Release the bundled wheels (extracted to a temporary directory when running from a zipapp)"""
+        with self._lock:
+            support_dirs, self._support_dirs = self._support_dirs, None
+        if support_dirs is not None:
+            support_dirs.__exit__(None, None, None)
+
+    @property
+    def search_dirs(self):
+        with self._lock:
+            if self._search_dirs is None:
+                self._support_dirs = virtualenv_support_dirs()
+                self._search_dirs = self._support_dirs.__enter__()
+            return self._search_dirs
+
+    def cached(self, key, compute):
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        # computed unlocked, so that other creations are not held up; a concurrent one may compute it too
+        value = compute()
+        if value is None:
+            return value
+        with self._lock:
+            return self._cache.setdefault(key, value)
+
+    def forget(self, key):
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def create(self, home_dir, **options):
+        """Create the environment ``home_dir`` like ``create_environment`` does, return its ``EnvironmentResult``"""
+        options = dict(self.defaults, **options)
+        if options.get("search_dirs") is None:
+            options["search_dirs"] = self.search_dirs
+        # each creation gets a logger of its own, for its indentation and progress
+        context = _BuildContext(self, Logger(self.logger.consumers))
+        previous = getattr(_building, "context", None)
+        _building.context = context
+        start = time.time()
+        try:
+            create_environment(home_dir, **options)
+        finally:
+            _building.context = previous
+        context.timings["total"] = time.time() - start
+        home_dir, lib_dir, inc_dir, bin_dir = path_locations(home_dir, dry_run=True)
+        executable = join(bin_dir, EXPECTED_EXE + (".exe" if IS_WIN else ""))
+        projects = [name for name in ("setuptools", "pip", "wheel") if not options.get("no_{}".format(name))]
+        seed_versions = installed_versions(join(lib_dir, "site-packages"), projects)
+        return EnvironmentResult(home_dir, lib_dir, inc_dir, bin_dir, executable, context.timings, seed_versions)
+
+
+class _BuildContext(object):
+    """The state of an environment being created by an EnvironmentBuilder"""
+
+    def __init__(self, builder, logger):
+        self.builder = builder
+        self.logger = logger
+        self.timings = {}
+
+
+class EnvironmentResult(object):
+    """
+    An environment created by an EnvironmentBuilder: its paths and python
+    ``executable``, how long each creation step took in seconds (``total`` for
+    all of them) and the versions of the seeded projects
+    """
+
+    def __init__(self, home_dir, lib_dir, inc_dir, bin_dir, executable, timings, seed_versions):
+        self.home_dir = home_dir
+        self.lib_dir = lib_dir
+        self.inc_dir = inc_dir
+        self.bin_dir = bin_dir
+        self.executable = executable
+        self.timings = timings
+        self.seed_versions = seed_versions
+
+    def __repr__(self):
+        return "<EnvironmentResult {!r} {!r}>".format(self.home_dir, self.seed_versions)
+
+
+def installed_versions(site_packages, projects):
+    """The version of each of the ``projects`` installed in ``site_packages``, as found in its dist-info name"""
+    versions = {}
+    if not os.path.isdir(site_packages):
+        return versions
+    for name in os.listdir(site_packages):
+        if name.endswith(".dist-info"):
+            project, _, version = name[: -len(".dist-info")].partition("-")
+            if project.lower() in projects:
+                versions[project.lower()] = version
+    return versions
+
+
+@contextlib.contextmanager
+def environment_lock(home_dir):
+    """
+    Hold an advisory lock on the environment ``home_dir``, on a
+    .NAME.virtualenv-lock file next to it, waiting for other holders; yields
+    whether it had to wait. Where the platform can not lock (Jython) it does
+    not lock.
+    """
+    parent, name = os.path.split(os.path.abspath(home_dir))
+    if not os.path.isdir(parent):
+        os.makedirs(parent)
+    with open(join(parent, ".{}.virtualenv-lock".format(name)), "a") as lock_file:
+        try:
+            import fcntl
+        except ImportError:
+            fcntl = None
+        try:
+            import msvcrt
+        except ImportError:
+            msvcrt = None
+        waited = False
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                elif msvcrt is not None:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except (IOError, OSError):
+                if not waited:
+                    logger.notify("Waiting for another virtualenv to finish with %s", home_dir)
+                    waited = True
+                time.sleep(0.1)
+        try:
+            yield waited
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+# the steps completed so far by an unfinished creation are kept in this file of the environment
+JOURNAL_NAME = ".virtualenv-journal"
+
+
+def journal_digest(options):
+    """Digest of what an environment is built from: this virtualenv, the interpreter and the creation ``options``"""
+    key = repr((__version__, sys.executable, sys.version, sorted(options.items())))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def fingerprint(paths):
+    """
+    Cheap digest of the current state of ``paths``, built from the stat of the
+    files and the names within the directories: their content is not read
+    """
+    parts = []
+    for path in paths:
+        try:
+            st = os.lstat(path)
+        except OSError:
+            parts.append((path, None))
+            continue
+        if os.path.isdir(path):
+            parts.append((path, sorted(os.listdir(path))))
+        else:
+            parts.append((path, st.st_mode, st.st_size, int(st.st_mtime * 1000)))
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+class Journal(object):
+    """
+    An append-only record, one JSON line each, of the creation steps completed
+    in ``home_dir`` with a fingerprint of their outputs. Steps are re-run from
+    the first one that is missing, or whose outputs changed since; the journal
+    is removed once the environment is complete. Without a ``digest`` the
+    steps are just run.
+    """
+
+    def __init__(self, home_dir, digest, clear=False):
+        self.filename = None if digest is None else join(home_dir, JOURNAL_NAME)
+        self.digest = digest
+        self.done = {} if clear or digest is None else self.read(self.filename, digest)
+        self.resuming = bool(self.done)
+        if self.resuming:
+            logger.notify("Resuming the interrupted creation of %s", home_dir)
+        else:
+            self._append({"journal": digest}, mode="w")
+
+    @staticmethod
+    def read(filename, digest):
+        """Return the steps recorded in the journal ``filename`` as name: record, or nothing if not for ``digest``"""
+        try:
+            with open(filename) as file_handler:
+                content = file_handler.read()
+        except (IOError, OSError):
+            return {}
+        # a line being written when the creation was interrupted is incomplete, and so is ignored
+        lines = content.split("\n")[:-1]
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+        if not records or records[0].get("journal") != digest:
+            return {}
+        done = {}
+        for record in records[1:]:
+            # re-running a step means the ones after it are to be re-run too
+            for name in [name for name, other in done.items() if other["index"] > record["index"]]:
+                del done[name]
+            done[record["step"]] = record
+        return done
+
+    def _append(self, record, mode="a"):
+        if self.filename is None:
+            return
+        with open(self.filename, mode) as file_handler:
+            file_handler.write(json.dumps(record, sort_keys=True) + "\n")
+
+    def run(self, index, name, outputs, func, *args, **kwargs):
+        """
+        Run the step ``func(*args, **kwargs)``, unless the journal holds it as
+        completed and ``outputs(result)`` still has the recorded fingerprint;
+        return its result (the recorded one for a skipped step)
+        """
+        record = self.done.get(name) if self.resuming else None
+        if record is not None and record["index"] == index:
+            if fingerprint(outputs(record["result"])) == record["fingerprint"]:
+                logger.info("Skipping %s, done before the interruption", name)
+                return record["result"]
+            logger.notify("The output of %s changed since the interruption, resuming from it", name)
+        self.resuming = False
+        start = time.time()
+        result = func(*args, **kwargs)
+        context = getattr(_building, "context", None)
+        if context is not None:
+            context.timings[name] = time.time() - start
+        if self.filename is not None:
+            record = {"index": index, "step": name, "result": result, "fingerprint": fingerprint(outputs(result))}
+            self._append(record)
+        return result
+
+    def complete(self):
+        if self.filename is not None:
+            os.remove(self.filename)
+
+
+def activation_variables(home_dir):
+    """
+    Return what activating the environment in ``home_dir`` changes, the way
+    sourcing ``bin/activate`` does it: the variables to ``set``, the ones to
+    ``unset`` and the directories to ``path_prepend`` to ``PATH``.
+    """
+    home_dir, lib_dir, inc_dir, bin_dir = path_locations(home_dir, dry_run=True)
+    return {"set": {"VIRTUAL_ENV": home_dir}, "unset": ["PYTHONHOME"], "path_prepend": [bin_dir]}
+
+
+def activated_environ(home_dir, environ=None):
+    """
+    Return a copy of ``environ`` (``os.environ`` by default) with the
+    environment in ``home_dir`` activated, see ``activation_variables``.
+    """
+    environ = dict(os.environ if environ is None else environ)
+    variables = activation_variables(home_dir)
+    path = environ.get("PATH", "").split(os.pathsep) if environ.get("PATH") else []
+    if environ.get("VIRTUAL_ENV"):
+        # an already active environment is deactivated first
+        active_bin_dirs = activation_variables(environ["VIRTUAL_ENV"])["path_prepend"]
+        path = [entry for entry in path if entry not in active_bin_dirs]
+    environ.update(variables["set"])
+    environ["PATH"] = os.pathsep.join(variables["path_prepend"] + path)
+    for name in variables["unset"]:
+        environ.pop(name, None)
+    return environ
+
+
+def run_in_environment(home_dir, cmd, environ=None):
+    """
+    Run ``cmd`` (a list of arguments) with the environment in ``home_dir``
+    activated, without going through a shell.
+
+    The current process is replaced by the command; on Windows, where exec
+    does not keep the process, the command runs as a child and its exit code
+    is passed on.
+    """
+    bin_dir = path_locations(home_dir, dry_run=True)[3]
+    if not os.path.isdir(bin_dir):
+        logger.fatal("ERROR: {} is not a virtual environment (no {})".format(home_dir, bin_dir))
+        sys.exit(3)
+    env = activated_environ(home_dir, environ)
+    logger.info("Running %s in %s", " ".join(cmd), home_dir)
+    sys.stdout.flush()
+    try:
+        if IS_WIN:
+            raise SystemExit(subprocess.call(cmd, env=env))
+        os.execvpe(cmd[0], cmd, env)
+    except OSError:
+        e = sys.exc_info()[1]
+        logger.fatal("ERROR: could not run {}: {}".format(cmd[0], e))
+        sys.exit(127)
+
+
+def is_executable_file(fpath):
+    return os.path.isfile(fpath) and is_executable(fpath)
+
+
+def path_locations(home_dir, dry_run=False):
+    """Return the path locations for the environment (where libraries are,
+    where scripts go, etc)"""
+    home_dir = os.path.abspath(home_dir)
+    lib_dir, inc_dir, bin_dir = None, None, None
+    # XXX: We'd use distutils.sysconfig.get_python_inc/lib but its
+    # prefix arg is broken: http://bugs.python.org/issue3386
+    if IS_WIN:
+        # Windows has lots of problems with executables with spaces in
+        # the name; this function will remove them (using the ~1
+        # format):
+        if not dry_run:
+            mkdir(home_dir)
+        if " " in home_dir:
+            import ctypes
+
+            get_short_path_name = ctypes.windll.kernel32.GetShortPathNameW
+            size = max(len(home_dir) + 1, 256)
+            buf = ctypes.create_unicode_buffer(size)
+            try:
+                # noinspection PyUnresolvedReferences
+                u = unicode
+            except NameError:
+                u = str
+            ret = get_short_path_name(u(home_dir), buf, size)
+            if not ret:
+                print('Error: the path "{}" has a space in it'.format(home_dir))
+                print("We could not determine the short pathname for it.")
+                print("Exiting.")
+                sys.exit(3)
+            home_dir = str(buf.value)
+        lib_dir = join(home_dir, "Lib")
+        inc_dir = join(home_dir, "Include")
+        bin_dir = join(home_dir, "Scripts")
+    if IS_JYTHON:
+        lib_dir = join(home_dir, "Lib")
+        inc_dir = join(home_dir, "Include")
+        bin_dir = join(home_dir, "bin")
+    elif IS_PYPY:
+        lib_dir = home_dir
+        inc_dir = join(home_dir, "include")
+        bin_dir = join(home_dir, "bin")
+    elif not IS_WIN:
+        lib_dir = join(home_dir, "lib", PY_VERSION)
+        inc_dir = join(home_dir, "include", PY_VERSION + ABI_FLAGS)
+        bin_dir = join(home_dir, "bin")
+    return home_dir, lib_dir, inc_dir, bin_dir
+
+
+def source_prefixes():
+    """The prefixes of the interpreter files, longest first"""
+    prefixes = [sys.prefix]
+
+    if IS_DARWIN:
+        prefixes.extend(
+            (
+                os.path.join("/Library/Python", sys.version[:3], "site-packages"),
+                os.path.join(sys.prefix, "Extras", "lib", "python"),
+                os.path.join("~", "Library", "Python", sys.version[:3], "site-packages"),
+                # Python 2.6 no-frameworks
+                os.path.join("~", ".local", "lib", "python", sys.version[:3], "site-packages"),
+                # System Python 2.7 on OSX Mountain Lion
+                os.path.join("~", "Library", "Python", sys.version[:3], "lib", "python", "site-packages"),
+            )
+        )
+
+    if hasattr(sys, "real_prefix"):
+        prefixes.append(sys.real_prefix)
+    if hasattr(sys, "base_prefix"):
+        prefixes.append(sys.base_prefix)
+    prefixes = list(map(os.path.expanduser, prefixes))
+    prefixes = list(map(os.path.abspath, prefixes))
+    # Check longer prefixes first so we don't split in the middle of a filename
+    prefixes = sorted(prefixes, key=len, reverse=True)
+    for i, prefix in enumerate(prefixes):
+        if IS_WIN and prefix[0] in "abcdefghijklmnopqrstuvwxyz":
+            prefixes[i] = prefix[0].upper() + prefix[1:]
+    return prefixes
+
+
+def change_prefix(filename, dst_prefix):
+    prefixes = cached("prefixes", source_prefixes)
+    filename = os.path.abspath(filename)
+    # On Windows, make sure drive letter is uppercase
+    if IS_WIN and filename[0] in "abcdefghijklmnopqrstuvwxyz":
+        filename = filename[0].upper() + filename[1:]
+    for src_prefix in prefixes:
+        if filename.startswith(src_prefix):
+            _, relative_path = filename.split(src_prefix, 1)
+            if src_prefix != os.sep:  # sys.prefix == "/"
+                assert relative_path[0] == os.sep
+                relative_path = relative_path[1:]
+            return join(dst_prefix, relative_path)
+    assert False, "Filename {} does not start with any of these prefixes: {}".format(filename, prefixes)
+
+
+def find_module_filename(modname):
+
+    if sys.version_info < (3, 4):
+        # noinspection PyDeprecation
+        import imp
+
+        try:
+            file_handler, filepath, _ = imp.find_module(modname)
+        except ImportError:
+            return None
+        else:
+            if file_handler is not None:
+                file_handler.close()
+            return filepath
+    else:
+        import importlib.util
+
+        if sys.version_info < (3, 5):
+
+            def find_spec(modname):
+                # noinspection PyDeprecation
+                loader = importlib.find_loader(modname)
+                if loader is None:
+                    return None
+                else:
+                    return importlib.util.spec_from_loader(modname, loader)
+
+        else:
+            find_spec = importlib.util.find_spec
+
+        spec = find_spec(modname)
+        if spec is None:
+            return None
+        if not os.path.exists(spec.origin):
+            # https://bitbucket.org/pypy/pypy/issues/2944/origin-for-several-builtin-modules
+            # on pypy3, some builtin modules have a bogus build-time file path, ignore them
+            return None
+        filepath = spec.origin
+        # https://www.python.org/dev/peps/pep-3147/#file guarantee to be non-cached
+        if os.path.basename(filepath) == "__init__.py":
+            filepath = os.path.dirname(filepath)
+        return filepath
+
+
+def copy_required_modules(dst_prefix, symlink):
+    for modname in REQUIRED_MODULES:
+        if modname in sys.builtin_module_names:
+            logger.info("Ignoring built-in bootstrap module: %s" % modname)
+            continue
+        filename = cached(("module", modname), lambda: find_module_filename(modname))
+        if filename is None:
+            logger.info("Cannot import bootstrap module: %s" % modname)
+        else:
+            # special-case custom readline.so on OS X, but not for pypy:
+            if (
+                modname == "readline"
+                and sys.platform == "darwin"
+                and not (IS_PYPY or filename.endswith(join("lib-dynload", "readline.so")))
+            ):
+                dst_filename = join(dst_prefix, "lib", "python{}".format(sys.version[:3]), "readline.so")
+            elif modname == "readline" and sys.platform == "win32":
+                # special-case for Windows, where readline is not a standard module, though it may have been installed
+                # in site-packages by a third-party package
+                dst_filename = None
+            else:
+                dst_filename = change_prefix(filename, dst_prefix)
+            if dst_filename is not None:
+                copyfile(filename, dst_filename, symlink)
+            if filename.endswith(".pyc"):
+                py_file = filename[:-1]
+                if os.path.exists(py_file):
+                    copyfile(py_file, dst_filename[:-1], symlink)
+
+
+def copy_required_files(src_dir, lib_dir, symlink):
+    if not os.path.isdir(src_dir):
+        return
+    for fn in os.listdir(src_dir):
+        bn = os.path.splitext(fn)[0]
+        if fn != "site-packages" and bn in REQUIRED_FILES:
+            copyfile(join(src_dir, fn), join(lib_dir, fn), symlink)
+
+
+def copy_license(prefix, dst_prefix, lib_dir, symlink):
+    """Copy the license file so `license()` builtin works"""
+    for license_path in (
+        # posix cpython
+        os.path.join(prefix, os.path.relpath(lib_dir, dst_prefix), "LICENSE.txt"),
+        # windows cpython
+        os.path.join(prefix, "LICENSE.txt"),
+        # pypy
+        os.path.join(prefix, "LICENSE"),
+    ):
+        if os.path.exists(license_path):
+            dest = subst_path(license_path, prefix, dst_prefix)
+            copyfile(license_path, dest, symlink)
+            return
+    logger.warn("No LICENSE.txt / LICENSE found in source")
+
+
+def copy_include_dir(include_src, include_dest, symlink):
+    """Copy headers from *include_src* to *include_dest* symlinking if required"""
+    if not os.path.isdir(include_src):
+        return
+    # PyPy headers are located in ``pypy-dir/include`` and following code
+    # avoids making ``venv-dir/include`` symlink to it
+    if IS_PYPY:
+        for fn in os.listdir(include_src):
+            copyfile(join(include_src, fn), join(include_dest, fn), symlink)
+    else:
+        copyfile(include_src, include_dest, symlink)
+
+
+def copy_tcltk(src, dest, symlink):
+    """ copy tcl/tk libraries on Windows (issue #93) """
+    for lib_version in "8.5", "8.6":
+        for libname in "tcl", "tk":
+            src_dir = join(src, "tcl", libname + lib_version)
+            dest_dir = join(dest, "tcl", libname + lib_version)
+            # Only copy the dirs from the above combinations that exist
+            if os.path.exists(src_dir) and not os.path.exists(dest_dir):
+                copy_file_or_folder(src_dir, dest_dir, symlink)
+
+
+def subst_path(prefix_path, prefix, home_dir):
+    prefix_path = os.path.normpath(prefix_path)
+    prefix = os.path.normpath(prefix)
+    home_dir = os.path.normpath(home_dir)
+    if not prefix_path.startswith(prefix):
+        logger.warn("Path not in prefix %r %r", prefix_path, prefix)
+        return
+    return prefix_path.replace(prefix, home_dir, 1)
+
+
+def relink_framework_python(py_executable, prefix):
+    """Make the copied framework python executable load the .Python dylib of the environment"""
+    # noinspection PyBroadException
+    try:
+        mach_o_change(py_executable, os.path.join(prefix, "Python"), "@executable_path/../.Python")
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.warn("Could not call mach_o_change: %s. " "Trying to call install_name_tool instead.", e)
+        try:
+            call_subprocess(
+                [
+                    "install_name_tool",
+                    "-change",
+                    os.path.join(prefix, "Python"),
+                    "@executable_path/../.Python",
+                    py_executable,
+                ]
+            )
+        except Exception:
+            logger.fatal("Could not call install_name_tool -- you must " "have Apple's development tools installed")
+            raise
+
+
+def install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages, clear, symlink=True):
+    """Install just the base environment, no distutils patches etc"""
+    if sys.executable.startswith(bin_dir):
+        print("Please use the *system* python to run this script")
+        return
+
+    if clear:
+        rm_tree(lib_dir, background=True)
+        # FIXME: why not delete it?
+        # Maybe it should delete everything with #!/path/to/venv/python in it
+        logger.notify("Not deleting %s", bin_dir)
+
+    if hasattr(sys, "real_prefix"):
+        logger.notify("Using real prefix %r", sys.real_prefix)
+        prefix = sys.real_prefix
+    elif hasattr(sys, "base_prefix"):
+        logger.notify("Using base prefix %r", sys.base_prefix)
+        prefix = sys.base_prefix
+    else:
+        prefix = sys.prefix
+    prefix = os.path.abspath(prefix)
+    pyvenv_cfg = join(home_dir, "pyvenv.cfg")
+    if os.path.exists(pyvenv_cfg):
+        # left over by a --venv-style creation, it would make the interpreter ignore our site.py
+        logger.info("Deleting %s", pyvenv_cfg)
+        remove_file(pyvenv_cfg)
+    mkdir(lib_dir)
+    fix_lib64(lib_dir, symlink)
+    stdlib_dirs = [os.path.dirname(os.__file__)]
+    if IS_WIN:
+        stdlib_dirs.append(join(os.path.dirname(stdlib_dirs[0]), "DLLs"))
+    elif IS_DARWIN:
+        stdlib_dirs.append(join(stdlib_dirs[0], "site-packages"))
+    if hasattr(os, "symlink"):
+        logger.info("Symlinking Python bootstrap modules")
+    else:
+        logger.info("Copying Python bootstrap modules")
+    logger.indent += 2
+    try:
+        # copy required files...
+        for stdlib_dir in stdlib_dirs:
+            copy_required_files(stdlib_dir, lib_dir, symlink)
+        # ...and modules
+        copy_required_modules(home_dir, symlink)
+        copy_license(prefix, home_dir, lib_dir, symlink)
+    finally:
+        logger.indent -= 2
+    # ...copy tcl/tk
+    if IS_WIN:
+        copy_tcltk(prefix, home_dir, symlink)
+    mkdir(join(lib_dir, "site-packages"))
+    import site
+
+    site_filename = site.__file__
+    if site_filename.endswith(".pyc") or site_filename.endswith(".pyo"):
+        site_filename = site_filename[:-1]
+    elif site_filename.endswith("$py.class"):
+        site_filename = site_filename.replace("$py.class", ".py")
+    site_filename_dst = change_prefix(site_filename, home_dir)
+    site_dir = os.path.dirname(site_filename_dst)
+    writefile(site_filename_dst, site_py_template(site_filename_dst))
+    writefile(join(site_dir, "orig-prefix.txt"), prefix)
+    site_packages_filename = join(site_dir, "no-global-site-packages.txt")
+    if not site_packages:
+        writefile(site_packages_filename, "")
+
+    if IS_PYPY or IS_WIN:
+        standard_lib_include_dir = join(prefix, "include")
+    else:
+        standard_lib_include_dir = join(prefix, "include", PY_VERSION + ABI_FLAGS)
+    if os.path.exists(standard_lib_include_dir):
+        copy_include_dir(standard_lib_include_dir, inc_dir, symlink)
+    else:
+        logger.debug("No include dir %s", standard_lib_include_dir)
+
+    platform_include_dir = distutils.sysconfig.get_python_inc(plat_specific=1)
+    if platform_include_dir != standard_lib_include_dir:
+        platform_include_dest = distutils.sysconfig.get_python_inc(plat_specific=1, prefix=home_dir)
+        if platform_include_dir == platform_include_dest:
+            # Do platinc_dest manually due to a CPython bug;
+            # not http://bugs.python.org/issue3386 but a close cousin
+            platform_include_dest = subst_path(platform_include_dir, prefix, home_dir)
+        if platform_include_dest:
+            # PyPy's stdinc_dir and prefix are relative to the original binary
+            # (traversing virtualenvs), whereas the platinc_dir is relative to
+            # the inner virtualenv and ignores the prefix argument.
+            # This seems more evolved than designed.
+            copy_include_dir(platform_include_dir, platform_include_dest, symlink)
+
+    # pypy never uses exec_prefix, just ignore it
+    if os.path.realpath(sys.exec_prefix) != os.path.realpath(prefix) and not IS_PYPY:
+        if IS_WIN:
+            exec_dir = join(sys.exec_prefix, "lib")
+        elif IS_JYTHON:
+            exec_dir = join(sys.exec_prefix, "Lib")
+        else:
+            exec_dir = join(sys.exec_prefix, "lib", PY_VERSION)
+        copy_required_files(exec_dir, lib_dir, symlink)
+
+    if IS_JYTHON:
+        # Jython has either jython-dev.jar and javalib/ dir, or just
+        # jython.jar
+        for name in "jython-dev.jar", "javalib", "jython.jar":
+            src = join(prefix, name)
+            if os.path.exists(src):
+                copyfile(src, join(home_dir, name), symlink)
+        # XXX: registry should always exist after Jython 2.5rc1
+        src = join(prefix, "registry")
+        if os.path.exists(src):
+            copyfile(src, join(home_dir, "registry"), symlink=False)
+        copyfile(join(prefix, "cachedir"), join(home_dir, "cachedir"), symlink=False)
+
+    mkdir(bin_dir)
+    py_executable = join(bin_dir, os.path.basename(sys.executable))
+    if "Python.framework" in prefix:
+        # OS X framework builds cause validation to break
+        # https://github.com/pypa/virtualenv/issues/322
+        if os.environ.get("__PYVENV_LAUNCHER__"):
+            del os.environ["__PYVENV_LAUNCHER__"]
+        if re.search(r"/Python(?:-32|-64)*$", py_executable):
+            # The name of the python executable is not quite what
+            # we want, rename it.
+            py_executable = os.path.join(os.path.dirname(py_executable), "python")
+
+    logger.notify("New %s executable in %s", EXPECTED_EXE, py_executable)
+    pc_build_dir = os.path.dirname(sys.executable)
+    pyd_pth = os.path.join(lib_dir, "site-packages", "virtualenv_builddir_pyd.pth")
+    if IS_WIN and os.path.exists(os.path.join(pc_build_dir, "build.bat")):
+        logger.notify("Detected python running from build directory %s", pc_build_dir)
+        logger.notify("Writing .pth file linking to build directory for *.pyd files")
+        writefile(pyd_pth, pc_build_dir)
+    else:
+        if os.path.exists(pyd_pth):
+            logger.info("Deleting %s (not Windows env or not build directory python)", pyd_pth)
+            remove_file(pyd_pth)
+
+    if sys.executable != py_executable:
+        # FIXME: could I just hard link?
+        executable = sys.executable
+        copy_executable(executable, py_executable)
+        make_exe(py_executable)
+        if IS_WIN or IS_CYGWIN:
+            python_w = os.path.join(os.path.dirname(sys.executable), "pythonw.exe")
+            if os.path.exists(python_w):
+                logger.info("Also created pythonw.exe")
+                copy_executable(python_w, os.path.join(os.path.dirname(py_executable), "pythonw.exe"))
+            python_d = os.path.join(os.path.dirname(sys.executable), "python_d.exe")
+            python_d_dest = os.path.join(os.path.dirname(py_executable), "python_d.exe")
+            if os.path.exists(python_d):
+                logger.info("Also created python_d.exe")
+                copy_executable(python_d, python_d_dest)
+            elif os.path.exists(python_d_dest):
+                logger.info("Removed python_d.exe as it is no longer at the source")
+                remove_file(python_d_dest)
+
+            # we need to copy the DLL to enforce that windows will load the correct one.
+            # may not exist if we are cygwin.
+            if IS_PYPY:
+                py_executable_dll_s = [("libpypy-c.dll", "libpypy_d-c.dll")]
+            else:
+                py_executable_dll_s = [
+                    ("python{}.dll".format(sys.version_info[0]), "python{}_d.dll".format(sys.version_info[0])),
+                    (
+                        "python{}{}.dll".format(sys.version_info[0], sys.version_info[1]),
+                        "python{}{}_d.dll".format(sys.version_info[0], sys.version_info[1]),
+                    ),
+                ]
+
+            for py_executable_dll, py_executable_dll_d in py_executable_dll_s:
+                python_dll = os.path.join(os.path.dirname(sys.executable), py_executable_dll)
+                python_dll_d = os.path.join(os.path.dirname(sys.executable), py_executable_dll_d)
+                python_dll_d_dest = os.path.join(os.path.dirname(py_executable), py_executable_dll_d)
+                if os.path.exists(python_dll):
+                    logger.info("Also created %s", py_executable_dll)
+                    copy_executable(python_dll, os.path.join(os.path.dirname(py_executable), py_executable_dll))
+                if os.path.exists(python_dll_d):
+                    logger.info("Also created %s", py_executable_dll_d)
+                    copy_executable(python_dll_d, python_dll_d_dest)
+                elif os.path.exists(python_dll_d_dest):
+                    logger.info("Removed %s as the source does not exist", python_dll_d_dest)
+                    remove_file(python_dll_d_dest)
+        if IS_PYPY:
+            # make a symlink python --> pypy-c
+            python_executable = os.path.join(os.path.dirname(py_executable), "python")
+            if sys.platform in ("win32", "cygwin"):
+                python_executable += ".exe"
+            logger.info("Also created executable %s", python_executable)
+            copyfile(py_executable, python_executable, symlink)
+
+            if IS_WIN:
+                for name in ["libexpat.dll", "libeay32.dll", "ssleay32.dll", "sqlite3.dll", "tcl85.dll", "tk85.dll"]:
+                    src = join(prefix, name)
+                    if os.path.exists(src):
+                        copyfile(src, join(bin_dir, name), symlink)
+
+                for d in sys.path:
+                    if d.endswith("lib_pypy"):
+                        break
+                else:
+                    logger.fatal("Could not find lib_pypy in sys.path")
+                    raise SystemExit(3)
+                logger.info("Copying lib_pypy")
+                copyfile(d, os.path.join(home_dir, "lib_pypy"), symlink)
+
+    if os.path.splitext(os.path.basename(py_executable))[0] != EXPECTED_EXE:
+        secondary_exe = os.path.join(os.path.dirname(py_executable), EXPECTED_EXE)
+        py_executable_ext = os.path.splitext(py_executable)[1]
+        if py_executable_ext.lower() == ".exe":
+            # python2.4 gives an extension of '.4' :P
+            secondary_exe += py_executable_ext
+        if os.path.exists(secondary_exe):
+            logger.warn(
+                "Not overwriting existing {} script {} (you must use {})".format(
+                    EXPECTED_EXE, secondary_exe, py_executable
+                )
+            )
+        else:
+            logger.notify("Also creating executable in %s", secondary_exe)
+            copy_executable(sys.executable, secondary_exe)
+            make_exe(secondary_exe)
+
+    if ".framework" in prefix:
+        original_python = None
+        if "Python.framework" in prefix:
+            logger.debug("MacOSX Python framework detected")
+            # Make sure we use the embedded interpreter inside
+            # the framework, even if sys.executable points to
+            # the stub executable in ${sys.prefix}/bin
+            # See http://groups.google.com/group/python-virtualenv/
+            #                              browse_thread/thread/17cab2f85da75951
+            original_python = os.path.join(prefix, "Resources/Python.app/Contents/MacOS/Python")
+        if "EPD" in prefix:
+            logger.debug("EPD framework detected")
+            original_python = os.path.join(prefix, "bin/python")
+        copy_executable(original_python, py_executable)
+
+        # Copy the framework's dylib into the virtual
+        # environment
+        virtual_lib = os.path.join(home_dir, ".Python")
+
+        if os.path.exists(virtual_lib):
+            remove_file(virtual_lib)
+        copyfile(os.path.join(prefix, "Python"), virtual_lib, symlink)
+
+        # And then change the install_name of the copied python executable
+        if not planned("relink", py_executable, src=os.path.join(prefix, "Python")):
+            relink_framework_python(py_executable, prefix)
+
+    if not IS_WIN:
+        # Ensure that 'python', 'pythonX' and 'pythonX.Y' all exist
+        py_exe_version_major = "python{}".format(sys.version_info[0])
+        py_exe_version_major_minor = "python{}.{}".format(sys.version_info[0], sys.version_info[1])
+        py_exe_no_version = "python"
+        required_symlinks = [py_exe_no_version, py_exe_version_major, py_exe_version_major_minor]
+
+        py_executable_base = os.path.basename(py_executable)
+
+        if py_executable_base in required_symlinks:
+            # Don't try to symlink to yourself.
+            required_symlinks.remove(py_executable_base)
+
+        for pth in required_symlinks:
+            full_pth = join(bin_dir, pth)
+            if os.path.exists(full_pth):
+                remove_file(full_pth)
+            if symlink:
+                make_symlink(py_executable_base, full_pth)
+            else:
+                copyfile(py_executable, full_pth, symlink)
+
+    check_executable(py_executable, home_dir)
+
+    pydistutils = os.path.expanduser("~/.pydistutils.cfg")
+    if os.path.exists(pydistutils):
+        logger.notify("Please make sure you remove any previous custom paths from " "your %s file.", pydistutils)
+    # FIXME: really this should be calculated earlier
+
+    fix_local_scheme(home_dir, symlink)
+
+    if site_packages:
+        if os.path.exists(site_packages_filename):
+            logger.info("Deleting %s", site_packages_filename)
+            remove_file(site_packages_filename)
+
+    if not IS_JYTHON:
+        bake_site_constants(py_executable, site_filename_dst)
+        write_stdlib_index(py_executable, home_dir, site_dir)
+
+    return py_executable
+
+
+# stands for the environment location in recorded installations
+PLAN_PLACEHOLDER = "__VIRTUALENV_PREFIX__"
+
+
+def python_plan_filename(site_packages, symlink):
+    """Where the installation of this interpreter into a new environment with these options is recorded"""
+    key = [__version__, sys.executable, sys.version, sys.prefix, site_packages, symlink]
+    # a changed interpreter, standard library or virtualenv invalidates the recording
+    for path in (sys.executable, os.path.dirname(os.__file__), __file__):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        key.append((path, st.st_size, st.st_mtime))
+    return join(PLAN_CACHE_DIR, "{}.json".format(hashlib.sha1(repr(key).encode("utf-8")).hexdigest()))
+
+
+def replace_prefix(data, old, new):
+    """Replace the leading ``old`` by ``new`` in the strings within ``data``"""
+    if isinstance(data, dict):
+        return dict((replace_prefix(key, old, new), replace_prefix(value, old, new)) for key, value in data.items())
+    if isinstance(data, (list, tuple)):
+        return type(data)(replace_prefix(value, old, new) for value in data)
+    if isinstance(data, basestring) and data.startswith(old):
+        return new + data[len(old) :]
+    return data
+
+
+def record_python(plan, home_dir, py_executable, filename):
+    """
+    Save the operations of installing the interpreter into the new environment
+    ``home_dir`` recorded by ``plan`` into ``filename``: the paths within the
+    environment and the content of the files written there hold a placeholder
+    for its location. Installations depending on what was there before, or
+    writing files that are not text (but the standard library index), are not
+    recorded.
+    """
+    operations, written = [], set()
+    for operation in plan.operations:
+        op, path = operation["op"], operation["path"]
+        if op not in ("mkdir", "symlink", "copy", "write", "generate", "chmod", "check"):
+            logger.info("Not recording the installation into %s, it did %s %s", home_dir, op, path)
+            return
+        recorded = {"op": op, "path": replace_prefix(path, home_dir, PLAN_PLACEHOLDER)}
+        if op in ("symlink", "copy"):
+            recorded["src"] = replace_prefix(operation["src"], home_dir, PLAN_PLACEHOLDER)
+        elif op == "chmod":
+            recorded["mode"] = os.stat(path).st_mode & 0xFFF
+        elif op in ("write", "generate"):
+            # the final content is written once, where the file was first written
+            if path in written:
+                continue
+            written.add(path)
+            recorded["op"] = "write"
+            with open(path, "rb") as file_handler:
+                content = file_handler.read()
+            if os.path.basename(path) == "stdlib.index":
+                index = replace_prefix(marshal.loads(content), home_dir, PLAN_PLACEHOLDER)
+                recorded["marshal"] = base64.b64encode(marshal.dumps(index)).decode("ascii")
+            else:
+                try:
+                    recorded["content"] = content.decode("utf-8").replace(home_dir, PLAN_PLACEHOLDER)
+                except UnicodeDecodeError:
+                    logger.info("Not recording the installation into %s, %s is not text", home_dir, path)
+                    return
+        elif op == "check":
+            continue
+        operations.append(recorded)
+    recording = {"py_executable": replace_prefix(py_executable, home_dir, PLAN_PLACEHOLDER), "operations": operations}
+    if not os.path.isdir(PLAN_CACHE_DIR):
+        os.makedirs(PLAN_CACHE_DIR)
+    tmp = "{}.{}.{}.tmp".format(filename, os.getpid(), threading.current_thread().ident)
+    with open(tmp, "w") as file_handler:
+        json.dump(recording, file_handler)
+    if hasattr(os, "replace"):
+        os.replace(tmp, filename)
+    else:
+        if os.path.exists(filename):
+            os.remove(filename)
+        os.rename(tmp, filename)
+    logger.info("Recorded the installation of %s into %s", sys.executable, filename)
+
+
+def load_recording(filename):
+    """The installation recorded in ``filename``, or None if there is none"""
+    try:
+        with open(filename) as file_handler:
+            return json.load(file_handler)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def replay_python(filename, home_dir, symlink=True):
+    """
+    Install the interpreter into the new environment ``home_dir`` by replaying
+    the operations recorded in ``filename``, with no module discovery or
+    standard library scan; return the python executable, or None when there is
+    no recording.
+    """
+    recording = cached(("recording", filename), lambda: load_recording(filename))
+    if recording is None:
+        return None
+    logger.notify("Replaying the recorded installation of %s", sys.executable)
+    for operation in recording["operations"]:
+        op, path = operation["op"], replace_prefix(operation["path"], PLAN_PLACEHOLDER, home_dir)
+        if op == "mkdir":
+            if not os.path.isdir(path):
+                os.makedirs(path)
+        elif op == "symlink":
+            src = replace_prefix(operation["src"], PLAN_PLACEHOLDER, home_dir)
+            try:
+                os.symlink(src, path)
+            except (OSError, NotImplementedError):
+                copy_file_or_folder(src, path, symlink)
+        elif op == "copy":
+            copy_file_or_folder(replace_prefix(operation["src"], PLAN_PLACEHOLDER, home_dir), path, symlink)
+        elif op == "chmod":
+            os.chmod(path, operation["mode"])
+        elif "marshal" in operation:
+            index = marshal.loads(base64.b64decode(operation["marshal"].encode("ascii")))
+            with open(path, "wb") as file_handler:
+                marshal.dump(replace_prefix(index, PLAN_PLACEHOLDER, home_dir), file_handler)
+        else:
+            with open(path, "wb") as file_handler:
+                file_handler.write(operation["content"].replace(PLAN_PLACEHOLDER, home_dir).encode("utf-8"))
+    py_executable = replace_prefix(recording["py_executable"], PLAN_PLACEHOLDER, home_dir)
+    logger.notify("New %s executable in %s", EXPECTED_EXE, py_executable)
+    check_executable(py_executable, home_dir)
+    return py_executable
+
+
+SITE_CONSTANTS_RE = re.compile(r"^SITE_CONSTANTS = .*$", re.M)
+
+
+def site_py_template(site_filename):
+    """The generic site.py, or the one already in place if it only differs by its baked constants"""
+    if os.path.exists(site_filename):
+        with open(site_filename, "rb") as file_handler:
+            content = file_handler.read().decode("utf-8")
+        if SITE_CONSTANTS_RE.sub("SITE_CONSTANTS = None", content, count=1) == SITE_PY:
+            return content
+    return SITE_PY
+
+
+def bake_site_constants(py_executable, site_filename):
+    """Bake what site.py computes on every start for this environment into it
+
+    The values are computed by the generic code inside the new interpreter; site.py falls
+    back to that code if the environment or its base interpreter moves later on."""
+    if planned("generate", site_filename, by=py_executable):
+        return
+    script = textwrap.dedent(
+        """
+        import os
+        import site
+        import sys
+
+        site_dir = os.path.dirname(site.__file__)
+        with open(os.path.join(site_dir, "orig-prefix.txt")) as file_handler:
+            sys.real_prefix = os.path.normpath(os.path.join(site_dir, file_handler.read().strip()))
+        print(repr({
+            "prefix": sys.prefix,
+            "version": sys.version,
+            "real_prefix": sys.real_prefix,
+            "main_paths": site.find_main_paths(),
+            "sitedirs": site.find_sitedirs(sys.prefix, sys.exec_prefix),
+        }))
+        """
+    ).encode("utf8")
+    output = call_subprocess([py_executable, "-"], show_stdout=False, raise_on_return_code=False, stdin=script)
+    try:
+        constants = ast.literal_eval("\n".join(output))
+    except (SyntaxError, ValueError):
+        logger.info("Could not determine the constants of %s, keeping the generic version", site_filename)
+        return
+    content = SITE_CONSTANTS_RE.sub(lambda _: "SITE_CONSTANTS = {!r}".format(constants), SITE_PY, count=1)
+    with open(site_filename, "rb") as file_handler:
+        if file_handler.read() == content.encode("utf-8"):
+            return
+    logger.info("Baking the environment constants into %s", site_filename)
+    with open(site_filename, "wb") as file_handler:
+        file_handler.write(content.encode("utf-8"))
+    # the generic version was compiled within the same second, Python 2 would keep using it
+    for compiled in (site_filename + "c", site_filename + "o"):
+        if os.path.exists(compiled):
+            os.unlink(compiled)
+
+
+def write_stdlib_index(py_executable, home_dir, site_dir):
+    """Index the top level standard library modules by the sys.path entry they live in
+
+    site.py uses this to import them without probing the environment directories (which
+    only hold the bootstrap modules) first."""
+    index_filename = join(site_dir, "stdlib.index")
+    if planned("generate", index_filename, by=py_executable):
+        return
+    if os.path.exists(index_filename):
+        os.unlink(index_filename)
+    script = textwrap.dedent(
+        """
+        import marshal
+        import os
+        import pkgutil
+        import sys
+
+        home_dir, index_filename = sys.argv[1:]
+        home_dir = os.path.normcase(os.path.realpath(home_dir))
+        covered, stdlib = [], []
+        for entry in sys.path[1:]:
+            if os.path.basename(entry) in ("site-packages", "dist-packages", "site-python"):
+                continue
+            if os.path.normcase(os.path.realpath(entry)).startswith(os.path.join(home_dir, "")):
+                covered.append(entry)
+            else:
+                stdlib.append(entry)
+        seen = set(sys.builtin_module_names)
+        for entry in covered:
+            seen.update(name for _, name, _ in pkgutil.iter_modules([entry]))
+        modules = {}
+        for entry in stdlib:
+            for _, name, _ in pkgutil.iter_modules([entry]):
+                if name not in seen:
+                    seen.add(name)
+                    modules[name] = entry
+        with open(index_filename, "wb") as file_handler:
+            marshal.dump({"modules": modules, "covered": covered}, file_handler)
+        """
+    ).encode("utf8")
+    logger.info("Indexing the standard library into %s", index_filename)
+    call_subprocess(
+        [py_executable, "-", home_dir, index_filename], show_stdout=False, raise_on_return_code=False, stdin=script
+    )
+
+
+def check_executable(py_executable, home_dir):
+    """Make sure the new executable runs and considers home_dir its sys.prefix"""
+    if planned("check", py_executable):
+        return
+    cmd = [
+        py_executable,
+        "-c",
+        "import sys;out=sys.stdout;" 'getattr(out, "buffer", out).write(sys.prefix.encode("utf-8"))',
+    ]
+    logger.info('Testing executable with %s %s "%s"', *cmd)
+    try:
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+        proc_stdout, proc_stderr = proc.communicate()
+    except OSError:
+        e = sys.exc_info()[1]
+        if e.errno == errno.EACCES:
+            logger.fatal("ERROR: The executable {} could not be run: {}".format(py_executable, e))
+            sys.exit(100)
+        else:
+            raise e
+
+    proc_stdout = proc_stdout.strip().decode("utf-8")
+    # normalize paths using realpath to ensure that a virtualenv correctly identifies itself even
+    # when addressed over a symlink
+    proc_stdout = os.path.normcase(os.path.realpath(proc_stdout))
+    norm_home_dir = os.path.normcase(os.path.realpath(home_dir))
+    if hasattr(norm_home_dir, "decode"):
+        norm_home_dir = norm_home_dir.decode(sys.getfilesystemencoding())
+    if proc_stdout != norm_home_dir:
+        logger.fatal("ERROR: The executable %s is not functioning", py_executable)
+        logger.fatal("ERROR: It thinks sys.prefix is {!r} (should be {!r})".format(proc_stdout, norm_home_dir))
+        logger.fatal("ERROR: virtualenv is not compatible with this system or executable")
+        if IS_WIN:
+            logger.fatal(
+                "Note: some Windows users have reported this error when they "
+                'installed Python for "Only this user" or have multiple '
+                "versions of Python installed. Copying the appropriate "
+                "PythonXX.dll to the virtualenv Scripts/ directory may fix "
+                "this problem."
+            )
+        sys.exit(100)
+    else:
+        logger.info("Got sys.prefix result: %r", proc_stdout)
+
+
+def find_base_executable():
+    """The executable of the Python installation the running interpreter belongs to"""
+    base_prefix = getattr(sys, "real_prefix", getattr(sys, "base_prefix", sys.prefix))
+    if base_prefix == sys.prefix:
+        return sys.executable
+    base_executable = getattr(sys, "_base_executable", None)
+    if base_executable and not base_executable.startswith(sys.prefix) and os.path.exists(base_executable):
+        return base_executable
+    names = [os.path.basename(sys.executable), "python{}.{}".format(*sys.version_info[:2])]
+    for name in names:
+        for candidate in (join(base_prefix, "bin", name), join(base_prefix, name)):
+            if is_executable_file(candidate):
+                return candidate
+    return os.path.realpath(sys.executable)
+
+
+def install_venv_python(home_dir, lib_dir, bin_dir, site_packages, clear, symlink=True):
+    """Install the base environment the way the venv module does: a pyvenv.cfg
+    makes the interpreter itself pick up the environment, with the standard
+    library (and its site module) used straight from the base installation"""
+    if clear:
+        rm_tree(lib_dir, background=True)
+        logger.notify("Not deleting %s", bin_dir)
+    base_executable = find_base_executable()
+    logger.notify("Using base executable %r", base_executable)
+    mkdir(join(lib_dir, "site-packages"))
+    fix_lib64(lib_dir, symlink)
+    writefile(
+        join(home_dir, "pyvenv.cfg"),
+        "home = {}\ninclude-system-site-packages = {}\nversion = {}\nvirtualenv = {}\n".format(
+            os.path.dirname(base_executable),
+            "true" if site_packages else "false",
+            ".".join(str(i) for i in sys.version_info[:3]),
+            virtualenv_version,
+        ),
+    )
+
+    mkdir(bin_dir)
+    base_dir = os.path.dirname(base_executable)
+    if IS_WIN:
+        names = ["python.exe", "pythonw.exe", "python3.dll", "python{}{}.dll".format(*sys.version_info[:2])]
+        for name in names:
+            if os.path.exists(join(base_dir, name)):
+                copyfile(join(base_dir, name), join(bin_dir, name), symlink=False)
+        py_executable = join(bin_dir, "python.exe")
+    else:
+        py_executable = join(bin_dir, "python")
+        for name in ("python", "python{}".format(sys.version_info[0]), "python{}.{}".format(*sys.version_info[:2])):
+            dest = join(bin_dir, name)
+            if os.path.lexists(dest):
+                remove_file(dest)
+            if name == "python":
+                copyfile(base_executable, dest, symlink)
+                if not symlink:
+                    make_exe(dest)
+            elif symlink:
+                make_symlink("python", dest)
+            else:
+                copyfile(py_executable, dest, symlink=False)
+                make_exe(dest)
+    logger.notify("New %s executable in %s", EXPECTED_EXE, py_executable)
+
+    check_executable(py_executable, home_dir)
+    return py_executable
+
+
+# the absolute path the environment is created at stays in place as the fallback for shells that
+# can not tell where the sourced script is (plain sh, csh and xonsh)
+RELOCATABLE_ACTIVATE = {
+    "activate": (
+        "\nexport VIRTUAL_ENV\n",
+        """
+# relocatable environment: it is the parent of the directory holding this script
+_VIRTUAL_ENV_SCRIPT=""
+if [ -n "${BASH_SOURCE-}" ] ; then
+    _VIRTUAL_ENV_SCRIPT="$BASH_SOURCE"
+elif [ -n "${ZSH_VERSION-}" ] ; then
+    eval '_VIRTUAL_ENV_SCRIPT="${(%):-%x}"'
+fi
+if [ -n "$_VIRTUAL_ENV_SCRIPT" ] ; then
+    case "$_VIRTUAL_ENV_SCRIPT" in
+        /*) ;;
+        *) _VIRTUAL_ENV_SCRIPT="$PWD/${_VIRTUAL_ENV_SCRIPT#./}" ;;
+    esac
+    VIRTUAL_ENV="${_VIRTUAL_ENV_SCRIPT%/*/*}"
+fi
+unset _VIRTUAL_ENV_SCRIPT
+export VIRTUAL_ENV
+""",
+    ),
+    "activate.fish": (
+        'set -gx VIRTUAL_ENV "__VIRTUAL_ENV__"\n',
+        """# relocatable environment: it is the parent of the directory holding this script
+set -l _virtual_env_script (status --current-filename)
+if not string match -q '/*' -- $_virtual_env_script
+    set _virtual_env_script "$PWD/"(string replace -r '^\\./' '' -- $_virtual_env_script)
+end
+set -gx VIRTUAL_ENV (string replace -r '/[^/]*/[^/]*$' '' -- $_virtual_env_script)
+""",
+    ),
+    "activate.bat": ('set "VIRTUAL_ENV=__VIRTUAL_ENV__"', 'for %%i in ("%~dp0..") do set "VIRTUAL_ENV=%%~fi"'),
+}
+
+
+def install_activate(home_dir, bin_dir, prompt=None, relocatable=False):
+    if IS_WIN or IS_JYTHON and getattr(os, "_name", None) == "nt":
+        files = {"activate.bat": ACTIVATE_BAT, "deactivate.bat": DEACTIVATE_BAT, "activate.ps1": ACTIVATE_PS}
+
+        # MSYS needs paths of the form /c/path/to/file, Cygwin /cygdrive/c/path/to/file
+        drive, tail = os.path.splitdrive(home_dir.replace(os.sep, "/"))
+        home_dir_msys = (drive and "/{}{}" or "{}{}").format(drive[:1], tail)
+        home_dir_cygwin = (drive and "/cygdrive/{}{}" or "{}{}").format(drive[:1].lower(), tail)
+
+        # Run-time conditional enables (basic) Cygwin compatibility, without running cygpath
+        files["activate"] = ACTIVATE_SH.replace(
+            'VIRTUAL_ENV="__VIRTUAL_ENV__"',
+            'if [ "${{OSTYPE-}}" = "cygwin" ] ; then\n'
+            '    VIRTUAL_ENV="{}"\n'
+            "else\n"
+            '    VIRTUAL_ENV="{}"\n'
+            "fi".format(home_dir_cygwin, home_dir_msys),
+        )
+
+    else:
+        files = {
+            "activate": ACTIVATE_SH,
+            "activate.fish": ACTIVATE_FISH,
+            "activate.csh": ACTIVATE_CSH,
+            "activate.ps1": ACTIVATE_PS,
+        }
+    files["activate_this.py"] = ACTIVATE_THIS
+
+    if sys.version_info >= (3, 4):
+        # Add xonsh support
+        files["activate.xsh"] = ACTIVATE_XSH
+
+    if relocatable:
+        for name, (marker, replacement) in RELOCATABLE_ACTIVATE.items():
+            if name in files:
+                files[name] = files[name].replace(marker, replacement, 1)
+
+    install_files(home_dir, bin_dir, prompt, files)
+    if relocatable:
+        # the static formats can only hold the path the environment is created at
+        logger.info("Not writing activate.json and activate.env for a relocatable environment")
+    else:
+        install_activation_exports(home_dir, bin_dir)
+
+
+# the PATH systemd starts services with, activate.env can not refer to the inherited one
+DEFAULT_SYSTEM_PATH = "/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin"
+
+
+def install_activation_exports(home_dir, bin_dir):
+    """
+    Write the activated variables in static formats, for process supervisors
+    that can not source a shell script: ``activate.json`` with the changes as
+    returned by ``activation_variables`` and, on POSIX, ``activate.env`` with
+    KEY=VALUE lines as read by systemd's ``EnvironmentFile=``.
+    """
+    variables = activation_variables(home_dir)
+    writefile(
+        os.path.join(bin_dir, "activate.json"),
+        json.dumps(variables, indent=2, separators=(",", ": "), sort_keys=True) + "\n",
+    )
+    if IS_WIN:
+        return
+    lines = [
+        "# Variables set by activating this environment; PYTHONHOME must be unset.",
+        "# PATH is the environment's bin directory in front of the default system PATH.",
+    ]
+    for name, value in sorted(variables["set"].items()):
+        lines.append("{}={}".format(name, _env_file_value(value)))
+    path = os.pathsep.join(variables["path_prepend"] + [DEFAULT_SYSTEM_PATH])
+    lines.append("PATH={}".format(_env_file_value(path)))
+    writefile(os.path.join(bin_dir, "activate.env"), "\n".join(lines) + "\n")
+
+
+def _env_file_value(value):
+    if re.search(r"[\s\"'\\$`]", value):
+        return '"{}"'.format(value.replace("\\", "\\\\").replace('"', '\\"'))
+    return value
+
+
+def install_files(home_dir, bin_dir, prompt, files):
+    if hasattr(home_dir, "decode"):
+        home_dir = home_dir.decode(sys.getfilesystemencoding())
+    virtualenv_name = os.path.basename(home_dir)
+    for name, content in files.items():
+        content = content.replace("__VIRTUAL_PROMPT__", prompt or "")
+        content = content.replace("__VIRTUAL_WINPROMPT__", prompt or "({}) ".format(virtualenv_name))
+        content = content.replace("__VIRTUAL_ENV__", home_dir)
+        content = content.replace("__VIRTUAL_NAME__", virtualenv_name)
+        content = content.replace("__BIN_NAME__", os.path.basename(bin_dir))
+        content = content.replace("__PATH_SEP__", os.pathsep)
+        writefile(os.path.join(bin_dir, name), content)
+
+
+def install_python_config(home_dir, bin_dir, prompt=None, py_executable=None):
+    if sys.platform == "win32" or IS_JYTHON and getattr(os, "_name", None) == "nt":
+        files = {}
+    else:
+        files = {"python-config": PYTHON_CONFIG}
+    install_files(home_dir, bin_dir, prompt, files)
+    for name, _ in files.items():
+        make_exe(os.path.join(bin_dir, name))
+    if files and py_executable is not None:
+        make_static_python_config(py_executable, os.path.join(bin_dir, "python-config"))
+
+
+def make_static_python_config(py_executable, config_filename):
+    """Replace the python-config script with a shell script printing precomputed answers
+
+    Every option is evaluated once by running the generic script inside the new interpreter, so
+    build systems calling python-config no longer start Python each time. The generic script is
+    kept if the answers cannot be determined."""
+    if planned("generate", config_filename, by=py_executable):
+        return
+    script = textwrap.dedent(
+        """
+        import sys
+
+        path = sys.argv[1]
+        with open(path) as file_handler:
+            code = compile(file_handler.read(), path, "exec")
+
+
+        class Capture(object):
+            def __init__(self):
+                self.parts = []
+
+            def write(self, text):
+                self.parts.append(text)
+
+            def flush(self):
+                pass
+
+
+        def evaluate(option):
+            namespace = {"__name__": "__main__"}
+            captured = Capture()
+            stdout, stderr = sys.stdout, sys.stderr
+            sys.argv, sys.stdout, sys.stderr = [path, option], captured, Capture()
+            try:
+                exec(code, namespace)
+            except SystemExit:
+                return namespace, None
+            finally:
+                sys.stdout, sys.stderr = stdout, stderr
+            return namespace, "".join(captured.parts)
+
+
+        valid_opts = evaluate("--help")[0]["valid_opts"]
+        answers = dict((opt, evaluate("--" + opt)[1]) for opt in valid_opts if opt != "help")
+        print(repr((valid_opts, answers)))
+        """
+    ).encode("utf8")
+    output = call_subprocess(
+        [py_executable, "-", config_filename], show_stdout=False, raise_on_return_code=False, stdin=script
+    )
+    try:
+        valid_opts, answers = ast.literal_eval("\n".join(output))
+    except (SyntaxError, ValueError):
+        logger.info("Could not evaluate %s, keeping the generic version", config_filename)
+        return
+    options = ["--{}".format(opt) for opt in valid_opts]
+    lines = [
+        "#!/bin/sh",
+        "# answers computed when the environment was created, recreate it if its Python changes",
+        "",
+        "usage() {",
+        '    echo "Usage: $0 [{}]" >&2'.format("|".join(options)),
+        '    exit "$1"',
+        "}",
+        "",
+        "# like getopt, validate every option before answering and stop at the first non-option",
+        "seen=0",
+        'for opt in "$@" ; do',
+        '    case "$opt" in',
+        "        --help) usage 0 ;;",
+        "        {}) seen=1 ;;".format("|".join(option for option in options if option != "--help")),
+        "        --|-) break ;;",
+        "        -*) usage 1 ;;",
+        "        *) break ;;",
+        "    esac",
+        "done",
+        '[ "$seen" = 1 ] || usage 1',
+        "",
+        'for opt in "$@" ; do',
+        '    case "$opt" in',
+    ]
+    for opt, answer in sorted(answers.items()):
+        if answer is None:
+            action = "usage 1"
+        else:
+            action = "printf '%s\\n' {}".format(_sh_quote(answer[:-1] if answer.endswith("\n") else answer))
+        lines.append("        --{}) {} ;;".format(opt, action))
+    lines.extend(["        *) break ;;", "    esac", "done", ""])
+    logger.info("Writing the precomputed answers into %s", config_filename)
+    with open(config_filename, "wb") as file_handler:
+        file_handler.write("\n".join(lines).encode("utf-8"))
+
+
+def _sh_quote(value):
+    return "'{}'".format(value.replace("'", "'\\''"))
+
+
+def install_distutils(home_dir):
+    distutils_path = change_prefix(distutils.__path__[0], home_dir)
+    mkdir(distutils_path)
+    # FIXME: maybe this prefix setting should only be put in place if
+    # there's a local distutils.cfg with a prefix setting?
+    # FIXME: this is breaking things, removing for now:
+    # distutils_cfg = DISTUTILS_CFG + "\n[install]\nprefix=%s\n" home_dir
+    writefile(os.path.join(distutils_path, "__init__.py"), DISTUTILS_INIT)
+    writefile(os.path.join(distutils_path, "distutils.cfg"), DISTUTILS_CFG, overwrite=False)
+
+
+def fix_local_scheme(home_dir, symlink=True):
+    """
+    Platforms that use the "posix_local" install scheme (like Ubuntu with
+    Python 2.7) need to be given an additional "local" location, sigh.
+    """
+    try:
+        import sysconfig
+    except ImportError:
+        pass
+    else:
+        # noinspection PyProtectedMember
+        if sysconfig._get_default_scheme() == "posix_local":
+            local_path = os.path.join(home_dir, "local")
+            if not os.path.exists(local_path):
+                if planned("mkdir", local_path):
+                    # what it links to is not there yet to be listed
+                    return
+                os.mkdir(local_path)
+                for subdir_name in os.listdir(home_dir):
+                    if subdir_name == "local":
+                        continue
+                    copyfile(
+                        os.path.abspath(os.path.join(home_dir, subdir_name)),
+                        os.path.join(local_path, subdir_name),
+                        symlink,
+                    )
+
+
+def fix_lib64(lib_dir, symlink=True):
+    """
+    Some platforms (particularly Gentoo on x64) put things in lib64/pythonX.Y
+    instead of lib/pythonX.Y.  If this is such a platform we'll just create a
+    symlink so lib64 points to lib
+    """
+    # PyPy's library path scheme is not affected by this.
+    # Return early or we will die on the following assert.
+    if IS_PYPY:
+        logger.debug("PyPy detected, skipping lib64 symlinking")
+        return
+    # Check we have a lib64 library path
+    if not [p for p in distutils.sysconfig.get_config_vars().values() if isinstance(p, basestring) and "lib64" in p]:
+        return
+
+    logger.debug("This system uses lib64; symlinking lib64 to lib")
+
+    assert os.path.basename(lib_dir) == "python{}".format(sys.version[:3]), "Unexpected python lib dir: {!r}".format(
+        lib_dir
+    )
+    lib_parent = os.path.dirname(lib_dir)
+    top_level = os.path.dirname(lib_parent)
+    lib_dir = os.path.join(top_level, "lib")
+    lib64_link = os.path.join(top_level, "lib64")
+    assert os.path.basename(lib_parent) == "lib", "Unexpected parent dir: {!r}".format(lib_parent)
+    if os.path.lexists(lib64_link):
+        return
+    if symlink:
+        make_symlink("lib", lib64_link)
+    else:
+        copyfile(lib_dir, lib64_link, symlink=False)
+
+
+def resolve_interpreter(exe):
+    """
+    If the executable given isn't an absolute path, search $PATH for the interpreter
+    """
+    # If the "executable" is a version number, get the installed executable for
+    # that version
+    orig_exe = exe
+    python_versions = get_installed_pythons()
+    if exe in python_versions:
+        exe = python_versions[exe]
+
+    if os.path.abspath(exe) != exe:
+        exe = distutils.spawn.find_executable(exe) or exe
+    if not os.path.exists(exe):
+        logger.fatal("The path {} (from --python={}) does not exist".format(exe, orig_exe))
+        raise SystemExit(3)
+    if not is_executable(exe):
+        logger.fatal("The path {} (from --python={}) is not an executable file".format(exe, orig_exe))
+        raise SystemExit(3)
+    return exe
+
+
+def is_executable(exe):
+    """Checks a file is executable"""
+    return os.path.isfile(exe) and os.access(exe, os.X_OK)
+
+
+# Relocating the environment:
+def make_environment_relocatable(home_dir):
+    """
+    Makes the already-existing environment use relative paths, and takes out
+    the #!-based environment selection in scripts.
+    """
+    home_dir, lib_dir, inc_dir, bin_dir = path_locations(home_dir)
+    activate_this = os.path.join(bin_dir, "activate_this.py")
+    if not os.path.exists(activate_this):
+        logger.fatal(
+            "The environment doesn't have a file %s -- please re-run virtualenv " "on this environment to update it",
+            activate_this,
+        )
+    fixup_scripts(home_dir, bin_dir)
+    fixup_pth_and_egg_link(home_dir)
+    # FIXME: need to fix up distutils.cfg
+
+
+def move_environment(src, dest):
+    """
+    Move the environment in ``src`` to ``dest``, which must not exist, and
+    rewrite the absolute paths pointing into it in a single pass.
+    """
+    src, dest = os.path.abspath(src), os.path.abspath(dest)
+    bin_name = os.path.basename(path_locations(src, dry_run=True)[3])
+    if not os.path.exists(join(src, bin_name, "activate_this.py")):
+        logger.fatal("ERROR: %s is not an environment (it has no %s)", src, join(bin_name, "activate_this.py"))
+        sys.exit(3)
+    if os.path.lexists(dest):
+        logger.fatal("ERROR: %s already exists", dest)
+        sys.exit(3)
+    logger.notify("Moving %s to %s", src, dest)
+    try:
+        os.rename(src, dest)
+    except OSError as error:
+        if error.errno != errno.EXDEV:
+            raise
+        # another filesystem, copy and delete
+        shutil.move(src, dest)
+    rewrite_prefix(src, dest, join(dest, bin_name))
+
+
+def rewrite_prefix(old_home_dir, home_dir, bin_dir):
+    """
+    Rewrite the paths into ``old_home_dir`` to point into ``home_dir`` after
+    the environment moved there: in the scripts and activation files, the
+    .pth, .egg-link and RECORD files, orig-prefix.txt and the symlinks
+    virtualenv creates; the environment constants in site.py are baked again
+    and the caches derived from the old location dropped.
+    """
+    # the environment's own Python version may differ from the one running virtualenv
+    lib_dirs = glob.glob(join(home_dir, "lib", "python*")) + [join(home_dir, "Lib"), home_dir]
+    lib_dirs = [lib_dir for lib_dir in lib_dirs if os.path.isdir(join(lib_dir, "site-packages"))]
+    activation = set()
+    files = []
+    for name in sorted(os.listdir(bin_dir)):
+        filename = join(bin_dir, name)
+        if name in ("activate.json", "activate.env") or not os.path.isfile(filename) or os.path.islink(filename):
+            continue
+        if name.startswith("activate"):
+            activation.add(filename)
+            files.append(filename)
+            continue
+        with open(filename, "rb") as f:
+            if f.read(2) == b"#!":
+                files.append(filename)
+    for lib_dir in lib_dirs:
+        site_packages = join(lib_dir, "site-packages")
+        files.extend(path for path in [join(lib_dir, "orig-prefix.txt")] if os.path.exists(path))
+        for found in find_pth_and_egg_links(home_dir, [site_packages]):
+            files.extend(found)
+        files.extend(sorted(glob.glob(join(site_packages, "*.dist-info", "RECORD"))))
+
+    encoding = sys.getfilesystemencoding() or "utf-8"
+    replacements = [(old_home_dir, home_dir)]
+    if IS_WIN:
+        # the MSYS and Cygwin forms of the bash activation script
+        old_drive, old_tail = os.path.splitdrive(old_home_dir.replace(os.sep, "/"))
+        new_drive, new_tail = os.path.splitdrive(home_dir.replace(os.sep, "/"))
+        if old_drive and new_drive:
+            for form, case in (("/{}{}", lambda drive: drive), ("/cygdrive/{}{}", lambda drive: drive.lower())):
+                replacements.append(
+                    (form.format(case(old_drive[:1]), old_tail), form.format(case(new_drive[:1]), new_tail))
+                )
+    # a path into the environment, not one that merely starts with the same characters
+    replacements = [
+        (re.compile(re.escape(old.encode(encoding)) + br"(?![\w.-])"), new.encode(encoding))
+        for old, new in replacements
+    ]
+    old_name, name = os.path.basename(old_home_dir), os.path.basename(home_dir)
+    # the default prompts of the activation scripts (see install_files)
+    prompts = [
+        ("({}) ".format(old_name).encode(encoding), "({}) ".format(name).encode(encoding)),
+        (
+            '(set_color normal) "{}"'.format(old_name).encode(encoding),
+            '(set_color normal) "{}"'.format(name).encode(encoding),
+        ),
+    ]
+
+    def rewrite(filename):
+        with open(filename, "rb") as f:
+            content = f.read()
+        new_content = content
+        for regex, new in replacements:
+            new_content = regex.sub(lambda _: new, new_content)
+        if filename in activation and old_name != name:
+            for old, new in prompts:
+                new_content = new_content.replace(old, new)
+        if new_content == content:
+            return False
+        replace_file(filename, new_content)
+        return True
+
+    for filename, rewritten in zip(files, threaded_map(rewrite, files)):
+        if rewritten:
+            logger.info("Rewrote the paths in %s", filename)
+
+    old_prefix = os.path.join(old_home_dir, "")
+    for folder in [home_dir, join(home_dir, "local"), bin_dir] + lib_dirs:
+        if not os.path.isdir(folder) or os.path.islink(folder):
+            continue
+        for name in os.listdir(folder):
+            link = join(folder, name)
+            if not os.path.islink(link):
+                continue
+            target = os.readlink(link)
+            if target == old_home_dir or target.startswith(old_prefix):
+                logger.info("Pointing the symlink %s into %s", link, home_dir)
+                os.remove(link)
+                os.symlink(home_dir + target[len(old_home_dir) :], link)
+
+    if os.path.exists(join(bin_dir, "activate.json")):
+        for name in ("activate.json", "activate.env"):
+            if os.path.exists(join(bin_dir, name)):
+                os.remove(join(bin_dir, name))
+        install_activation_exports(home_dir, bin_dir)
+    py_executable = join(bin_dir, EXPECTED_EXE)
+    for lib_dir in lib_dirs:
+        for cache in (join(lib_dir, "site.cache"), join(lib_dir, "site-packages", "pth-cache.pyc")):
+            if os.path.exists(cache):
+                os.remove(cache)
+        site_filename = join(lib_dir, "site.py")
+        if os.path.exists(site_filename):
+            with open(site_filename) as f:
+                baked = SITE_CONSTANTS_RE.search(f.read()) is not None
+            if baked:
+                bake_site_constants(py_executable, site_filename)
+        if os.path.exists(join(lib_dir, "stdlib.index")):
+            write_stdlib_index(py_executable, home_dir, lib_dir)
+    relocate_pyc(py_executable, [home_dir], old_home_dir, home_dir)
+
+
+def relocate_pyc(py_executable, folders, old_prefix, new_prefix):
+    """Rewrite the source path (``co_filename``) of the code objects in the
+    bytecode files below ``folders`` from ``old_prefix`` to ``new_prefix``
+
+    The files keep their header, so they stay valid for their sources and are
+    not recompiled; it runs in ``py_executable`` as the bytecode format is
+    specific to the interpreter. Symlinked directories are not followed."""
+    script = textwrap.dedent(
+        """
+        import marshal
+        import os
+        import shutil
+        import sys
+        import types
+
+        old_prefix, new_prefix = sys.argv[1:3]
+        if sys.version_info >= (3, 7):
+            header_size = 16  # magic, flags, then source mtime and size or source hash
+        elif sys.version_info >= (3, 3):
+            header_size = 12  # magic, source mtime and size
+        else:
+            header_size = 8  # magic, source mtime
+        try:
+            from importlib.util import MAGIC_NUMBER as magic
+        except ImportError:
+            import imp
+
+            magic = imp.get_magic()
+
+
+        def relocate(code):
+            consts = tuple(relocate(c) if isinstance(c, types.CodeType) else c for c in code.co_consts)
+            filename = code.co_filename
+            if filename == old_prefix or filename.startswith(os.path.join(old_prefix, "")):
+                filename = new_prefix + filename[len(old_prefix):]
+            # code objects compare equal regardless of their file name
+            if filename == code.co_filename and all(a is b for a, b in zip(consts, code.co_consts)):
+                return code
+            if hasattr(code, "replace"):
+                return code.replace(co_filename=filename, co_consts=consts)
+            args = [code.co_argcount]
+            if sys.version_info[0] >= 3:
+                args.append(code.co_kwonlyargcount)
+            args.extend([code.co_nlocals, code.co_stacksize, code.co_flags, code.co_code, consts, code.co_names])
+            args.extend([code.co_varnames, filename, code.co_name, code.co_firstlineno, code.co_lnotab])
+            args.extend([code.co_freevars, code.co_cellvars])
+            return types.CodeType(*args)
+
+
+        relocated = 0
+        for folder in sys.argv[3:]:
+            for dirpath, _, filenames in os.walk(folder):
+                for name in filenames:
+                    if not name.endswith((".pyc", ".pyo")):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    with open(path, "rb") as file_handler:
+                        data = file_handler.read()
+                    if data[: len(magic)] != magic:
+                        continue
+                    try:
+                        code = marshal.loads(data[header_size:])
+                    except (EOFError, ValueError, TypeError):
+                        continue
+                    if not isinstance(code, types.CodeType):
+                        continue
+                    new_code = relocate(code)
+                    if new_code is code:
+                        continue
+                    tmp = "{}.{}.tmp".format(path, os.getpid())
+                    with open(tmp, "wb") as file_handler:
+                        file_handler.write(data[:header_size] + marshal.dumps(new_code))
+                    shutil.copymode(path, tmp)
+                    if hasattr(os, "replace"):
+                        os.replace(tmp, path)
+                    else:
+                        if sys.platform == "win32":
+                            os.remove(path)
+                        os.rename(tmp, path)
+                    relocated += 1
+        print(relocated)
+        """
+    ).encode("utf8")
+    output = call_subprocess(
+        [py_executable, "-", old_prefix, new_prefix] + list(folders),
+        show_stdout=False,
+        raise_on_return_code=False,
+        stdin=script,
+    )
+    logger.info("Relocated %s bytecode files from %s to %s", "".join(output).strip() or "no", old_prefix, new_prefix)
+
+
+OK_ABS_SCRIPTS = [
+    "python",
+    "python{}".format(sys.version[:3]),
+    "activate",
+    "activate.bat",
+    "activate_this.py",
+    "activate.fish",
+    "activate.csh",
+    "activate.xsh",
+    "activate.ps1",
+]
+
+
+# a header both /bin/sh and Python accept: the shell execs the python next to the script (resolving a
+# symlink to the script only if there is none), for Python it is the module docstring
+SH_LAUNCHER = [
+    "#!/bin/sh",
+    "'''true'",
+    'case "$0" in */*) _bin="${0%/*}" ;; *) _bin=. ;; esac',
+    '[ -x "$_bin/python" ] || _bin="$(dirname -- "$(readlink -f -- "$0")")"',
+    'exec "$_bin/python" "$0" "$@"',
+    "'''",
+]
+CODING_RE = re.compile(r"^[ \t\f]*#.*?coding[:=]")
+
+
+# enough of a script to tell its shebang and whether it has been made relative already
+SCRIPT_HEAD_SIZE = 1024
+
+
+def fixup_scripts(_, bin_dir, sh_launcher=False):
+    """
+    Replace the absolute interpreter path in the scripts of ``bin_dir``: by
+    default with ``/usr/bin/env`` and an activation of the environment at
+    startup, with ``sh_launcher`` (POSIX only) with a ``/bin/sh`` header
+    running the interpreter next to the script.
+    """
+    sh_launcher = sh_launcher and not IS_WIN
+    if IS_WIN:
+        new_shebang_args = ("{} /c".format(os.path.normcase(os.environ.get("COMSPEC", "cmd.exe"))), "", ".exe")
+    else:
+        new_shebang_args = ("/usr/bin/env", sys.version[:3], "")
+
+    # This is what we expect at the top of scripts:
+    shebang = "#!{}".format(
+        os.path.normcase(os.path.join(os.path.abspath(bin_dir), "python{}".format(new_shebang_args[2])))
+    )
+    # This is what we'll put:
+    new_shebang = "#!{} python{}{}".format(*new_shebang_args)
+
+    candidates = []
+    for filename in sorted(os.listdir(bin_dir)):
+        filename = os.path.join(bin_dir, filename)
+        if not os.path.isfile(filename):
+            # ignore child directories, e.g. .svn ones.
+            continue
+        with open(filename, "rb") as f:
+            head = f.read(SCRIPT_HEAD_SIZE)
+        if not head:
+            logger.warn("Script %s is an empty file", filename)
+            continue
+        if not head.startswith(b"#!"):
+            # binary programs and the activation scripts
+            continue
+        # the chunk may end within a character, only its first lines matter
+        lines = head.decode("utf-8", "replace").splitlines()
+
+        old_shebang = lines[0].strip()
+        old_shebang = old_shebang[0:2] + os.path.normcase(old_shebang[2:])
+
+        if not old_shebang.startswith(shebang):
+            if os.path.basename(filename) in OK_ABS_SCRIPTS:
+                logger.debug("Cannot make script %s relative", filename)
+            elif lines[0].strip() == new_shebang or SH_LAUNCHER[1] in lines[1:3]:
+                logger.info("Script %s has already been made relative", filename)
+            else:
+                logger.warn(
+                    "Script %s cannot be made relative (it's not a normal script that starts with %s)",
+                    filename,
+                    shebang,
+                )
+            continue
+        candidates.append(filename)
+
+    def make_relative(filename):
+        with open(filename, "rb") as f:
+            try:
+                lines = f.read().decode("utf-8").splitlines()
+            except UnicodeDecodeError:
+                return False
+        script = launcher_script(lines[1:]) if sh_launcher else None
+        if script is None:
+            script = relative_script([new_shebang] + lines[1:])
+        replace_file(os.path.realpath(filename), "\n".join(script).encode("utf-8"))
+        return True
+
+    for filename, made_relative in zip(candidates, threaded_map(make_relative, candidates)):
+        if made_relative:
+            logger.notify("Making script %s relative", filename)
+        else:
+            logger.warn("Script %s cannot be made relative (it's not UTF-8 encoded)", filename)
+
+
+def relative_script(lines):
+    """Return a script that'll work in a relocatable environment."""
+    activate = (
+        "import os; "
+        "activate_this=os.path.join(os.path.dirname(os.path.realpath(__file__)), 'activate_this.py'); "
+        "exec(compile(open(activate_this).read(), activate_this, 'exec'), { '__file__': activate_this}); "
+        "del os, activate_this"
+    )
+    # Find the last future statement in the script. If we insert the activation
+    # line before a future statement, Python will raise a SyntaxError.
+    activate_at = None
+    for idx, line in reversed(list(enumerate(lines))):
+        if line.split()[:3] == ["from", "__future__", "import"]:
+            activate_at = idx + 1
+            break
+    if activate_at is None:
+        # Activate after the shebang.
+        activate_at = 1
+    return lines[:activate_at] + ["", activate, ""] + lines[activate_at:]
+
+
+def launcher_script(lines):
+    """
+    Return the script (without its shebang line) behind the ``SH_LAUNCHER``
+    header, or None if the script has future statements: those could no longer
+    follow a docstring of the script. An encoding declaration stays on the
+    second line, a comment for the shell.
+    """
+    for line in lines:
+        if line.split()[:3] == ["from", "__future__", "import"]:
+            return None
+    if lines and CODING_RE.match(lines[0]):
+        return SH_LAUNCHER[:1] + lines[:1] + SH_LAUNCHER[1:] + lines[1:]
+    return SH_LAUNCHER + lines
+
+
+def fixup_pth_and_egg_link(home_dir, sys_path=None):
+    """
+    Makes .pth and .egg-link files use relative paths
+
+    The files are looked up in the environment's site-packages and in the
+    directories inside the environment its .pth files add to ``sys.path``,
+    or in the directories of ``sys_path`` within the environment if given.
+    """
+    home_dir, lib_dir, inc_dir, bin_dir = path_locations(home_dir, dry_run=True)
+    if sys_path is None:
+        pth_files, egg_links = find_pth_and_egg_links(home_dir, [join(lib_dir, "site-packages")])
+    else:
+        pth_files, egg_links = find_pth_and_egg_links(home_dir, sys_path, follow=False)
+    for filename in pth_files:
+        if not os.access(filename, os.W_OK):
+            logger.warn("Cannot write .pth file %s, skipping", filename)
+        else:
+            fixup_pth_file(filename)
+    for filename in egg_links:
+        if not os.access(filename, os.W_OK):
+            logger.warn("Cannot write .egg-link file %s, skipping", filename)
+        else:
+            fixup_egg_link(filename)
+
+
+def find_pth_and_egg_links(home_dir, site_dirs, follow=True):
+    """
+    Return the .pth and the .egg-link files in the directories of
+    ``site_dirs`` within ``home_dir``, scanning each directory once; with
+    ``follow`` also in the directories within ``home_dir`` the .pth files add
+    """
+    home_prefix = os.path.join(os.path.normcase(os.path.abspath(home_dir)), "")
+    pending = [a_path or "." for a_path in site_dirs]
+    seen, pth_files, egg_links = set(), [], []
+    while pending:
+        a_path = os.path.normcase(os.path.abspath(pending.pop(0)))
+        if a_path in seen or not os.path.isdir(a_path):
+            continue
+        seen.add(a_path)
+        if not os.path.join(a_path, "").startswith(home_prefix):
+            logger.debug("Skipping system (non-environment) directory %s", a_path)
+            continue
+        for filename in scan_files(a_path, (".pth", ".egg-link")):
+            if filename.endswith(".egg-link"):
+                egg_links.append(filename)
+                continue
+            pth_files.append(filename)
+            if follow:
+                pending.extend(os.path.join(a_path, entry) for entry in pth_entries(filename))
+    return pth_files, egg_links
+
+
+def scan_files(directory, suffixes):
+    """Return the sorted paths of the files in ``directory`` with a name ending with one of ``suffixes``"""
+    if hasattr(os, "scandir"):
+        entries = os.scandir(directory)
+        try:
+            found = [entry.path for entry in entries if entry.name.endswith(suffixes) and entry.is_file()]
+        finally:
+            getattr(entries, "close", lambda: None)()
+    else:
+        found = [join(directory, name) for name in os.listdir(directory) if name.endswith(suffixes)]
+        found = [path for path in found if os.path.isfile(path)]
+    return sorted(found)
+
+
+def pth_entries(filename):
+    """Return the directory entries (not comments or import lines) of a .pth file"""
+    with open(filename) as f:
+        lines = [line.strip() for line in f]
+    return [line for line in lines if line and not line.startswith("#") and not line.startswith("import ")]
+
+
+def fixup_pth_file(filename):
+    lines = []
+    with open(filename) as f:
+        prev_lines = [line.strip() for line in f]
+    for line in prev_lines:
+        if not line or line.startswith("#") or line.startswith("import ") or os.path.abspath(line) != line:
+            lines.append(line)
+        else:
+            new_value = make_relative_path(filename, line)
+            if line != new_value:
+                logger.debug("Rewriting path {} as {} (in {})".format(line, new_value, filename))
+            lines.append(new_value)
+    if lines == prev_lines:
+        logger.info("No changes to .pth file %s", filename)
+        return
+    logger.notify("Making paths in .pth file %s relative", filename)
+    with open(filename, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def fixup_egg_link(filename):
+    with open(filename) as f:
+        link = f.readline().strip()
+    if os.path.abspath(link) != link:
+        logger.debug("Link in %s already relative", filename)
+        return
+    new_link = make_relative_path(filename, link)
+    logger.notify("Rewriting link {} in {} as {}".format(link, filename, new_link))
+    with open(filename, "w") as f:
+        f.write(new_link)
+
+
+def make_relative_path(source, dest, dest_is_directory=True):
+    """
+    Make a filename relative, where the filename is dest, and it is
+    being referred to from the filename source.
+
+        >>> make_relative_path('/usr/share/something/a-file.pth',
+        ...                    '/usr/share/another-place/src/Directory')
+        '../another-place/src/Directory'
+        >>> make_relative_path('/usr/share/something/a-file.pth',
+        ...                    '/home/user/src/Directory')
+        '../../../home/user/src/Directory'
+        >>> make_relative_path('/usr/share/a-file.pth', '/usr/share/')
+        './'
+    """
+    source = os.path.dirname(source)
+    if not dest_is_directory:
+        dest_filename = os.path.basename(dest)
+        dest = os.path.dirname(dest)
+    else:
+        dest_filename = None
+    dest = os.path.normpath(os.path.abspath(dest))
+    source = os.path.normpath(os.path.abspath(source))
+    dest_parts = dest.strip(os.path.sep).split(os.path.sep)
+    source_parts = source.strip(os.path.sep).split(os.path.sep)
+    while dest_parts and source_parts and dest_parts[0] == source_parts[0]:
+        dest_parts.pop(0)
+        source_parts.pop(0)
+    full_parts = [".."] * len(source_parts) + dest_parts
+    if not dest_is_directory and dest_filename is not None:
+        full_parts.append(dest_filename)
+    if not full_parts:
+        # Special case for the current directory (otherwise it'd be '')
+        return "./"
+    return os.path.sep.join(full_parts)
+
+
+FILE_PATH = __file__ if os.path.isabs(__file__) else os.path.join(os.getcwd(), __file__)
+
+
+# Bootstrap script creation:
+def create_bootstrap_script(extra_text, python_version=""):
+    """
+    Creates a bootstrap script, which is like this script but with
+    extend_parser, adjust_options, and after_install hooks.
+
+    This returns a string that (written to disk of course) can be used
+    as a bootstrap script with your own customizations.  The script
+    will be the standard virtualenv.py script, with your extra text
+    added (your extra text should be Python code).
+
+    If you include these functions, they will be called:
+
+    ``extend_parser(optparse_parser)``:
+        You can add or remove options from the parser here.
+
+    ``adjust_options(options, args)``:
+        You can change options here, or change the args (if you accept
+        different kinds of arguments, be sure you modify ``args`` so it is
+        only ``[DEST_DIR]``).
+
+    ``after_install(options, home_dir)``:
+
+        After everything is installed, this function is called.  This
+        is probably the function you are most likely to use.  An
+        example would be::
+
+            def after_install(options, home_dir):
+                subprocess.call([join(home_dir, 'bin', 'easy_install'),
+                                 'MyPackage'])
+                subprocess.call([join(home_dir, 'bin', 'my-package-script'),
+                                 'setup', home_dir])
+
+        This example immediately installs a package, and runs a setup
+        script from that package.
+
+    If you provide something like ``python_version='2.5'`` then the
+    script will start with ``#!/usr/bin/env python2.5`` instead of
+    ``#!/usr/bin/env python``.  You can use this when the script must
+    be run with a particular Python version.
+    """
+    filename = FILE_PATH
+    if filename.endswith(".pyc"):
+        filename = filename[:-1]
+    with codecs.open(filename, "r", encoding="utf-8") as f:
+        content = f.read()
+    py_exe = "python{}".format(python_version)
+    content = "#!/usr/bin/env {}\n# WARNING: This file is generated\n{}".format(py_exe, content)
+    # we build the string as two, to avoid replacing here, but yes further done
+    return content.replace("# EXTEND - " "bootstrap here", extra_text)
+
+
+# EXTEND - bootstrap here
+
+
+def convert(s):
+    b = base64.b64decode(s.encode("ascii"))
+    return zlib.decompress(b).decode("utf-8")
+
+
+# file site.py
+SITE_PY = convert(
+    """
+eJy1ff1327aS6O/6K3CZ02MpleV8tH33unXfcRKn9W6aeOPcbXZdPy4lUTJriWRJyo5uTu/f/uYL
+XyQo27ddn57UJoDBYDAYDAYzgyiKjssyzedqXcw3q1TVaVLNrlSZNFe1WhSVaq6yar5fJlWzha+z
+62SZ1qopVL2tJ1hrMhg8/oM/g8fqw1VWaxTgt2TTFOukyWbJarVV2bosqiadq/mmyvKlyvKsyZJV
+9g+oUeQT9fiPYzA4zRWMfJWllbpJqxrg1qpYqLNtc1XkargpccxPJ18nz0djVc+qrGygQiU4A0Wu
+kmaQp+kc0ISamxpImTXpfl2ms2yRzUzF22KzmqtylcxS9T//w0Ojqnt7g7pYp7dXaZWqHJABmCnA
+KhEP+DWr1KyYpxOlXqSzBDvg75ZYA4Y2xjmrkYx5oVZFvoQx5eksreuk2qrhdNMQIEJZzQvAKQMM
+mmy1GtwW1XU9giml+biFTyph9vAHw+wB48T+u5wDOL7LB3/Ps09jhg3cg+CaK2abKl1kn1SCYOHP
+9FM6i+XbMFuoebZYAA3yZoRVBoxArVbZ9KCk6fhOZuj7A8LKcGUCfaSIMlfmQmoxGZw2KlnVwLab
+EmlUE+av0mmW5ECN/Aa6A4hA0kGon3lWN6YfGp0qAECF89jAKlnXarhOshyY9adkRmj/nOXz4rYe
+EQVgtmr166Zu3PEPAwSA2g4BxgOcLD2bm3yVXaer7QgQ+ADYV2m9WTW4IOZZlc6aosrSmgAAaluV
+fgKkxyqpUiEhc6Zet2OiP9Eky3FicYHhgsdCJMkiW24qWmFqkQHnAle8fvdevTp5cXr8VnhMA+M1
+u1wDzgCFJtrBCTpQB5u6OlgVsKAngzf4P5XM57jIltg/4GUrHNw504MhjL2ctNs4Ew5kl8mVbmCM
+DQgT6mtA7T5Dk3F9BfT5/Y75HgyO+6hCA+ffbq8KWJN5sk7VVcL8hZwx+E7gfD8pm6tvgRtqhNMA
+qWqcHEQwQ3hAEpdmwyJPVQkstsrydDQACk2prj+LwApvi3yf5rrFCQChGuRQ6HwbUY95CgPtwvoW
+5YWuvKWRSZWBmed1UZHgAP7PZySLVkl+TTjWxFD82zRdZnmOCCEvDPYe7VHH9XUGnDifqDdUi+SC
+rqT2WHpxTVwSG+AlZDrgyfRTsi5X6ZiXL8rW3WKEOksbped6xRwHNRsSrzRrdqhB3ns2+djiOkKz
+uapSAL6ZeotuURRjNQWZTdiUyZqXV3NbEOcMAuuJGiFPUE1oi78DRY/rerNOTSHyCkgWYqjBolit
+ilsg2eFgoNQjrKQ3ZZ85oRTK4F+Ai/+u0mZ2NRg4PRnAAgqR7wOFQGBLSHPhakHC4zZh5baQyXKW
+FEU1Tyvq6n7EPmDE71kZxzp4WzSyqfFwcZaLddagSJrKlpnxjpfvNSwfv+VxwzBg566JZrqqpdMa
+h7cqr5JpqlWSabrAlSCT9K2ZduhzEOiT9uJGrXmXgTIgS5rxDhIWLCh0Fk1KSgDA4MWX5Fm5WVGl
+GhlMJdDRuiT46wS39EKUJWBv3pYHKJB4+57B/gO4/QOW0e1VBvSZAQSQMCilYPqmWVOhgmDl0cDf
+9HV77h849XQhexN3uUiylezyST44pY8nVUXLd5aW2GosxKhhhHmDqt0yBzriMo+iaCAKDIylAsG8
+0n8Wtf4NJEZjft/Wg0FTbQ+BTZTGIY6nmww3xThGNUD+qAeMgXKQ8pqZegYeSA/d6C1Q0GmyqIo1
+Fptxn4Oggb6wxeCROiMJlLLy7HHpt0haV9yXuiru6w6rK5RRg7P3J69PP56cqyN1YcXduC3rLqHP
+kzwBlqfdAhiu1a2Vc1AThWKGclG9hq2fGAb2OmpNSztNmg3wNaD+odpQMQxj5hUOTt4ev3hzEv/9
+/OR9fH764QQQhD0oHTyiIePWuQFlsp7AwgGOndcT2XsHnRb04cXxufkAMN6npBvD8tmqm6xqNgmw
+yg2z1S0ubkRlmeZphSyJeuw0BXGEy7SEHUMfWhAdaJdVRY6r7pCaVamh+pg+AF75PKlw25oS87Ni
+KxuF0tsqEi5I0gy1wXPYD2ZX6ew6xkoxrGUE24DegGONX757e/7h+O2HczPIOKvjb76C9QZfhssU
+eLqphjCtYxWtk081rNBoTFVHOBGdCqDCRKOR+l49U48fq+fPCF65LbcADjQPpzJ+jEWpibN8UUQj
+qvwrn2qOWE6LCntx+NWlOjpS0a/JTRINQI20VZnzfyKJ8mFbptC0gf8Ni3qEc4baaLFpUFLqQ4nR
+GHheWLDByp8lQKo5qCCfGj4/wDeUd8DXBR+iHqnbBASSHBoqZgeCaTfssiqmonCQjIbjaW0UiUTh
+7yua7jmAK1cb2Ahymu2GFgkhhhBd5OapKMl4pMQ5XRXJXKYUkdbTefzyR+TXCEsmVBI5JfF/nrw/
+P333FmrAxBy/ekUM/+r0/VjFJx9PXsZnH37EX3/4IT59C+z/ASpWCZzRhs9HQkkaEakImpgOI+/B
+x9uc2LGz/eJooNmcFeqEuJYIQcukmP4KtYHODUpc3phdmoJimq4WztABjZhOnAPA2Y4bPu8zQcrt
+LIJOfq5wv8PNSM2A5ETMJlvDlK6Tsjan2BVonavuijMH6EJWreEcGC2UXxWrOU4tFK4ZOREncd3M
+AUi8gINWWsHsfHj15vQFUPXVyUeaHyqeYOknRBP2PJFyIb6cptgJ0AIVlbkWIsyuhINo9Bkep8sK
+KAwgh8SHc5Eaoh7iQR0GhVumpcXIyBRi6C1J3BRPnfUg5l6xfy0hBvMUlh/y6xBhj3j9wRb5PgUR
+nGvZ1SCD0GiG2A6PfuusxkmH80+VrtP1NGWLSVN7OBE4xKs1UGd4Qi+DG+7P1ErvkLRLoggr6onF
+lIpk4xy+O6d9c6xO39Evo1ZLGixtwzBaSwXRlrDUNrDlFxEv/+jyAru8FEAIpCbtgv5KcXurG0At
+XuNICVDF5KsbTWIqcmlMeMWt8Uiz+/QicGnnqF3AAsMB7Y5Tt8tqWJD3xaduXBCsg0LFyXl8eg4S
+Zyh4wRIeCfx1cp0imOFjYlnpA7rkaaQT5a9FlutyMzl208BehtQC1lgcz1ZJXWPlOI4Ubf/VhEU3
+Loch1AAp4dQZOTwgw4AmY/wngEsypXbYnzdyaqIrgQa5niV1yrV4oNAwjlGGxvHQrh7S1FYrkTl7
+SldBPbrKppuGNB7Uq6d1scI/sQPN+bhU1ig3UUKJ2JrcJKtNWg+dUQG5hi164RRlNcktODUP4XBo
+t9IRbfJ634YiIBmK37RCalmw+PMI9qaVFZlobmQLIJMJcfs3tndRt/MCzzlweqlbUGSbPDs5U8+f
+PNvHQ/UqA1iaHl51PCdm+SY1HxcwQVopYXy5lVZaXEos9Eo53A1zPTFz0Z39hZ5VEGnFTToHdJE7
+nYkFrRFLFBStUMSltHngvsjaut5SEjSH8vBhKehthaDoKdez/Yht0mleg87L9l2itRifWeyCILrJ
+5qyscmGD4jPFg5s+Xw+cmfP4Ck9moKXhLoCkuk33YA+vNmw3IbwRJB5N5nabnhC4N3gouKRfr3PQ
+B2LegY5Qvx+ODLfiYhJ+xQp2Dh6p13DgASRBa3OIxlCGwLW4nvYBeRg+DPcmZRMXAILzZk1WQweW
+tjjSENl4id0ijNG3ihZsleKx9UZ3wQqKEMOBRKUT80FLBoQEgzPSy4gD4TJcX7oadOyQxGe7NxO2
+hPoAWlScwAltKNC4kqbfxSHuNW9cQeS0G6Am/PHjR+ab+ors/IjZFEdd0V5NOmO5HaNiNjOWAb41
+ID64vUpzALOphTfV/rkqSrYKwISeyeomPeiqacrDg4Pb29uJWLmLanlQLw6+/us33/z1CcvB+ZwY
+CHcVu1zkymdyQGVoWZl8p48B3+upazGk6IuGHQnWMCXrAJlEEL8fNtm8UIf7IyMzkY3tkRD/1cdm
+ECGx7nTAdEa1zaL0+ff9z4eT579HE6wCG6DbYjjik7CcbsxO5R+AoEVTgLIIR75ZscFzk6OBqC+h
+u/1yO0+nm2VkMPD2Qf0HDBiX69Cwwv7TS8TAZxDNXvXI7OcgLYg98PQ17OhxCR3IRVIglXF36hhz
+t2Fppmk8v/+695Q3oZgeIqseuDL8KvdeiKZydwXhjyiFuOc51hT94+0IepfXm/l8LifvIS4gQgZn
+Y+wuP4e70coCq+pWznmFJyNBUoPqP2VyCzjaLfcQ5J4icxUZn3lqpQYQqnWTpe3VehqghttPZ99r
+84KjBiETHKmnrDuDRnnYKXvCc7tZreiCocWlHlVGXTUdd+wCOHOoAcDSqCJPVxcNva2cBWAVfCWB
+DLboMBOWePrfo7YO05nsXa2ZxCEQOEdDvhq5F3RC+Yh7qGpYTeXQb9nH4oa23c527jzEU3qW5DgQ
+Xlxt6RFcVDs3KDi2oQh2JmkyWxWgERuxSHxky32lwRzDgpuarEChg6WHU+uI9D5vAe5JPbzOWW7Q
+cuHeCzgnVaLTFfyz8iwfGbOeAXPfVeaP7E9Yc2a88ksPf9ij0gPOsWwAiC71zA99g1Go65HpCEG7
+OPUpPp3NSRBGfQtnylhDAM286S54UlNZ4qyAix0e8AQIFKe9EoRgTGpYyzIHGugFiTOUKfQLjIFL
+cHzwywRv/kkUIPhPTZ2W6ksyQUWjy+7h1JdSHkR/2d1vRxHeEFwcEGRPO/KtZD6g2tNP7+KJu/nC
+mg5NN9jpyHYT851ABxv8KzCs+3AqWR1cdkn0jRSvVLYZLaHhrZgASa/Pmj9J6sQ0TTD5TtHYE9Qi
+c+55BNgpaHsFrI9LnC20ceceWMVBwX+PcVk70j0n9VCOmTQxomHzXfwwnSwnqCBuyqYoVrXaz+vy
+eokVR8DCxbXalFbNycUauFrxKTQRyxnttzPHlCTGZkSuzfpmI3jJdSzHsGwnTavewwOR3SaIddCM
+5RirJ3wuOHWHg4buaxQ47GOxxQ9jFmLa94DuIXAI5MEgJyk+5K/wTmCLjFmsbsRy+60cSs2G1OjB
+sYmUTOt4vwP1k2UiO9Otvg4nfOGUVE/0HlUXG7wzM0f0HcKoo5AbVW2Hgudobzw1YQ2OJVVLF+p2
+2K/PCRPfT6cL9qZ/7tS++rrqVwCDg/GRoTkkJVFL9wjZOOp2jT9CxvMtHMY+BUgZGA+BG37+S/X7
+yBxSSU0k34wEzrrEJcBzeOk15nveBJ3G8P4f2pIzQrAX5iEtqcKKLo+yh+T/gj6LP1fpCm/I0LYr
+UipyD4mOPGPbd9QVjFFXw/UGE33+3Zd8SED+15KR8WhJRYtuR+Olj57W2+o08gzImjmiX/JIlhhV
+HzkbrGYWlnc7N/vQ/Yy5jfPv84zEwxsaa+eZFeVWX46KhPGv5+z1lQNvnrGJaXaFV4gT9Y4tcPZa
+sFgYUM4lotz10b0W8CPf5jkaNoLsWNe1IuCuz04lX2o5XgtA/4Dpf8cmQlWvU7zUHjqGnrGCfQwm
+bsgLWi5wdgjL0agrf4WRaNzEhL0HanPzuetUbeGgZJ468qUjoHiGYxjXWGuR4uwyQQZDU/cDWFym
+ywLFSxn4n9/G0Hqut3K+nZMNY6zMNd3Ju9fy23/itYb8biw2zvyViVwqyCDumkh9XoGJnIPEilFh
+TOPptkkRgKMacYHQxKPs0BBt1FrK89Q/pmo3DV/KQN/iMnPkMqbjSnPUcq3xT7S+Bwg575YFaAxT
+WHKu56l7znXWVMsXpHNxZ7DDOWy5N7qujVLqfHIUXKY8atd+dxeRLoouAydepx3epsf676HFyiOU
+tTQ6eqNuZMHeYTXo3K3KLN4PhZDINZbTe8+VIyvtNd8mn1vlzThpwZe2dDOIReS3FY1cLjPnU3f2
+/nLk1HCWk3SidyuvI889XPc0Gpg5ENAwBRqMdxnZ7ks+u64/2HYYFfWzdP0pQhmW1bOijuhmMnS6
+DvCNTxuD7ZtsigC9+dBHd/1DJ2ztw/SvdHI3dG+weHE9T6rbLI9odXkLy0xNSD3lMk9BPTinO7GD
+N+zOcvAaT0wURnEAWivZWErYr/Zqubvpwm2PsVfp9AYfmR4ZbuRdh1wcPr/sEmZ8P9CGriefmiqp
+cf5WPI28avoAXXbHRmKGLAf5ViImJKIG74SqAv2yYPv5qJBi7Ax2m2zvJFEYXR9J9eXdBGlhTKyC
+3ixpSUxyEO3mxiCefxZuYRrvhO5Itoe134UWwN6fb3PUTkJALztfoME3X8UBnxIX3W++eiA5QstR
+W1dMjyPP6I7ennTkccrJEyO3HGTqlKwmlu5Odhk+AIq0Ig/O/iOiBoLer2nVDJ+MLWV6DqDentwL
+zxwJe4H1HovZuW6ZNmxeqcUp4QZOquSQBmPf30e5pm9F+bo3vB49SDuXrEOCkJZdXzzBCedr2FF3
+OKKvHmsfnR1nc6OW+qPmUCDrye6F97g6QP96D+7M/qZ8cI9F7vUcGqxsVrrVE3bJfRaQRA/A7k/A
+q585/wQcntwLhQd1xNBEFo5aYj40FFewa2D3kLY9WscOnaPbNTvOL7TmwIuuVo9xdT5WtxRX47ur
+k04RgIN8KNEZLzdVxTEWtMjLtNrH2ICxwpBCrTxQpGIXzMHbtEFMTLUZObM4AWhFiHEjcU8xI4ms
+UhrmnatCX2aLdQJFyjD68d1PJz1WOnTxgEb3l5PeHGJT1kpxWDiL99eefHzuPPw4CItXpzaghHGn
+Y0f7js49IVEFbXyncIOUwj5wVrG+413yEouxZxMN4sf11cmCL92yfLba4JBZEULv88Umn7Hbcgp7
+q/UP5mAOtnwuVslSDakxmddd09JNUomaUFYFBh2rTTY/WGZwiv1tk6zwdJwuFoALeoNJkdj56fpJ
+veJ4FPbBrtPZpsoatNgndSHOdBS64lScbnmgQw9JdptiEmIwy6E6x2HTeZoIN9fk0gc133cIB4ln
+IGzgxGBM6DuU50WMvdJJFfiHkOpauOjzoN1DIc5JMH7poV2SUpHrsUdz7hIVhYpHSvfUV9DujFCG
+Izx18t/0Z9A65Lpit3FZ9mO53I3lso3lMojl0sdyuRtLd1HgxFrjj14KIQNQ2z8oGCzl2m64n5Nk
+dsX1MKgX/egx/KLUhxhjnaXYds/qwFdpBITEnOPCSR9t8FPGsQVVwXeYAhLZH93B5MCksxI4jSmU
+ShrzULSC0xcA5rc9mEwoBnBKzXnBzZMmmXgLY7kqprBuDbpjC2Cs2rFgbFzKb+IpXzu0JfvZf334
+8d1brI6gjMcwNcNJRCmNQxk+Tqpl3V1O9h6iBH6kmr7fOjUTgI+Cdo49tnPsjdUe2zn2zOUp/fOK
+vKaRcyTerFAlbJkUk2equZFre3ut7xLiJt+ZzdltC7SAvHE0gB4qHZ+dvTr+cMwGmOifkbtkNHH9
+9eHio2uYCl2Fx61uSI5t7I5otzt3TB6xHZbQrTqKXevDs76jnY/j/+o4gaCAxEQMaQ8b5sPP8Ub2
+d8ImUaCKamA+OhzvWE+dBRdy5GhD9t1gUBOOAW/RVIZ6DPbM0pK1ZlfbQQgH6MNOFm0tWQhg+gxo
+Rw4hTLV+Q3LXjaROmxcnP5y+fXP64uz4w4+OnoT6zrvzg2fq5KePinwMUMiz4pCgI26D/u8gfN0s
+L2pewH8bPC/PNw0bq6DVqzdvxNK8xjwfGPhNl3XwnZ3nDTS2NLA1zHwUr3fESEfGOQlVyEecYuRQ
+B19znCIFTGJwOOVpmaaiISIYSZSjE+rQJfoEWBwqu6TQMZcCh0L4G33SqNiNR0IQA0jJPmbckFer
+4FWaewko5mDPpkSN4YttLLLwInJxjS4ndbnKQDp+GxnOl2bojW35Rj4aLx/GKyRmnObQs1TkUfdi
+gVfj38qdsbQfWUb7bQMYWgZ7BePOU/JFphBzDKlQe1hpj32O00/wq5l6mYMaJgwvKhqcRM10WY1x
+g6C4XGFwHvDkFWxQqEwDhNZM+FbMQ2e/SQu8tIxeruf7/xEJQfzav/wSqN5Uq/3/5jhavm2JAsR0
+K7+C08EkneCF4ihi5CgITP3HBh3FYNMms5Gz2Mnbid014yFeTsv1rS8OKEJVPKDxf4NW+yotK2kf
+ViAjXAKffx/Szvr5d01A43ZgOhjjeEZt+OhUZPDDi0fX81X/PFLnVyk6H5G7x+mrNyegZWE+ClxH
+fF1wAn3ySRxdKiXug2NHW6DQ4RKKK2TmigKo8f53PvGqBQ1+uPCodefKmGaLjGrdVh0LWpVktYu2
+dgLDMp02YYIcDVOiZzfCv2WVmjpIZ7cO0R2XDnNGfFZR9JTPGsDS9DXh4wOcKzDdhTZf8u1Xljfa
+i2KVzUCcguQFuTqGtYLU1T4Q6ClDBsSishH+6HZRZcurBi3D0Ji8IKj6T8cf35y+pfQLz55bBTXA
+o2NSmsfsknGEgSloCYBf3GAT5Ks4dlm3VYQwUAjB/9pF7OtxxB102rHNCv/XLmJ/uCPn1MQjIF/A
+9iJBVdlpFlo9djEwrubMiD9u3InFrOtrhoPQzhju+LqsaGq2dhTSOXThA6zfi9KEQUjjliOd+yND
+XJR4RTAPeKsxxODa0j9TaHrdKdnlrqd/OqsQs4IBRt3afh/aEbZTVYbj8Fofs9ABUHbaX9xjgFNv
+luNKBhoO3cYjl8fCkliqMwN6PiwdYOo7QVcvxLA8t/5bHiaG2J0jgW5IaSy+qIfsr5FKipMNaFJf
+1CQ/IvWFGg6dhTseqcfqmTdKZz+4e5QivGCP/BEk4Xtt1asoqdYYN6TfWIHkIkIMBemhsgdAHF5e
+mOAE/GHHsKf+KIOLgCx+uO444QTDGmuYX/rk7jFTkrj1iH2RXYa2FnWKiRd6eLy7MsJGeY1aixU6
+9dhPzJNHPnmwQjASeSfBfPBVcgvCv9w0Q57JnW6kraRB/VDvhoghL1BVri6HEWrQv/W5xFrAQWoI
+LNT0fuu5U+K5MRqt2SFbcfR7pkBU2VkFR7SmRk9uNw2TVkqNHmC33CO76Ufmq5jizd+BHASO/cQA
+5c59kPwNycVR8ZwmK6NgSxuzLWVzTE8CuwPspkMMqf3VhNSOJsZGEXRUuS8SZ9uzbRgFKrEIHOrQ
+XuyHgnqDRpJd/Xoza5HwP0fRL3LySPJrOl2+/Pl0rF6+fQ//vkjfwVaJSZzG6r8BLfWyqOAYySlN
+KHUkRgk3fD4sNjVmeiJoZLbnLJuolp155MUrAglf9uOWjSBUGKmFujimdgUULc5MA8rfZzUCHZgL
+f+sMAi29U+uEIepEUuj0EunQ6robW13WiwNpceA0uYjenL48eXt+Mmk+If/qP6NLp457DvbvpFKS
+/vipwjufsTJfZhv8IlAcVflHco7uaMpy2tRh2njaVHvoSG1OmJxINDHniaQiZ7dyOy9mE6wJvM+5
+IZpbUJ1HzsHyzr3d21gR1nAkd0xWf8fPQB8VYcoLrCJDoIrUfzLFlAQS/hH17LVjRXZe+N/j69u5
+ayaWyBca0KCNmh3m0G9vpR27nWtRZ3iIUDsyhDdZRlZZUq+nMzcVxbtcSepXTGmFdv90kWxWjUpz
+ODnRgZ5ycII0d7NH8DLhmTau3ls2yaxuk23tuGkktYqwV7pexdgCuvddwXn7p+SaZT6mtVAbTuwG
+0AlROiQVTtN6M7viZex5f3curm+z/LnrgaDDi6hTPgfPakttGCgFxxFKy7QRAvCH4ejiqb0qJzvv
+zHOom5XiNwe/PX78OFL/927FhjGYYDATaFwAMaiQvKHink1ZxmQmKeDLposmnA/sAj5ckhnafN/k
+ZH3c0ZQmIjX/1zB4Tiwb6gatPZctcxVfuXINvrmRfeTveUb+2Gg/SlHUSoJstC3plUS8CEJgL6ln
+WbbHVgiYh22xwXQPaEsURkk/Aa9nCGaMpXhVxAdpCjYgbz3DNgYdGAsBjtjvhrujJDmU6gAQjc+2
+gmd8mmeNjVF+4t4jSkrDxmRsFoZSyS2uCT2QFjWc3CEek9rZhL93Mad3JClmF09bPmDOOLn4LuSB
+qWGRFYuFRhU+6mmaFWk109spzlk2k9hJBqPrIRxuTJmqybo+GQRQikCY0x4wN4vZlP7FzIyL6Tu6
+U93XPYnnSWOyf7P1J8lb3leTie2f7EyGkIZz9S8UC/WWzNeiCnidqb8I16OXs5el1M2Wsckl+yg7
+M9iUpBQHCcM0wtFwpCconDTrBj7zbU9eUPyhQzgjJ4koY516DlW42Nwy23jPfid/PwoV3Q6NQ3/H
+V98pjS4ddDhuFm1aw3YTQQhqRJchXbEAXdp2uDPFiVGjxrhNZ8t98XpG3cYJN6bgYAesE7hiQhhD
+pY9gx7HZgMR1vbafdFJIc2k9JuXAcTHBVHY3Os0459tz8i7toLMbrUROn/elw0KMQBMJXXQD0ToW
+ID1PFMZg58XKuYdkCHDnFWDytZYendyEN3jLIRdhTgSF23UoWKIn92mxaFNOr6iyqCmrJf5+BQ1x
+8c1jPXHaEHlhRKLJlSNOjI7gQVBf6uwLPWc7TcdO1IWLm9wpjXRUS/CA5vtUUiJU9b0aPh+rZ61T
+9Kzc3nD04xdztP+0m8FQHNOSHmM7y6r6/kgNn47V1zugT3o6OHzm9tC2ibQg9AJ53hUbd5ERU2ni
+SDCI5e6q2rVyLCiNLtvU7lLlOyLK31pE4Yh78RB++rC+I85pmc73v6iREIKLXYv9bErdYkIv8b6k
+FcG5rNQee2rucRosSi9sxZcjyPR5yvSiw+dlo+M8QrgrsZblyjh7HPRv6zk7Sm7waxELAAQDFiX4
+EMuFFq4W37111/kpNbyANUlSIfAlqq1oF9qd54QHreA7Zx4v2O1Cd1fGA1h8p/OGw8R/PuOwv37f
+DXkH0TsCJPz0Il4cRGA6d0cseCvQhCnYydY/YROtxyahpn9onThQ7IqBA41+uYWOIofoI83JMAvj
+K73Gt1HIVwH37FXqKtZsYOEk+Kjpkk3JJAivm80CXQtu6KmX45pcBTFX5lfPno51cDYDkgE8nzz/
+Ul5EoWY6+Zp/DhvLwR4Kpd2zyf9xgGWN39oUdc68NKyjVmZwvzM2o44msaGD3Vbujqewc5YofELE
+EpOPXyYP4WvQhqegB+u3gDCg/DbZTkLouvLCrt0+ifbw5evLP+w0uEr6ZN4uefdgHpZWYYlPuc5v
+8ZkYLkHtdFMeGuup3gNI03edV4kZroOxVSz/cXdsrqPguLnhrkFLjYEZsnZI6Qzaj2l0By9t+7e7
+0ODZWlWaY9TdoRNWPhvh743LI44rwsfiFNX15ndr4Th7toBOO+1khVczxH+CrGbHdTJzf0ePu31+
+QCzgFedEJLqc0BpuV7p38033s3bSSiPt+srRaw8xu/zG6XJZx5TzKSb7CCfDbx979fHgNT0UkSb1
+Vh+TMakpgNBMI47EbrAAzD8IMX4NjT3XnLSVkm4KfaAdp+o6m7Osto9DTNi0Te315Qp7RUerFO8o
+6g3mNK/TSN7MYpeqkKe28+KEmF3XSX2tUdctxvKEEkk88uPTUatsUO/6Y/2xrHD2tYCxKLdAV96w
+O9tAHJsyYLsnNlQ/Gxt2SvPNOq2SxuYz9R1BMjge2R4oRhoXk2Omteu5xW4uYpk5qTpIocXU/P4l
+HAF9C8uOFA4jIyHvz6Iunz8kO4Sz89hD9SeTyNzNpTund91cNdBU898yyORxEp2im+SrWE+5VJIG
+8wNLfI+DiqTDlCA8vMdHPD4zopD1WIOG880VKt30sJm8JhBO7d7mgW5u99Zh1fTfFT006o4+2VPZ
+UHGXAcT2NnIsiugwfIdF0Y+ceKBF0YP/EIsihyBVK0ycskK7lYOcmI+1jRttTxTR5L8SVeSq6xoH
+nDzdCtMv0bWQzMaJLEKn/lVRXMcx88/pQiu/3I/saBIaol/f5BdzsB2bhmu5kPiQTNGngMVfrWRA
+iCF6GqDw0Kiofx7IbWoM4pqCXKCB/pVfvUIopGtJ7wXI2Sqbzym5IK8y14iLfOnNgSDPegjdPmKi
+e4o6Of9w/P7D38+cjrx7TY1lrOkw7N4rgsj8lDV2j+7mU+Z6GkSwzM55WyUPMg1PJvnfOYeF99CD
+9nr030PFMDjkkxG7na+Trc5CnubFZnnF/k4wFgeaP2laRcNamJ9mAWpPo10mKZ3ZXB5D0YRkHHnM
+8ZyuWPSupD/T1gRF9E5A5KuoXtN2ZhxUatF9ga4s3ZptEnEJXqPXaQwt42mGib/wX/X/ToHusSZ8
+tEsI9QICBfdQOSD6ucCAwF/YYRRp5RiJZcIl81L78HWc6xJ2d+DwW9KY15hJg96Vq/mwzC+w1o3i
+x0FV2+vnEUeIsV9/hUp7XqgJeR1VM2aRIfQzQRLrDyYLJD0y2wKHD5y+O1cfYfOWmRnpBnhjSO+I
+6jhkfCQu595nFF1020buNmE1kB+CEyjyWpx/imThGeAavMaLZxzurAVLDLvlEvdp3MuetOl7im6S
+RvDc4nux+OIGiDgtcwGjlqiatGBgpMZyg/ZzSuGvn9dFC8RNkc05RARXqO4G3/UCAdICQ9f37rMR
+5Cat0wayPEYEdeZKvQek8xag5qqi1d2Wdiiwx+jg2CaC+BhNN8va9XHJ6nqTfv3Xr75+tK6XT//2
+12+ef+M11MPpuUVyAvOif6JVL2rRseVvG7zP99ePnlJaQvJH8II/uJq6rIM/KPA51ZgAbAec9uLm
+4eeB2IGgg+TwNdR6WzSv8aAgGdbO0oqSjxZ5O8+a+/OoFUfKbzejrKTTH+12/DeihSpEHxjxbgpO
+PUz5354GG3apyNvhRO+cQ48cIiB7NA/0p2xvuF5wu/+WnqMdoclJuTYn7zHArPNiGnnWth9nkXt2
+XFn0ZhlGv1bo6sZXi/w8BwcICAYguirUx6/JCtIKjvWvY/Wh746Ub9YNrX2bq+9+JV2YnLRMdRhP
+u4WYwWwT+eC2wc4l3G7njTOzrsOEPc8YcoZiP2Ef26HI38M5IqFqxu+m6uf8SJ3XF7g6BSIaDKjp
+2D4QusxuyMul1ESlMA/ZXtr8bjT1daltitHn3yef7RMijB+HmZcYZr4rr6MGA0LsdmdWR53Ccb5Z
+l0MZwcMzOXbAFngOpbtoi0nrCOULPlzc4nxmhYMmeYE7ihd5YvpApm8dzu7uvz+NpE0e6dotg6Oj
+njX0+6lHziHKeZ0Rs186QuJn/VwTsUH3mUdKPDZN0ZjEliL3JT+Tx5liHY2FkROPmlvtp4eXI954
+QVMme15INBtnKfNCJm3G8gygMwA5tInJFJPQOAmpXERa+VkxCUY9LOXuSkwdbdHivkxpfVLdtKre
+R7HUet/cLIS2wEHMfuXlNbvFpA6kp8mgKGEwyg6v6q78AKP+mpwjpr/cxNDbKuGsKda71qT5tbMS
+dp2QPL0d3qJHYmrvFcW6wbPyGuP/UiERWQxv0a/KfVdQXu+jw6M2FbaeKG1tOtZmaKyMATeKdn4P
+Dg7orJwdYvC+XjKW1Ub3y4P75yW/vYhgENFlMP2tNnnB3k7p3Ol5K2qjn5EMeIP6T0Pipkp/7oqY
+cL+Er0p1wlqz3P/lTLxj9e/ptjcn772T7boPj34mEh7y+V+T5lB9/h0TYbNF+lBdXNITxMYnCb/8
+buGRT5jvht9N71rDMTa8ws5wSYot1bzE2l5kuxeB+Wvsjy52CtxUN55Z3jfJOzGPmls/m0IhlmO1
+JwZ0wggMBXnbCLxeOsnwMT1QQZxWhtKdVvpWwK3tzUSnhecT6LRylb3DtrOXU4+SLaABGmrZ1A+t
+csp+dOikhHHGQoI2dqu1M1Vwbeaglib5L0kdmij7WmRri+V00j2vhr1P54XPefYJa9rDneem6Q6K
+kxrVE5s6i6eIbky5b/1ghPC02Ci4f6UvHujBUX7rWN9CddQJq3U8AaVD2wIkfqDWarAkZ7vVcczO
+MnlA9p77VcWc3yxFLZtcjr1vNOf2W4cd7I0EEc4RzJrX7WK8zignMxW4TngYz0ZFsMSdt5M6F6Tc
+8NmljqLrfSKSyN96J4YbP710rYZux/pxHh9S6+0WDWRscAnkMGHY7b3jX77x8nOhcPDQOT2L/Zoe
+ze5EEP2UNglLXH5Vm96H4fNX/8vdzKZwVnPuUS3rUhgL+rVAMXD7dVaWWrVxb4LdRwv4sD5P+cRb
+4y0srE2cOXqwgF8CP5E7M3y2BIBIIFrS+E8moMcKR9uwIMfrBPe5VuhEDUMa/FjMaJj0Y8RZORq+
+9UCNV6xvZBinJQwiC05dctcSJhTsrGlZU6ZjqDdpxVR5WQWEsmONLx+75KXzdsoJiozVc3Gk2/rF
+etxHGqJf7ECXOzb5y2LoaPqCpH5L0EHFnMuPPKxIITfV3bXrHuS7sblt1ZXxFW+iCysE2D8cBWjw
+VlOLAKpxdGQ6DSx8Am6WPTbo2vH049up51TldSJCxiX9Azvr5LuzifHLdNaaAWYP4ouxgiMEkLvN
+JPpmN0hnQ1NC2J3p7qQJMGnS+5qZRyifwyZ2GHYADE9jfx86MG/1UyI8eGOAo9ySLdbvHc1ORrwH
+0TyC3Q+8z9PU+OJwvx2O9Mi4DvALiiTZRILTTS0//vWPrOTkISzJpum24IijiUNKf4r50rfSbntI
+Jf2NlSla1IShzn3Z5hEDAwZNNbQRcuiW6Nlw3kfXxWNC8S2Q81S+jAKm8RD1AjdyVCkGQG/ocfVh
+a/QdXhx1rFF33M7qM47E6NqevE02IO0pbVdboOtXKCTrq25K5okg6zsAFmPzvjjeaPHW5ohlmyds
+F62QQG53lkB98O84vuvn4Pslhj3gswavw61q0llkmboHxg0ovZ5G46kDyLlr0GjYFty9GaBsb0nO
+akBLYYbR321V+TOMJh9evTl9EZ++fXXy8W6zCSssf9hs0tYvKA0FQL6IpATVdnxSWr5KNRNa9qea
+LRxSBgJ1JHjoWccVAyfIHTfrLp522x5mKDBOW4fMHpD7bNNhYe3X4DQi1wacWPJtoM2HXKjOoAqj
+EnnZc/2mZjsMpfTwTUt92WweSAdPnbQuVmbMTiyArjMYeJFVRh7xZJhsH+Q6716l4iLF5Bbav+qQ
+Y+JNegKtt4rn25RCAve1yxG+5YiuDlY0YmM49i6rZF2LuwF7D3NqRD17AhVEHplUN+XEOHAzZEsx
+fFEdUdyrybNoUjo3/VomOGwXCBDHzOfGZ0Ei6wEJTRNGJg68QqtBmrY+TNi15fnDB4M0TUWQoilI
+T4sIuODZXxu6OlZwvTy5QkeLCV/ZmuI7wmcDy7IbvCmmgXBsbMcZkCt3o2LD8YFBJqbiZFprYS1f
+CFyM1bY1XWLTjfGmpO+WUG7K37KoAVv9zJf4NjsPlaDxhPYFY+UBRY9FyE8ijy2yyXxOgdN4jbsz
+N47vr3rHBP7w5t2L4zfECPHZ8ct/P/6BMt/RlbH4lt87aDgv9pnH9r1UuBxA7CnFCD7Us8/TAdMT
+Z1V3IHXqBBXtkBEreCdkWrVmu+1C7BbvatRJTB5uCAO5mxwt6H2O0+EeOsb3wNrrcHiPGbXbQyh0
+Q14Vc9XbVjregXzl3Kn6LyfvlP6kk7PcoSs8t30FvGx5WdvELRq4TbkhOk4nHYHutj/dcsDjmBuF
+9VgqQ1dOFCF9eRRGJkkvMRH6xfr3ygLFJHrgqAnfJ5RTgNCTDvrJOBA5s5R911I0G6PLmYCiQDYd
+1lLj28bop5uIjWysd2Wux143tcQAGfuzJpb/pkJ3fK7SM09XPVSAbYy3MHPxT6joLU3S85iEVl/U
+6mKfnjvZR9l6af7CGZUQm58zTFsF54dqueGsAnJhiyoGVIbjjpuKyrTpNKBYFEpwAkcOm3AcBPwB
+UNrKmhrWJsZcsO4B5/S9L+o9uT3AxKpEyZqdYhzk8WzsYK+p9UTt973u4b5uodTT/orz1gMa0uIZ
+t6jvaFFv9BMKjnjCBJ99z3ao7wky58hRKR4D9EGOF2W1rMXeAL/eoIOF5iK63YBiR0hRHsLICQ24
+cA5ObjLSoD1QmuOv9PqwcRDCALhRu5fLqJUJuD/cynkrmV2tekKydLas0JPJO2+PI3QtwRcKqGU0
+aONqOPCQRqaGn51XlZ27HRmC+TLqDttKuD5QfDfkgqIk9l1QHZmpvqgwSrP93dmptpwyePjEJBte
+LOhsYzNMRM46ISXZ5xFuoS2sdqTt5nQbda/mjKJuzxXaPCnTD8udVSWu5Ss+/VtIe+iWJ3q0HH4M
+J9z+6T3aB8zBuvmzXZdSptbz4AMOfA7BPKqYa67Npfr7BHYeEKX02jemWzVrH18Es4R0GcoO7ok+
+lsrZW8KWSOmPReEwG8Xg/wOqct3Z
+"""
+)
+
+# file activate.sh
+ACTIVATE_SH = convert(
+    """
+eJytVdtu2kAQffdXDAbl1lJEH1sRlShIIAWIMKVqq8pa7CFe1azR7pqEXP69s7YxNg70IfEDeD0z
+u2fmnJmtwzTgChY8RFjGSsMcIVbowz3XAdgqiqWHMOeixTzN10yjDRcLGS1hzlRwYdVhE8XgMSEi
+DTIWwDX4XKKnw41l+biNgrNzeLKAnlgo1NBcwGrjRx5ctnxct0QchvD58qRtJT51kGi8otAHFGsu
+I7FEoWHNJGfzEFXmVYPf0HyExtOsO/ngvsAfitOxFAq0jBH4AsgAlJ+PXsgkpcU0sDBMwsmaxduN
+J3d8c+3OBpPp9+6Ne9ud9mk7m/b7CjpAkfibx1g6dqPibece+LCKpE4c829pypWgxL7g/wPzc9of
+j/rjYe8ApNxeAZZbqvBy01GQZS+CmtU90YwKopj48VET24kcgAkfHlXwEe4D7gUQsDUCoz8yedFy
+acw6IAqM0rKtSG8eMULU6AjuCAEJiN4WkTSLFSNJZqHqE8APUmUU68ysubjLtik5mgJBw5QYvICJ
+O1RwT/JmvvnZgJEqHUsSWxFy9LcEUPmFKf9V1+k3k1I/P+cffzl9d9abOIPxqPkaDUmSTUkizgVd
+KtoRgp32AWaddoVSp13l0mkfJTEzb4GkLltrbzTbpV8z2NomvQ7YIhI+Kuoj08G4B68ODoYL2DrU
+9gA0jWnb+tvTXyyaFqmdS4khrlmppQvDony2ZRXQdmzXLSxd17ayOhRTsirNRpVMGzVbFLxbrns1
+GLmj7rDnul8yt2If57h3DWEKRl+sEq3HWvVAYxlYe226f5RlmEvlmZxSzP564HSvbnru7WQ8vJ1W
+hLkvhI4B6RiGd6TbD7uCpttQTaHWgYcDiqy6lzbFUGE54GwXkdb4HEoR2QgsyNlkXIch+4ugYolm
+IMSChZyp7NYg5FyfKprlEpm/MSglWkWPQh8W75iTk72dqMXNXWFZ6TK/plYbmjQCmsvMz258s1MJ
+v8vwe4fB98ah95aB99qwI87+AZNadAs=
+"""
+)
+
+# file activate.fish
+ACTIVATE_FISH = convert(
+    """
+eJytVl1v2zYUfdevuJUdOCkqGVuLPgQYhrTxEAOJHThugGEYZFqiLQ406ZGUWxf78bukvqhYToFh
+eYgs8dyvw3sPOYBlzjRsGKewK7SBNYVC0wz/MbGFlZaFSimsmRiT1LADMTTeMJ2v4O1XZnImgIAq
+hLBg+x0uITdmfz0e2zedU87jVO7gCjTVmknxNg4GcCtBSGMNgRnImKKp4cc4CDaFwChSQLImOmeb
+Y7InJocog/CzFAeqjMaALpBbMBK03FGbyBasCaREALqTW8G+0zAA/NPUOJPK2ZCo7aFZsEb1Qgv6
+46c/HWIjlQuEH5UBrNbH/BzHUYXr8RYO25frYeOkTImKrHymuQQPGNgFjwUb7RwLrtxTFhw5fSwY
+ZZf1niPl4XUIUVRR0Y2Z0XqjbcDR5BvCD0yZgnAqDrCTGQUiMnRvCiVsbJNT3E61IxzrQqgUOypM
+PHJhBwi0zEie+atwIIqRNafaodgGDMXuiwTylszvb5Pn6WL55eY+ebxZ3oUNxwPXXRrba4vdV6xt
+b7lOi1yr+T+Z1gXV4w/vPwLhhirsaesLckyeIxONzzr2ZZehuGTot+nTXfI8WTxN57MrbAuIuIH3
+jXG98dH2W+n+srtnp8VcNbaUa3re0alla1h1T2NDoR/sdvYH/P6+vJvP7uYPkzA4yaNZe5lNs/B6
+Hl3YK9k4lh8X84fHZTJHthfT24m/60/oHVua7vbmCFym2GorN4pJ3beO7pVtR8K5/OqaUtGdPCBU
+bmDlwHsl0cOqFrfaVmPmq7hbCodT94GX0UQRTb3BGOkXMcoZ0UYq6pKRim2ZILyN44cHz7YPkEKC
+E5R4qB9Z0BOL3r3qY767WxW63tTJ7Lm7i6FTERyNEN78AiMhRYafVWFVhI46m8g3Ub32pj/n/TGT
+af9SK0xnyvWPjDMQfzabKl2lA/gibKVMKcrpgfgSFQeeKHbrC4J6WDx+IEwS7zVJQuv//1Ou/6pY
+daonYoGq1Tlvh6VQNQJ13tAhHYMd8QqHXv3jJPk0nSWzm4cJUlGZNISvhq1MrGxT4cc4KJ8Q/Q0v
+RKQ/FU+o+vDU99I97tqG2x9Njh+iXfnNPxwbwfrerSy5nT7dfLqfVAMUVifeZ7k/uplPC+wm7KSu
+MjSxCWrGyyGtdKgz+v7Unwx1B94rCjh55EA7CQ21IabQ79wFx7PRiCL2RoYtRY54OTtRRRu+NK6d
++Kr4WCYp8Y6iGF4U0OsBn9mvHma6sZe/d/CXvW7uFd0jxS45/3ogyI62sf0Dox2tSrWS9qBw24gj
+YTYwutAXetQLx7mhJkklx9rLe8srZ3Lr7vJCX8Gox9gPUjV556j2al/0HAgNj42NvRSG1F68hi3d
+IfwD5W28AfYKfFe360npk/luL4eu1f8FF1O5LA==
+"""
+)
+
+# file activate.csh
+ACTIVATE_CSH = convert(
+    """
+eJyNVFFP2zAQfvevOEKlQAVley3rurIiDQkKYgVpEpLlxtfFUuKA7bTqC799ZycpaZtN80NV5+67
+++678x3DPFUWlipDyEvrYIFQWpSwVi6FyBalSRAWSl+IxKmVcDhIbBpBf2mKHOhvf8CO4VdRQiK0
+LhyYUoNyIJXBxGUbb/1ukHASFhuYipWSCFMFV5mwCr7I8EEuvv3OhcoGSZF/HTBm0YHGdaY0juIX
+FjMmMiUsSGxYQKyWcNIb8/vbKX++eZw/TW75w2T+4xQIjHoF/gJR78Bh+BZdQql9igPbJRhMhU0v
+oSv64/3dwzzEh1eq/tWN9sMHj78mCNba5Bk2huvZc5Uwejka9iM4GkGkCy3ROlP6ejE6JdS+BP+P
+ed3IIiERj+Ep0FLGYIYroR2shFFikaEdsJa4u5FCP/YIQ8R568p5VHXtQFLSqFad7TamhR6+XXB+
+dTPjs8ndNefDLYJOqJHviUjpQsVUo0tRM6Djs1N4rkWOMIIuDMPMYpdzfBLvEnKUPT6FmKGWalmx
+gN64XfH05ufk6va6jg4tJpXzP3xHnnob0VCSBa8myxfwOQq2LedOp0+1U6C5U95+rJ1KWsZgbZOh
+B1uUmfSbQGkQfhjOlXZownig102ZQueo3VkNIL91qpKUloDFM+jVsWmxlDRIS3rGEoSmpYKw9rF1
+7GpkIgyCWBSl8wTqd0W+m7Wg3fGh5ri2dIjW8cho6Cp/P0SNbwjUMsDoHfpRr94z9KG/H92f4fa2
+04gm+YfEvWaehm8dySv1W62qulGtiQZZX7fNadZeeL/069JCw3le3RmrdhX7A3FRviE=
+"""
+)
+
+# file activate.xsh
+ACTIVATE_XSH = convert(
+    """
+eJyNU11PwjAUfe+vuNY9sIj7ASQ+YCSBRD6i02gIaSq7gyWjXdqyaIz/3XYwVmB+9GFZ78c57T2n
+lNIXKfQa+NJkJTcIeqmywkAqFZSZMlueoygppSRVcgPvrjgyUuYask0hlYEVGqaxAK6B7f8JSTAF
+lmCN2uFqpcMeAbuyFGjxkcglhUwAzzOuUe9SbiWY18H5vm5B6sbgM4qir8jSdCib3t+x59FD/NS/
+Z7N+PKRdoDRskAIXhBsIziqPyFrSf9O9xsPpZDgdD85JD6lz6kPqtwM0RYdx1bnB5Lka2u5cxzML
+vKLWTjZ7mI5n8b8A9rUNjpAiQW3U1gmKFIQ0lXpW1gblEh4xT6EuvGjXtHGFE5ZcwlZotGhKYY4l
+FwZKrjL+lqMmvoXmp4dYhKQV1M7d6yPEv5jNKcqYf1VGbcmZB5x4lRcCfzfvLXaBiCdJ5wj46uD+
+Tmg3luR2NGGT/nhgGbpgX48wN7HaYhcUFjlfYrULCTkxWru36jF59rJ9NlJlf7JQde5j11VS+yZr
+0d22eUPaxdycLKMTvqWjR3610emDtgTu36ylcJe83rhv/di/AYN1UZY=
+"""
+)
+
+# file activate.bat
+ACTIVATE_BAT = convert(
+    """
+eJyVk1FLhEAUhd8X/A8XWSkf28dCyMUpBR3FzAiCS+WYwq4TOdXfb0Z3dTJdyCfveO85n8frNXut
+OPCyNFbGqmUCzDxIs3s3REJzB1GrEE3VVJdQsLJuWAEYh97QkaRxlGRwbqxAXp1Uf+RYM32W1LKB
+7Vp2nJC6DReD9m+5qeQ6Wd+a/SN7dlzn9oI7dxsSXJCcoXOskfLgYXdv/j8LnXiM8iGg/RmiZmOr
+bFMSgcebMwGfKhgbBIfnL14X8P7BX3Zs38J3LSoQFdtD3YCVuJlvnfgmj5kfUz+OCLxxqUWoF9zk
+qtYAFyZkBsO9ArzUh/td0ZqP9IskElTFMsnwb4/GqeoLPUlZT5dJvf8Id5hQIONynUSa2G0Wc+m8
+Z+w2w4/Tt2hbYT0hbgOK1I0I4tUw/QOTZfLE
+"""
+)
+
+# file deactivate.bat
+DEACTIVATE_BAT = convert(
+    """
+eJyFkN0KgkAUhO8X9h0GQapXCIQEDQX/EBO6kso1F9KN3Or1201Si6JzN+fMGT5mxQ61gKgqSijp
+mETup9nGDgo3yi29S90QjmhnEteOYb6AFNjdBC9xvoj9iTUd7lzWkDVrwFuYiZ15JiW8QiskSlbx
+lpUo4sApXtlJGodJhqNQWW7k+Ou831ACNZrC6BeW+eXPNEbfl7OiXr6H/oHZZl4ceXHoToG0nuIM
+pk+k4fAba/wd0Pr4P2CqyLeOlJ4iKfkJo6v/iaH9YzfPMEoeMG2RUA==
+"""
+)
+
+# file activate.ps1
+ACTIVATE_PS = convert(
+    """
+eJytVcFu2zAMvfsrWNfYEmx2sWuGHVIkQAO0adBkvWyDoMh0I0CWDElOGwz598p2HDt20w3YdLP5
+SD2Sj9QlrDbcQMIFQpobC2uEWFkwKtcMY0i0SmGhlpuvsFM5MCqls+pcArcQc43Mil0EEwXWxRlB
+BNEVZZZvqcUoM188LzBM88yOVjezJVmMVzfwDYJ0x+VWMWq5klG6YypNqYyjjNrN0eF6vJySyezB
+4U0muA0LKww0GiW2WH35wTHsVRT5QwgXVKO0npfkkhXR4UmoNRWjGGtagx/mmVu2+QXBXMkJGqvz
+woRD77cH7vAEBtb9rq7YUs3pWuCI3N9OyOPsYfV9fFveOCzRlU9xApTbUZ3hebcjXmOqXCI1Evwe
+1IfQMJXhIYnSc++9QbLOdkSUiMmWa5tTQTLXvMz2aB7Blb1g+55/ly+3mDYX/jzn0eJZFqbOazp/
+7DEqQjjMaae7XhAKpMmbbHpI1FppWgnAOG1Lp1KmpOUyxy67i54MTtldwhJFAvEBcfF+PRqdvY/L
+drFiByr7vlwrc0Ui29mNs4QplH8hoPrJFE6XkEuDFrjWKHBLpT2q1XgNEQilknGToJvJdrFc++tR
+83o1d8bWp/M88OtJtUDW+vfak+B3Y14Rcj2bk/n4bkrcKWBkOV0Q4sOnVoyqNR1fR3I5vr6dksXD
+/d1iVU9st3rnNNk01fcPtT+diDccT8ajFavg55OmBiWhIolQulH2uyrqNfh0thpgJblxHLuNisDc
+TnYbONOY8BewqvyJL9w4KT9BJ0hxnrXTWbhRbpWfYackPgsu8cTtw1/ugH2rbCgM/nuWtJMcy3Wx
+wQ+5fYZ17h4aJT8Wz41hVMfu5YnOpjwIBn/eITAcwn+rxN57BRHvOEk=
+"""
+)
+
+# file distutils-init.py
+DISTUTILS_INIT = convert(
+    """
+eJytV21v5DQQ/p5fMaRCJLANcAcSqlghuBdUcRzo6BdUnSI3cXZNs3bO9m679+uZsbOJnWR7fKBS
+u65nPC/PvK7YdUpbUCYR/mSOw/GBaSnkxiTJBaiuUjUHYUAqCwwOQts9a7k8wE7V+5avwCh44FAx
+CXuDnBasgkbIGuyWg7F1K+5Q0LWTzaT9DG7wgdL3oCR0x+64QkaUv9sbC3ccdXjBeMssaG5EzQ0I
+SeJQDkq77I52q+TXyCcawevLx+JYfIRaaF5ZpY8nP7ztSYIEyXYc1uhu0TG7LfobIhm7t6I1Jd0H
+HP8oIbMJe+YFFmXZiJaXZb6CdBCQ5olohudS6R0dslhBDuuZEdnszSA/v0oAf07xKOiQpTcIaxCG
+QQN0rLpnG0TQwucGWNdxpg1FA1H1+IEhHFpVMSsQfWb85dFYvhsF/YS+8NZwr710lpdlIaTh2mbf
+rGDqFFxgdnxgV/D6h2ffukcIBUotDlwbVFQK2Sj4EbLnK/iud8px+TjhRzLcac7acvRpTdSiVawu
+fVpkaTk6PzKmK3irJJ/atoIsRRL9kpw/f/u1fHn97tWLmz/e/Z3nTunoaWwSfmCuFTtWbYXkmFUD
+z9NJMzUgLdF9YRHA7pjmgxByiWvv31RV8Zfa64q/xix449jOOz0JxejH2QB8HwQg8NgeO26SiDIL
+heMpfndxuMFz5p0oKI1H1TGgi6CSwFiX6XgVgUEsBd2WjVa70msKFa56CPOnbZ5I9EnkZZL0jP5M
+o1LwR9Tb51ssMfdmX8AL1R1d9Wje8gP2NSw7q8Xd3iKMxGL1cUShLDU/CBeKEo2KZRYh1efkY8U7
+Cz+fJL7SWulRWseM6WvzFOBFqQMxScjhoFX0EaGLFSVKpWQjNuSXMEi4MvcCa3Jw4Y4ZbtAWuUl6
+095iBAKrRga0Aw80OjAhqy3c7UVbl/zRwlgZUCtu5BcW7qV6gC3+YpPacOvwxFCZoJc7OVuaFQ84
+U9SDgUuaMVuma2rGvoMRC3Y8rfb92HG6ee1qoNO8EY8YuL4mupbZBnst9eIUhT5/lnonYoyKSu12
+TNbF6EGP2niBDVThcbjwyVG1GJ+RK4tYguqreUODkrXiIy9VRy3ZZIa3zbRC0W68LRAZzfQRQ4xt
+HScmNbyY01XSjHUNt+8jNt6iSMw3aXAgVzybPVkFAc3/m4rZHRZvK+xpuhne5ZOKnz0YB0zUUClm
+LrV9ILGjvsEUSfO48COQi2VYkyfCvBjc4Z++GXgB09sgQ9YQ5MJFoIVOfVaaqyQha2lHKn3huYFP
+KBJb8VIYX/doeTHjSnBr8YkT34eZ07hCWMOimh6LPrMQar8cYTF0yojHdIw37nPavenXpxRHWABc
+s0kXJujs0eKbKdcs4qdgR4yh1Y5dGCJlMdNoC5Y5NgvcbXD9adGIzAEzLy/iKbiszYPA/Wtm8UIJ
+OEGYljt14Bk9z5OYROuXrLMF8zW3ey09W+JX0E+EHPFZSIMwvcYWHucYNtXSb8u4AtCAHRiLmNRn
+1UCevMyoabqBiRt3tcYS9fFZUw/q4UEc/eW8N/X3Tn1YyyEec3NjpSeVWMXJOTNx5tWqcsNwLu5E
+TM5hEMJTTuGZyMPGdQ5N+r7zBJpInqNJjbjGkUbUs+iGTEAt63+Ee2ZVbNMnwacF6yz4AXEZ/Ama
+5RTNk7yefGB+5ESiAtoi/AE9+5LpjemBdfj0Ehf09Lzht5qzCwT9oL00zZZaWjzEWjfEwoU9mMiD
+UbThVzZ34U7fXP+C315S91UcO9rAFLen4fr29OA9WnOyC1c8Zu5xNaLeyNo2WNvPmkCtc2ICqidc
+zmg+LaPu/BXc9srfx9pJbJiSw5NZkgXxWMiyBWpyNjdmeRbmzb+31cHS
+"""
+)
+
+# file distutils.cfg
+DISTUTILS_CFG = convert(
+    """
+eJxNj00KwkAMhfc9xYNuxe4Ft57AjYiUtDO1wXSmNJnK3N5pdSEEAu8nH6lxHVlRhtDHMPATA4uH
+xJ4EFmGbvfJiicSHFRzUSISMY6hq3GLCRLnIvSTnEefN0FIjw5tF0Hkk9Q5dRunBsVoyFi24aaLg
+9FDOlL0FPGluf4QjcInLlxd6f6rqkgPu/5nHLg0cXCscXoozRrP51DRT3j9QNl99AP53T2Q=
+"""
+)
+
+# file activate_this.py
+ACTIVATE_THIS = convert(
+    """
+eJylVE1v2zAMvetXENqhNpZ5wHoL0EMOBdqh64Kt3RAEhaE4TMzOlgxJ+ULR/z7Sdpr041BsOUSS
+9fj0SD5Jaz0qIq1NRFiTjytToV3DwnkoVt6jjUA2om888v9QqduAgFssEtegTWJJIV9QhWnm0cyT
+dAAPJ3n7Jc9PhvC0/5hmSt3wCgpjYYawCjiHTYkWdm4F9SpE+QS8iVsKkewSxrtYOnt8/gCsi0z6
+TOuM7OemhWZKa62obpyP4MJ+Fiji03wXlIp+N1TAv71ShdsCmwjXpsZz753vtr0hljQKAX0kZ9ud
+RE+O9f5TKVKdKvUBOCcOnEsCEB2MRzcX0NKAwIBHsoHm2CYsoDl5LKLzu1TxMuclnHGeWWNimfHK
+svxkvzazIGOyl5Cmire4YOSdnWo5Td8d4gM22b0jm0x76jv4CIeAbIkx6YIGoHWahaaimByCmV7N
+DFfktaKesM257xtI4zhBT8sygpm59YsMn2n9dfnj5nZ0lZ9f/2olyzlCZubzYzNAH1Cza0Pb9U+N
+Kf6YJUp5BVg6blvT26ozRI1FaSyFWl3+zMeT8YT5SxNMjD5hs3Cyza7Z5Wv0gS2Qk1047h5jv05u
+Lr5fM5pRWVOZyHemzkI0PoYNceH1vVkbxtICnuCdr0Ra3ksLRwVr6y/J8alXNJNKH2cRmAyrjk6U
+vp/sNUvALpqpfl++zALOzkBvyJ5+0S2oO5JxXcx/piDhBwHvJas6sq55D486E6EmSo+yvjnT4eld
++saBii/aWlLEDi7cqRJUxg6SkW2XPBPB2wzke1zlHLyg7b5C7UIdpkdu/CYmFpcxKb9tTFeHvfEW
+bEt+khbtQs4f8N0GrneByuKGWSp+9I7V9bPpUAw/pfZFJgkSODeE2qdQSDg5uatvYvb76i9zKfxE
+"""
+)
+
+# file python-config
+PYTHON_CONFIG = convert(
+    """
+eJyNVV1P2zAUfc+v8ODBiSABxlulTipbO6p1LWqBgVhlhcZpPYUkctzSivHfd6+dpGloGH2Ja/ue
+e+65Hz78xNhtf3x90xmw7vCWsRPGLvpDNuz87MKfdKMWSWxZ4ilNpCLZJiuWc66SVFUOZkkcirll
+rfxIBAzOMtImDzSVPBRrekwoX/OZu/0r4lm0DHiG60g86u8sjPw5rCyy86NRkB8QuuBRSqfAKESn
+3orLTCQxE3GYkC9tYp8fk89OSwNsmXgizrhUtnumeSgeo5GbLUMk49Rv+2nK48Cm/qMwfp333J2/
+dVcAGE0CIQHBsgIeEr4Wij0LtWDLzJ9ze5YEvH2WI6CHTAVcSu9ZCsXtgxu81CIvp6/k4eXsdfo7
+PvDCRD75yi41QitfzlcPp1OI7i/1/iQitqnr0iMgQ+A6wa+IKwwdxyk9IiXNAzgquTFU8NIxAVjM
+osm1Zz526e+shQ4hKRVci69nPC3Kw4NQEmkQ65E7OodxorSvxjvpBjQHDmWFIQ1mlmzlS5vedseT
+/mgIEsMJ7Lxz2bLAF9M5xeLEhdbHxpWOw0GdkJApMVBRF1y+a0z3c9WZPAXGFcFrJgCIB+024uad
+0CrzmEoRa3Ub4swNIHPGf7QDV+2uj2OiFWsChgCwjKqN6rp5izpbH6Wc1O1TclQTP/XVwi6anTr1
+1sbubjZLI1+VptPSdCfwnFBrB1jvebrTA9uUhU2/9gad7xPqeFkaQcnnLbCViZK8d7R1kxzFrIJV
+8EaLYmKYpvGVkig+3C5HCXbM1jGCGekiM2pRCVPyRyXYdPf6kcbWEQ36F5V4Gq9N7icNNw+JHwRE
+LTgxRXACpvnQv/PuT0xCCAywY/K4hE6Now2qDwaSE5FB+1agsoUveYDepS83qFcF1NufvULD3fTl
+g6Hgf7WBt6lzMeiyyWVn3P1WVbwaczHmTzE9A5SyItTVgFYyvs/L/fXlaNgbw8v3azT+0eikVlWD
+/vBHbzQumP23uBCjsYdrL9OWARwxs/nuLOzeXbPJTa/Xv6sUmQir5pC1YRLz3eA+CD8Z0XpcW8v9
+MZWF36ryyXXf3yBIz6nzqz8Muyz0m5Qj7OexfYo/Ph3LqvkHUg7AuA==
+"""
+)
+
+MH_MAGIC = 0xFEEDFACE
+MH_CIGAM = 0xCEFAEDFE
+MH_MAGIC_64 = 0xFEEDFACF
+MH_CIGAM_64 = 0xCFFAEDFE
+FAT_MAGIC = 0xCAFEBABE
+BIG_ENDIAN = ">"
+LITTLE_ENDIAN = "<"
+LC_LOAD_DYLIB = 0xC
+maxint = MAJOR == 3 and getattr(sys, "maxsize") or getattr(sys, "maxint")
+
+
+class FileView(object):
+    """
+    A proxy for file-like objects that exposes a given view of a file.
+    Modified from macholib.
+    """
+
+    def __init__(self, file_obj, start=0, size=maxint):
+        if isinstance(file_obj, FileView):
+            self._file_obj = file_obj._file_obj
+        else:
+            self._file_obj = file_obj
+        self._start = start
+        self._end = start + size
+        self._pos = 0
+
+    def __repr__(self):
+        return "<fileview [{:d}, {:d}] {!r}>".format(self._start, self._end, self._file_obj)
+
+    def tell(self):
+        return self._pos
+
+    def _checkwindow(self, seek_to, op):
+        if not (self._start <= seek_to <= self._end):
+            raise IOError(
+                "{} to offset {:d} is outside window [{:d}, {:d}]".format(op, seek_to, self._start, self._end)
+            )
+
+    def seek(self, offset, whence=0):
+        seek_to = offset
+        if whence == os.SEEK_SET:
+            seek_to += self._start
+        elif whence == os.SEEK_CUR:
+            seek_to += self._start + self._pos
+        elif whence == os.SEEK_END:
+            seek_to += self._end
+        else:
+            raise IOError("Invalid whence argument to seek: {!r}".format(whence))
+        self._checkwindow(seek_to, "seek")
+        self._file_obj.seek(seek_to)
+        self._pos = seek_to - self._start
+
+    def write(self, content):
+        here = self._start + self._pos
+        self._checkwindow(here, "write")
+        self._checkwindow(here + len(content), "write")
+        self._file_obj.seek(here, os.SEEK_SET)
+        self._file_obj.write(content)
+        self._pos += len(content)
+
+    def read(self, size=maxint):
+        assert size >= 0
+        here = self._start + self._pos
+        self._checkwindow(here, "read")
+        size = min(size, self._end - here)
+        self._file_obj.seek(here, os.SEEK_SET)
+        read_bytes = self._file_obj.read(size)
+        self._pos += len(read_bytes)
+        return read_bytes
+
+
+def read_data(file, endian, num=1):
+    """
+    Read a given number of 32-bits unsigned integers from the given file
+    with the given endianness.
+    """
+    res = struct.unpack(endian + "L" * num, file.read(num * 4))
+    if len(res) == 1:
+        return res[0]
+    return res
+
+
+def mach_o_change(at_path, what, value):
+    """
+    Replace a given name (what) in any LC_LOAD_DYLIB command found in
+    the given binary with a new name (value), provided it's shorter.
+    """
+
+    def do_macho(file, bits, endian):
+        # Read Mach-O header (the magic number is assumed read by the caller)
+        cpu_type, cpu_sub_type, file_type, n_commands, size_of_commands, flags = read_data(file, endian, 6)
+        # 64-bits header has one more field.
+        if bits == 64:
+            read_data(file, endian)
+        # The header is followed by n commands
+        for _ in range(n_commands):
+            where = file.tell()
+            # Read command header
+            cmd, cmd_size = read_data(file, endian, 2)
+            if cmd == LC_LOAD_DYLIB:
+                # The first data field in LC_LOAD_DYLIB commands is the
+                # offset of the name, starting from the beginning of the
+                # command.
+                name_offset = read_data(file, endian)
+                file.seek(where + name_offset, os.SEEK_SET)
+                # Read the NUL terminated string
+                load = file.read(cmd_size - name_offset).decode()
+                load = load[: load.index("\0")]
+                # If the string is what is being replaced, overwrite it.
+                if load == what:
+                    file.seek(where + name_offset, os.SEEK_SET)
+                    file.write(value.encode() + "\0".encode())
+            # Seek to the next command
+            file.seek(where + cmd_size, os.SEEK_SET)
+
+    def do_file(file, offset=0, size=maxint):
+        file = FileView(file, offset, size)
+        # Read magic number
+        magic = read_data(file, BIG_ENDIAN)
+        if magic == FAT_MAGIC:
+            # Fat binaries contain nfat_arch Mach-O binaries
+            n_fat_arch = read_data(file, BIG_ENDIAN)
+            for _ in range(n_fat_arch):
+                # Read arch header
+                cpu_type, cpu_sub_type, offset, size, align = read_data(file, BIG_ENDIAN, 5)
+                do_file(file, offset, size)
+        elif magic == MH_MAGIC:
+            do_macho(file, 32, BIG_ENDIAN)
+        elif magic == MH_CIGAM:
+            do_macho(file, 32, LITTLE_ENDIAN)
+        elif magic == MH_MAGIC_64:
+            do_macho(file, 64, BIG_ENDIAN)
+        elif magic == MH_CIGAM_64:
+            do_macho(file, 64, LITTLE_ENDIAN)
+
+    assert len(what) >= len(value)
+
+    with open(at_path, "r+b") as f:
+        do_file(f)
+
+
+if __name__ == "__main__":
+    main()
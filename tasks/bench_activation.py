@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+"""
+Measure how long sourcing (and deactivating) each generated activation script
+takes in every shell available on this machine, and how many processes it spawns
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from bench_common import create_env, median_ms, which
+
+# name -> (executable, arguments skipping the user's startup files, activation script, how to source it)
+SHELLS = [
+    ("bash", "bash", ["--noprofile", "--norc"], "activate", '. "{}"'),
+    ("zsh", "zsh", ["-f"], "activate", '. "{}"'),
+    ("fish", "fish", ["--no-config"], "activate.fish", 'source "{}"'),
+    ("csh", "csh", ["-f"], "activate.csh", 'source "{}"'),
+    ("tcsh", "tcsh", ["-f"], "activate.csh", 'source "{}"'),
+    ("xonsh", "xonsh", ["--no-rc"], "activate.xsh", 'source "{}"'),
+]
+EXECVE_RE = re.compile(r"\bexecve\(.*\)\s*=\s*0\b")
+
+
+def scenarios(bin_dir, work_dir):
+    """Yield (name, command running the empty script, command activating, command activating and deactivating)"""
+    for name, executable, args, activate_script, source in SHELLS:
+        shell = which(executable)
+        if shell is None:
+            continue
+        activate = os.path.join(bin_dir, activate_script)
+        commands = []
+        for at, lines in enumerate(([], [source.format(activate)], [source.format(activate), "deactivate"])):
+            path = os.path.join(work_dir, "{}-{}".format(name, at))
+            with open(path, "w") as file_handler:
+                file_handler.write("\n".join(lines) + "\n")
+            commands.append([shell] + args + [path])
+        yield [name] + commands
+    python_exe = os.path.join(bin_dir, "python")
+    activate_this = os.path.join(bin_dir, "activate_this.py")
+    exec_line = "exec(open({0!r}).read(), {{'__file__': {0!r}}})".format(activate_this)
+    # activate_this.py has no deactivate, the interpreter exiting is the end of the activation
+    yield ["activate_this.py", [python_exe, "-S", "-c", "pass"], [python_exe, "-S", "-c", exec_line], None]
+
+
+def count_processes(cmd, strace, work_dir):
+    """Number of programs executed by the command beyond its own, None when strace is not available"""
+    if strace is None:
+        return None
+    trace = os.path.join(work_dir, "trace")
+    subprocess.check_call([strace, "-f", "-qq", "-e", "trace=execve", "-o", trace] + cmd)
+    with open(trace) as file_handler:
+        executed = sum(1 for line in file_handler if EXECVE_RE.search(line))
+    return executed - 1
+
+
+def run(bin_dir, work_dir, repeat, strace):
+    results = {}
+    for name, empty, activate, deactivate in scenarios(bin_dir, work_dir):
+        startup = median_ms(empty, repeat)
+        result = {
+            "activate_ms": median_ms(activate, repeat) - startup,
+            "activate_processes": count_processes(activate, strace, work_dir),
+            "deactivate_ms": None,
+            "deactivate_processes": None,
+        }
+        if deactivate is not None:
+            result["deactivate_ms"] = median_ms(deactivate, repeat) - startup - result["activate_ms"]
+            both = count_processes(deactivate, strace, work_dir)
+            if both is not None:
+                result["deactivate_processes"] = both - result["activate_processes"]
+        results[name] = result
+    return results
+
+
+def fmt(value, spec):
+    return "n/a" if value is None else format(value, spec)
+
+
+def report(results):
+    header = "{:>16} {:>14} {:>10} {:>16} {:>10}"
+    print(header.format("script", "activate (ms)", "processes", "deactivate (ms)", "processes"))
+    for name, result in sorted(results.items()):
+        print(
+            header.format(
+                name,
+                fmt(result["activate_ms"], ".2f"),
+                fmt(result["activate_processes"], "d"),
+                fmt(result["deactivate_ms"], ".2f"),
+                fmt(result["deactivate_processes"], "d"),
+            )
+        )
+
+
+def compare(results, baseline, tolerance):
+    """Return the list of regressions against the baseline: slower than the tolerance allows or more processes"""
+    regressions = []
+    for name, result in sorted(results.items()):
+        if name not in baseline:
+            continue
+        for phase in ("activate", "deactivate"):
+            now, then = result["{}_ms".format(phase)], baseline[name]["{}_ms".format(phase)]
+            # sub-millisecond baselines are noise, compare those against a one millisecond floor
+            if now is not None and then is not None and now > max(then, 1.0) * (1 + tolerance / 100.0):
+                regressions.append("{} {}: {:.2f}ms, baseline {:.2f}ms".format(name, phase, now, then))
+            now, then = result["{}_processes".format(phase)], baseline[name]["{}_processes".format(phase)]
+            if now is not None and then is not None and now > then:
+                regressions.append("{} {}: {} processes, baseline {}".format(name, phase, now, then))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--python", default=sys.executable, help="interpreter to create the environment with")
+    parser.add_argument("--repeat", type=int, default=20, help="shell starts per measurement")
+    parser.add_argument("--save", help="record the results as a baseline into this JSON file")
+    parser.add_argument("--compare", help="compare the results against the baseline in this JSON file")
+    parser.add_argument("--tolerance", type=float, default=25, help="allowed slowdown against the baseline in %%")
+    args = parser.parse_args()
+
+    strace = which("strace")
+    if strace is None:
+        print("strace not found, spawned processes are not counted")
+    dest = tempfile.mkdtemp()
+    try:
+        bin_dir = create_env(args.python, os.path.join(dest, "env"))
+        results = run(bin_dir, dest, args.repeat, strace)
+    finally:
+        shutil.rmtree(dest)
+    report(results)
+
+    if args.save:
+        with open(args.save, "w") as file_handler:
+            json.dump(results, file_handler, indent=2, sort_keys=True)
+        print("baseline written to {}".format(args.save))
+    if args.compare:
+        with open(args.compare) as file_handler:
+            baseline = json.load(file_handler)
+        regressions = compare(results, baseline, args.tolerance)
+        for regression in regressions:
+            print("regression: {}".format(regression))
+        if regressions:
+            raise SystemExit(1)
+        print("no regressions against {}".format(args.compare))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""
+Helpers shared by the benchmark scripts: creating the environment to measure and timing commands
+"""
+from __future__ import print_function, unicode_literals
+
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+here = os.path.realpath(os.path.dirname(__file__))
+script = os.path.realpath(os.path.join(here, "..", "virtualenv.py"))
+
+
+def create_env(python, dest):
+    """Create a bare environment (no seed packages) with the given interpreter, return its scripts folder"""
+    cmd = [python, script, "--quiet", "--no-setuptools", "--no-pip", "--no-wheel", dest]
+    subprocess.check_call(cmd)
+    return os.path.join(dest, "Scripts" if sys.platform == "win32" else "bin")
+
+
+def which(name):
+    for folder in os.environ.get("PATH", "").split(os.pathsep):
+        candidate = os.path.join(folder, name)
+        if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+            return candidate
+    return None
+
+
+def median_ms(cmd, repeat):
+    """Median wall clock time (in milliseconds) of running the command to completion"""
+    subprocess.check_call(cmd)  # warm up the OS caches
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.check_call(cmd)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Measure how the startup time of an environment interpreter scales with the
+number of distributions, .pth files and .pth lines in its site-packages
+"""
+from __future__ import print_function, unicode_literals
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from bench_common import create_env, median_ms
+
+PREFIX = "vbench_"
+# the line setuptools writes into *-nspkg.pth files for namespace packages (one per namespace)
+NSPKG_LINE = (
+    "import sys, types, os;has_mfs = sys.version_info > (3, 5);"
+    "p = os.path.join(sys._getframe(1).f_locals['sitedir'], *('{name}',));"
+    "importlib = has_mfs and __import__('importlib.util');has_mfs and __import__('importlib.machinery');"
+    "m = has_mfs and sys.modules.setdefault('{name}', "
+    "importlib.util.module_from_spec(importlib.machinery.PathFinder.find_spec('{name}', [os.path.dirname(p)])));"
+    "m = m or sys.modules.setdefault('{name}', types.ModuleType('{name}'));"
+    "mp = (m or []) and m.__dict__.setdefault('__path__',[]);(p not in mp) and mp.append(p)"
+)
+
+
+def clean(site_packages):
+    for name in os.listdir(site_packages):
+        if name.startswith(PREFIX):
+            path = os.path.join(site_packages, name)
+            if os.path.isdir(path):
+                shutil.rmtree(path)
+            else:
+                os.remove(path)
+
+
+def populate(site_packages, dists, pth_files, pth_lines, nspkg):
+    """Fill site-packages with a synthetic set of distributions and path configuration files"""
+    clean(site_packages)
+    for at in range(dists):
+        package = os.path.join(site_packages, "{}pkg{}".format(PREFIX, at))
+        os.mkdir(package)
+        with open(os.path.join(package, "__init__.py"), "w"):
+            pass
+        dist_info = os.path.join(site_packages, "{}pkg{}-1.0.dist-info".format(PREFIX, at))
+        os.mkdir(dist_info)
+        with open(os.path.join(dist_info, "METADATA"), "w") as file_handler:
+            file_handler.write("Metadata-Version: 2.1\nName: {}pkg{}\nVersion: 1.0\n".format(PREFIX, at))
+    for at in range(pth_files):
+        is_nspkg = at < nspkg
+        name = "{}{}{}.pth".format(PREFIX, at, "-nspkg" if is_nspkg else "")
+        lines = []
+        for line_at in range(pth_lines):
+            if is_nspkg:
+                namespace = "{}ns{}_{}".format(PREFIX, at, line_at)
+                os.makedirs(os.path.join(site_packages, namespace))
+                lines.append(NSPKG_LINE.format(name=namespace))
+            else:
+                # every other entry points to a missing directory, like stale develop installs do
+                entry = "{}src{}_{}".format(PREFIX, at, line_at)
+                if line_at % 2 == 0:
+                    os.mkdir(os.path.join(site_packages, entry))
+                lines.append(entry)
+        with open(os.path.join(site_packages, name), "w") as file_handler:
+            file_handler.write("\n".join(lines) + "\n")
+
+
+def parse_counts(value):
+    return [int(i) for i in value.split(",")]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip())
+    parser.add_argument("--python", default=sys.executable, help="interpreter to create the environment with")
+    parser.add_argument("--dists", type=parse_counts, default=[0, 100, 200, 400, 800])
+    parser.add_argument("--pth-files", type=parse_counts, default=[0, 10, 25, 50, 100])
+    parser.add_argument("--pth-lines", type=parse_counts, default=[1, 5, 20, 50])
+    parser.add_argument("--nspkg", type=int, default=5, help="how many of the .pth files are -nspkg.pth files")
+    parser.add_argument("--repeat", type=int, default=20, help="interpreter starts per data point")
+    parser.add_argument("--csv", help="also write the results to this file")
+    args = parser.parse_args()
+
+    base_dists, base_pth_files, base_pth_lines = args.dists[0], args.pth_files[0], args.pth_lines[0]
+    points = [("dists", count, base_pth_files, base_pth_lines) for count in args.dists]
+    points += [("pth-files", base_dists, count, base_pth_lines) for count in args.pth_files]
+    points += [("pth-lines", base_dists, max(base_pth_files, 1), count) for count in args.pth_lines]
+
+    dest = tempfile.mkdtemp()
+    results = []
+    try:
+        python_exe = os.path.join(create_env(args.python, os.path.join(dest, "env")), "python")
+        site_packages = subprocess.check_output(
+            [python_exe, "-c", "from distutils.sysconfig import get_python_lib; print(get_python_lib())"],
+            universal_newlines=True,
+        ).strip()
+        print("{:>10} {:>6} {:>9} {:>9} {:>12}".format("varying", "dists", "pth-files", "pth-lines", "median (ms)"))
+        for varying, dists, pth_files, pth_lines in points:
+            populate(site_packages, dists, pth_files, pth_lines, min(args.nspkg, pth_files))
+            median = median_ms([python_exe, "-c", "pass"], args.repeat)
+            results.append((varying, dists, pth_files, pth_lines, median))
+            print("{:>10} {:>6} {:>9} {:>9} {:>12.2f}".format(varying, dists, pth_files, pth_lines, median))
+    finally:
+        shutil.rmtree(dest)
+
+    if args.csv:
+        with open(args.csv, "w") as file_handler:
+            file_handler.write("varying,dists,pth_files,pth_lines,median_ms\n")
+            for row in results:
+                file_handler.write("{},{},{},{},{:.3f}\n".format(*row))
+        print("results written to {}".format(args.csv))
+
+
+if __name__ == "__main__":
+    main()
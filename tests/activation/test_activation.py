@@ -1,5 +1,6 @@
 from __future__ import absolute_import, unicode_literals
 
+import distutils.spawn
 import os
 import pipes
 import re
@@ -163,6 +164,34 @@ def test_bash(clean_python, monkeypatch, tmp_path):
     BashActivation(clean_python, tmp_path)(monkeypatch)
 
 
+def check_fork_free(activation, tmp_path, shell_args=()):
+    """Sourcing the activation script (and deactivating) must use shell builtins only, verified by running it with
+    an empty PATH: any external command would fail as not found"""
+    shell = distutils.spawn.find_executable(activation.cmd)
+    script = tmp_path / "fork-free.{}".format(activation.extension)
+    activate_script = join(activation.bin_dir, activation.activate_script)
+    script.write_text(six.text_type("\n".join([activation.activate_call(activate_script), "deactivate", ""])))
+    empty = tmp_path / "empty"
+    empty.mkdir()
+    env = {str("PATH"): str(empty), str("HOME"): str(tmp_path)}
+    process = subprocess.Popen(
+        [shell] + list(shell_args) + [str(script)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        universal_newlines=True,
+        env=env,
+    )
+    out, _ = process.communicate()
+    assert not process.returncode, out
+    assert not out, out
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="no sane way to provision bash on Windows yet")
+@requires(BashActivation)
+def test_bash_fork_free(clean_python, tmp_path):
+    check_fork_free(BashActivation(clean_python, tmp_path), tmp_path)
+
+
 class CshActivation(Activation):
     cmd = "csh.exe" if virtualenv.IS_WIN else "csh"
     invoke_script = [cmd]
@@ -177,6 +206,12 @@ def test_csh(clean_python, monkeypatch, tmp_path):
     CshActivation(clean_python, tmp_path)(monkeypatch)
 
 
+@pytest.mark.skipif(sys.platform == "win32", reason="no sane way to provision csh on Windows yet")
+@requires(CshActivation)
+def test_csh_fork_free(clean_python, tmp_path):
+    check_fork_free(CshActivation(clean_python, tmp_path), tmp_path, ["-f"])
+
+
 class FishActivation(Activation):
     cmd = "fish.exe" if virtualenv.IS_WIN else "fish"
     invoke_script = [cmd]
@@ -191,6 +226,12 @@ def test_fish(clean_python, monkeypatch, tmp_path):
     FishActivation(clean_python, tmp_path)(monkeypatch)
 
 
+@pytest.mark.skipif(sys.platform == "win32", reason="no sane way to provision fish on Windows yet")
+@requires(FishActivation)
+def test_fish_fork_free(clean_python, tmp_path):
+    check_fork_free(FishActivation(clean_python, tmp_path), tmp_path, ["--no-config"])
+
+
 class PowershellActivation(Activation):
     cmd = "powershell.exe" if virtualenv.IS_WIN else "pwsh"
     extension = "ps1"
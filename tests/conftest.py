@@ -16,6 +16,21 @@ except ImportError:
 ROOT_DIR = Path(__file__).parents[1]
 
 
+@pytest.fixture(scope="session", autouse=True)
+def plan_cache(tmp_path_factory):
+    """keep the recorded installations of the test runs (in process and in virtualenv subprocesses) out of the
+    user's storage directory"""
+    previous, previous_env = virtualenv.PLAN_CACHE_DIR, os.environ.get(str("VIRTUALENV_PLAN_CACHE_DIR"))
+    virtualenv.PLAN_CACHE_DIR = str(tmp_path_factory.mktemp("plans"))
+    os.environ[str("VIRTUALENV_PLAN_CACHE_DIR")] = virtualenv.PLAN_CACHE_DIR
+    yield virtualenv.PLAN_CACHE_DIR
+    virtualenv.PLAN_CACHE_DIR = previous
+    if previous_env is None:
+        del os.environ[str("VIRTUALENV_PLAN_CACHE_DIR")]
+    else:
+        os.environ[str("VIRTUALENV_PLAN_CACHE_DIR")] = previous_env
+
+
 @pytest.fixture(scope="session")
 def clean_python(tmp_path_factory):
     path = tmp_path_factory.mktemp("activation-test-env")
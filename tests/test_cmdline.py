@@ -1,5 +1,6 @@
 from __future__ import absolute_import, unicode_literals
 
+import distutils.spawn
 import os
 import subprocess
 import sys
@@ -61,3 +62,98 @@ def test_commandline_abbrev_interp(tmpdir):
     """Specifying abbreviated forms of the Python interpreter should work"""
     abbrev = "{}{}.{}".format("" if sys.platform == "win32" else "python", *sys.version_info[0:2])
     subprocess.check_call([sys.executable, VIRTUALENV_SCRIPT, "-p", abbrev, str(tmpdir.join("venv"))])
+
+
+def test_commandline_several_interps(tmpdir):
+    """Several interpreters create an environment each, at the DEST_DIR of their version"""
+    current = "{}.{}".format(*sys.version_info)
+    other = None
+    for version in ("2.7", "3.5", "3.6", "3.7", "3.8", "3.9"):
+        if version != current and distutils.spawn.find_executable("python{}".format(version)):
+            other = version
+            break
+    if other is None:
+        pytest.skip("needs an interpreter of another version")
+    dest_dir = str(tmpdir.join("venv-{version}"))
+    pythons = "{},python{}".format(sys.executable, other)
+    out = subprocess.check_output(
+        [sys.executable, VIRTUALENV_SCRIPT, "-p", pythons, "--prompt=({version}) ", "--no-setuptools", "--no-pip"]
+        + ["--no-wheel", dest_dir],
+        universal_newlines=True,
+    )
+    assert "2 of 2 environments created" in out
+    for version in (current, other):
+        bin_dir = virtualenv.path_locations(dest_dir.replace("{version}", version))[3]
+        assert os.path.exists(os.path.join(bin_dir, "activate_this.py"))
+        with open(os.path.join(bin_dir, "activate")) as file_handler:
+            assert "({}) ".format(version) in file_handler.read()
+
+    with pytest.raises(subprocess.CalledProcessError):
+        subprocess.check_call([sys.executable, VIRTUALENV_SCRIPT, "-p", pythons, str(tmpdir.join("venv"))])
+    assert not tmpdir.join("venv").check()
+
+
+@pytest.mark.skipif("sys.platform == 'win32'", reason="the broken interpreter is a /bin/sh script")
+def test_commandline_several_interps_broken(tmpdir):
+    """An interpreter that does not run is reported as failed, the environments of the others are still created"""
+    broken = tmpdir.join("broken")
+    broken.write("#!/bin/sh\necho 'pyenv: python3.99: command not found' >&2\nexit 127\n")
+    broken.chmod(0o755)
+    dest_dir = str(tmpdir.join("venv-{version}"))
+    cmd = [sys.executable, VIRTUALENV_SCRIPT, "-p", "{},{}".format(sys.executable, broken), "--no-setuptools"]
+    process = subprocess.Popen(
+        cmd + ["--no-pip", "--no-wheel", dest_dir], stdout=subprocess.PIPE, universal_newlines=True
+    )
+    out = process.communicate()[0]
+    assert process.returncode == 3
+    assert "FAILED  {} does not run".format(broken) in out
+    assert "command not found" in out
+    assert "1 of 2 environments created" in out
+    bin_dir = virtualenv.path_locations(dest_dir.replace("{version}", "{}.{}".format(*sys.version_info)))[3]
+    assert os.path.exists(os.path.join(bin_dir, "activate_this.py"))
+
+
+@pytest.mark.parametrize("python", [sys.executable, "python2.7"], ids=["current", "python2.7"])
+def test_commandline_run_stdlib_module(tmpdir, python):
+    """Standard library modules found through the stdlib index run with python -m"""
+    if python != sys.executable and not distutils.spawn.find_executable(python):
+        pytest.skip("{} is not available".format(python))
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(str(tmpdir.join("venv")))
+    cmd = [sys.executable, VIRTUALENV_SCRIPT, "-p", python, "--no-setuptools", "--no-pip", "--no-wheel", home_dir]
+    subprocess.check_call(cmd)
+    exe = os.path.join(bin_dir, virtualenv.EXPECTED_EXE)
+    subprocess.check_call([exe, "-m", "timeit", "-n", "1", "pass"])
+    assert "json" in subprocess.check_output([exe, "-m", "pydoc", "json"], universal_newlines=True)
+    script = "import pkgutil; print(bool(pkgutil.get_data('json', '__init__.py')))"
+    assert subprocess.check_output([exe, "-c", script], universal_newlines=True).strip() == "True"
+
+
+@pytest.mark.skipif("sys.platform == 'win32'")
+def test_commandline_record_versioned_interp(tmpdir):
+    """An interpreter named pythonX.Y is recorded too, into the directory VIRTUALENV_PLAN_CACHE_DIR names"""
+    python = distutils.spawn.find_executable("python{}.{}".format(*sys.version_info))
+    if python is None:
+        pytest.skip("needs python{}.{} on the PATH".format(*sys.version_info))
+    env = os.environ.copy()
+    env[str("VIRTUALENV_PLAN_CACHE_DIR")] = str(tmpdir.join("plans"))
+    for name in ("recorded", "replayed"):
+        cmd = [python, VIRTUALENV_SCRIPT, "--no-setuptools", "--no-pip", "--no-wheel", str(tmpdir.join(name))]
+        out = subprocess.check_output(cmd, universal_newlines=True, env=env)
+    assert "Replaying the recorded installation" in out
+    assert len(tmpdir.join("plans").listdir()) == 1
+    bin_dir = virtualenv.path_locations(str(tmpdir.join("replayed")))[3]
+    for exe in ("python", "python{}".format(sys.version_info[0]), "python{}.{}".format(*sys.version_info)):
+        subprocess.check_call([os.path.join(bin_dir, exe), "-c", "import os"])
+
+
+def test_commandline_run(clean_python):
+    """The run subcommand executes the command with the environment activated"""
+    home_dir, bin_dir, _ = clean_python
+    script = "import os, sys; print(sys.prefix); print(os.environ['VIRTUAL_ENV'])"
+    out = subprocess.check_output(
+        [sys.executable, VIRTUALENV_SCRIPT, "run", home_dir, "--", virtualenv.EXPECTED_EXE, "-c", script],
+        universal_newlines=True,
+    )
+    prefix, virtual_env = out.splitlines()
+    assert os.path.realpath(prefix) == os.path.realpath(home_dir)
+    assert virtual_env == home_dir
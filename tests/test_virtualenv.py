@@ -1,13 +1,19 @@
 from __future__ import absolute_import, unicode_literals
 
+import contextlib
 import inspect
+import json
+import marshal
 import optparse
 import os
 import shutil
+import stat
 import subprocess
 import sys
 import tempfile
 import textwrap
+import threading
+import time
 import zipfile
 
 import pypiserver
@@ -19,9 +25,9 @@ import virtualenv
 
 try:
     from pathlib import Path
-    from unittest.mock import NonCallableMock, call, patch
+    from unittest.mock import ANY, NonCallableMock, call, patch
 except ImportError:
-    from mock import NonCallableMock, call, patch
+    from mock import ANY, NonCallableMock, call, patch
     from pathlib2 import Path
 
 
@@ -302,6 +308,105 @@ def test_activate_after_future_statements():
     ], out
 
 
+def test_launcher_script():
+    """The /bin/sh launcher goes after an encoding declaration, scripts with future statements keep activate_this"""
+    script = ["# -*- coding: utf-8 -*-", "import sys", "sys.exit(0)"]
+    out = virtualenv.launcher_script(script)
+    assert out == [out[0], script[0]] + virtualenv.SH_LAUNCHER[1:] + script[1:]
+    assert out[0] == "#!/bin/sh"
+    assert virtualenv.launcher_script(script[1:]) == virtualenv.SH_LAUNCHER + script[1:]
+    assert virtualenv.launcher_script(["from __future__ import print_function", "print(1)"]) is None
+
+
+@pytest.mark.skipif("sys.platform == 'win32'", reason="the launcher is a /bin/sh script")
+def test_sh_launcher(tmp_path):
+    """A script behind the launcher runs with the python next to it, also when called through a symlink"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    python = bin_dir / "python"
+    python.symlink_to(sys.executable)
+    script = bin_dir / "script"
+    script.write_text(six.text_type("\n".join(["#!{}".format(python), "import sys", "print(sys.argv[1:])", ""])))
+    os.chmod(str(script), 0o755)
+    virtualenv.fixup_scripts(None, str(bin_dir), sh_launcher=True)
+    assert script.read_text().startswith("#!/bin/sh\n")
+    link = tmp_path / "link"
+    link.symlink_to(script)
+    (tmp_path / "other").mkdir()
+    chained = tmp_path / "other" / "chained"
+    chained.symlink_to(os.path.join("..", "link"))
+    for path in (script, link, chained):
+        assert subprocess.check_output([str(path), "a b", "c"], universal_newlines=True) == "['a b', 'c']\n"
+
+
+def test_fixup_scripts(tmp_path):
+    """Only scripts starting with the environment's interpreter are rewritten, keeping their mode"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    python = os.path.join(os.path.normcase(str(bin_dir)), "python.exe" if virtualenv.IS_WIN else "python")
+    names = ["script{}".format(i) for i in range(20)]
+    for name in names:
+        (bin_dir / name).write_text(six.text_type("#!{}\nimport sys\n".format(python)))
+        os.chmod(str(bin_dir / name), 0o750)
+    binary = b"\x7fELF\xff" + b"#!" * virtualenv.SCRIPT_HEAD_SIZE
+    (bin_dir / "binary").write_bytes(binary)
+    (bin_dir / "other").write_text(six.text_type("#!/bin/sh\necho other\n"))
+
+    virtualenv.fixup_scripts(None, str(bin_dir))
+
+    assert sorted(os.listdir(str(bin_dir))) == sorted(names + ["binary", "other"])
+    for name in names:
+        lines = (bin_dir / name).read_text().splitlines()
+        assert lines[0] != "#!{}".format(python)
+        assert lines[-1] == "import sys"
+        if not virtualenv.IS_WIN:
+            assert stat.S_IMODE(os.stat(str(bin_dir / name)).st_mode) == 0o750
+    assert (bin_dir / "binary").read_bytes() == binary
+    assert (bin_dir / "other").read_text() == "#!/bin/sh\necho other\n"
+
+
+def test_fixup_pth_and_egg_link(tmp_path):
+    """The .pth and .egg-link files of the environment are found through its site-packages, not sys.path"""
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(str(tmp_path / "venv"), dry_run=True)
+    site_packages = os.path.join(lib_dir, "site-packages")
+    project, outside = os.path.join(home_dir, "src", "project"), str(tmp_path / "outside")
+    # an environment of another Python version than the running one
+    other_version = "python{}".format("2.7" if sys.version_info[0] == 3 else "3.7")
+    other_site_packages = os.path.join(home_dir, "lib", other_version, "site-packages")
+    for folder in (site_packages, other_site_packages, project, outside):
+        os.makedirs(folder)
+    files = {
+        os.path.join(site_packages, "project.pth"): "import sys\n{}\n{}\n".format(project, outside),
+        os.path.join(other_site_packages, "other.pth"): "{}\n".format(project),
+        os.path.join(site_packages, "project.egg-link"): "{}\n.".format(project),
+        os.path.join(project, "nested.pth"): "{}\n".format(site_packages),
+        os.path.join(outside, "outside.pth"): "{}\n".format(project),
+    }
+    for filename, content in files.items():
+        with open(filename, "w") as file_handler:
+            file_handler.write(content)
+
+    virtualenv.fixup_pth_and_egg_link(home_dir)
+
+    def read(filename):
+        with open(filename) as file_handler:
+            return file_handler.read()
+
+    relative_project = virtualenv.make_relative_path(os.path.join(site_packages, "project.pth"), project)
+    assert relative_project.startswith("..")
+    relative_outside = virtualenv.make_relative_path(os.path.join(site_packages, "project.pth"), outside)
+    assert read(os.path.join(site_packages, "project.pth")) == "import sys\n{}\n{}\n".format(
+        relative_project, relative_outside
+    )
+    assert read(os.path.join(site_packages, "project.egg-link")) == relative_project
+    assert read(os.path.join(project, "nested.pth")) == "{}\n".format(
+        virtualenv.make_relative_path(os.path.join(project, "nested.pth"), site_packages)
+    )
+    assert read(os.path.join(outside, "outside.pth")) == "{}\n".format(project)
+    other_pth = os.path.join(other_site_packages, "other.pth")
+    assert read(other_pth) == "{}\n".format(virtualenv.make_relative_path(other_pth, project))
+
+
 def test_cop_update_defaults_with_store_false():
     """store_false options need reverted logic"""
 
@@ -628,3 +733,684 @@ def test_license_builtin(clean_python):
     out = out_b.decode()
     assert not proc.returncode
     assert "Ian Bicking and Contributors" not in out
+
+
+@pytest.mark.skipif("sys.platform.startswith('java')")
+def test_site_cache(tmp_path):
+    """A warm start replays the cached sys.path computation, a changed site-packages invalidates it"""
+    ve_path = str(tmp_path / "venv")
+    virtualenv.create_environment(ve_path, no_pip=True, no_setuptools=True, no_wheel=True)
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(ve_path)
+    site_packages = os.path.join(lib_dir, "site-packages")
+    extra = tmp_path / "extra"
+    extra.mkdir()
+    with open(os.path.join(site_packages, "extra.pth"), "w") as file_handler:
+        file_handler.write("{}\nimport sys; sys.pth_import_ran = True\n".format(extra))
+
+    env = os.environ.copy()
+    env.pop(str("PYTHONDONTWRITEBYTECODE"), None)
+    cmd = [
+        os.path.join(bin_dir, virtualenv.EXPECTED_EXE),
+        "-c",
+        "import sys; print(sys.path); print(sys.pth_import_ran)",
+    ]
+    cold = subprocess.check_output(cmd, universal_newlines=True, env=env)
+    assert os.path.exists(os.path.join(lib_dir, "site.cache"))
+    warm = subprocess.check_output(cmd, universal_newlines=True, env=env)
+    assert warm == cold
+    assert str(extra) in warm
+
+    later = tmp_path / "later"
+    later.mkdir()
+    with open(os.path.join(site_packages, "later.pth"), "w") as file_handler:
+        file_handler.write("{}\n".format(later))
+    mtime = os.stat(site_packages).st_mtime + 2  # do not depend on the file system timestamp granularity
+    os.utime(site_packages, (mtime, mtime))
+    assert str(later) in subprocess.check_output(cmd, universal_newlines=True, env=env)
+
+    # the first search path entry (here from PYTHONPATH) is part of what the cache depends on
+    site_cache = os.path.join(lib_dir, "site.cache")
+    for name in ("one", "two"):
+        entry = tmp_path / name
+        entry.mkdir()
+        subprocess.check_output(cmd, universal_newlines=True, env=dict(env, PYTHONPATH=str(entry)))
+        with open(site_cache, "rb") as file_handler:
+            assert str(entry) in marshal.load(file_handler)[0]["key"][4]
+    # starts alternating between them use the computations kept for each
+    written = os.stat(site_cache)
+    for name in ("one", "two", "one"):
+        subprocess.check_output(cmd, universal_newlines=True, env=dict(env, PYTHONPATH=str(tmp_path / name)))
+    assert (os.stat(site_cache).st_ino, os.stat(site_cache).st_mtime) == (written.st_ino, written.st_mtime)
+
+
+@pytest.mark.skipif("sys.platform.startswith('java')")
+def test_site_cache_user_site(tmp_path):
+    """A changed .pth file of the user site directory invalidates the cached sys.path computation"""
+    ve_path = str(tmp_path / "venv")
+    virtualenv.create_environment(ve_path, site_packages=True, no_pip=True, no_setuptools=True, no_wheel=True)
+    bin_dir = virtualenv.path_locations(ve_path)[3]
+    env = os.environ.copy()
+    env.pop(str("PYTHONDONTWRITEBYTECODE"), None)
+    env.pop(str("PYTHONNOUSERSITE"), None)
+    env[str("PYTHONUSERBASE")] = str(tmp_path / "user")
+    python = os.path.join(bin_dir, virtualenv.EXPECTED_EXE)
+    user_site = subprocess.check_output([python, "-c", "import site; print(site.USER_SITE)"], env=env)
+    user_site = user_site.decode().strip()
+    os.makedirs(user_site)
+    first, second = str(tmp_path / "first"), str(tmp_path / "second")
+    for folder in (first, second):
+        os.mkdir(folder)
+    foo_pth = os.path.join(user_site, "foo.pth")
+    with open(foo_pth, "w") as file_handler:
+        file_handler.write("{}\n".format(first))
+    cmd = [python, "-c", "import sys; print(sys.path)"]
+    for _ in range(2):
+        out = subprocess.check_output(cmd, universal_newlines=True, env=env)
+        assert first in out and second not in out
+
+    with open(foo_pth, "a") as file_handler:
+        file_handler.write("{}\n".format(second))
+    mtime = os.stat(foo_pth).st_mtime + 2  # do not depend on the file system timestamp granularity
+    os.utime(foo_pth, (mtime, mtime))
+    assert second in subprocess.check_output(cmd, universal_newlines=True, env=env)
+
+
+@pytest.mark.skipif("sys.platform.startswith('java')")
+def test_pth_cache(tmp_path):
+    """The .pth files of the environment are compiled once, import lines still find sitedir in the calling frame"""
+    ve_path = str(tmp_path / "venv")
+    virtualenv.create_environment(ve_path, no_pip=True, no_setuptools=True, no_wheel=True)
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(ve_path)
+    site_packages = os.path.join(lib_dir, "site-packages")
+    missing = tmp_path / "missing"
+    with open(os.path.join(site_packages, "a.pth"), "w") as file_handler:
+        file_handler.write("import sys; sys.pth_sitedir = sys._getframe(1).f_locals['sitedir']\n{}\n".format(missing))
+
+    env = os.environ.copy()
+    env.pop(str("PYTHONDONTWRITEBYTECODE"), None)
+    env.pop(str("PYTHONPATH"), None)
+    cmd = [os.path.join(bin_dir, virtualenv.EXPECTED_EXE), "-c", "import sys; print(sys.pth_sitedir); print(sys.path)"]
+    for _ in range(2):
+        out = subprocess.check_output(cmd, universal_newlines=True, env=env)
+        assert out.splitlines()[0] == site_packages
+        assert str(missing) not in out
+        assert os.path.exists(os.path.join(site_packages, "pth-cache.pyc"))
+
+    missing.mkdir()  # entries are checked on every start, whether they existed at compile time or not
+    assert str(missing) in subprocess.check_output(cmd, universal_newlines=True, env=env)
+    missing.rmdir()
+    assert str(missing) not in subprocess.check_output(cmd, universal_newlines=True, env=env)
+
+
+@pytest.mark.skipif("sys.platform.startswith('java')")
+def test_stdlib_finder(tmp_path):
+    """Standard library modules resolve through the creation time index, without breaking shadowing"""
+    ve_path = str(tmp_path / "venv")
+    virtualenv.create_environment(ve_path, no_pip=True, no_setuptools=True, no_wheel=True)
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(ve_path)
+    python = os.path.join(bin_dir, virtualenv.EXPECTED_EXE)
+    assert os.path.exists(os.path.join(lib_dir, "stdlib.index"))
+
+    script = "import sys, json; print(type(sys.meta_path[0]).__name__); print(json.__file__)"
+    finder, json_file = subprocess.check_output([python, "-c", script], universal_newlines=True).splitlines()
+    assert finder == "StdlibFinder"
+    assert not os.path.realpath(json_file).startswith(os.path.realpath(home_dir))
+
+    shadow = tmp_path / "shadow"
+    shadow.mkdir()
+    (shadow / "json.py").write_text(six.text_type(""))
+    env = os.environ.copy()
+    env[str("PYTHONPATH")] = str(shadow)
+    out = subprocess.check_output([python, "-c", "import json; print(json.__file__)"], universal_newlines=True, env=env)
+    assert os.path.dirname(out.strip()) == str(shadow)
+
+
+def test_site_constants(tmp_path):
+    """The constants baked into site.py at creation time reproduce what the generic code computes"""
+    ve_path = str(tmp_path / "venv")
+    virtualenv.create_environment(ve_path, no_pip=True, no_setuptools=True, no_wheel=True)
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(ve_path)
+    cmd = [
+        os.path.join(bin_dir, virtualenv.EXPECTED_EXE),
+        "-c",
+        "import site, sys; print(site.SITE_CONSTANTS); print(sys.path)",
+    ]
+    constants, baked_path = subprocess.check_output(cmd, universal_newlines=True).splitlines()
+    assert constants != "None"
+    if not virtualenv.IS_WIN:
+        # a site directory made after the creation is still found
+        site_python = os.path.join(home_dir, "lib", "site-python")
+        assert site_python not in baked_path
+        os.mkdir(site_python)
+        constants, baked_path = subprocess.check_output(cmd, universal_newlines=True).splitlines()
+        assert site_python in baked_path
+
+    site_py = os.path.join(lib_dir, "site.py")
+    with open(site_py) as file_handler:
+        content = file_handler.read()
+    with open(site_py, "w") as file_handler:
+        file_handler.write(virtualenv.SITE_CONSTANTS_RE.sub("SITE_CONSTANTS = None", content))
+    for compiled in (site_py + "c", site_py + "o"):
+        if os.path.exists(compiled):
+            os.remove(compiled)
+    assert subprocess.check_output(cmd, universal_newlines=True).splitlines() == ["None", baked_path]
+
+
+@pytest.mark.skipif("sys.platform == 'win32'", reason="python-config is not installed on Windows")
+def test_static_python_config(tmp_path):
+    """The shell python-config written at creation time answers like the generic Python script"""
+    ve_path = str(tmp_path / "venv")
+    virtualenv.create_environment(ve_path, no_pip=True, no_setuptools=True, no_wheel=True)
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(ve_path)
+    python_config = os.path.join(bin_dir, "python-config")
+    with open(python_config) as file_handler:
+        assert file_handler.readline() == "#!/bin/sh\n"
+
+    generic = str(tmp_path / "python-config")
+    virtualenv.install_files(home_dir, str(tmp_path), None, {"python-config": virtualenv.PYTHON_CONFIG})
+    python = os.path.join(bin_dir, virtualenv.EXPECTED_EXE)
+    for options in (
+        ["--prefix"],
+        ["--includes", "--ldflags"],
+        ["--cflags", "--exec-prefix", "--libs"],
+        ["--pref", "--exe", "--inc"],
+    ):
+        expected = subprocess.check_output([python, generic] + options, universal_newlines=True)
+        assert subprocess.check_output([python_config] + options, universal_newlines=True) == expected
+    for options in ([], ["--bogus"], ["--prefix", "--bogus"], ["--ex"]):
+        process = subprocess.Popen([python_config] + options, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        out, err = process.communicate()
+        assert process.returncode == 1
+        assert not out
+        assert err.startswith(b"Usage: ")
+
+
+@pytest.mark.skipif(
+    "sys.version_info < (3, 3) or platform.python_implementation() != 'CPython'", reason="requires CPython 3.3+"
+)
+def test_venv_style(tmp_path):
+    ve_path = str(tmp_path / "venv")
+    virtualenv.create_environment(ve_path, no_pip=True, no_setuptools=True, no_wheel=True, venv_style=True)
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(ve_path)
+    assert os.path.exists(os.path.join(home_dir, "pyvenv.cfg"))
+    assert not os.path.exists(os.path.join(lib_dir, "site.py"))
+    assert not os.path.exists(os.path.join(lib_dir, "os.py"))
+
+    script = "import site, sys; print(sys.prefix); print(sys.base_prefix); print(site.__file__)"
+    cmd = [os.path.join(bin_dir, virtualenv.EXPECTED_EXE), "-c", script]
+    prefix, base_prefix, site_file = subprocess.check_output(cmd, universal_newlines=True).splitlines()
+    assert os.path.realpath(prefix) == os.path.realpath(home_dir)
+    assert base_prefix != prefix
+    assert not os.path.realpath(site_file).startswith(os.path.realpath(home_dir))
+
+
+@pytest.mark.skipif("sys.platform == 'win32'", reason="sources the bash activation script")
+def test_relocatable_environment(tmp_path):
+    """An environment created relocatable keeps working after a plain move"""
+    ve_path = str(tmp_path / "venv")
+    virtualenv.create_environment(ve_path, no_pip=True, no_setuptools=True, no_wheel=True, relocatable=True)
+    moved = str(tmp_path / "moved")
+    os.rename(ve_path, moved)
+    activate = os.path.join(virtualenv.path_locations(moved, dry_run=True)[3], "activate")
+    script = (
+        'PS1="$ " && source "$1" && echo "$VIRTUAL_ENV" && echo "$PS1" && '
+        'python -c "import sys; print(sys.prefix)" && python-config --prefix'
+    )
+    virtual_env, ps1, prefix, base_prefix = subprocess.check_output(
+        ["bash", "-c", script, "bash", activate], universal_newlines=True
+    ).splitlines()
+    assert virtual_env == moved
+    assert ps1 == "(moved) $ "
+    assert os.path.realpath(prefix) == os.path.realpath(moved)
+    assert base_prefix != prefix
+
+
+def test_move_environment(tmp_path):
+    """After a move no script, path configuration file or activation script points to the old location"""
+    old_path, new_path = str(tmp_path / "venv"), str(tmp_path / "moved")
+    virtualenv.create_environment(old_path, no_pip=True, no_setuptools=True, no_wheel=True)
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(old_path)
+    source = os.path.join(old_path, "src")
+    os.mkdir(source)
+    site_packages = os.path.join(lib_dir, "site-packages")
+    with open(os.path.join(site_packages, "project.pth"), "w") as file_handler:
+        file_handler.write("{}\n{}2\n".format(source, old_path))
+
+    virtualenv.move_environment(old_path, new_path)
+
+    assert not os.path.exists(old_path)
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(new_path)
+    site_packages = os.path.join(lib_dir, "site-packages")
+    with open(os.path.join(site_packages, "project.pth")) as file_handler:
+        assert file_handler.read() == "{}\n{}2\n".format(os.path.join(new_path, "src"), old_path)
+    for name in os.listdir(bin_dir):
+        if name.startswith("activate") or name == "python-config":
+            with open(os.path.join(bin_dir, name), "rb") as file_handler:
+                assert old_path.encode() not in file_handler.read(), name
+    if not virtualenv.IS_WIN:
+        with open(os.path.join(bin_dir, "activate")) as file_handler:
+            assert "(moved) " in file_handler.read()
+    script = "import sys; print(sys.prefix); print({!r} in sys.path)".format(os.path.join(new_path, "src"))
+    out = subprocess.check_output([os.path.join(bin_dir, virtualenv.EXPECTED_EXE), "-c", script])
+    prefix, found = out.decode().splitlines()
+    assert os.path.realpath(prefix) == os.path.realpath(new_path)
+    assert found == "True"
+
+
+def test_move_environment_bytecode(tmp_path):
+    """The bytecode of a moved environment refers to the new location and is used as is"""
+    old_path, new_path = str(tmp_path / "venv"), str(tmp_path / "moved")
+    virtualenv.create_environment(old_path, no_pip=True, no_setuptools=True, no_wheel=True)
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(old_path)
+    with open(os.path.join(lib_dir, "site-packages", "module.py"), "w") as file_handler:
+        file_handler.write("def outer():\n    def inner():\n        pass\n    return inner\n")
+    env = os.environ.copy()
+    env.pop(str("PYTHONDONTWRITEBYTECODE"), None)
+    python = os.path.join(bin_dir, virtualenv.EXPECTED_EXE)
+    subprocess.check_call([python, "-c", "import module"], env=env)
+
+    virtualenv.move_environment(old_path, new_path)
+
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(new_path)
+    source = os.path.join(lib_dir, "site-packages", "module.py")
+    if six.PY3:
+        import importlib.util
+
+        compiled = importlib.util.cache_from_source(source)
+    else:
+        compiled = source + "c"
+    with open(compiled, "rb") as file_handler:
+        content = file_handler.read()
+    code = marshal.loads(content[16 if sys.version_info >= (3, 7) else 12 if six.PY3 else 8 :])
+    outer = next(const for const in code.co_consts if hasattr(const, "co_filename"))
+    inner = next(const for const in outer.co_consts if hasattr(const, "co_filename"))
+    assert {code.co_filename, outer.co_filename, inner.co_filename} == {source}
+    python = os.path.join(bin_dir, virtualenv.EXPECTED_EXE)
+    subprocess.check_call([python, "-c", "import module"], env=env)
+    with open(compiled, "rb") as file_handler:
+        assert file_handler.read() == content
+
+
+def test_rm_tree_background(tmp_path):
+    """The tree is gone right away and its trash, like the one left by an interrupted run, is deleted later"""
+    folder = tmp_path / "lib"
+    (folder / "package").mkdir(parents=True)
+    (folder / "package" / "module.py").write_text(six.text_type(""))
+    leftover = tmp_path / ".lib{}interrupted".format(virtualenv.TRASH_MARKER)
+    (leftover / "lib").mkdir(parents=True)
+    unrelated = tmp_path / "other"
+    unrelated.mkdir()
+
+    virtualenv.rm_tree(str(folder), background=True)
+
+    assert not folder.exists()
+    for _ in range(100):
+        if not virtualenv.find_trash(str(folder)):
+            break
+        time.sleep(0.1)
+    assert os.listdir(str(tmp_path)) == ["other"]
+
+
+def test_create_environment_lock(tmp_path, monkeypatch):
+    """A creation that waited for another one uses its environment, unless it was created with other options"""
+    path = str(tmp_path / "venv")
+    with virtualenv.environment_lock(path) as waited:
+        assert waited is False
+    assert os.listdir(str(tmp_path)) == []  # the lock file is removed on release
+
+    virtualenv.create_environment(path, no_pip=True, no_setuptools=True, no_wheel=True, prompt="(first) ")
+    assert os.listdir(str(tmp_path)) == ["venv"]
+
+    @contextlib.contextmanager
+    def waited_lock(home_dir):
+        yield True
+
+    builds = []
+    build_environment = virtualenv._build_environment
+
+    def build(home_dir, digest, **options):
+        builds.append(home_dir)
+        return build_environment(home_dir, digest, **options)
+
+    monkeypatch.setattr(virtualenv, "environment_lock", waited_lock)
+    monkeypatch.setattr(virtualenv, "_build_environment", build)
+    virtualenv.create_environment(path, no_pip=True, no_setuptools=True, no_wheel=True, prompt="(first) ")
+    assert builds == []
+    virtualenv.create_environment(path, no_pip=True, no_setuptools=True, no_wheel=True, prompt="(second) ")
+    assert len(builds) == 1
+    with open(os.path.join(virtualenv.path_locations(path)[3], "activate")) as file_handler:
+        assert "(second) " in file_handler.read()
+
+
+def test_create_environment_lock_inside(tmp_path, monkeypatch):
+    """The lock is taken within the environment when the directory containing it is not writable"""
+    path = str(tmp_path / "venv")
+    os.mkdir(path)
+
+    def denied(filename, *args):
+        if os.path.dirname(filename) == str(tmp_path):
+            raise IOError(13, "Permission denied", filename)
+        return open(filename, *args)
+
+    monkeypatch.setattr(virtualenv, "open", denied, raising=False)
+    with virtualenv.environment_lock(path) as waited:
+        assert waited is False
+        assert os.listdir(path) == [virtualenv.LOCK_NAME]
+    assert os.listdir(path) == []
+    with pytest.raises(SystemExit):
+        with virtualenv.environment_lock(str(tmp_path / "missing")):
+            pass
+
+
+def test_create_environment_partial_copy(tmp_path):
+    """A copy an unfinished creation left half written is made again"""
+    path = str(tmp_path / "venv")
+    virtualenv.create_environment(path, no_pip=True, no_setuptools=True, no_wheel=True, symlink=False)
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(path)
+    journal = os.path.join(path, virtualenv.JOURNAL_NAME)
+    with open(journal, "w") as file_handler:
+        file_handler.write(json.dumps({"journal": virtualenv.Journal.completed(journal)}) + "\n")
+    copied = os.path.join(lib_dir, "os.py")
+    assert not os.path.islink(copied)
+    open(copied, "w").close()
+
+    virtualenv.create_environment(path, no_pip=True, no_setuptools=True, no_wheel=True, symlink=False)
+    assert os.path.getsize(copied) == os.path.getsize(os.path.join(os.path.dirname(os.__file__), "os.py"))
+
+
+def test_create_environment_resume(tmp_path, monkeypatch):
+    """An interrupted creation is resumed by the next one after its last completed step"""
+    path = str(tmp_path / "venv")
+
+    def interrupt(*args, **kwargs):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(virtualenv, "install_python_config", interrupt)
+    with pytest.raises(KeyboardInterrupt):
+        virtualenv.create_environment(path, no_pip=True, no_setuptools=True, no_wheel=True)
+    journal = os.path.join(path, virtualenv.JOURNAL_NAME)
+    done = virtualenv.Journal.read(journal, ANY)
+    assert sorted(done) == ["activate", "python"]
+    assert virtualenv.Journal.completed(journal) is None
+
+    monkeypatch.undo()
+    monkeypatch.setattr(virtualenv, "install_python", interrupt)
+    virtualenv.create_environment(path, no_pip=True, no_setuptools=True, no_wheel=True)
+
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(path)
+    assert virtualenv.Journal.completed(journal) is not None
+    assert virtualenv.Journal.read(journal, virtualenv.Journal.completed(journal)) == {}
+    out = subprocess.check_output(
+        [os.path.join(bin_dir, virtualenv.EXPECTED_EXE), "-c", "import sys; print(sys.prefix)"]
+    )
+    assert os.path.realpath(out.decode().strip()) == os.path.realpath(path)
+
+
+def test_create_environment_resume_leftovers(tmp_path, monkeypatch):
+    """What the step an interruption stopped made is deleted before the step is run again"""
+    path = str(tmp_path / "venv")
+    options = dict(no_pip=True, no_setuptools=True, no_wheel=True, symlink=False, record=False)
+    copy_file_or_folder, trees = virtualenv.copy_file_or_folder, []
+
+    def interrupted_copy(src, dest, symlink=True):
+        if os.path.isdir(src):
+            # a tree copy interrupted half way
+            trees.append((src, dest))
+            os.makedirs(dest)
+            raise KeyboardInterrupt
+        copy_file_or_folder(src, dest, symlink)
+
+    monkeypatch.setattr(virtualenv, "copy_file_or_folder", interrupted_copy)
+    with pytest.raises(KeyboardInterrupt):
+        virtualenv.create_environment(path, **options)
+    (src, dest), = trees
+    assert os.listdir(dest) == []
+    journal = os.path.join(path, virtualenv.JOURNAL_NAME)
+    assert virtualenv.Journal.load(journal, ANY) == ({}, ANY)
+    assert dest in virtualenv.Journal.load(journal, ANY)[1]
+
+    monkeypatch.undo()
+    virtualenv.create_environment(path, **options)
+    assert sorted(os.listdir(dest)) == sorted(os.listdir(src))
+
+
+def test_dry_run(tmp_path):
+    """A dry run records what creating the environment does, without touching the filesystem"""
+    path = str(tmp_path / "venv")
+    with virtualenv.dry_run() as plan:
+        virtualenv.create_environment(path, no_pip=True, no_setuptools=True, no_wheel=True, symlink=False)
+    assert virtualenv.current_plan() is None
+    assert os.listdir(str(tmp_path)) == []
+
+    result = plan.as_dict()
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(path, dry_run=True)
+    operations = {}
+    for operation in result["operations"]:
+        operations.setdefault(operation["path"], operation)
+    assert operations[home_dir]["op"] == "mkdir"
+    assert operations[os.path.join(bin_dir, "activate_this.py")]["op"] == "write"
+    assert operations[os.path.join(bin_dir, "activate_this.py")]["bytes"] == len(virtualenv.ACTIVATE_THIS.encode())
+    executable = operations[os.path.join(bin_dir, os.path.basename(sys.executable))]
+    assert executable["op"] == "copy"
+    assert executable["bytes"] == os.path.getsize(sys.executable)
+    assert result["counts"]["write"] == sum(1 for o in result["operations"] if o["op"] == "write")
+    assert result["links"] == 0
+    assert result["copies"] == result["counts"]["copy"]
+    assert result["bytes"] == sum(o.get("bytes", 0) for o in result["operations"])
+
+
+def test_batch(tmp_path, monkeypatch, capsys):
+    """A batch creates the environments of its manifest, each with its own options over the shared ones"""
+    manifest = tmp_path / "envs.ini"
+    manifest.write_text(
+        six.text_type(
+            "[DEFAULT]\nno-pip = true\nno-setuptools = true\nno-wheel = true\n\n"
+            "[envs/one]\nprompt = (first)\n\n[envs/two]\nunknown = 1\n"
+        )
+    )
+    monkeypatch.setattr(virtualenv.logger, "default", virtualenv.logger.default)  # main logs to the captured stdout
+    monkeypatch.setattr(sys, "argv", ["virtualenv", "--batch", str(manifest)])
+    with pytest.raises(SystemExit) as exit_info:
+        virtualenv.main()
+    assert exit_info.value.code == 2
+    assert not (tmp_path / "envs").exists()
+
+    manifest.write_text(manifest.read_text().replace("unknown = 1", "clear = true"))
+    monkeypatch.setattr(sys, "argv", ["virtualenv", "--jobs", "2", "--batch", str(manifest)])
+    virtualenv.main()
+    output = capsys.readouterr().out
+    for name in ("one", "two"):
+        home_dir, _, _, bin_dir = virtualenv.path_locations(str(tmp_path / "envs" / name))
+        assert os.path.exists(os.path.join(bin_dir, "activate_this.py"))
+        assert "created {} in ".format(home_dir) in output
+    assert "2 of 2 environments created" in output
+    with open(os.path.join(virtualenv.path_locations(str(tmp_path / "envs" / "one"))[3], "activate")) as file_handler:
+        assert "(first)" in file_handler.read()
+
+
+def test_replay_python(tmp_path, monkeypatch):
+    """The interpreter installation replayed from its recording is the one of a full build, but for the location"""
+    monkeypatch.setattr(virtualenv, "PLAN_CACHE_DIR", str(tmp_path / "plans"))
+    built, replayed = str(tmp_path / "built" / "venv"), str(tmp_path / "replayed" / "venv")
+    virtualenv.create_environment(built, no_pip=True, no_setuptools=True, no_wheel=True)
+    assert len(os.listdir(virtualenv.PLAN_CACHE_DIR)) == 1
+
+    def discover(*args, **kwargs):
+        raise AssertionError("the bootstrap modules are discovered again")
+
+    monkeypatch.setattr(virtualenv, "copy_required_modules", discover)
+    virtualenv.create_environment(replayed, no_pip=True, no_setuptools=True, no_wheel=True)
+
+    compared = 0
+    for root, dirs, files in os.walk(built):
+        dirs[:] = [name for name in dirs if name != "__pycache__"]
+        for name in files + [name for name in dirs if os.path.islink(os.path.join(root, name))]:
+            path = os.path.join(root, name)
+            other = os.path.join(replayed, os.path.relpath(path, built))
+            if name.endswith(".pyc") or name == "site.cache":
+                continue
+            compared += 1
+            assert os.path.islink(path) == os.path.islink(other), path
+            if os.path.islink(path):
+                assert os.readlink(path).replace(built, replayed) == os.readlink(other), path
+                continue
+            assert stat.S_IMODE(os.stat(path).st_mode) == stat.S_IMODE(os.stat(other).st_mode), path
+            with open(path, "rb") as file_handler:
+                content = file_handler.read()
+            with open(other, "rb") as file_handler:
+                replayed_content = file_handler.read()
+            if name == "stdlib.index":
+                index = virtualenv.replace_prefix(marshal.loads(content), built, replayed)
+                assert index == marshal.loads(replayed_content)
+            else:
+                assert content.replace(built.encode(), replayed.encode()) == replayed_content, path
+    assert compared > 10
+    bin_dir = virtualenv.path_locations(replayed, dry_run=True)[3]
+    out = subprocess.check_output(
+        [os.path.join(bin_dir, virtualenv.EXPECTED_EXE), "-c", "import sys; print(sys.prefix)"]
+    )
+    assert os.path.realpath(out.decode().strip()) == os.path.realpath(replayed)
+
+
+def test_record_escaped_prefix(tmp_path, monkeypatch):
+    """The environment location is recorded wherever it is, also with its backslashes doubled by a repr"""
+    monkeypatch.setattr(virtualenv, "PLAN_CACHE_DIR", str(tmp_path / "plans"))
+    home_dir = str(tmp_path / "back\\slash" / "venv")
+    os.makedirs(home_dir)
+    site_py = os.path.join(home_dir, "site.py")
+    with open(site_py, "w") as file_handler:
+        file_handler.write("PREFIX = {!r}\n# {}\n".format(str(home_dir), home_dir))
+    plan = virtualenv.Plan(perform=True)
+    plan.record("write", site_py)
+    filename = os.path.join(virtualenv.PLAN_CACHE_DIR, "recording.json")
+    virtualenv.record_python(plan, home_dir, os.path.join(home_dir, "python"), filename)
+
+    content = virtualenv.load_recording(filename)["operations"][0]["content"]
+    assert content == "PREFIX = '{}'\n# {}\n".format(virtualenv.PLAN_ESCAPED_PLACEHOLDER, virtualenv.PLAN_PLACEHOLDER)
+
+
+def test_record_prefix_boundary(tmp_path, monkeypatch):
+    """A path merely starting with the environment location (the interpreter next to it) is recorded as it is"""
+    monkeypatch.setattr(virtualenv, "PLAN_CACHE_DIR", str(tmp_path / "plans"))
+    home_dir = str(tmp_path / "venv")
+    outside = home_dir + "full"
+    os.makedirs(home_dir)
+    orig_prefix = os.path.join(home_dir, "orig-prefix.txt")
+    with open(orig_prefix, "w") as file_handler:
+        file_handler.write("{}\n{}\n".format(outside, os.path.join(home_dir, "lib")))
+    plan = virtualenv.Plan(perform=True)
+    plan.record("write", orig_prefix)
+    plan.record("symlink", os.path.join(home_dir, "os.py"), src=os.path.join(outside, "os.py"))
+    filename = os.path.join(virtualenv.PLAN_CACHE_DIR, "recording.json")
+    virtualenv.record_python(plan, home_dir, os.path.join(home_dir, "python"), filename)
+
+    write, symlink = virtualenv.load_recording(filename)["operations"]
+    assert write["content"] == "{}\n{}\n".format(outside, os.path.join(virtualenv.PLAN_PLACEHOLDER, "lib"))
+    assert symlink == {
+        "op": "symlink",
+        "path": os.path.join(virtualenv.PLAN_PLACEHOLDER, "os.py"),
+        "src": os.path.join(outside, "os.py"),
+    }
+
+
+def test_replay_python_fallback(tmp_path, monkeypatch):
+    """A replay failing halfway is cleaned up before the interpreter is installed the usual way"""
+    monkeypatch.setattr(virtualenv, "PLAN_CACHE_DIR", str(tmp_path / "plans"))
+    virtualenv.create_environment(str(tmp_path / "built"), no_pip=True, no_setuptools=True, no_wheel=True)
+    (filename,) = [os.path.join(virtualenv.PLAN_CACHE_DIR, name) for name in os.listdir(virtualenv.PLAN_CACHE_DIR)]
+    recording = virtualenv.load_recording(filename)
+    operations = recording["operations"]
+    # a source gone since the recording: the replay leaves a dangling link where the installation puts a module
+    gone = str(tmp_path / "gone")
+    at = min(at for at, operation in enumerate(operations) if operation["op"] == "symlink")
+    operations[at : at + 1] = [
+        {"op": "symlink", "path": operations[at]["path"], "src": gone},
+        {"op": "copy", "path": operations[at]["path"] + ".copy", "src": gone},
+    ]
+    with open(filename, "w") as file_handler:
+        json.dump(recording, file_handler)
+
+    home_dir = str(tmp_path / "venv")
+    virtualenv.create_environment(home_dir, no_pip=True, no_setuptools=True, no_wheel=True)
+    bin_dir = virtualenv.path_locations(home_dir, dry_run=True)[3]
+    out = subprocess.check_output(
+        [os.path.join(bin_dir, virtualenv.EXPECTED_EXE), "-c", "import sys; print(sys.prefix)"]
+    )
+    assert os.path.realpath(out.decode().strip()) == os.path.realpath(home_dir)
+    # recorded again by the full installation
+    assert gone not in json.dumps(virtualenv.load_recording(filename))
+
+
+def test_plan_cache_bounds(tmp_path, monkeypatch):
+    """Only the most recently used recordings are kept, and none is made without record"""
+    monkeypatch.setattr(virtualenv, "PLAN_CACHE_DIR", str(tmp_path / "plans"))
+    virtualenv.create_environment(str(tmp_path / "venv"), no_pip=True, no_setuptools=True, no_wheel=True, record=False)
+    assert not os.path.exists(virtualenv.PLAN_CACHE_DIR)
+
+    os.makedirs(virtualenv.PLAN_CACHE_DIR)
+    for name, mtime in (("old.json", 1000), ("older.json", 900), ("new.json", 2000)):
+        path = os.path.join(virtualenv.PLAN_CACHE_DIR, name)
+        with open(path, "w") as file_handler:
+            file_handler.write("{}")
+        os.utime(path, (mtime, mtime))
+    virtualenv.prune_plan_cache(2)
+    assert sorted(os.listdir(virtualenv.PLAN_CACHE_DIR)) == ["new.json", "old.json"]
+
+
+def test_environment_builder(tmp_path):
+    """A builder creates environments from several threads, logging to its own logger"""
+    output = six.StringIO()
+    default = virtualenv.logger.default
+    builder = virtualenv.EnvironmentBuilder(
+        logger=virtualenv.Logger([(virtualenv.Logger.NOTIFY, output)]), no_setuptools=True, no_wheel=True
+    )
+    results = {}
+
+    def create(name):
+        results[name] = builder.create(str(tmp_path / name), no_pip=True)
+
+    with builder:
+        threads = [threading.Thread(target=create, args=(name,)) for name in ("one", "two")]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        results["three"] = builder.create(str(tmp_path / "three"), no_pip=False, download=False)
+
+    assert virtualenv.logger.default is default
+    assert "New {} executable".format(virtualenv.EXPECTED_EXE) in output.getvalue()
+    for name, result in results.items():
+        assert result.home_dir == str(tmp_path / name)
+        assert result.bin_dir == virtualenv.path_locations(str(tmp_path / name), dry_run=True)[3]
+        assert result.timings["total"] >= result.timings["python"] > 0
+        out = subprocess.check_output([result.executable, "-c", "import sys; print(sys.prefix)"])
+        assert os.path.realpath(out.decode().strip()) == os.path.realpath(result.home_dir)
+    assert results["one"].seed_versions == {}
+    assert sorted(results["three"].seed_versions) == ["pip"]
+
+
+def test_activated_environ(tmp_path):
+    home_dir, lib_dir, inc_dir, bin_dir = virtualenv.path_locations(str(tmp_path / "venv"), dry_run=True)
+    old_bin_dir = virtualenv.path_locations(str(tmp_path / "old"), dry_run=True)[3]
+    environ = {
+        "PATH": os.pathsep.join([old_bin_dir, "/usr/bin"]),
+        "PYTHONHOME": "/somewhere",
+        "VIRTUAL_ENV": str(tmp_path / "old"),
+    }
+    activated = virtualenv.activated_environ(home_dir, environ)
+    assert activated["VIRTUAL_ENV"] == home_dir
+    assert activated["PATH"] == os.pathsep.join([bin_dir, "/usr/bin"])
+    assert "PYTHONHOME" not in activated
+    assert environ["VIRTUAL_ENV"] == str(tmp_path / "old")
+
+
+def test_activation_exports(clean_python):
+    home_dir, bin_dir, _ = clean_python
+    variables = virtualenv.activation_variables(home_dir)
+    with open(os.path.join(bin_dir, "activate.json")) as file_handler:
+        assert json.load(file_handler) == variables
+    if virtualenv.IS_WIN:
+        return
+    with open(os.path.join(bin_dir, "activate.env")) as file_handler:
+        lines = [line for line in file_handler.read().splitlines() if not line.startswith("#")]
+    assert lines == ["VIRTUAL_ENV={}".format(home_dir), "PATH={}:{}".format(bin_dir, virtualenv.DEFAULT_SYSTEM_PATH)]
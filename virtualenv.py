@@ -23,7 +23,10 @@ import distutils.spawn
 import distutils.sysconfig
 import errno
 import glob
+import hashlib
+import json
 import logging
+import marshal
 import optparse
 import os
 import re
@@ -33,6 +36,8 @@ import subprocess
 import sys
 import tempfile
 import textwrap
+import threading
+import time
 import zipfile
 import zlib
 from distutils.util import strtobool
@@ -76,6 +81,10 @@ if IS_WIN:
 else:
     DEFAULT_STORAGE_DIR = os.path.join(USER_DIR, ".virtualenv")
 DEFAULT_CONFIG_FILE = os.path.join(DEFAULT_STORAGE_DIR, "virtualenv.ini")
+# the recorded installations of interpreters, replayed into new environments
+PLAN_CACHE_DIR = os.environ.get("VIRTUALENV_PLAN_CACHE_DIR") or os.path.join(DEFAULT_STORAGE_DIR, "plans")
+# the recordings of the interpreters least recently used beyond this many are deleted
+PLAN_CACHE_SIZE = 16
 
 if IS_PYPY:
     EXPECTED_EXE = "pypy"
@@ -383,13 +392,166 @@ class Logger(object):
         return levels[level]
 
 
+# the state of the EnvironmentBuilder creating an environment in the current thread
+_building = threading.local()
+
+
+def cached(key, compute):
+    """
+    Return ``compute()``, kept under ``key`` by the EnvironmentBuilder at work
+    in this thread for its later creations (a None result is not kept)
+    """
+    context = getattr(_building, "context", None)
+    if context is None:
+        return compute()
+    return context.builder.cached(key, compute)
+
+
+def forget(key):
+    """Drop what the EnvironmentBuilder at work in this thread keeps under ``key``"""
+    context = getattr(_building, "context", None)
+    if context is not None:
+        context.builder.forget(key)
+
+
+class ThreadLogger(object):
+    """
+    The module logger: stands for the logger of the EnvironmentBuilder creating
+    an environment in the current thread, or else for the ``default`` one
+    """
+
+    def __init__(self, default):
+        object.__setattr__(self, "default", default)
+
+    def _current(self):
+        context = getattr(_building, "context", None)
+        return self.default if context is None else context.logger
+
+    def __getattr__(self, name):
+        return getattr(self._current(), name)
+
+    def __setattr__(self, name, value):
+        if name == "default":
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self._current(), name, value)
+
+
 # create a silent logger just to prevent this from being undefined
 # will be overridden with requested verbosity main() is called.
-logger = Logger([(Logger.LEVELS[-1], sys.stdout)])
+logger = ThreadLogger(Logger([(Logger.LEVELS[-1], sys.stdout)]))
+
+
+class Plan(object):
+    """
+    The filesystem operations a dry run would have performed (or, with
+    ``perform``, a recording did perform), in order: each one an ``op`` on a
+    ``path`` with its details, like the ``src`` of a copy or symlink and the
+    (estimated) ``bytes`` it writes.
+    """
+
+    def __init__(self, perform=False):
+        self.perform = perform
+        self.operations = []
+        self.directories = set()
+        self.files = {}  # path -> bytes, of the files that would be there
+
+    def record(self, op, path, **details):
+        # nothing gets created, so the same directory is found missing again and again
+        if op == "mkdir":
+            if path in self.directories:
+                return
+            self.directories.add(path)
+        elif op in ("copy", "write", "symlink"):
+            self.files[path] = details.get("bytes", 0)
+        details.update(op=op, path=path)
+        self.operations.append(details)
+        if not self.perform:
+            logger.info("Would %s %s", op, path)
+
+    def as_dict(self):
+        counts = {}
+        for operation in self.operations:
+            counts[operation["op"]] = counts.get(operation["op"], 0) + 1
+        return {
+            "operations": self.operations,
+            "counts": counts,
+            "bytes": sum(operation.get("bytes", 0) for operation in self.operations),
+            "links": counts.get("symlink", 0),
+            "copies": counts.get("copy", 0),
+        }
+
+
+_planning = threading.local()
+
+
+@contextlib.contextmanager
+def dry_run(enabled=True):
+    """
+    Within this context the filesystem primitives record their operations into
+    the yielded ``Plan`` instead of performing them (unless not ``enabled``,
+    then None is yielded)
+    """
+    if not enabled:
+        yield None
+        return
+    _planning.plan = plan = Plan()
+    try:
+        yield plan
+    finally:
+        _planning.plan = None
+
+
+@contextlib.contextmanager
+def recording():
+    """Within this context the filesystem primitives also record the operations they perform into the yielded Plan"""
+    _planning.recording = plan = Plan(perform=True)
+    try:
+        yield plan
+    finally:
+        _planning.recording = None
+
+
+def current_plan():
+    """The ``Plan`` of the dry run in progress in this thread, or None"""
+    return getattr(_planning, "plan", None)
+
+
+def planned(op, path, **details):
+    """Record the operation when in a dry run and return True, return False otherwise: it is to be performed"""
+    recorded = getattr(_planning, "recording", None)
+    if recorded is not None:
+        recorded.record(op, path, **details)
+    journal = getattr(_planning, "journal", None)
+    if journal is not None:
+        journal.making(op, path)
+    plan = current_plan()
+    if plan is None:
+        return False
+    plan.record(op, path, **details)
+    return True
+
+
+def tree_size(path):
+    """Bytes of the files in the ``path`` tree, the estimate of what copying it writes"""
+    plan = current_plan()
+    if plan is not None and path in plan.files:
+        return plan.files[path]
+    if not os.path.isdir(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            filename = join(root, name)
+            if not os.path.islink(filename):
+                total += os.path.getsize(filename)
+    return total
 
 
 def mkdir(at_path):
     if not os.path.exists(at_path):
+        if planned("mkdir", at_path):
+            return
         logger.info("Creating %s", at_path)
         os.makedirs(at_path)
     else:
@@ -404,17 +566,27 @@ def copy_file_or_folder(src, dest, symlink=True):
 
 
 def copyfile(src, dest, symlink=True):
-    if not os.path.exists(src):
+    plan = current_plan()
+    if not os.path.exists(src) and (plan is None or src not in plan.files):
         # Some bad symlink in the src
         logger.warn("Cannot find file %s (bad symlink)", src)
         return
     if os.path.exists(dest):
-        logger.debug("File %s already exists", dest)
-        return
-    if not os.path.exists(os.path.dirname(dest)):
+        # a copy of another size is what an interrupted creation left half written, it is made again
+        if os.path.islink(dest) or not os.path.isfile(dest) or not os.path.isfile(src):
+            logger.debug("File %s already exists", dest)
+            return
+        if os.path.getsize(dest) == os.path.getsize(src):
+            logger.debug("File %s already exists", dest)
+            return
+        logger.info("Replacing %s, it differs from %s", dest, src)
+        remove_file(dest)
+    if not os.path.exists(os.path.dirname(dest)) and not planned("mkdir", os.path.dirname(dest)):
         logger.info("Creating parent directories for %s", os.path.dirname(dest))
         os.makedirs(os.path.dirname(dest))
     if symlink and hasattr(os, "symlink") and not IS_WIN:
+        if planned("symlink", dest, src=os.path.realpath(src)):
+            return
         logger.info("Symlinking %s", dest)
         try:
             os.symlink(os.path.realpath(src), dest)
@@ -422,12 +594,16 @@ def copyfile(src, dest, symlink=True):
             logger.info("Symlinking failed, copying to %s", dest)
             copy_file_or_folder(src, dest, symlink)
     else:
+        if planned("copy", dest, src=src, bytes=tree_size(src) if plan is not None else 0):
+            return
         logger.info("Copying to %s", dest)
         copy_file_or_folder(src, dest, symlink)
 
 
 def writefile(dest, content, overwrite=True):
     if not os.path.exists(dest):
+        if planned("write", dest, bytes=len(content.encode("utf-8"))):
+            return
         logger.info("Writing %s", dest)
         with open(dest, "wb") as f:
             f.write(content.encode("utf-8"))
@@ -439,6 +615,8 @@ def writefile(dest, content, overwrite=True):
             if not overwrite:
                 logger.notify("File %s exists with different content; not overwriting", dest)
                 return
+            if planned("write", dest, bytes=len(content.encode("utf-8"))):
+                return
             logger.notify("Overwriting %s with new content", dest)
             with open(dest, "wb") as f:
                 f.write(content.encode("utf-8"))
@@ -446,22 +624,169 @@ def writefile(dest, content, overwrite=True):
             logger.info("Content %s already in place", dest)
 
 
-def rm_tree(folder):
+def replace_file(dest, content):
+    """Write the bytes ``content`` to a temporary file next to ``dest`` and
+    rename it over ``dest``, keeping its mode"""
+    tmp = os.path.join(os.path.dirname(dest), ".{}.{}.tmp".format(os.path.basename(dest), os.getpid()))
+    try:
+        with open(tmp, "wb") as f:
+            f.write(content)
+        shutil.copymode(dest, tmp)
+        if hasattr(os, "replace"):
+            os.replace(tmp, dest)
+        else:
+            if IS_WIN:
+                os.remove(dest)
+            os.rename(tmp, dest)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def threaded_map(func, items, workers=8):
+    """Return the list of ``func`` applied to ``items``, computed by up to
+    ``workers`` threads; the first exception raised by ``func`` is re-raised"""
+    if len(items) < 2 or workers < 2:
+        return [func(item) for item in items]
+    results = [None] * len(items)
+    pending = iter(enumerate(items))
+    lock = threading.Lock()
+    errors = []
+
+    def work():
+        while not errors:
+            with lock:
+                try:
+                    at, item = next(pending)
+                except StopIteration:
+                    return
+            try:
+                results[at] = func(item)
+            except BaseException as exception:
+                errors.append(exception)
+
+    threads = [threading.Thread(target=work) for _ in range(min(workers, len(items)))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return results
+
+
+def rm_tree(folder, background=False):
+    """Delete the ``folder`` tree; with ``background`` it is renamed out of the
+    way right away and deleted by a detached process, together with what
+    earlier runs left behind when interrupted"""
     if os.path.exists(folder):
+        if planned("rmtree", folder):
+            return
         logger.notify("Deleting tree %s", folder)
+        if background and move_to_trash(folder):
+            trash = find_trash(folder)
+            if delete_in_background(trash):
+                return
+            for path in trash:
+                shutil.rmtree(path)
+            return
         shutil.rmtree(folder)
     else:
         logger.info("Do not need to delete %s; already gone", folder)
 
 
+def empty_directory(folder, keep=()):
+    """Delete what is within ``folder``, but the entries named in ``keep``"""
+    for name in os.listdir(folder):
+        if name in keep:
+            continue
+        path = join(folder, name)
+        logger.info("Deleting %s", path)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
+
+# the sibling directories trees deleted in the background are renamed into are named .NAME.virtualenv-trash-*
+TRASH_MARKER = ".virtualenv-trash-"
+
+
+def move_to_trash(folder):
+    """Rename ``folder`` into a new trash directory next to it, return whether that worked"""
+    parent, name = os.path.split(os.path.abspath(folder))
+    trash = tempfile.mkdtemp(prefix=".{}{}".format(name, TRASH_MARKER), dir=parent)
+    try:
+        os.rename(folder, join(trash, name))
+    except OSError as error:
+        logger.info("Could not move %s out of the way (%s), deleting it in place", folder, error)
+        os.rmdir(trash)
+        return False
+    return True
+
+
+def find_trash(folder):
+    """Return the trash directories next to ``folder``"""
+    parent, name = os.path.split(os.path.abspath(folder))
+    prefix = ".{}{}".format(name, TRASH_MARKER)
+    return sorted(join(parent, entry) for entry in os.listdir(parent) if entry.startswith(prefix))
+
+
+def delete_in_background(folders):
+    """Delete the ``folders`` trees in a process detached from this one, return whether it could be started"""
+    script = "import shutil, sys\nfor path in sys.argv[1:]:\n    shutil.rmtree(path, ignore_errors=True)\n"
+    if IS_WIN:
+        # DETACHED_PROCESS | CREATE_NEW_PROCESS_GROUP
+        kwargs = {"creationflags": 0x00000008 | 0x00000200}
+    elif sys.version_info < (3, 2):
+        kwargs = {"preexec_fn": os.setsid, "close_fds": True}
+    else:
+        # unlike preexec_fn, safe when other threads are running (several environments being created)
+        kwargs = {"start_new_session": True, "close_fds": True}
+    try:
+        with open(os.devnull, "r+b") as devnull:
+            subprocess.Popen(
+                [sys.executable, "-S", "-c", script] + list(folders),
+                stdin=devnull,
+                stdout=devnull,
+                stderr=devnull,
+                cwd=os.path.dirname(folders[0]),
+                **kwargs
+            )
+    except OSError as error:
+        logger.info("Could not start the background deletion (%s)", error)
+        return False
+    logger.info("Deleting %s in the background", ", ".join(folders))
+    return True
+
+
 def make_exe(fn):
     if hasattr(os, "chmod"):
+        if planned("chmod", fn):
+            return
         old_mode = os.stat(fn).st_mode & 0xFFF  # 0o7777
         new_mode = (old_mode | 0x16D) & 0xFFF  # 0o555, 0o7777
         os.chmod(fn, new_mode)
         logger.info("Changed mode of %s to %s", fn, oct(new_mode))
 
 
+def copy_executable(src, dest):
+    """Copy the interpreter (or one of its libraries) ``src`` to ``dest``"""
+    if not planned("copy", dest, src=src, bytes=os.path.getsize(src)):
+        shutil.copyfile(src, dest)
+
+
+def remove_file(path):
+    if not planned("remove", path):
+        os.unlink(path)
+
+
+def make_symlink(src, dest):
+    if not planned("symlink", dest, src=src):
+        os.symlink(src, dest)
+
+
 def _find_file(filename, folders):
     for folder in reversed(folders):
         files = glob.glob(os.path.join(folder, filename))
@@ -545,7 +870,13 @@ class ConfigOptionParser(optparse.OptionParser):
         config.update(dict(self.get_config_section("virtualenv")))
         # 2. environmental variables
         config.update(dict(self.get_environ_vars()))
-        # Then set the options with those values
+        return self.apply_config(defaults, config)
+
+    def apply_config(self, defaults, config):
+        """
+        Set the options named by the keys of ``config`` to its (string)
+        values, converted like the command line ones, into ``defaults``
+        """
         for key, val in config.items():
             key = key.replace("_", "-")
             if not key.startswith("--"):
@@ -609,7 +940,12 @@ class ConfigOptionParser(optparse.OptionParser):
 
 def main():
     parser = ConfigOptionParser(
-        version=virtualenv_version, usage="%prog [OPTIONS] DEST_DIR", formatter=UpdatingDefaultsHelpFormatter()
+        version=virtualenv_version,
+        usage="%prog [OPTIONS] DEST_DIR\n"
+        "       %prog run DEST_DIR -- COMMAND [ARGS...]\n"
+        "       %prog --move SRC_DIR DEST_DIR\n"
+        "       %prog [OPTIONS] --batch MANIFEST",
+        formatter=UpdatingDefaultsHelpFormatter(),
     )
 
     parser.add_option(
@@ -625,7 +961,9 @@ def main():
         metavar="PYTHON_EXE",
         help="The Python interpreter to use, e.g., --python=python3.5 will use the python3.5 "
         "interpreter to create the new environment.  The default is the interpreter that "
-        "virtualenv was installed with ({})".format(sys.executable),
+        "virtualenv was installed with ({}).  A comma separated list creates an environment "
+        "with each of them at the same time, DEST_DIR then names them apart with {{version}} (replaced in the "
+        "other options too), e.g., -p python2.7,python3.7 env-{{version}}".format(sys.executable),
     )
 
     parser.add_option(
@@ -656,12 +994,63 @@ def main():
         help="Always copy files rather than symlinking.",
     )
 
+    parser.add_option(
+        "--venv-style",
+        dest="venv_style",
+        action="store_true",
+        help="Create the environment like the venv module does (Python 3.3+): "
+        "write a pyvenv.cfg and use the interpreter's own site module and standard library.",
+    )
+
     parser.add_option(
         "--relocatable",
         dest="relocatable",
         action="store_true",
-        help="Make an EXISTING virtualenv environment relocatable. "
-        "This fixes up scripts and makes all .pth files relative.",
+        help="Make an EXISTING virtualenv environment relocatable, or create a new one relocatable. "
+        "This fixes up scripts and makes all .pth files relative; new environments also get "
+        "activation scripts that find the environment from their own location.",
+    )
+
+    parser.add_option(
+        "--move",
+        dest="move",
+        action="store_true",
+        help="Move the EXISTING environment SRC_DIR to DEST_DIR, rewriting the paths that point into it.",
+    )
+
+    parser.add_option(
+        "--batch",
+        dest="batch",
+        metavar="MANIFEST",
+        help="Create all the environments listed in the ini file MANIFEST from this one process: each section is "
+        "a DEST_DIR (relative to the file) with the options for it, named as in virtualenv.ini, over the "
+        "command line ones.",
+    )
+
+    parser.add_option(
+        "--jobs",
+        dest="jobs",
+        type="int",
+        default=4,
+        metavar="N",
+        help="With --batch, create up to N environments at the same time.",
+    )
+
+    parser.add_option(
+        "--no-record",
+        dest="record",
+        action="store_false",
+        default=True,
+        help="Do not record the installation of the interpreter into {} for later environments, nor replay a "
+        "recorded one.".format(PLAN_CACHE_DIR),
+    )
+
+    parser.add_option(
+        "--dry-run",
+        dest="dry_run",
+        action="store_true",
+        help="Do not create the environment, print the JSON plan of the filesystem operations creating it takes: "
+        "each one with its estimated bytes, their counts and how many files are linked or copied.",
     )
 
     parser.add_option(
@@ -730,14 +1119,30 @@ def main():
 
     options, args = parser.parse_args()
 
-    global logger
-
     if "adjust_options" in globals():
         # noinspection PyUnresolvedReferences
         adjust_options(options, args)  # noqa: F821
 
     verbosity = options.verbose - options.quiet
-    logger = Logger([(Logger.level_for_integer(2 - verbosity), sys.stdout)])
+    # the plan of a dry run is the output, the log goes out of its way
+    logger.default = Logger([(Logger.level_for_integer(2 - verbosity), sys.stderr if options.dry_run else sys.stdout)])
+
+    if len(args) > 1 and args[0] == "run":
+        if len(args) < 3:
+            print("You must provide a COMMAND to run in {}".format(args[1]))
+            parser.print_help()
+            sys.exit(2)
+        run_in_environment(args[1], args[2:])
+        return
+
+    if options.python and "," in options.python and not os.environ.get("VIRTUALENV_INTERPRETER_RUNNING"):
+        if options.move or options.batch or options.dry_run or len(args) != 1:
+            print("Several interpreters only create the environments of one DEST_DIR template")
+            parser.print_help()
+            sys.exit(2)
+        if not fan_out([python for python in options.python.split(",") if python], args[0]):
+            sys.exit(3)
+        return
 
     if options.python and not os.environ.get("VIRTUALENV_INTERPRETER_RUNNING"):
         env = os.environ.copy()
@@ -747,14 +1152,31 @@ def main():
         else:
             logger.notify("Running virtualenv with interpreter {}".format(interpreter))
             env["VIRTUALENV_INTERPRETER_RUNNING"] = "true"
-            file = __file__
-            if file.endswith(".pyc"):
-                file = file[:-1]
-            elif IS_ZIPAPP:
-                file = HERE
-            sub_process_call = subprocess.Popen([interpreter, file] + sys.argv[1:], env=env)
+            sub_process_call = subprocess.Popen([interpreter, virtualenv_script()] + sys.argv[1:], env=env)
             raise SystemExit(sub_process_call.wait())
 
+    if options.dry_run and (options.move or options.batch or args[:1] == ["run"]):
+        print("--dry-run only plans the creation of environments")
+        parser.print_help()
+        sys.exit(2)
+
+    if options.move:
+        if len(args) != 2:
+            print("--move needs two arguments: SRC_DIR DEST_DIR (you gave {})".format(" ".join(args)))
+            parser.print_help()
+            sys.exit(2)
+        move_environment(args[0], args[1])
+        return
+
+    if options.batch:
+        if args:
+            print("--batch takes the environments from MANIFEST, not DEST_DIR (you gave {})".format(" ".join(args)))
+            parser.print_help()
+            sys.exit(2)
+        if not create_batch(parser, options, options.batch):
+            sys.exit(3)
+        return
+
     if not args:
         print("You must provide a DEST_DIR")
         parser.print_help()
@@ -780,11 +1202,20 @@ def main():
         logger.warn("PYTHONHOME is set.  You *must* activate the virtualenv before using it")
         del os.environ["PYTHONHOME"]
 
-    if options.relocatable:
+    if options.relocatable and os.path.exists(
+        os.path.join(path_locations(home_dir, dry_run=True)[3], "activate_this.py")
+    ):
+        if options.dry_run:
+            logger.fatal("ERROR: --dry-run can not plan making an existing environment relocatable")
+            sys.exit(2)
         make_environment_relocatable(home_dir)
         return
 
-    with virtualenv_support_dirs() as search_dirs:
+    if options.venv_style and (sys.version_info < (3, 3) or IS_PYPY or IS_JYTHON):
+        logger.fatal("ERROR: --venv-style requires CPython 3.3 or later")
+        sys.exit(2)
+
+    with virtualenv_support_dirs() as search_dirs, dry_run(options.dry_run) as plan:
         create_environment(
             home_dir,
             site_packages=options.system_site_packages,
@@ -796,12 +1227,194 @@ def main():
             no_pip=options.no_pip,
             no_wheel=options.no_wheel,
             symlink=options.symlink,
+            venv_style=options.venv_style,
+            relocatable=options.relocatable,
+            record=options.record,
         )
+    if plan is not None:
+        result = plan.as_dict()
+        result["home_dir"] = os.path.abspath(home_dir)
+        print(json.dumps(result, indent=2, separators=(",", ": "), sort_keys=True))
+        return
     if "after_install" in globals():
         # noinspection PyUnresolvedReferences
         after_install(options, home_dir)  # noqa: F821
 
 
+# what the whole batch shares, the environments of a manifest can not set it each
+BATCH_SHARED_OPTIONS = ("python", "batch", "jobs", "move", "dry_run", "verbose", "quiet")
+
+
+def create_batch(parser, options, manifest):
+    """
+    Create the environments listed in the ini file ``manifest`` from this
+    process, up to ``options.jobs`` at the same time, sharing what the
+    interpreter and the wheels they are seeded from take to look up. Each
+    section is a DEST_DIR (relative to the manifest) holding the options for
+    it, named and converted like in virtualenv.ini, over the command line
+    ``options`` parsed by ``parser``. Logs a summary and returns whether all
+    of them were created.
+    """
+    config = ConfigParser.RawConfigParser()
+    if not config.read([manifest]) or not config.sections():
+        logger.fatal("ERROR: No environments found in the batch manifest %s", manifest)
+        sys.exit(2)
+    base_dir = os.path.dirname(os.path.abspath(manifest))
+    environments = []
+    for section in config.sections():
+        items = dict(config.items(section))
+        options_of = {key: parser.get_option("--{}".format(key.replace("_", "-"))) for key in items}
+        invalid = [key for key, option in options_of.items() if option is None or option.dest in BATCH_SHARED_OPTIONS]
+        if invalid:
+            logger.fatal(
+                "ERROR: Unknown or batch wide options for %s in %s: %s", section, manifest, ", ".join(sorted(invalid))
+            )
+            sys.exit(2)
+        values = parser.apply_config(dict(vars(options)), items)
+        environments.append((os.path.join(base_dir, os.path.expanduser(section)), optparse.Values(values)))
+
+    # the summary tells what became of each environment, their creation logs one level quieter
+    level = Logger.level_for_integer(3 - options.verbose + options.quiet)
+    start = time.time()
+    with EnvironmentBuilder(logger=Logger([(level, sys.stdout)])) as builder:
+
+        def create(environment):
+            home_dir, values = environment
+            started = time.time()
+            try:
+                result = builder.create(
+                    home_dir,
+                    site_packages=values.system_site_packages,
+                    clear=values.clear,
+                    prompt=values.prompt,
+                    search_dirs=builder.search_dirs + values.search_dirs,
+                    download=values.download,
+                    no_setuptools=values.no_setuptools,
+                    no_pip=values.no_pip,
+                    no_wheel=values.no_wheel,
+                    symlink=values.symlink,
+                    venv_style=values.venv_style,
+                    relocatable=values.relocatable,
+                    record=values.record,
+                )
+                if "after_install" in globals():
+                    # noinspection PyUnresolvedReferences
+                    after_install(values, home_dir)  # noqa: F821
+            except (Exception, SystemExit) as error:
+                if isinstance(error, SystemExit):
+                    error = "exited with {}".format(error.code)
+                return time.time() - started, error
+            return result, None
+
+        outcomes = threaded_map(create, environments, workers=options.jobs)
+
+    failed = 0
+    for (home_dir, _), (result, error) in zip(environments, outcomes):
+        if error is not None:
+            failed += 1
+            logger.error("FAILED  %s after %.2fs: %s", home_dir, result, error)
+            continue
+        steps = ", ".join(
+            "{} {:.2f}s".format(name, result.timings[name])
+            for name in ("python", "seed", "activate", "python-config")
+            if name in result.timings
+        )
+        seeds = ", ".join("{} {}".format(name, version) for name, version in sorted(result.seed_versions.items()))
+        logger.notify("created %s in %.2fs (%s)%s", home_dir, result.timings["total"], steps, seeds and "; " + seeds)
+    logger.notify(
+        "%d of %d environments created in %.2fs", len(environments) - failed, len(environments), time.time() - start
+    )
+    return not failed
+
+
+def virtualenv_script():
+    """The path another interpreter runs this virtualenv with"""
+    file = __file__
+    if file.endswith(".pyc"):
+        file = file[:-1]
+    elif IS_ZIPAPP:
+        file = HERE
+    return file
+
+
+def fan_out(pythons, dest_dir):
+    """
+    Create an environment with each of the interpreters ``pythons`` at the
+    same time, one virtualenv process running under each, at ``dest_dir``.
+    Each gets the command line of this one, with ``{version}`` replaced by
+    the interpreter's major.minor version in all of its arguments (like
+    ``--prompt``), ``dest_dir`` included. Interpreters that can not be found
+    or do not run are reported and skipped. Logs a summary (and the output of
+    the failed ones) and returns whether all of them were created.
+    """
+    interpreters, broken = [], 0
+    for python in pythons:
+        try:
+            interpreter = resolve_interpreter(python)
+        except SystemExit:
+            broken += 1  # resolve_interpreter told why
+            continue
+        try:
+            version = subprocess.check_output(
+                [interpreter, "-c", "import sys; print('{}.{}'.format(*sys.version_info))"],
+                stderr=subprocess.STDOUT,
+                universal_newlines=True,
+            ).strip()
+        except (subprocess.CalledProcessError, OSError) as error:
+            broken += 1
+            logger.error("FAILED  %s does not run (%s):", interpreter, error)
+            logger.indent += 2
+            try:
+                for line in (getattr(error, "output", None) or "").splitlines():
+                    logger.error(line)
+            finally:
+                logger.indent -= 2
+            continue
+        interpreters.append((interpreter, version, dest_dir.replace("{version}", version)))
+    destinations = [destination for _, _, destination in interpreters]
+    if len(set(destinations)) != len(destinations):
+        logger.fatal(
+            "ERROR: The environments of %s would share a DEST_DIR, name them apart with {version}", ", ".join(pythons)
+        )
+        sys.exit(2)
+
+    env = os.environ.copy()
+    env["VIRTUALENV_INTERPRETER_RUNNING"] = "true"
+
+    def create(job):
+        interpreter, version, destination = job
+        arguments = [arg.replace("{version}", version) for arg in sys.argv[1:]]
+        start = time.time()
+        process = subprocess.Popen(
+            [interpreter, virtualenv_script()] + arguments,
+            env=env,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            universal_newlines=True,
+        )
+        output = process.communicate()[0]
+        return process.returncode, time.time() - start, output
+
+    start = time.time()
+    outcomes = threaded_map(create, interpreters, workers=len(interpreters))
+    failed = broken
+    for (interpreter, _, destination), (code, elapsed, output) in zip(interpreters, outcomes):
+        if code:
+            failed += 1
+            logger.error("FAILED  %s with %s after %.2fs (exit code %s):", destination, interpreter, elapsed, code)
+        else:
+            logger.notify("created %s with %s in %.2fs", destination, interpreter, elapsed)
+        # what the failed ones had to say is shown, the rest with --verbose
+        logger.indent += 2
+        try:
+            for line in output.splitlines():
+                logger.log(Logger.ERROR if code else Logger.INFO, line)
+        finally:
+            logger.indent -= 2
+    logger.notify("%d of %d environments created in %.2fs", len(pythons) - failed, len(pythons), time.time() - start)
+    return not failed
+
+
 def call_subprocess(
     cmd,
     show_stdout=True,
@@ -830,6 +1443,9 @@ def call_subprocess(
     else:
         stdout = subprocess.PIPE
     logger.debug("Running command {}".format(cmd_desc))
+    if os.environ.get("__PYVENV_LAUNCHER__"):
+        # it would make the python of the environment (OS X framework builds) act as the one it was copied from
+        remove_from_env = list(remove_from_env or []) + ["__PYVENV_LAUNCHER__"]
     if extra_env or remove_from_env:
         env = os.environ.copy()
         if extra_env:
@@ -937,11 +1553,18 @@ def install_wheel(project_names, py_executable, search_dirs=None, download=False
             yield search_dirs
 
     with search_dirs_context() as search_dirs:
+        if current_plan() is not None:
+            # pip is not run, the unpacked size of the local wheels estimates what it would install
+            for wheel in find_wheels(project_names, search_dirs):
+                with zipfile.ZipFile(wheel) as archive:
+                    size = sum(info.file_size for info in archive.infolist())
+                planned("install", wheel, by=py_executable, bytes=size, download=download)
+            return
         _install_wheel_with_search_dir(download, project_names, py_executable, search_dirs)
 
 
 def _install_wheel_with_search_dir(download, project_names, py_executable, search_dirs):
-    wheels = find_wheels(["setuptools", "pip"], search_dirs)
+    wheels = cached(("wheels", tuple(search_dirs)), lambda: find_wheels(["setuptools", "pip"], search_dirs))
     python_path = os.pathsep.join(wheels)
 
     # PIP_FIND_LINKS uses space as the path separator and thus cannot have paths
@@ -966,7 +1589,8 @@ def _install_wheel_with_search_dir(download, project_names, py_executable, searc
     if IS_JYTHON:
         extra_args.append("--no-cache")
 
-    config = _pip_config(py_executable, python_path)
+    # read by the new interpreter, but the same for every new environment
+    config = cached(("pip-config", python_path), lambda: _pip_config(py_executable, python_path))
     defined_cert = bool(config.get("install.cert") or config.get(":env:.cert") or config.get("global.cert"))
 
     script = textwrap.dedent(
@@ -1060,6 +1684,9 @@ def create_environment(
     no_pip=False,
     no_wheel=False,
     symlink=True,
+    venv_style=False,
+    relocatable=False,
+    record=True,
 ):
     """
     Creates a new environment in ``home_dir``.
@@ -1069,14 +1696,133 @@ def create_environment(
 
     If ``clear`` is true (default False) then the environment will
     first be cleared.
+
+    If ``venv_style`` is true the environment is laid out like the venv
+    module does it (Python 3 only): a ``pyvenv.cfg`` instead of a custom
+    ``site.py`` and links to the standard library.
+
+    If ``relocatable`` is true the environment keeps working after being
+    moved: the activation scripts find it from their own location and the
+    scripts and ``.pth`` files of the seeded packages are made relative.
+
+    If ``record`` is true (the default) the installation of the interpreter
+    is replayed from the one recorded in ``PLAN_CACHE_DIR``, or recorded there
+    for the next creations.
+
+    The creation holds a lock on ``home_dir``: a concurrent creation of the
+    same environment waits for it, and then uses it if it was created with
+    the same options. The steps are journaled in the environment, so that the
+    next creation with the same options resumes an interrupted one after its
+    last completed step.
     """
-    home_dir, lib_dir, inc_dir, bin_dir = path_locations(home_dir)
+    options = dict(
+        site_packages=site_packages,
+        clear=clear,
+        prompt=prompt,
+        search_dirs=search_dirs,
+        download=download,
+        no_setuptools=no_setuptools,
+        no_pip=no_pip,
+        no_wheel=no_wheel,
+        symlink=symlink,
+        venv_style=venv_style,
+        relocatable=relocatable,
+        record=record,
+    )
+    target = path_locations(home_dir, dry_run=True)[0]
+    if current_plan() is not None:
+        # a dry run plans the creation right at its target, with no lock or journal
+        _build_environment(target, None, **options)
+        return
+    digest = journal_digest(options)
+    with environment_lock(target) as waited:
+        if waited and not clear:
+            created = Journal.completed(join(target, JOURNAL_NAME))
+            if created == digest:
+                logger.notify("Using %s, created by another virtualenv meanwhile", target)
+                return
+            if created is not None:
+                logger.notify("%s was created meanwhile by another virtualenv with other options, updating it", target)
+        _build_environment(target, digest, **options)
 
-    py_executable = os.path.abspath(
-        install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages=site_packages, clear=clear, symlink=symlink)
+
+def _build_environment(
+    home_dir,
+    digest,
+    site_packages,
+    clear,
+    prompt,
+    search_dirs,
+    download,
+    no_setuptools,
+    no_pip,
+    no_wheel,
+    symlink,
+    venv_style,
+    relocatable,
+    record,
+):
+    """
+    Create the environment in ``home_dir`` in place, return its (normalized)
+    location. The steps are journaled so that an interrupted creation with
+    the options of ``digest`` resumes at the first step it did not complete
+    (with no ``digest`` they are not).
+    """
+    home_dir, lib_dir, inc_dir, bin_dir = path_locations(home_dir)
+    mkdir(home_dir)
+    # the installation of the interpreter into an empty directory is recorded, to be replayed by later creations
+    replayable = (
+        record
+        and current_plan() is None
+        and not IS_JYTHON
+        and not [name for name in os.listdir(home_dir) if name not in (JOURNAL_NAME, LOCK_NAME)]
     )
+    journal = Journal(home_dir, digest, clear=clear)
+
+    def install():
+        if venv_style:
+            return os.path.abspath(
+                install_venv_python(
+                    home_dir, lib_dir, bin_dir, site_packages=site_packages, clear=clear, symlink=symlink
+                )
+            )
+        if not replayable:
+            py_executable = os.path.abspath(
+                install_python(
+                    home_dir, lib_dir, inc_dir, bin_dir, site_packages=site_packages, clear=clear, symlink=symlink
+                )
+            )
+            install_distutils(home_dir)
+            return py_executable
+        plan_filename = cached(("plan", site_packages, symlink), lambda: python_plan_filename(site_packages, symlink))
+        try:
+            py_executable = replay_python(plan_filename, home_dir, symlink)
+        except (IOError, OSError) as error:
+            # what the recording refers to changed, the installation is done the usual way into the emptied directory
+            logger.notify("Could not replay the recorded installation (%s), installing %s", error, sys.executable)
+            forget(("recording", plan_filename))
+            if os.path.exists(plan_filename):
+                os.remove(plan_filename)
+            empty_directory(home_dir, keep=[JOURNAL_NAME, LOCK_NAME])
+            py_executable = None
+        if py_executable is not None:
+            return py_executable
+        with recording() as plan:
+            py_executable = os.path.abspath(
+                install_python(
+                    home_dir, lib_dir, inc_dir, bin_dir, site_packages=site_packages, clear=clear, symlink=symlink
+                )
+            )
+            install_distutils(home_dir)
+        record_python(plan, home_dir, py_executable, plan_filename)
+        return py_executable
 
-    install_distutils(home_dir)
+    def installed(py_executable):
+        if venv_style:
+            return [py_executable, join(home_dir, "pyvenv.cfg")]
+        return [py_executable, join(lib_dir, "site.py"), join(lib_dir, "orig-prefix.txt"), join(lib_dir, "distutils")]
+
+    py_executable = journal.run(0, "python", installed, install)
 
     to_install = []
 
@@ -1089,82 +1835,519 @@ def create_environment(
     if not no_wheel:
         to_install.append("wheel")
 
+    def seeded(_):
+        return [join(lib_dir, "site-packages")]
+
+    def activated(_):
+        return [join(bin_dir, name) for name in sorted(os.listdir(bin_dir)) if name.startswith("activate")]
+
+    def configured(_):
+        return [join(bin_dir, "python-config")]
+
     if to_install:
-        install_wheel(to_install, py_executable, search_dirs, download=download)
+        journal.run(1, "seed", seeded, install_wheel, to_install, py_executable, search_dirs, download=download)
 
-    install_activate(home_dir, bin_dir, prompt)
+    journal.run(2, "activate", activated, install_activate, home_dir, bin_dir, prompt, relocatable=relocatable)
 
-    install_python_config(home_dir, bin_dir, prompt)
+    # the precomputed python-config answers hold the absolute paths of the environment
+    config_executable = None if relocatable else py_executable
+    journal.run(3, "python-config", configured, install_python_config, home_dir, bin_dir, prompt, config_executable)
 
+    if relocatable and not planned("relocate", home_dir):
+        fixup_scripts(home_dir, bin_dir, sh_launcher=True)
+        fixup_pth_and_egg_link(home_dir)
+    journal.complete()
+    return home_dir
 
-def is_executable_file(fpath):
-    return os.path.isfile(fpath) and is_executable(fpath)
 
+class EnvironmentBuilder(object):
+    """
+    Creates any number of environments for the running interpreter, from one
+    or more threads. What does not depend on the environment (the prefixes of
+    the interpreter, its bootstrap modules and recorded installation, the
+    wheels found in ``search_dirs`` and the pip configuration) is looked up
+    once and kept for later creations. ``search_dirs`` defaults to the wheels
+    bundled with virtualenv, the keyword arguments to the options of
+    ``create_environment`` every creation uses. It logs to its own ``logger``
+    (warnings on stderr by default) and leaves the module logger, the working
+    directory and the environment variables of the process alone.
+    """
 
-def path_locations(home_dir, dry_run=False):
-    """Return the path locations for the environment (where libraries are,
-    where scripts go, etc)"""
-    home_dir = os.path.abspath(home_dir)
-    lib_dir, inc_dir, bin_dir = None, None, None
-    # XXX: We'd use distutils.sysconfig.get_python_inc/lib but its
-    # prefix arg is broken: http://bugs.python.org/issue3386
-    if IS_WIN:
-        # Windows has lots of problems with executables with spaces in
-        # the name; this function will remove them (using the ~1
-        # format):
-        if not dry_run:
-            mkdir(home_dir)
-        if " " in home_dir:
-            import ctypes
+    def __init__(self, search_dirs=None, logger=None, **defaults):
+        self.logger = Logger([(Logger.WARN, sys.stderr)]) if logger is None else logger
+        self.defaults = defaults
+        self._search_dirs = search_dirs
+        self._support_dirs = None
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Release the bundled wheels (extracted to a temporary directory when running from a zipapp)"""
+        with self._lock:
+            support_dirs, self._support_dirs = self._support_dirs, None
+        if support_dirs is not None:
+            support_dirs.__exit__(None, None, None)
+
+    @property
+    def search_dirs(self):
+        with self._lock:
+            if self._search_dirs is None:
+                self._support_dirs = virtualenv_support_dirs()
+                self._search_dirs = self._support_dirs.__enter__()
+            return self._search_dirs
+
+    def cached(self, key, compute):
+        with self._lock:
+            if key in self._cache:
+                return self._cache[key]
+        # computed unlocked, so that other creations are not held up; a concurrent one may compute it too
+        value = compute()
+        if value is None:
+            return value
+        with self._lock:
+            return self._cache.setdefault(key, value)
+
+    def forget(self, key):
+        with self._lock:
+            self._cache.pop(key, None)
+
+    def create(self, home_dir, **options):
+        """Create the environment ``home_dir`` like ``create_environment`` does, return its ``EnvironmentResult``"""
+        options = dict(self.defaults, **options)
+        if options.get("search_dirs") is None:
+            options["search_dirs"] = self.search_dirs
+        # each creation gets a logger of its own, for its indentation and progress
+        context = _BuildContext(self, Logger(self.logger.consumers))
+        previous = getattr(_building, "context", None)
+        _building.context = context
+        start = time.time()
+        try:
+            create_environment(home_dir, **options)
+        finally:
+            _building.context = previous
+        context.timings["total"] = time.time() - start
+        home_dir, lib_dir, inc_dir, bin_dir = path_locations(home_dir, dry_run=True)
+        executable = join(bin_dir, EXPECTED_EXE + (".exe" if IS_WIN else ""))
+        projects = [name for name in ("setuptools", "pip", "wheel") if not options.get("no_{}".format(name))]
+        seed_versions = installed_versions(join(lib_dir, "site-packages"), projects)
+        return EnvironmentResult(home_dir, lib_dir, inc_dir, bin_dir, executable, context.timings, seed_versions)
 
-            get_short_path_name = ctypes.windll.kernel32.GetShortPathNameW
-            size = max(len(home_dir) + 1, 256)
-            buf = ctypes.create_unicode_buffer(size)
-            try:
-                # noinspection PyUnresolvedReferences
-                u = unicode
-            except NameError:
-                u = str
-            ret = get_short_path_name(u(home_dir), buf, size)
-            if not ret:
-                print('Error: the path "{}" has a space in it'.format(home_dir))
-                print("We could not determine the short pathname for it.")
-                print("Exiting.")
-                sys.exit(3)
-            home_dir = str(buf.value)
-        lib_dir = join(home_dir, "Lib")
-        inc_dir = join(home_dir, "Include")
-        bin_dir = join(home_dir, "Scripts")
-    if IS_JYTHON:
-        lib_dir = join(home_dir, "Lib")
-        inc_dir = join(home_dir, "Include")
-        bin_dir = join(home_dir, "bin")
-    elif IS_PYPY:
-        lib_dir = home_dir
-        inc_dir = join(home_dir, "include")
-        bin_dir = join(home_dir, "bin")
-    elif not IS_WIN:
-        lib_dir = join(home_dir, "lib", PY_VERSION)
-        inc_dir = join(home_dir, "include", PY_VERSION + ABI_FLAGS)
-        bin_dir = join(home_dir, "bin")
-    return home_dir, lib_dir, inc_dir, bin_dir
 
+class _BuildContext(object):
+    """The state of an environment being created by an EnvironmentBuilder"""
 
-def change_prefix(filename, dst_prefix):
-    prefixes = [sys.prefix]
+    def __init__(self, builder, logger):
+        self.builder = builder
+        self.logger = logger
+        self.timings = {}
 
-    if IS_DARWIN:
-        prefixes.extend(
-            (
-                os.path.join("/Library/Python", sys.version[:3], "site-packages"),
-                os.path.join(sys.prefix, "Extras", "lib", "python"),
-                os.path.join("~", "Library", "Python", sys.version[:3], "site-packages"),
-                # Python 2.6 no-frameworks
-                os.path.join("~", ".local", "lib", "python", sys.version[:3], "site-packages"),
-                # System Python 2.7 on OSX Mountain Lion
-                os.path.join("~", "Library", "Python", sys.version[:3], "lib", "python", "site-packages"),
-            )
-        )
+
+class EnvironmentResult(object):
+    """
+    An environment created by an EnvironmentBuilder: its paths and python
+    ``executable``, how long each creation step took in seconds (``total`` for
+    all of them) and the versions of the seeded projects
+    """
+
+    def __init__(self, home_dir, lib_dir, inc_dir, bin_dir, executable, timings, seed_versions):
+        self.home_dir = home_dir
+        self.lib_dir = lib_dir
+        self.inc_dir = inc_dir
+        self.bin_dir = bin_dir
+        self.executable = executable
+        self.timings = timings
+        self.seed_versions = seed_versions
+
+    def __repr__(self):
+        return "<EnvironmentResult {!r} {!r}>".format(self.home_dir, self.seed_versions)
+
+
+def installed_versions(site_packages, projects):
+    """The version of each of the ``projects`` installed in ``site_packages``, as found in its dist-info name"""
+    versions = {}
+    if not os.path.isdir(site_packages):
+        return versions
+    for name in os.listdir(site_packages):
+        if name.endswith(".dist-info"):
+            project, _, version = name[: -len(".dist-info")].partition("-")
+            if project.lower() in projects:
+                versions[project.lower()] = version
+    return versions
+
+
+@contextlib.contextmanager
+def environment_lock(home_dir):
+    """
+    Hold an advisory lock on the environment ``home_dir``, on a
+    .NAME.virtualenv-lock file next to it (or a .virtualenv-lock file within
+    it, when its directory is not writable), waiting for other holders;
+    yields whether it had to wait. The file is removed on release. Where the
+    platform can not lock (Jython) it does not lock.
+    """
+    parent, name = os.path.split(os.path.abspath(home_dir))
+    if not os.path.isdir(parent):
+        os.makedirs(parent)
+    path = join(parent, ".{}.virtualenv-lock".format(name))
+    try:
+        open(path, "a").close()
+    except (IOError, OSError) as error:
+        inside = join(home_dir, LOCK_NAME)
+        try:
+            open(inside, "a").close()
+        except (IOError, OSError):
+            logger.fatal("Cannot lock the environment %s: %s", home_dir, error)
+            raise SystemExit(3)
+        logger.info("Cannot create %s (%s), locking with %s", path, error, inside)
+        path = inside
+    try:
+        import fcntl
+    except ImportError:
+        fcntl = None
+    try:
+        import msvcrt
+    except ImportError:
+        msvcrt = None
+    waited = False
+    while True:
+        lock_file = open(path, "a")
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                elif msvcrt is not None:
+                    msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except (IOError, OSError):
+                if not waited:
+                    logger.notify("Waiting for another virtualenv to finish with %s", home_dir)
+                    waited = True
+                time.sleep(0.1)
+        # the previous holder may have removed the file while this one waited on it, the lock is then on a new one
+        if fcntl is None or same_file(lock_file, path):
+            break
+        lock_file.close()
+    try:
+        yield waited
+    finally:
+        if fcntl is not None:
+            os.remove(path)
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            lock_file.close()
+        else:
+            if msvcrt is not None:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            lock_file.close()
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # still open by a waiting virtualenv, which removes it in turn
+
+
+def same_file(file_handler, path):
+    """Whether the open ``file_handler`` is the file at ``path``"""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    opened = os.fstat(file_handler.fileno())
+    return (opened.st_dev, opened.st_ino) == (st.st_dev, st.st_ino)
+
+
+# the steps completed so far by an unfinished creation are kept in this file of the environment
+JOURNAL_NAME = ".virtualenv-journal"
+# the lock of an environment whose directory is not writable is this file within it, see environment_lock
+LOCK_NAME = ".virtualenv-lock"
+
+
+def journal_digest(options):
+    """Digest of what an environment is built from: this virtualenv, the interpreter and the creation ``options``"""
+    key = repr((__version__, sys.executable, sys.version, sorted(options.items())))
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+
+def fingerprint(paths):
+    """
+    Cheap digest of the current state of ``paths``, built from the stat of the
+    files and the names within the directories: their content is not read
+    """
+    parts = []
+    for path in paths:
+        try:
+            st = os.lstat(path)
+        except OSError:
+            parts.append((path, None))
+            continue
+        if os.path.isdir(path):
+            parts.append((path, sorted(os.listdir(path))))
+        else:
+            parts.append((path, st.st_mode, st.st_size, int(st.st_mtime * 1000)))
+    return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+
+class Journal(object):
+    """
+    An append-only record, one JSON line each, of the creation steps completed
+    in ``home_dir`` with a fingerprint of their outputs, and of the paths a
+    step makes, logged before it makes them. Steps are re-run from the first
+    one that is missing, or whose outputs changed since, once what the steps
+    left unfinished made is deleted; once the environment is complete only the
+    ``digest`` of its options is kept. Without a ``digest`` the steps are just
+    run.
+    """
+
+    def __init__(self, home_dir, digest, clear=False):
+        self.filename = None if digest is None else join(home_dir, JOURNAL_NAME)
+        self.digest = digest
+        self.step = None
+        if clear or digest is None:
+            self.done, leftovers = {}, []
+        else:
+            self.done, leftovers = self.load(self.filename, digest)
+        remove_leftovers(home_dir, leftovers)
+        self.resuming = bool(self.done)
+        if self.resuming:
+            logger.notify("Resuming the interrupted creation of %s", home_dir)
+        else:
+            self._append({"journal": digest}, mode="w")
+
+    @staticmethod
+    def read(filename, digest):
+        """Return the steps recorded in the journal ``filename`` as name: record, or nothing if not for ``digest``"""
+        return Journal.load(filename, digest)[0]
+
+    @staticmethod
+    def load(filename, digest):
+        """
+        Return the steps completed according to the journal ``filename`` as
+        name: record, and the paths made by the steps that did not complete,
+        or nothing if it is not for ``digest``
+        """
+        try:
+            with open(filename) as file_handler:
+                content = file_handler.read()
+        except (IOError, OSError):
+            return {}, []
+        # a line being written when the creation was interrupted is incomplete, and so is ignored
+        lines = content.split("\n")[:-1]
+        records = []
+        for line in lines:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                break
+        if not records or records[0].get("journal") != digest or records[0].get("complete"):
+            return {}, []
+        done, made = {}, {}
+        for record in records[1:]:
+            # re-running a step means the ones after it are to be re-run too
+            later = record["index"] - 1 if "made" in record else record["index"]
+            for name in [name for name, other in done.items() if other["index"] > later]:
+                del done[name]
+            if "made" in record:
+                made.setdefault(record["step"], []).append(record["made"])
+            else:
+                made.pop(record["step"], None)
+                done[record["step"]] = record
+        return done, [path for paths in made.values() for path in paths]
+
+    @staticmethod
+    def completed(filename):
+        """Return the digest of the options the environment of the journal ``filename`` was completed with, if it was"""
+        try:
+            with open(filename) as file_handler:
+                header = json.loads(file_handler.readline())
+        except (IOError, OSError, ValueError):
+            return None
+        return header.get("journal") if header.get("complete") else None
+
+    def _append(self, record, mode="a"):
+        if self.filename is None:
+            return
+        with open(self.filename, mode) as file_handler:
+            file_handler.write(json.dumps(record, sort_keys=True) + "\n")
+
+    def making(self, op, path):
+        """Log that the running step is about to make ``path`` (see ``planned``)"""
+        if self.step is not None and op in ("mkdir", "symlink", "copy", "write", "generate"):
+            index, name = self.step
+            self._append({"index": index, "step": name, "made": path})
+
+    def run(self, index, name, outputs, func, *args, **kwargs):
+        """
+        Run the step ``func(*args, **kwargs)``, unless the journal holds it as
+        completed and ``outputs(result)`` still has the recorded fingerprint;
+        return its result (the recorded one for a skipped step)
+        """
+        record = self.done.get(name) if self.resuming else None
+        if record is not None and record["index"] == index:
+            if fingerprint(outputs(record["result"])) == record["fingerprint"]:
+                logger.info("Skipping %s, done before the interruption", name)
+                return record["result"]
+            logger.notify("The output of %s changed since the interruption, resuming from it", name)
+        self.resuming = False
+        start = time.time()
+        if self.filename is not None:
+            self.step, _planning.journal = (index, name), self
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            self.step, _planning.journal = None, None
+        context = getattr(_building, "context", None)
+        if context is not None:
+            context.timings[name] = time.time() - start
+        if self.filename is not None:
+            record = {"index": index, "step": name, "result": result, "fingerprint": fingerprint(outputs(result))}
+            self._append(record)
+        return result
+
+    def complete(self):
+        self._append({"journal": self.digest, "complete": True}, mode="w")
+
+
+def remove_leftovers(home_dir, paths):
+    """Delete the ``paths`` within ``home_dir`` an interrupted creation made, the last made first"""
+    prefix = os.path.join(home_dir, "")
+    for path in reversed(paths):
+        if not path.startswith(prefix) or not os.path.lexists(path):
+            continue
+        logger.info("Deleting %s, left by the interrupted creation", path)
+        if os.path.isdir(path) and not os.path.islink(path):
+            shutil.rmtree(path)
+        else:
+            os.remove(path)
+
+
+def activation_variables(home_dir):
+    """
+    Return what activating the environment in ``home_dir`` changes, the way
+    sourcing ``bin/activate`` does it: the variables to ``set``, the ones to
+    ``unset`` and the directories to ``path_prepend`` to ``PATH``.
+    """
+    home_dir, lib_dir, inc_dir, bin_dir = path_locations(home_dir, dry_run=True)
+    return {"set": {"VIRTUAL_ENV": home_dir}, "unset": ["PYTHONHOME"], "path_prepend": [bin_dir]}
+
+
+def activated_environ(home_dir, environ=None):
+    """
+    Return a copy of ``environ`` (``os.environ`` by default) with the
+    environment in ``home_dir`` activated, see ``activation_variables``.
+    """
+    environ = dict(os.environ if environ is None else environ)
+    variables = activation_variables(home_dir)
+    path = environ.get("PATH", "").split(os.pathsep) if environ.get("PATH") else []
+    if environ.get("VIRTUAL_ENV"):
+        # an already active environment is deactivated first
+        active_bin_dirs = activation_variables(environ["VIRTUAL_ENV"])["path_prepend"]
+        path = [entry for entry in path if entry not in active_bin_dirs]
+    environ.update(variables["set"])
+    environ["PATH"] = os.pathsep.join(variables["path_prepend"] + path)
+    for name in variables["unset"]:
+        environ.pop(name, None)
+    return environ
+
+
+def run_in_environment(home_dir, cmd, environ=None):
+    """
+    Run ``cmd`` (a list of arguments) with the environment in ``home_dir``
+    activated, without going through a shell.
+
+    The current process is replaced by the command; on Windows, where exec
+    does not keep the process, the command runs as a child and its exit code
+    is passed on.
+    """
+    bin_dir = path_locations(home_dir, dry_run=True)[3]
+    if not os.path.isdir(bin_dir):
+        logger.fatal("ERROR: {} is not a virtual environment (no {})".format(home_dir, bin_dir))
+        sys.exit(3)
+    env = activated_environ(home_dir, environ)
+    logger.info("Running %s in %s", " ".join(cmd), home_dir)
+    sys.stdout.flush()
+    try:
+        if IS_WIN:
+            raise SystemExit(subprocess.call(cmd, env=env))
+        os.execvpe(cmd[0], cmd, env)
+    except OSError:
+        e = sys.exc_info()[1]
+        logger.fatal("ERROR: could not run {}: {}".format(cmd[0], e))
+        sys.exit(127)
+
+
+def is_executable_file(fpath):
+    return os.path.isfile(fpath) and is_executable(fpath)
+
+
+def path_locations(home_dir, dry_run=False):
+    """Return the path locations for the environment (where libraries are,
+    where scripts go, etc)"""
+    home_dir = os.path.abspath(home_dir)
+    lib_dir, inc_dir, bin_dir = None, None, None
+    # XXX: We'd use distutils.sysconfig.get_python_inc/lib but its
+    # prefix arg is broken: http://bugs.python.org/issue3386
+    if IS_WIN:
+        # Windows has lots of problems with executables with spaces in
+        # the name; this function will remove them (using the ~1
+        # format):
+        if not dry_run:
+            mkdir(home_dir)
+        if " " in home_dir:
+            import ctypes
+
+            get_short_path_name = ctypes.windll.kernel32.GetShortPathNameW
+            size = max(len(home_dir) + 1, 256)
+            buf = ctypes.create_unicode_buffer(size)
+            try:
+                # noinspection PyUnresolvedReferences
+                u = unicode
+            except NameError:
+                u = str
+            ret = get_short_path_name(u(home_dir), buf, size)
+            if not ret:
+                print('Error: the path "{}" has a space in it'.format(home_dir))
+                print("We could not determine the short pathname for it.")
+                print("Exiting.")
+                sys.exit(3)
+            home_dir = str(buf.value)
+        lib_dir = join(home_dir, "Lib")
+        inc_dir = join(home_dir, "Include")
+        bin_dir = join(home_dir, "Scripts")
+    if IS_JYTHON:
+        lib_dir = join(home_dir, "Lib")
+        inc_dir = join(home_dir, "Include")
+        bin_dir = join(home_dir, "bin")
+    elif IS_PYPY:
+        lib_dir = home_dir
+        inc_dir = join(home_dir, "include")
+        bin_dir = join(home_dir, "bin")
+    elif not IS_WIN:
+        lib_dir = join(home_dir, "lib", PY_VERSION)
+        inc_dir = join(home_dir, "include", PY_VERSION + ABI_FLAGS)
+        bin_dir = join(home_dir, "bin")
+    return home_dir, lib_dir, inc_dir, bin_dir
+
+
+def source_prefixes():
+    """The prefixes of the interpreter files, longest first"""
+    prefixes = [sys.prefix]
+
+    if IS_DARWIN:
+        prefixes.extend(
+            (
+                os.path.join("/Library/Python", sys.version[:3], "site-packages"),
+                os.path.join(sys.prefix, "Extras", "lib", "python"),
+                os.path.join("~", "Library", "Python", sys.version[:3], "site-packages"),
+                # Python 2.6 no-frameworks
+                os.path.join("~", ".local", "lib", "python", sys.version[:3], "site-packages"),
+                # System Python 2.7 on OSX Mountain Lion
+                os.path.join("~", "Library", "Python", sys.version[:3], "lib", "python", "site-packages"),
+            )
+        )
 
     if hasattr(sys, "real_prefix"):
         prefixes.append(sys.real_prefix)
@@ -1174,13 +2357,18 @@ def change_prefix(filename, dst_prefix):
     prefixes = list(map(os.path.abspath, prefixes))
     # Check longer prefixes first so we don't split in the middle of a filename
     prefixes = sorted(prefixes, key=len, reverse=True)
+    for i, prefix in enumerate(prefixes):
+        if IS_WIN and prefix[0] in "abcdefghijklmnopqrstuvwxyz":
+            prefixes[i] = prefix[0].upper() + prefix[1:]
+    return prefixes
+
+
+def change_prefix(filename, dst_prefix):
+    prefixes = cached("prefixes", source_prefixes)
     filename = os.path.abspath(filename)
     # On Windows, make sure drive letter is uppercase
     if IS_WIN and filename[0] in "abcdefghijklmnopqrstuvwxyz":
         filename = filename[0].upper() + filename[1:]
-    for i, prefix in enumerate(prefixes):
-        if IS_WIN and prefix[0] in "abcdefghijklmnopqrstuvwxyz":
-            prefixes[i] = prefix[0].upper() + prefix[1:]
     for src_prefix in prefixes:
         if filename.startswith(src_prefix):
             _, relative_path = filename.split(src_prefix, 1)
@@ -1240,7 +2428,7 @@ def copy_required_modules(dst_prefix, symlink):
         if modname in sys.builtin_module_names:
             logger.info("Ignoring built-in bootstrap module: %s" % modname)
             continue
-        filename = find_module_filename(modname)
+        filename = cached(("module", modname), lambda: find_module_filename(modname))
         if filename is None:
             logger.info("Cannot import bootstrap module: %s" % modname)
         else:
@@ -1325,6 +2513,29 @@ def subst_path(prefix_path, prefix, home_dir):
     return prefix_path.replace(prefix, home_dir, 1)
 
 
+def relink_framework_python(py_executable, prefix):
+    """Make the copied framework python executable load the .Python dylib of the environment"""
+    # noinspection PyBroadException
+    try:
+        mach_o_change(py_executable, os.path.join(prefix, "Python"), "@executable_path/../.Python")
+    except Exception:
+        e = sys.exc_info()[1]
+        logger.warn("Could not call mach_o_change: %s. " "Trying to call install_name_tool instead.", e)
+        try:
+            call_subprocess(
+                [
+                    "install_name_tool",
+                    "-change",
+                    os.path.join(prefix, "Python"),
+                    "@executable_path/../.Python",
+                    py_executable,
+                ]
+            )
+        except Exception:
+            logger.fatal("Could not call install_name_tool -- you must " "have Apple's development tools installed")
+            raise
+
+
 def install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages, clear, symlink=True):
     """Install just the base environment, no distutils patches etc"""
     if sys.executable.startswith(bin_dir):
@@ -1332,7 +2543,7 @@ def install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages, clear, sy
         return
 
     if clear:
-        rm_tree(lib_dir)
+        rm_tree(lib_dir, background=True)
         # FIXME: why not delete it?
         # Maybe it should delete everything with #!/path/to/venv/python in it
         logger.notify("Not deleting %s", bin_dir)
@@ -1346,6 +2557,11 @@ def install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages, clear, sy
     else:
         prefix = sys.prefix
     prefix = os.path.abspath(prefix)
+    pyvenv_cfg = join(home_dir, "pyvenv.cfg")
+    if os.path.exists(pyvenv_cfg):
+        # left over by a --venv-style creation, it would make the interpreter ignore our site.py
+        logger.info("Deleting %s", pyvenv_cfg)
+        remove_file(pyvenv_cfg)
     mkdir(lib_dir)
     fix_lib64(lib_dir, symlink)
     stdlib_dirs = [os.path.dirname(os.__file__)]
@@ -1380,7 +2596,7 @@ def install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages, clear, sy
         site_filename = site_filename.replace("$py.class", ".py")
     site_filename_dst = change_prefix(site_filename, home_dir)
     site_dir = os.path.dirname(site_filename_dst)
-    writefile(site_filename_dst, SITE_PY)
+    writefile(site_filename_dst, site_py_template(site_filename_dst))
     writefile(join(site_dir, "orig-prefix.txt"), prefix)
     site_packages_filename = join(site_dir, "no-global-site-packages.txt")
     if not site_packages:
@@ -1435,10 +2651,9 @@ def install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages, clear, sy
     mkdir(bin_dir)
     py_executable = join(bin_dir, os.path.basename(sys.executable))
     if "Python.framework" in prefix:
-        # OS X framework builds cause validation to break
+        # OS X framework builds cause validation to break, the processes run are given an
+        # environment without __PYVENV_LAUNCHER__ (see call_subprocess and check_executable)
         # https://github.com/pypa/virtualenv/issues/322
-        if os.environ.get("__PYVENV_LAUNCHER__"):
-            del os.environ["__PYVENV_LAUNCHER__"]
         if re.search(r"/Python(?:-32|-64)*$", py_executable):
             # The name of the python executable is not quite what
             # we want, rename it.
@@ -1454,26 +2669,26 @@ def install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages, clear, sy
     else:
         if os.path.exists(pyd_pth):
             logger.info("Deleting %s (not Windows env or not build directory python)", pyd_pth)
-            os.unlink(pyd_pth)
+            remove_file(pyd_pth)
 
     if sys.executable != py_executable:
         # FIXME: could I just hard link?
         executable = sys.executable
-        shutil.copyfile(executable, py_executable)
+        copy_executable(executable, py_executable)
         make_exe(py_executable)
         if IS_WIN or IS_CYGWIN:
             python_w = os.path.join(os.path.dirname(sys.executable), "pythonw.exe")
             if os.path.exists(python_w):
                 logger.info("Also created pythonw.exe")
-                shutil.copyfile(python_w, os.path.join(os.path.dirname(py_executable), "pythonw.exe"))
+                copy_executable(python_w, os.path.join(os.path.dirname(py_executable), "pythonw.exe"))
             python_d = os.path.join(os.path.dirname(sys.executable), "python_d.exe")
             python_d_dest = os.path.join(os.path.dirname(py_executable), "python_d.exe")
             if os.path.exists(python_d):
                 logger.info("Also created python_d.exe")
-                shutil.copyfile(python_d, python_d_dest)
+                copy_executable(python_d, python_d_dest)
             elif os.path.exists(python_d_dest):
                 logger.info("Removed python_d.exe as it is no longer at the source")
-                os.unlink(python_d_dest)
+                remove_file(python_d_dest)
 
             # we need to copy the DLL to enforce that windows will load the correct one.
             # may not exist if we are cygwin.
@@ -1494,13 +2709,13 @@ def install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages, clear, sy
                 python_dll_d_dest = os.path.join(os.path.dirname(py_executable), py_executable_dll_d)
                 if os.path.exists(python_dll):
                     logger.info("Also created %s", py_executable_dll)
-                    shutil.copyfile(python_dll, os.path.join(os.path.dirname(py_executable), py_executable_dll))
+                    copy_executable(python_dll, os.path.join(os.path.dirname(py_executable), py_executable_dll))
                 if os.path.exists(python_dll_d):
                     logger.info("Also created %s", py_executable_dll_d)
-                    shutil.copyfile(python_dll_d, python_dll_d_dest)
+                    copy_executable(python_dll_d, python_dll_d_dest)
                 elif os.path.exists(python_dll_d_dest):
                     logger.info("Removed %s as the source does not exist", python_dll_d_dest)
-                    os.unlink(python_dll_d_dest)
+                    remove_file(python_dll_d_dest)
         if IS_PYPY:
             # make a symlink python --> pypy-c
             python_executable = os.path.join(os.path.dirname(py_executable), "python")
@@ -1538,7 +2753,7 @@ def install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages, clear, sy
             )
         else:
             logger.notify("Also creating executable in %s", secondary_exe)
-            shutil.copyfile(sys.executable, secondary_exe)
+            copy_executable(sys.executable, secondary_exe)
             make_exe(secondary_exe)
 
     if ".framework" in prefix:
@@ -1554,36 +2769,19 @@ def install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages, clear, sy
         if "EPD" in prefix:
             logger.debug("EPD framework detected")
             original_python = os.path.join(prefix, "bin/python")
-        shutil.copy(original_python, py_executable)
+        copy_executable(original_python, py_executable)
 
         # Copy the framework's dylib into the virtual
         # environment
         virtual_lib = os.path.join(home_dir, ".Python")
 
         if os.path.exists(virtual_lib):
-            os.unlink(virtual_lib)
+            remove_file(virtual_lib)
         copyfile(os.path.join(prefix, "Python"), virtual_lib, symlink)
 
         # And then change the install_name of the copied python executable
-        # noinspection PyBroadException
-        try:
-            mach_o_change(py_executable, os.path.join(prefix, "Python"), "@executable_path/../.Python")
-        except Exception:
-            e = sys.exc_info()[1]
-            logger.warn("Could not call mach_o_change: %s. " "Trying to call install_name_tool instead.", e)
-            try:
-                call_subprocess(
-                    [
-                        "install_name_tool",
-                        "-change",
-                        os.path.join(prefix, "Python"),
-                        "@executable_path/../.Python",
-                        py_executable,
-                    ]
-                )
-            except Exception:
-                logger.fatal("Could not call install_name_tool -- you must " "have Apple's development tools installed")
-                raise
+        if not planned("relink", py_executable, src=os.path.join(prefix, "Python")):
+            relink_framework_python(py_executable, prefix)
 
     if not IS_WIN:
         # Ensure that 'python', 'pythonX' and 'pythonX.Y' all exist
@@ -1601,12 +2799,315 @@ def install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages, clear, sy
         for pth in required_symlinks:
             full_pth = join(bin_dir, pth)
             if os.path.exists(full_pth):
-                os.unlink(full_pth)
+                remove_file(full_pth)
             if symlink:
-                os.symlink(py_executable_base, full_pth)
+                make_symlink(py_executable_base, full_pth)
             else:
                 copyfile(py_executable, full_pth, symlink)
 
+    check_executable(py_executable, home_dir)
+
+    pydistutils = os.path.expanduser("~/.pydistutils.cfg")
+    if os.path.exists(pydistutils):
+        logger.notify("Please make sure you remove any previous custom paths from " "your %s file.", pydistutils)
+    # FIXME: really this should be calculated earlier
+
+    fix_local_scheme(home_dir, symlink)
+
+    if site_packages:
+        if os.path.exists(site_packages_filename):
+            logger.info("Deleting %s", site_packages_filename)
+            remove_file(site_packages_filename)
+
+    if not IS_JYTHON:
+        bake_site_constants(py_executable, site_filename_dst)
+        write_stdlib_index(py_executable, home_dir, site_dir)
+
+    return py_executable
+
+
+# stands for the environment location in recorded installations
+PLAN_PLACEHOLDER = "__VIRTUALENV_PREFIX__"
+# and for it with its backslashes doubled, the way the repr of a Windows path in the baked site.py holds it
+PLAN_ESCAPED_PLACEHOLDER = "__VIRTUALENV_ESCAPED_PREFIX__"
+
+
+def escaped_path(path):
+    """``path`` as it is within the repr of a string"""
+    return path.replace("\\", "\\\\")
+
+
+def python_plan_filename(site_packages, symlink):
+    """Where the installation of this interpreter into a new environment with these options is recorded"""
+    key = [__version__, sys.executable, sys.version, sys.prefix, site_packages, symlink]
+    # a changed interpreter, standard library or virtualenv invalidates the recording
+    for path in (sys.executable, os.path.dirname(os.__file__), __file__):
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        key.append((path, st.st_size, st.st_mtime))
+    return join(PLAN_CACHE_DIR, "{}.json".format(hashlib.sha1(repr(key).encode("utf-8")).hexdigest()))
+
+
+def replace_prefix(data, old, new):
+    """Replace the leading ``old`` by ``new`` in the strings within ``data`` that are ``old`` or a path below it"""
+    if isinstance(data, dict):
+        return dict((replace_prefix(key, old, new), replace_prefix(value, old, new)) for key, value in data.items())
+    if isinstance(data, (list, tuple)):
+        return type(data)(replace_prefix(value, old, new) for value in data)
+    if isinstance(data, basestring) and data.startswith(old) and data[len(old) : len(old) + 1] in ("", "/", os.sep):
+        return new + data[len(old) :]
+    return data
+
+
+def replace_path(content, path, placeholder):
+    """Replace ``path`` by ``placeholder`` in ``content``, where it is not merely the start of a longer name"""
+    # the same boundary as rewrite_prefix uses
+    return re.sub(re.escape(path) + r"(?![\w.-])", lambda _: placeholder, content)
+
+
+def record_python(plan, home_dir, py_executable, filename):
+    """
+    Save the operations of installing the interpreter into the new environment
+    ``home_dir`` recorded by ``plan`` into ``filename``: the paths within the
+    environment and the content of the files written there hold a placeholder
+    for its location. Installations depending on what was there before, or
+    writing files that are not text (but the standard library index), are not
+    recorded.
+    """
+    operations, written = [], set()
+    for operation in plan.operations:
+        op, path = operation["op"], operation["path"]
+        # the directory was empty, so what is removed is a link or copy made before (python next to python3.X)
+        if op not in ("mkdir", "symlink", "copy", "remove", "write", "generate", "chmod", "check") or (
+            op == "remove" and path in written
+        ):
+            logger.info("Not recording the installation into %s, it did %s %s", home_dir, op, path)
+            return
+        recorded = {"op": op, "path": replace_prefix(path, home_dir, PLAN_PLACEHOLDER)}
+        if op in ("symlink", "copy"):
+            recorded["src"] = replace_prefix(operation["src"], home_dir, PLAN_PLACEHOLDER)
+        elif op == "chmod":
+            recorded["mode"] = os.stat(path).st_mode & 0xFFF
+        elif op in ("write", "generate"):
+            # the final content is written once, where the file was first written
+            if path in written:
+                continue
+            written.add(path)
+            recorded["op"] = "write"
+            with open(path, "rb") as file_handler:
+                content = file_handler.read()
+            if os.path.basename(path) == "stdlib.index":
+                index = replace_prefix(marshal.loads(content), home_dir, PLAN_PLACEHOLDER)
+                recorded["marshal"] = base64.b64encode(marshal.dumps(index)).decode("ascii")
+            else:
+                try:
+                    content = content.decode("utf-8")
+                    if escaped_path(home_dir) != home_dir:
+                        content = replace_path(content, escaped_path(home_dir), PLAN_ESCAPED_PLACEHOLDER)
+                    recorded["content"] = replace_path(content, home_dir, PLAN_PLACEHOLDER)
+                except UnicodeDecodeError:
+                    logger.info("Not recording the installation into %s, %s is not text", home_dir, path)
+                    return
+        elif op == "check":
+            continue
+        operations.append(recorded)
+    recording = {"py_executable": replace_prefix(py_executable, home_dir, PLAN_PLACEHOLDER), "operations": operations}
+    if not os.path.isdir(PLAN_CACHE_DIR):
+        os.makedirs(PLAN_CACHE_DIR)
+    tmp = "{}.{}.{}.tmp".format(filename, os.getpid(), threading.current_thread().ident)
+    with open(tmp, "w") as file_handler:
+        json.dump(recording, file_handler)
+    if hasattr(os, "replace"):
+        os.replace(tmp, filename)
+    else:
+        if os.path.exists(filename):
+            os.remove(filename)
+        os.rename(tmp, filename)
+    logger.info("Recorded the installation of %s into %s", sys.executable, filename)
+    prune_plan_cache(PLAN_CACHE_SIZE)
+
+
+def prune_plan_cache(keep):
+    """Delete the recorded installations but the ``keep`` most recently used ones"""
+    recordings = []
+    for name in os.listdir(PLAN_CACHE_DIR):
+        if name.endswith(".json"):
+            try:
+                recordings.append((os.path.getmtime(join(PLAN_CACHE_DIR, name)), name))
+            except OSError:
+                pass  # pruned by another virtualenv meanwhile
+    for _, name in sorted(recordings, reverse=True)[keep:]:
+        logger.info("Deleting the recorded installation %s, unused for the longest", name)
+        try:
+            os.remove(join(PLAN_CACHE_DIR, name))
+        except OSError:
+            pass
+
+
+def load_recording(filename):
+    """The installation recorded in ``filename``, or None if there is none"""
+    try:
+        with open(filename) as file_handler:
+            return json.load(file_handler)
+    except (IOError, OSError, ValueError):
+        return None
+
+
+def replay_python(filename, home_dir, symlink=True):
+    """
+    Install the interpreter into the new environment ``home_dir`` by replaying
+    the operations recorded in ``filename``, with no module discovery or
+    standard library scan; return the python executable, or None when there is
+    no recording.
+    """
+    recording = cached(("recording", filename), lambda: load_recording(filename))
+    if recording is None:
+        return None
+    logger.notify("Replaying the recorded installation of %s", sys.executable)
+    try:
+        os.utime(filename, None)  # last used now, see prune_plan_cache
+    except OSError:
+        pass
+    for operation in recording["operations"]:
+        op, path = operation["op"], replace_prefix(operation["path"], PLAN_PLACEHOLDER, home_dir)
+        if op == "mkdir":
+            if not os.path.isdir(path):
+                os.makedirs(path)
+        elif op == "symlink":
+            src = replace_prefix(operation["src"], PLAN_PLACEHOLDER, home_dir)
+            try:
+                os.symlink(src, path)
+            except (OSError, NotImplementedError):
+                copy_file_or_folder(src, path, symlink)
+        elif op == "copy":
+            copy_file_or_folder(replace_prefix(operation["src"], PLAN_PLACEHOLDER, home_dir), path, symlink)
+        elif op == "remove":
+            os.remove(path)
+        elif op == "chmod":
+            os.chmod(path, operation["mode"])
+        elif "marshal" in operation:
+            index = marshal.loads(base64.b64decode(operation["marshal"].encode("ascii")))
+            with open(path, "wb") as file_handler:
+                marshal.dump(replace_prefix(index, PLAN_PLACEHOLDER, home_dir), file_handler)
+        else:
+            with open(path, "wb") as file_handler:
+                content = operation["content"].replace(PLAN_ESCAPED_PLACEHOLDER, escaped_path(home_dir))
+                file_handler.write(content.replace(PLAN_PLACEHOLDER, home_dir).encode("utf-8"))
+    py_executable = replace_prefix(recording["py_executable"], PLAN_PLACEHOLDER, home_dir)
+    logger.notify("New %s executable in %s", EXPECTED_EXE, py_executable)
+    check_executable(py_executable, home_dir)
+    return py_executable
+
+
+SITE_CONSTANTS_RE = re.compile(r"^SITE_CONSTANTS = .*$", re.M)
+
+
+def site_py_template(site_filename):
+    """The generic site.py, or the one already in place if it only differs by its baked constants"""
+    if os.path.exists(site_filename):
+        with open(site_filename, "rb") as file_handler:
+            content = file_handler.read().decode("utf-8")
+        if SITE_CONSTANTS_RE.sub("SITE_CONSTANTS = None", content, count=1) == SITE_PY:
+            return content
+    return SITE_PY
+
+
+def bake_site_constants(py_executable, site_filename):
+    """Bake what site.py computes on every start for this environment into it
+
+    The values are computed by the generic code inside the new interpreter; site.py falls
+    back to that code if the environment or its base interpreter moves later on."""
+    if planned("generate", site_filename, by=py_executable):
+        return
+    script = textwrap.dedent(
+        """
+        import os
+        import site
+        import sys
+
+        site_dir = os.path.dirname(site.__file__)
+        with open(os.path.join(site_dir, "orig-prefix.txt")) as file_handler:
+            sys.real_prefix = os.path.normpath(os.path.join(site_dir, file_handler.read().strip()))
+        print(repr({
+            "prefix": sys.prefix,
+            "version": sys.version,
+            "real_prefix": sys.real_prefix,
+            "main_paths": site.find_main_paths(),
+            "sitedirs": site.find_sitedirs(sys.prefix, sys.exec_prefix, candidates=True),
+        }))
+        """
+    ).encode("utf8")
+    output = call_subprocess([py_executable, "-"], show_stdout=False, raise_on_return_code=False, stdin=script)
+    try:
+        constants = ast.literal_eval("\n".join(output))
+    except (SyntaxError, ValueError):
+        logger.info("Could not determine the constants of %s, keeping the generic version", site_filename)
+        return
+    content = SITE_CONSTANTS_RE.sub(lambda _: "SITE_CONSTANTS = {!r}".format(constants), SITE_PY, count=1)
+    with open(site_filename, "rb") as file_handler:
+        if file_handler.read() == content.encode("utf-8"):
+            return
+    logger.info("Baking the environment constants into %s", site_filename)
+    with open(site_filename, "wb") as file_handler:
+        file_handler.write(content.encode("utf-8"))
+    # the generic version was compiled within the same second, Python 2 would keep using it
+    for compiled in (site_filename + "c", site_filename + "o"):
+        if os.path.exists(compiled):
+            os.unlink(compiled)
+
+
+def write_stdlib_index(py_executable, home_dir, site_dir):
+    """Index the top level standard library modules by the sys.path entry they live in
+
+    site.py uses this to import them without probing the environment directories (which
+    only hold the bootstrap modules) first."""
+    index_filename = join(site_dir, "stdlib.index")
+    if planned("generate", index_filename, by=py_executable):
+        return
+    if os.path.exists(index_filename):
+        os.unlink(index_filename)
+    script = textwrap.dedent(
+        """
+        import marshal
+        import os
+        import pkgutil
+        import sys
+
+        home_dir, index_filename = sys.argv[1:]
+        home_dir = os.path.normcase(os.path.realpath(home_dir))
+        covered, stdlib = [], []
+        for entry in sys.path[1:]:
+            if os.path.basename(entry) in ("site-packages", "dist-packages", "site-python"):
+                continue
+            if os.path.normcase(os.path.realpath(entry)).startswith(os.path.join(home_dir, "")):
+                covered.append(entry)
+            else:
+                stdlib.append(entry)
+        seen = set(sys.builtin_module_names)
+        for entry in covered:
+            seen.update(name for _, name, _ in pkgutil.iter_modules([entry]))
+        modules = {}
+        for entry in stdlib:
+            for _, name, _ in pkgutil.iter_modules([entry]):
+                if name not in seen:
+                    seen.add(name)
+                    modules[name] = entry
+        with open(index_filename, "wb") as file_handler:
+            marshal.dump({"modules": modules, "covered": covered}, file_handler)
+        """
+    ).encode("utf8")
+    logger.info("Indexing the standard library into %s", index_filename)
+    call_subprocess(
+        [py_executable, "-", home_dir, index_filename], show_stdout=False, raise_on_return_code=False, stdin=script
+    )
+
+
+def check_executable(py_executable, home_dir):
+    """Make sure the new executable runs and considers home_dir its sys.prefix"""
+    if planned("check", py_executable):
+        return
     cmd = [
         py_executable,
         "-c",
@@ -1614,7 +3115,9 @@ def install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages, clear, sy
     ]
     logger.info('Testing executable with %s %s "%s"', *cmd)
     try:
-        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE)
+        env = os.environ.copy()
+        env.pop("__PYVENV_LAUNCHER__", None)
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, env=env)
         proc_stdout, proc_stderr = proc.communicate()
     except OSError:
         e = sys.exc_info()[1]
@@ -1647,34 +3150,144 @@ def install_python(home_dir, lib_dir, inc_dir, bin_dir, site_packages, clear, sy
     else:
         logger.info("Got sys.prefix result: %r", proc_stdout)
 
-    pydistutils = os.path.expanduser("~/.pydistutils.cfg")
-    if os.path.exists(pydistutils):
-        logger.notify("Please make sure you remove any previous custom paths from " "your %s file.", pydistutils)
-    # FIXME: really this should be calculated earlier
 
-    fix_local_scheme(home_dir, symlink)
+def find_base_executable():
+    """The executable of the Python installation the running interpreter belongs to"""
+    base_prefix = getattr(sys, "real_prefix", getattr(sys, "base_prefix", sys.prefix))
+    if base_prefix == sys.prefix:
+        return sys.executable
+    base_executable = getattr(sys, "_base_executable", None)
+    if base_executable and not base_executable.startswith(sys.prefix) and os.path.exists(base_executable):
+        return base_executable
+    names = [os.path.basename(sys.executable), "python{}.{}".format(*sys.version_info[:2])]
+    for name in names:
+        for candidate in (join(base_prefix, "bin", name), join(base_prefix, name)):
+            if is_executable_file(candidate):
+                return candidate
+    return os.path.realpath(sys.executable)
+
+
+def install_venv_python(home_dir, lib_dir, bin_dir, site_packages, clear, symlink=True):
+    """Install the base environment the way the venv module does: a pyvenv.cfg
+    makes the interpreter itself pick up the environment, with the standard
+    library (and its site module) used straight from the base installation"""
+    if clear:
+        rm_tree(lib_dir, background=True)
+        logger.notify("Not deleting %s", bin_dir)
+    base_executable = find_base_executable()
+    logger.notify("Using base executable %r", base_executable)
+    mkdir(join(lib_dir, "site-packages"))
+    fix_lib64(lib_dir, symlink)
+    writefile(
+        join(home_dir, "pyvenv.cfg"),
+        "home = {}\ninclude-system-site-packages = {}\nversion = {}\nvirtualenv = {}\n".format(
+            os.path.dirname(base_executable),
+            "true" if site_packages else "false",
+            ".".join(str(i) for i in sys.version_info[:3]),
+            virtualenv_version,
+        ),
+    )
 
-    if site_packages:
-        if os.path.exists(site_packages_filename):
-            logger.info("Deleting %s", site_packages_filename)
-            os.unlink(site_packages_filename)
+    mkdir(bin_dir)
+    base_dir = os.path.dirname(base_executable)
+    if IS_WIN:
+        names = ["python.exe", "pythonw.exe", "python3.dll", "python{}{}.dll".format(*sys.version_info[:2])]
+        for name in names:
+            if os.path.exists(join(base_dir, name)):
+                copyfile(join(base_dir, name), join(bin_dir, name), symlink=False)
+        py_executable = join(bin_dir, "python.exe")
+    else:
+        py_executable = join(bin_dir, "python")
+        for name in ("python", "python{}".format(sys.version_info[0]), "python{}.{}".format(*sys.version_info[:2])):
+            dest = join(bin_dir, name)
+            if os.path.lexists(dest):
+                remove_file(dest)
+            if name == "python":
+                copyfile(base_executable, dest, symlink)
+                if not symlink:
+                    make_exe(dest)
+            elif symlink:
+                make_symlink("python", dest)
+            else:
+                copyfile(py_executable, dest, symlink=False)
+                make_exe(dest)
+    logger.notify("New %s executable in %s", EXPECTED_EXE, py_executable)
 
+    check_executable(py_executable, home_dir)
     return py_executable
 
 
-def install_activate(home_dir, bin_dir, prompt=None):
+# the absolute path the environment is created at stays in place as the fallback for shells that
+# can not tell where the sourced script is (plain sh, csh and xonsh); the prompts show the name of
+# the directory the environment is found in
+RELOCATABLE_ACTIVATE = {
+    "activate": [
+        (
+            "\nexport VIRTUAL_ENV\n",
+            """
+# relocatable environment: it is the parent of the directory holding this script
+_VIRTUAL_ENV_SCRIPT=""
+if [ -n "${BASH_SOURCE-}" ] ; then
+    _VIRTUAL_ENV_SCRIPT="$BASH_SOURCE"
+elif [ -n "${ZSH_VERSION-}" ] ; then
+    eval '_VIRTUAL_ENV_SCRIPT="${(%):-%x}"'
+fi
+if [ -n "$_VIRTUAL_ENV_SCRIPT" ] ; then
+    case "$_VIRTUAL_ENV_SCRIPT" in
+        /*) ;;
+        *) _VIRTUAL_ENV_SCRIPT="$PWD/${_VIRTUAL_ENV_SCRIPT#./}" ;;
+    esac
+    VIRTUAL_ENV="${_VIRTUAL_ENV_SCRIPT%/*/*}"
+fi
+unset _VIRTUAL_ENV_SCRIPT
+export VIRTUAL_ENV
+""",
+        ),
+        ("(__VIRTUAL_NAME__) ", "(${VIRTUAL_ENV##*/}) "),
+    ],
+    "activate.fish": [
+        (
+            'set -gx VIRTUAL_ENV "__VIRTUAL_ENV__"\n',
+            """# relocatable environment: it is the parent of the directory holding this script
+set -l _virtual_env_script (status --current-filename)
+if not string match -q '/*' -- $_virtual_env_script
+    set _virtual_env_script "$PWD/"(string replace -r '^\\./' '' -- $_virtual_env_script)
+end
+set -gx VIRTUAL_ENV (string replace -r '/[^/]*/[^/]*$' '' -- $_virtual_env_script)
+""",
+        ),
+        ('"__VIRTUAL_NAME__"', "(string replace -r '.*/' '' -- $VIRTUAL_ENV)"),
+    ],
+    "activate.bat": [
+        (
+            'set "VIRTUAL_ENV=__VIRTUAL_ENV__"',
+            'for %%i in ("%~dp0..") do set "VIRTUAL_ENV=%%~fi"\r\n'
+            'for %%i in ("%VIRTUAL_ENV%") do set "_VIRTUAL_ENV_NAME=%%~nxi"',
+        ),
+        ('set "PROMPT=__VIRTUAL_WINPROMPT__%PROMPT%"', 'set "PROMPT=__VIRTUAL_RELOCATABLE_WINPROMPT__%PROMPT%"'),
+        ("\nREM Don't use ()", '\nset "_VIRTUAL_ENV_NAME="\r\n\r\nREM Don\'t use ()'),
+    ],
+}
+
+
+def install_activate(home_dir, bin_dir, prompt=None, relocatable=False):
     if IS_WIN or IS_JYTHON and getattr(os, "_name", None) == "nt":
         files = {"activate.bat": ACTIVATE_BAT, "deactivate.bat": DEACTIVATE_BAT, "activate.ps1": ACTIVATE_PS}
 
-        # MSYS needs paths of the form /c/path/to/file
+        # MSYS needs paths of the form /c/path/to/file, Cygwin /cygdrive/c/path/to/file
         drive, tail = os.path.splitdrive(home_dir.replace(os.sep, "/"))
         home_dir_msys = (drive and "/{}{}" or "{}{}").format(drive[:1], tail)
-
-        # Run-time conditional enables (basic) Cygwin compatibility
-        home_dir_sh = """$(if [ "$OSTYPE" "==" "cygwin" ]; then cygpath -u '{}'; else echo '{}'; fi;)""".format(
-            home_dir, home_dir_msys
+        home_dir_cygwin = (drive and "/cygdrive/{}{}" or "{}{}").format(drive[:1].lower(), tail)
+
+        # Run-time conditional enables (basic) Cygwin compatibility, without running cygpath
+        files["activate"] = ACTIVATE_SH.replace(
+            'VIRTUAL_ENV="__VIRTUAL_ENV__"',
+            'if [ "${{OSTYPE-}}" = "cygwin" ] ; then\n'
+            '    VIRTUAL_ENV="{}"\n'
+            "else\n"
+            '    VIRTUAL_ENV="{}"\n'
+            "fi".format(home_dir_cygwin, home_dir_msys),
         )
-        files["activate"] = ACTIVATE_SH.replace("__VIRTUAL_ENV__", home_dir_sh)
 
     else:
         files = {
@@ -1689,7 +3302,53 @@ def install_activate(home_dir, bin_dir, prompt=None):
         # Add xonsh support
         files["activate.xsh"] = ACTIVATE_XSH
 
+    if relocatable:
+        for name, replacements in RELOCATABLE_ACTIVATE.items():
+            for marker, replacement in replacements:
+                if name in files:
+                    files[name] = files[name].replace(marker, replacement, 1)
+
     install_files(home_dir, bin_dir, prompt, files)
+    if relocatable:
+        # the static formats can only hold the path the environment is created at
+        logger.info("Not writing activate.json and activate.env for a relocatable environment")
+    else:
+        install_activation_exports(home_dir, bin_dir)
+
+
+# the PATH systemd starts services with, activate.env can not refer to the inherited one
+DEFAULT_SYSTEM_PATH = "/usr/local/sbin:/usr/local/bin:/usr/sbin:/usr/bin:/sbin:/bin"
+
+
+def install_activation_exports(home_dir, bin_dir):
+    """
+    Write the activated variables in static formats, for process supervisors
+    that can not source a shell script: ``activate.json`` with the changes as
+    returned by ``activation_variables`` and, on POSIX, ``activate.env`` with
+    KEY=VALUE lines as read by systemd's ``EnvironmentFile=``.
+    """
+    variables = activation_variables(home_dir)
+    writefile(
+        os.path.join(bin_dir, "activate.json"),
+        json.dumps(variables, indent=2, separators=(",", ": "), sort_keys=True) + "\n",
+    )
+    if IS_WIN:
+        return
+    lines = [
+        "# Variables set by activating this environment; PYTHONHOME must be unset.",
+        "# PATH is the environment's bin directory in front of the default system PATH.",
+    ]
+    for name, value in sorted(variables["set"].items()):
+        lines.append("{}={}".format(name, _env_file_value(value)))
+    path = os.pathsep.join(variables["path_prepend"] + [DEFAULT_SYSTEM_PATH])
+    lines.append("PATH={}".format(_env_file_value(path)))
+    writefile(os.path.join(bin_dir, "activate.env"), "\n".join(lines) + "\n")
+
+
+def _env_file_value(value):
+    if re.search(r"[\s\"'\\$`]", value):
+        return '"{}"'.format(value.replace("\\", "\\\\").replace('"', '\\"'))
+    return value
 
 
 def install_files(home_dir, bin_dir, prompt, files):
@@ -1699,6 +3358,7 @@ def install_files(home_dir, bin_dir, prompt, files):
     for name, content in files.items():
         content = content.replace("__VIRTUAL_PROMPT__", prompt or "")
         content = content.replace("__VIRTUAL_WINPROMPT__", prompt or "({}) ".format(virtualenv_name))
+        content = content.replace("__VIRTUAL_RELOCATABLE_WINPROMPT__", prompt or "(%_VIRTUAL_ENV_NAME%) ")
         content = content.replace("__VIRTUAL_ENV__", home_dir)
         content = content.replace("__VIRTUAL_NAME__", virtualenv_name)
         content = content.replace("__BIN_NAME__", os.path.basename(bin_dir))
@@ -1706,7 +3366,7 @@ def install_files(home_dir, bin_dir, prompt, files):
         writefile(os.path.join(bin_dir, name), content)
 
 
-def install_python_config(home_dir, bin_dir, prompt=None):
+def install_python_config(home_dir, bin_dir, prompt=None, py_executable=None):
     if sys.platform == "win32" or IS_JYTHON and getattr(os, "_name", None) == "nt":
         files = {}
     else:
@@ -1714,6 +3374,116 @@ def install_python_config(home_dir, bin_dir, prompt=None):
     install_files(home_dir, bin_dir, prompt, files)
     for name, _ in files.items():
         make_exe(os.path.join(bin_dir, name))
+    if files and py_executable is not None:
+        make_static_python_config(py_executable, os.path.join(bin_dir, "python-config"))
+
+
+def make_static_python_config(py_executable, config_filename):
+    """Replace the python-config script with a shell script printing precomputed answers
+
+    Every option is evaluated once by running the generic script inside the new interpreter, so
+    build systems calling python-config no longer start Python each time. The generic script is
+    kept if the answers cannot be determined."""
+    if planned("generate", config_filename, by=py_executable):
+        return
+    script = textwrap.dedent(
+        """
+        import sys
+
+        path = sys.argv[1]
+        with open(path) as file_handler:
+            code = compile(file_handler.read(), path, "exec")
+
+
+        class Capture(object):
+            def __init__(self):
+                self.parts = []
+
+            def write(self, text):
+                self.parts.append(text)
+
+            def flush(self):
+                pass
+
+
+        def evaluate(option):
+            namespace = {"__name__": "__main__"}
+            captured = Capture()
+            stdout, stderr = sys.stdout, sys.stderr
+            sys.argv, sys.stdout, sys.stderr = [path, option], captured, Capture()
+            try:
+                exec(code, namespace)
+            except SystemExit:
+                return namespace, None
+            finally:
+                sys.stdout, sys.stderr = stdout, stderr
+            return namespace, "".join(captured.parts)
+
+
+        valid_opts = evaluate("--help")[0]["valid_opts"]
+        answers = dict((opt, evaluate("--" + opt)[1]) for opt in valid_opts if opt != "help")
+        print(repr((valid_opts, answers)))
+        """
+    ).encode("utf8")
+    output = call_subprocess(
+        [py_executable, "-", config_filename], show_stdout=False, raise_on_return_code=False, stdin=script
+    )
+    try:
+        valid_opts, answers = ast.literal_eval("\n".join(output))
+    except (SyntaxError, ValueError):
+        logger.info("Could not evaluate %s, keeping the generic version", config_filename)
+        return
+    options = ["--{}".format(opt) for opt in valid_opts]
+    patterns = dict((opt, "|".join(_long_option_spellings(opt, valid_opts))) for opt in valid_opts)
+    lines = [
+        "#!/bin/sh",
+        "# answers computed when the environment was created, recreate it if its Python changes",
+        "",
+        "usage() {",
+        '    echo "Usage: $0 [{}]" >&2'.format("|".join(options)),
+        '    exit "$1"',
+        "}",
+        "",
+        "# like getopt, validate every option before answering and stop at the first non-option",
+        "seen=0",
+        'for opt in "$@" ; do',
+        '    case "$opt" in',
+        "        {}) usage 0 ;;".format(patterns["help"]),
+        "        {}) seen=1 ;;".format("|".join(patterns[opt] for opt in valid_opts if opt != "help")),
+        "        --|-) break ;;",
+        "        -*) usage 1 ;;",
+        "        *) break ;;",
+        "    esac",
+        "done",
+        '[ "$seen" = 1 ] || usage 1',
+        "",
+        'for opt in "$@" ; do',
+        '    case "$opt" in',
+    ]
+    for opt, answer in sorted(answers.items()):
+        if answer is None:
+            action = "usage 1"
+        else:
+            action = "printf '%s\\n' {}".format(_sh_quote(answer[:-1] if answer.endswith("\n") else answer))
+        lines.append("        {}) {} ;;".format(patterns[opt], action))
+    lines.extend(["        *) break ;;", "    esac", "done", ""])
+    logger.info("Writing the precomputed answers into %s", config_filename)
+    with open(config_filename, "wb") as file_handler:
+        file_handler.write("\n".join(lines).encode("utf-8"))
+
+
+def _long_option_spellings(opt, valid_opts):
+    """The ways getopt accepts the long option ``opt`` in: in full, or abbreviated to a prefix no other option has"""
+    spellings = ["--{}".format(opt)]
+    for end in range(len(opt) - 1, 0, -1):
+        if any(other != opt and other.startswith(opt[:end]) for other in valid_opts):
+            break
+        spellings.append("--{}".format(opt[:end]))
+    return spellings
+
+
+def _sh_quote(value):
+    return "'{}'".format(value.replace("'", "'\\''"))
 
 
 def install_distutils(home_dir):
@@ -1741,6 +3511,9 @@ def fix_local_scheme(home_dir, symlink=True):
         if sysconfig._get_default_scheme() == "posix_local":
             local_path = os.path.join(home_dir, "local")
             if not os.path.exists(local_path):
+                if planned("mkdir", local_path):
+                    # what it links to is not there yet to be listed
+                    return
                 os.mkdir(local_path)
                 for subdir_name in os.listdir(home_dir):
                     if subdir_name == "local":
@@ -1780,7 +3553,7 @@ def fix_lib64(lib_dir, symlink=True):
     if os.path.lexists(lib64_link):
         return
     if symlink:
-        os.symlink("lib", lib64_link)
+        make_symlink("lib", lib64_link)
     else:
         copyfile(lib_dir, lib64_link, symlink=False)
 
@@ -1830,6 +3603,230 @@ def make_environment_relocatable(home_dir):
     # FIXME: need to fix up distutils.cfg
 
 
+def move_environment(src, dest):
+    """
+    Move the environment in ``src`` to ``dest``, which must not exist, and
+    rewrite the absolute paths pointing into it in a single pass.
+    """
+    src, dest = os.path.abspath(src), os.path.abspath(dest)
+    bin_name = os.path.basename(path_locations(src, dry_run=True)[3])
+    if not os.path.exists(join(src, bin_name, "activate_this.py")):
+        logger.fatal("ERROR: %s is not an environment (it has no %s)", src, join(bin_name, "activate_this.py"))
+        sys.exit(3)
+    if os.path.lexists(dest):
+        logger.fatal("ERROR: %s already exists", dest)
+        sys.exit(3)
+    logger.notify("Moving %s to %s", src, dest)
+    try:
+        os.rename(src, dest)
+    except OSError as error:
+        if error.errno != errno.EXDEV:
+            raise
+        # another filesystem, copy and delete
+        shutil.move(src, dest)
+    rewrite_prefix(src, dest, join(dest, bin_name))
+
+
+def rewrite_prefix(old_home_dir, home_dir, bin_dir):
+    """
+    Rewrite the paths into ``old_home_dir`` to point into ``home_dir`` after
+    the environment moved there: in the scripts and activation files, the
+    .pth, .egg-link and RECORD files, orig-prefix.txt and the symlinks
+    virtualenv creates; the environment constants in site.py are baked again
+    and the caches derived from the old location dropped.
+    """
+    lib_dirs = environment_lib_dirs(home_dir)
+    activation = set()
+    files = []
+    for name in sorted(os.listdir(bin_dir)):
+        filename = join(bin_dir, name)
+        if name in ("activate.json", "activate.env") or not os.path.isfile(filename) or os.path.islink(filename):
+            continue
+        if name.startswith("activate"):
+            activation.add(filename)
+            files.append(filename)
+            continue
+        with open(filename, "rb") as f:
+            if f.read(2) == b"#!":
+                files.append(filename)
+    for lib_dir in lib_dirs:
+        site_packages = join(lib_dir, "site-packages")
+        files.extend(path for path in [join(lib_dir, "orig-prefix.txt")] if os.path.exists(path))
+        for found in find_pth_and_egg_links(home_dir, [site_packages]):
+            files.extend(found)
+        files.extend(sorted(glob.glob(join(site_packages, "*.dist-info", "RECORD"))))
+
+    encoding = sys.getfilesystemencoding() or "utf-8"
+    replacements = [(old_home_dir, home_dir)]
+    if IS_WIN:
+        # the MSYS and Cygwin forms of the bash activation script
+        old_drive, old_tail = os.path.splitdrive(old_home_dir.replace(os.sep, "/"))
+        new_drive, new_tail = os.path.splitdrive(home_dir.replace(os.sep, "/"))
+        if old_drive and new_drive:
+            for form, case in (("/{}{}", lambda drive: drive), ("/cygdrive/{}{}", lambda drive: drive.lower())):
+                replacements.append(
+                    (form.format(case(old_drive[:1]), old_tail), form.format(case(new_drive[:1]), new_tail))
+                )
+    # a path into the environment, not one that merely starts with the same characters
+    replacements = [
+        (re.compile(re.escape(old.encode(encoding)) + br"(?![\w.-])"), new.encode(encoding))
+        for old, new in replacements
+    ]
+    old_name, name = os.path.basename(old_home_dir), os.path.basename(home_dir)
+    # the default prompts of the activation scripts (see install_files)
+    prompts = [
+        ("({}) ".format(old_name).encode(encoding), "({}) ".format(name).encode(encoding)),
+        (
+            '(set_color normal) "{}"'.format(old_name).encode(encoding),
+            '(set_color normal) "{}"'.format(name).encode(encoding),
+        ),
+    ]
+
+    def rewrite(filename):
+        with open(filename, "rb") as f:
+            content = f.read()
+        new_content = content
+        for regex, new in replacements:
+            new_content = regex.sub(lambda _: new, new_content)
+        if filename in activation and old_name != name:
+            for old, new in prompts:
+                new_content = new_content.replace(old, new)
+        if new_content == content:
+            return False
+        replace_file(filename, new_content)
+        return True
+
+    for filename, rewritten in zip(files, threaded_map(rewrite, files)):
+        if rewritten:
+            logger.info("Rewrote the paths in %s", filename)
+
+    old_prefix = os.path.join(old_home_dir, "")
+    for folder in [home_dir, join(home_dir, "local"), bin_dir] + lib_dirs:
+        if not os.path.isdir(folder) or os.path.islink(folder):
+            continue
+        for name in os.listdir(folder):
+            link = join(folder, name)
+            if not os.path.islink(link):
+                continue
+            target = os.readlink(link)
+            if target == old_home_dir or target.startswith(old_prefix):
+                logger.info("Pointing the symlink %s into %s", link, home_dir)
+                os.remove(link)
+                os.symlink(home_dir + target[len(old_home_dir) :], link)
+
+    if os.path.exists(join(bin_dir, "activate.json")):
+        for name in ("activate.json", "activate.env"):
+            if os.path.exists(join(bin_dir, name)):
+                os.remove(join(bin_dir, name))
+        install_activation_exports(home_dir, bin_dir)
+    py_executable = join(bin_dir, EXPECTED_EXE)
+    for lib_dir in lib_dirs:
+        for cache in (join(lib_dir, "site.cache"), join(lib_dir, "site-packages", "pth-cache.pyc")):
+            if os.path.exists(cache):
+                os.remove(cache)
+        site_filename = join(lib_dir, "site.py")
+        if os.path.exists(site_filename):
+            with open(site_filename) as f:
+                baked = SITE_CONSTANTS_RE.search(f.read()) is not None
+            if baked:
+                bake_site_constants(py_executable, site_filename)
+        if os.path.exists(join(lib_dir, "stdlib.index")):
+            write_stdlib_index(py_executable, home_dir, lib_dir)
+    relocate_pyc(py_executable, [home_dir], old_home_dir, home_dir)
+
+
+def relocate_pyc(py_executable, folders, old_prefix, new_prefix):
+    """Rewrite the source path (``co_filename``) of the code objects in the
+    bytecode files below ``folders`` from ``old_prefix`` to ``new_prefix``
+
+    The files keep their header, so they stay valid for their sources and are
+    not recompiled; it runs in ``py_executable`` as the bytecode format is
+    specific to the interpreter. Symlinked directories are not followed."""
+    script = textwrap.dedent(
+        """
+        import marshal
+        import os
+        import shutil
+        import sys
+        import types
+
+        old_prefix, new_prefix = sys.argv[1:3]
+        if sys.version_info >= (3, 7):
+            header_size = 16  # magic, flags, then source mtime and size or source hash
+        elif sys.version_info >= (3, 3):
+            header_size = 12  # magic, source mtime and size
+        else:
+            header_size = 8  # magic, source mtime
+        try:
+            from importlib.util import MAGIC_NUMBER as magic
+        except ImportError:
+            import imp
+
+            magic = imp.get_magic()
+
+
+        def relocate(code):
+            consts = tuple(relocate(c) if isinstance(c, types.CodeType) else c for c in code.co_consts)
+            filename = code.co_filename
+            if filename == old_prefix or filename.startswith(os.path.join(old_prefix, "")):
+                filename = new_prefix + filename[len(old_prefix):]
+            # code objects compare equal regardless of their file name
+            if filename == code.co_filename and all(a is b for a, b in zip(consts, code.co_consts)):
+                return code
+            if hasattr(code, "replace"):
+                return code.replace(co_filename=filename, co_consts=consts)
+            args = [code.co_argcount]
+            if sys.version_info[0] >= 3:
+                args.append(code.co_kwonlyargcount)
+            args.extend([code.co_nlocals, code.co_stacksize, code.co_flags, code.co_code, consts, code.co_names])
+            args.extend([code.co_varnames, filename, code.co_name, code.co_firstlineno, code.co_lnotab])
+            args.extend([code.co_freevars, code.co_cellvars])
+            return types.CodeType(*args)
+
+
+        relocated = 0
+        for folder in sys.argv[3:]:
+            for dirpath, _, filenames in os.walk(folder):
+                for name in filenames:
+                    if not name.endswith((".pyc", ".pyo")):
+                        continue
+                    path = os.path.join(dirpath, name)
+                    with open(path, "rb") as file_handler:
+                        data = file_handler.read()
+                    if data[: len(magic)] != magic:
+                        continue
+                    try:
+                        code = marshal.loads(data[header_size:])
+                    except (EOFError, ValueError, TypeError):
+                        continue
+                    if not isinstance(code, types.CodeType):
+                        continue
+                    new_code = relocate(code)
+                    if new_code is code:
+                        continue
+                    tmp = "{}.{}.tmp".format(path, os.getpid())
+                    with open(tmp, "wb") as file_handler:
+                        file_handler.write(data[:header_size] + marshal.dumps(new_code))
+                    shutil.copymode(path, tmp)
+                    if hasattr(os, "replace"):
+                        os.replace(tmp, path)
+                    else:
+                        if sys.platform == "win32":
+                            os.remove(path)
+                        os.rename(tmp, path)
+                    relocated += 1
+        print(relocated)
+        """
+    ).encode("utf8")
+    output = call_subprocess(
+        [py_executable, "-", old_prefix, new_prefix] + list(folders),
+        show_stdout=False,
+        raise_on_return_code=False,
+        stdin=script,
+    )
+    logger.info("Relocated %s bytecode files from %s to %s", "".join(output).strip() or "no", old_prefix, new_prefix)
+
+
 OK_ABS_SCRIPTS = [
     "python",
     "python{}".format(sys.version[:3]),
@@ -1839,10 +3836,43 @@ OK_ABS_SCRIPTS = [
     "activate.fish",
     "activate.csh",
     "activate.xsh",
+    "activate.ps1",
+]
+
+
+# a header both /bin/sh and Python accept: the shell execs the python next to the script (resolving a
+# symlink to the script only if there is none), for Python it is the module docstring
+SH_LAUNCHER = [
+    "#!/bin/sh",
+    "'''true'",
+    'case "$0" in */*) _bin="${0%/*}" ;; *) _bin=. ;; esac',
+    # called through a symlink: follow it (and the ones it leads to), BSD readlink has no -f
+    'if [ ! -x "$_bin/python" ] ; then',
+    '    _script="$0"',
+    '    while [ -h "$_script" ] ; do',
+    '        _link="$(readlink -- "$_script")"',
+    '        case "$_link" in /*) _script="$_link" ;; *) _script="$(dirname -- "$_script")/$_link" ;; esac',
+    "    done",
+    '    _bin="$(dirname -- "$_script")"',
+    "fi",
+    'exec "$_bin/python" "$0" "$@"',
+    "'''",
 ]
+CODING_RE = re.compile(r"^[ \t\f]*#.*?coding[:=]")
 
 
-def fixup_scripts(_, bin_dir):
+# enough of a script to tell its shebang and whether it has been made relative already
+SCRIPT_HEAD_SIZE = 1024
+
+
+def fixup_scripts(_, bin_dir, sh_launcher=False):
+    """
+    Replace the absolute interpreter path in the scripts of ``bin_dir``: by
+    default with ``/usr/bin/env`` and an activation of the environment at
+    startup, with ``sh_launcher`` (POSIX only) with a ``/bin/sh`` header
+    running the interpreter next to the script.
+    """
+    sh_launcher = sh_launcher and not IS_WIN
     if IS_WIN:
         new_shebang_args = ("{} /c".format(os.path.normcase(os.environ.get("COMSPEC", "cmd.exe"))), "", ".exe")
     else:
@@ -1855,21 +3885,22 @@ def fixup_scripts(_, bin_dir):
     # This is what we'll put:
     new_shebang = "#!{} python{}{}".format(*new_shebang_args)
 
-    for filename in os.listdir(bin_dir):
+    candidates = []
+    for filename in sorted(os.listdir(bin_dir)):
         filename = os.path.join(bin_dir, filename)
         if not os.path.isfile(filename):
             # ignore child directories, e.g. .svn ones.
             continue
         with open(filename, "rb") as f:
-            try:
-                lines = f.read().decode("utf-8").splitlines()
-            except UnicodeDecodeError:
-                # This is probably a binary program instead
-                # of a script, so just ignore it.
-                continue
-        if not lines:
+            head = f.read(SCRIPT_HEAD_SIZE)
+        if not head:
             logger.warn("Script %s is an empty file", filename)
             continue
+        if not head.startswith(b"#!"):
+            # binary programs and the activation scripts
+            continue
+        # the chunk may end within a character, only its first lines matter
+        lines = head.decode("utf-8", "replace").splitlines()
 
         old_shebang = lines[0].strip()
         old_shebang = old_shebang[0:2] + os.path.normcase(old_shebang[2:])
@@ -1877,7 +3908,7 @@ def fixup_scripts(_, bin_dir):
         if not old_shebang.startswith(shebang):
             if os.path.basename(filename) in OK_ABS_SCRIPTS:
                 logger.debug("Cannot make script %s relative", filename)
-            elif lines[0].strip() == new_shebang:
+            elif lines[0].strip() == new_shebang or SH_LAUNCHER[1] in lines[1:3]:
                 logger.info("Script %s has already been made relative", filename)
             else:
                 logger.warn(
@@ -1886,10 +3917,25 @@ def fixup_scripts(_, bin_dir):
                     shebang,
                 )
             continue
-        logger.notify("Making script %s relative", filename)
-        script = relative_script([new_shebang] + lines[1:])
-        with open(filename, "wb") as f:
-            f.write("\n".join(script).encode("utf-8"))
+        candidates.append(filename)
+
+    def make_relative(filename):
+        with open(filename, "rb") as f:
+            try:
+                lines = f.read().decode("utf-8").splitlines()
+            except UnicodeDecodeError:
+                return False
+        script = launcher_script(lines[1:]) if sh_launcher else None
+        if script is None:
+            script = relative_script([new_shebang] + lines[1:])
+        replace_file(os.path.realpath(filename), "\n".join(script).encode("utf-8"))
+        return True
+
+    for filename, made_relative in zip(candidates, threaded_map(make_relative, candidates)):
+        if made_relative:
+            logger.notify("Making script %s relative", filename)
+        else:
+            logger.warn("Script %s cannot be made relative (it's not UTF-8 encoded)", filename)
 
 
 def relative_script(lines):
@@ -1913,40 +3959,122 @@ def relative_script(lines):
     return lines[:activate_at] + ["", activate, ""] + lines[activate_at:]
 
 
+def launcher_script(lines):
+    """
+    Return the script (without its shebang line) behind the ``SH_LAUNCHER``
+    header, or None if the script has future statements: those could no longer
+    follow a docstring of the script. An encoding declaration stays on the
+    second line, a comment for the shell.
+    """
+    for line in lines:
+        if line.split()[:3] == ["from", "__future__", "import"]:
+            return None
+    if lines and CODING_RE.match(lines[0]):
+        return SH_LAUNCHER[:1] + lines[:1] + SH_LAUNCHER[1:] + lines[1:]
+    return SH_LAUNCHER + lines
+
+
+def environment_lib_dirs(home_dir):
+    """
+    Return the library directories holding a site-packages of the environment
+    in ``home_dir``, whatever its Python version (which may differ from the
+    one running virtualenv)
+    """
+    lib_dirs = glob.glob(join(home_dir, "lib", "python*")) + [join(home_dir, "Lib"), home_dir]
+    return [lib_dir for lib_dir in lib_dirs if os.path.isdir(join(lib_dir, "site-packages"))]
+
+
 def fixup_pth_and_egg_link(home_dir, sys_path=None):
-    """Makes .pth and .egg-link files use relative paths"""
-    home_dir = os.path.normcase(os.path.abspath(home_dir))
+    """
+    Makes .pth and .egg-link files use relative paths
+
+    The files are looked up in the environment's site-packages and in the
+    directories inside the environment its .pth files add to ``sys.path``,
+    or in the directories of ``sys_path`` within the environment if given.
+    All the files are read before the changed ones are written.
+    """
     if sys_path is None:
-        sys_path = sys.path
-    for a_path in sys_path:
-        if not a_path:
-            a_path = "."
-        if not os.path.isdir(a_path):
+        site_dirs = [join(lib_dir, "site-packages") for lib_dir in environment_lib_dirs(home_dir)]
+        pth_files, egg_links = find_pth_and_egg_links(home_dir, site_dirs)
+    else:
+        pth_files, egg_links = find_pth_and_egg_links(home_dir, sys_path, follow=False)
+    rewrites = []
+    for filenames, kind, relative_content in (
+        (pth_files, ".pth", relative_pth),
+        (egg_links, ".egg-link", relative_egg_link),
+    ):
+        for filename in filenames:
+            if not os.access(filename, os.W_OK):
+                logger.warn("Cannot write %s file %s, skipping", kind, filename)
+                continue
+            content = relative_content(filename)
+            if content is None:
+                logger.info("No changes to %s file %s", kind, filename)
+            else:
+                rewrites.append((filename, content))
+    if not rewrites:
+        return
+    logger.notify("Making paths relative in %d .pth and .egg-link files", len(rewrites))
+    for filename, content in rewrites:
+        logger.info("Rewriting %s", filename)
+        with open(filename, "w") as f:
+            f.write(content)
+
+
+def find_pth_and_egg_links(home_dir, site_dirs, follow=True):
+    """
+    Return the .pth and the .egg-link files in the directories of
+    ``site_dirs`` within ``home_dir``, scanning each directory once; with
+    ``follow`` also in the directories within ``home_dir`` the .pth files add
+    """
+    home_prefix = os.path.join(os.path.normcase(os.path.abspath(home_dir)), "")
+    pending = [a_path or "." for a_path in site_dirs]
+    seen, pth_files, egg_links = set(), [], []
+    while pending:
+        a_path = os.path.normcase(os.path.abspath(pending.pop(0)))
+        if a_path in seen or not os.path.isdir(a_path):
             continue
-        a_path = os.path.normcase(os.path.abspath(a_path))
-        if not a_path.startswith(home_dir):
+        seen.add(a_path)
+        if not os.path.join(a_path, "").startswith(home_prefix):
             logger.debug("Skipping system (non-environment) directory %s", a_path)
             continue
-        for filename in os.listdir(a_path):
-            filename = os.path.join(a_path, filename)
-            if filename.endswith(".pth"):
-                if not os.access(filename, os.W_OK):
-                    logger.warn("Cannot write .pth file %s, skipping", filename)
-                else:
-                    fixup_pth_file(filename)
+        for filename in scan_files(a_path, (".pth", ".egg-link")):
             if filename.endswith(".egg-link"):
-                if not os.access(filename, os.W_OK):
-                    logger.warn("Cannot write .egg-link file %s, skipping", filename)
-                else:
-                    fixup_egg_link(filename)
+                egg_links.append(filename)
+                continue
+            pth_files.append(filename)
+            if follow:
+                pending.extend(os.path.join(a_path, entry) for entry in pth_entries(filename))
+    return pth_files, egg_links
 
 
-def fixup_pth_file(filename):
+def scan_files(directory, suffixes):
+    """Return the sorted paths of the files in ``directory`` with a name ending with one of ``suffixes``"""
+    if hasattr(os, "scandir"):
+        entries = os.scandir(directory)
+        try:
+            found = [entry.path for entry in entries if entry.name.endswith(suffixes) and entry.is_file()]
+        finally:
+            getattr(entries, "close", lambda: None)()
+    else:
+        found = [join(directory, name) for name in os.listdir(directory) if name.endswith(suffixes)]
+        found = [path for path in found if os.path.isfile(path)]
+    return sorted(found)
+
+
+def pth_entries(filename):
+    """Return the directory entries (not comments or import lines) of a .pth file"""
+    with open(filename) as f:
+        lines = [line.strip() for line in f]
+    return [line for line in lines if line and not line.startswith("#") and not line.startswith("import ")]
+
+
+def relative_pth(filename):
+    """Return the content of the .pth file with its absolute paths made relative, None if it has none"""
     lines = []
     with open(filename) as f:
-        prev_lines = f.readlines()
+        prev_lines = [line.strip() for line in f]
     for line in prev_lines:
-        line = line.strip()
         if not line or line.startswith("#") or line.startswith("import ") or os.path.abspath(line) != line:
             lines.append(line)
         else:
@@ -1955,23 +4083,39 @@ def fixup_pth_file(filename):
                 logger.debug("Rewriting path {} as {} (in {})".format(line, new_value, filename))
             lines.append(new_value)
     if lines == prev_lines:
+        return None
+    return "\n".join(lines) + "\n"
+
+
+def relative_egg_link(filename):
+    """Return the content of the .egg-link file with its link made relative, None if it already is"""
+    with open(filename) as f:
+        link = f.readline().strip()
+    if os.path.abspath(link) != link:
+        return None
+    new_link = make_relative_path(filename, link)
+    logger.debug("Rewriting link {} in {} as {}".format(link, filename, new_link))
+    return new_link
+
+
+def fixup_pth_file(filename):
+    content = relative_pth(filename)
+    if content is None:
         logger.info("No changes to .pth file %s", filename)
         return
     logger.notify("Making paths in .pth file %s relative", filename)
     with open(filename, "w") as f:
-        f.write("\n".join(lines) + "\n")
+        f.write(content)
 
 
 def fixup_egg_link(filename):
-    with open(filename) as f:
-        link = f.readline().strip()
-    if os.path.abspath(link) != link:
+    content = relative_egg_link(filename)
+    if content is None:
         logger.debug("Link in %s already relative", filename)
         return
-    new_link = make_relative_path(filename, link)
-    logger.notify("Rewriting link {} in {} as {}".format(link, filename, new_link))
+    logger.notify("Rewriting link in {} as {}".format(filename, content))
     with open(filename, "w") as f:
-        f.write(new_link)
+        f.write(content)
 
 
 def make_relative_path(source, dest, dest_is_directory=True):
@@ -2076,223 +4220,294 @@ def convert(s):
 # file site.py
 SITE_PY = convert(
     """
-eJy1Pf1z2zaWv+uvQOnJiEplOnHaXNepc+MkTus7N/HG6WxuXZ+OkiCJNUWqBGlZ2+n+7fc+ABAg
-Kdm+7Wk6qUQCDw8P7xsPcBAEJ6uVzKZimU+rVAol42KyEKu4XCgxywtRLpJiur+Ki3IDTyc38Vwq
-UeZCbVSEraJe7+m/+Ok9FZ8XiTIowLe4KvNlXCaTOE03Ilmu8qKUUzGtiiSbiyRLyiROk39AizyL
-xNN/HYPeWSZg5mkiC3ErCwVwlchn4mJTLvJMhNUK5/w8+jZ+MRgKNSmSVQkNCo0zUGQRl71Myimg
-CS0rBaRMSrmvVnKSzJKJbbjOq3QqVmk8keJ//oenRk37/Z7Kl3K9kIUUGSADMCXAWiEe8DUpxCSf
-ykiIN3IS4wD8vCZWj6ENcc0UkjHLRZpnc5hTJidSqbjYiHBclQSIUBbTHHBKAIMySdPeOi9u1ACW
-lNZjDY9EzOzhT4bZA+aJ47c5B3D8mPV+zpK7IcMG7kFw5YLZppCz5E7ECBZ+yjs5GelnYTIT02Q2
-Axpk5QCb9BgBJdJkfLCi5fher9DrA8LKcmUMY0hEmRvzS+oR9c5KEacK2LZaIY0UYf5OjpM4A2pk
-tzAcQASS9rrGmSaqtOPQ7EQOAApcxxKkZKlEuIyTDJj1p3hCaP8tyab5Wg2IArBaSvxaqdKdf9hB
-AGjtEGDYw8Uyq1llaXIj080AEPgM2BdSVWmJAjFNCjkp8yKRigAAahsh7wDpoYgLqUnInGnkdkj0
-J5okGS4sChgKPL5EksySeVWQhIlZApwLXPH+4yfx7vTN2ckHzWMGGMvsfAk4AxRaaAcnGEAcVKo4
-SHMQ6Kh3jv8T8XSKQjbH8QGvusHBvSvdC2Huq6jZx1lwILteXD0MzLEEZUJj9ajf79BlqBZAnz/u
-We9e72QbVWji/G29yEEms3gpxSJm/kLO6H2v4byOVuXiFXCDQjglkErh4iCCCcIDkrg0C/NMihWw
-WJpkctADCo2prb+KwAof8myf1rrBCQCh6GXw0nk2oBEzCRNtw3qF+sI03tDMdJOeXedlXpDiAP7P
-JqSL0ji7IRwVMRR/G8t5kmWIEPJCr7/Xp4HVTQKcOI3EObUivWAaiT5rL26JIlEBLyHTAU/Ku3i5
-SuWQxRd16241QoPJUpi1TpnjoGVJ6pVWrZ5qJ+8dRl8aXEdolotCAvBq7AndLM+HYgw6m7BZxUsW
-r3KdE+f0OuSJOiFPUEvoi9+BoidKVUtpXyKvgGYhhurN8jTN10Cyo15PiD1sZIyyz5zwFt7BvwAX
-/01lOVn0es5IFrAGhchvA4VAwCTITHO1RsLjNs3KTSWTZKwp8mIqCxrqYcQ+YMQf2Bjn2vuQl9qo
-8XRxlfNlUqJKGmuTmbDFy/ol68dXPG+YBlhuRTQzTWs6LXF66WoRj6VxScZyhpKgF+mVXXYYs9cx
-JtniUizZysA7IItM2IJ0KxZUOrNSkhMAMFj44ixZVSk1UshgIoaBliuCv4zRpOfaWQL2ZrPcQ4XE
-5nsC9gdw+weI0XqRAH0mAAE0DGopWL5xUhboINT6qOcbfdOfxwdOPZtp28RDzuIk1VY+znpn9PC0
-KEh8J3KFvYaaGApmmJXo2s0zoCOKeRAEPe3AiFyZb8BIvV5ZbI6AF4QZaDQaVwlavtEIbb3+oXo8
-jHBG9rrZdhYeqAjT6QOQyekyK/IlvraTuwRtAmNhj96euCA1I9lD9ljxFdLP1ekr0xSNt8PPAhVR
-7+LT6fuzL6eX4lhc1Tpt2FRo1zDmaRYDX5NJAK5qDFsrM2iJmi9B5Sfeg30nrgCDRr1JfmVcVsC8
-gPrnoqLXMI2J97J3+uHkzfnp6OfL00+jy7PPp4AgGBrZ26Mpo32swGNUEUgHsOVURdrA9lo96MGb
-k0v7oDdK1OjlN8Bv8CScyxK4uAhhxkMRLOM7BRwaDKnpAHFsNQATHgwG4rU4FE+fiheHBG+1WW0A
-HFhepzE+HGmjPkqyWR4MqPGv7NUfs57SLtzV0TfX4vhYBL/Gt3HQAzeqbspM8RNJ1OfNSkLXEv4X
-5mrQ6/WmcgbidyNRSMOn5BsPuAesCjTNta3+NU8y854Z0x2DdEhIPQCJ0WiSxkph49EoEETzImJP
-GkUshBarjdtmoMfETyFhETPsMsR/OnCJx9QPx2Nc3C6mEcjmchIrya14otBxNEINNRqFekQQXRIP
-cK9Y6fSFaYIaqkjAiyU2Q401VnmKP3EAlHmSNgykUCfieuhAKbqN00qq0JkVkCts0Au1aqKI98Af
-CcHs1os0IPYxHAGvgGRpDmqyQGrVYPGzB/4MqCMTpGEgx7EVkwlx+w+OJGhYcCn7qM6VakBh7Scu
-Ti/Ei2eH++iuQEw5tfTwmqMFTrJK2oczWCDD7owv9zLi4FJihnoUnx7thrmM7Fq0V39mVrWQy/xW
-TgFd5E5nYcUnegOhN0xkEsPCgeImg88q0jiGMQaaPH0QBXQOgHxLgmKW3Kz2Hkf7MlOgaDhyJlrr
-sJ5t3arIbxP0JsYb/RKMIShDNInGc+k5K+fxFdo8kH9wczMk1Vr2Qd0VFXukhDeCRHswrRVnRODO
-URNf09ebLF9nIw51j1GphgPLrShMml+xQb0Ge+I9WBlAMofIrSYaQwGfXqA87QPyMH2YLlCWggcA
-BJZcUTzmwDKxHE2Rw0IcFmEMXgkS2EKiQ3BrhqBYyhDDgURvI/vAaAaEBJOz2suqA81lKF+mGQzs
-kMRnu/OIY0wfQIOKEZjFUEPjRoZ+V0egesW5q4icfj00uV++fGG+UQvKoCBmY5w1+gszsobRagOW
-MwFFYHwuzscQH6zBfQUwldK8KfYvRb5ifwsW9EJLNxh6iN/KcnV0cLBeryOdP8iL+YGaHXz73cuX
-3z1jPTidEgPBfBxx0cm06IDeoc8afW8MzGuzdA2GTDKfHQlWKMnvImcT8fuhSqa5ONofWJ2JbFzb
-YfzX+CqgQkZm0B7TGagb1Cj9/sf+70fRiz+CCJvEZej2CAfsfmi7aS2Vb1qhR5mDwQf3ZJJXaJFr
-hlDiaxgOIvGpHFfzwGLg2UHzAyaM4hpaVth/fo0Y+Axi2Mva2xFqC2IPtOvOCnxi9onJC9KaAqmM
-1qkVJm+6tZmh8fThcm99Skd4zBQThUyCkuE3ebAg2sZtCcKPdmHR5jkurPl4FsFYeWPMp1PtQYYo
-QIQMrsbQFT+Hu9G1Balas44GTePqSNDU4A2OmdwaHFnLPoLsCwoEKKznpdUtgFCNHKHJBJhlgBbu
-OC271+QFxw1CJjgWz+mJBF/4qPXuGa9tlaaUumlwqUcVBuytNFrsHDgzNABANIqAG5pw5GNjUXgN
-OmDlnOxBBpu1mAnfeP7fXtOHaS32rt5M4i4QuEYhJ50eBJ1QPuYRCgXStAr9nttY3NK2PdhOy0M8
-ZVaJRFptEa6m9ugUqp0GapZkqIKdRYomaQ4esVWLxEf1e99poHgHH3caNS2Bmg41PZxWx+T3eQLY
-1+0wUTavMKXgZlwQpWWiyMohnRbwD/gXlMmgtBMQk6BZMA+VMn9mf4LM2fnqL1v4w1IaOcJtus0f
-adkMDQfdICSgzriAAGRAvLYckvfIiiAF5nKWxpNreC23CjbBiBSImGM8SMEA1vTSC2vwSYS7HCSc
-CPmuVHIlvoYYFsxRg7UfprX/XAY1iYbQaUF+gs5QHLvZCydzcdzIZPi87OcwaENklQPzjsHrcbP5
-LocbfrWJFXDYfZ1tkQJlTLmWYOCiem0o42aMvzp2WtTUMoMYXvIG8vZtzEiDnl1vDRpW3IDxFr05
-ln7s5iSwbxjk6lAu7wI0LYma5CqgwLaZnXA/mi3atLHYnidjBOgtQDC49iDJVCcoMI/yfxnkfuje
-ZDHvMY2LdZIFpLs0/Y79pWnhYUnpGbiDSwqpDmCimNY8eF+AhND+5gHIE+kCiM1lX2nXvw23OcfO
-BvjxJh/YERlu4HnTV0cvrtuEGT4MtKXr6V1ZxArXL+VlZDHZBui6PTfSy0iEONvorUy91Y0hRZEr
-CDnFx8svAinGWd51vLmXRN3o+kiCUruXIA2MiVUANqpEZJKDYDc3duL5Z+HWTeOd0B1V9rj+u9AC
-2PvTTYYZrS6g160n0OHlN6OOlKSL7stvHkmOLnFsOGd24IHnuhUyTsnQO+8pn5fds4K242rAepZC
-Mr3+bUK0eUWjafPQ3S3wY6BieluCMX82rMnYnjp+fI9nKzxtT3YAa0WU5rNHiwIBeD7+FaJYpRNg
-t3GSUo4fiLG/j0rQROCcWugWXg/STvl2SNAVIqmrZ8gdHPIP2tPRXtOJyQd3RKrms4pVG5U9vaFf
-70d5m/TuXuR25dBpxn0LfvAAjeCN3DVZbdlMr2e8sXDYobYegd2fgNd25vwTcHj2IBQeNRBD04pz
-0LAJXVNxrYAB9gDVvMVF2eGgtIfmnbGZcTNY6JR4itL5VKxpd5wSfbhXAVCm7IB0wEE+1Husb6ui
-4J1SEvKVLPZx828osDDIeBpUb9QGc/BBloiJbTahxKlTRpJ3MW6gU6F2JkHtwXbzziI3iROZ3SYF
-9AWVEgY/fvzptMM+6GGw08P1pLeG2JVdWJwWruLDXS0fH7N9a9J6etQ2Xq1snokIu6dwT1Tv7bjx
-nijFWpOFnNyMJG304jJjXye1+RZfIyp2/9cv11HxjGqOYCqTtEIasBuFxWKzKptQsruUYJJ1ZSdW
-etD2LSdxZmk8FyF1nmL+QK8mpRhu40I7Gasix1pCUSXTg3kyFfK3Kk4xQJOzGeCCWxH6VcTDUxpB
-vOMdaK4xU3JSFUm5ARrEKtc7ObRZ7TQcb3iioYck5+yZgrh9fSQucdr4ngk3NeQyYZ6fuMZJYgSF
-HZyt5Yiew/ssH+GoIyQvMBQh1d5Zpce95gi5zozD/PUIzTeSXrnbRbTmLlFRy3ikdGPGnMw1QgkH
-GLPyb/rpc6LLXFuwnG/Hcr4by3kTy3knlnMfy/luLF2ZwIWt8w9GFLpyEM3kdGd5hJs+4HFO48mC
-22GtHtbkAUSxMiGQESouWfWSFLxbQ0BI7zn7h/SwLndIuAiwyDmTqUEi++NehA63TLGx05mKJ3Rn
-norxeLaVfPh9D6KISnvG1J0FbhqXceQJxjzNxyC3Ft1hDWAomtUfnPfKbkdjztE1Vf3Ff33+8eMH
-bI6g7HY1dcNFRLWNUwmfxsVctcWpDhhWwI/U0i+aoG4a4F5nlqTPWZL+UPQ5S9LXw+zxP+9oyx45
-R6xpxzkXK7ChVIVjm7m1Kv1+47kuatHPmc15zwDcgqx0XIItVDq5uHh38vmE0zfBPwNXZAxxfflw
-8TEtbIO2B+Q2tyTHPrWJrO2fOyeP2A5LmF4tT6/x4HBbYOjj+P86TyAoIBHpNNzjpvn4LIDV/a1C
-KTfEZV/BvnMY3/EQHLnryt82B/A3jNBDHgH62oMJzVTqWKahcq1x20EPB+jjIo6m9+zTwQ7d4TU5
-9LDNtvtM7TS1kuWb0x/OPpyfvbk4+fyj4zWh9/Px8uBQnP70RdD+OKp8diNi3BMusRQDVLF7lENM
-c/ivwnB6WpWc+IJe787PdZp6icX8WN2JWjqC51zHYaFxZoIza/ahLsBAjFLtkzunJqhcgU5VoIu+
-5Ip9lesKUDqMMUb/rtLevj4NY07N0IZeBAwPjV1SMAiusYFXVKdbmkCk4P0PfZKkAylt1eyOeEqZ
-l9Y2qZP8N6llLz9FneFJ3VlrxqvAxTW4jtQqTUBXvgqsAOhuWBhQ841+aHf2GK8upeN0h5F1Q571
-ViywXOJVwHPT/Qc1o/1WAYY1g72DeWeStsWpxBSre0QfG/V5+1vewVe79HoNFCwY7nKUuIiG6RKY
-fQzxnFgk4HMDTy7AXKFrDRAaK+FnRI8c6yNz3JUO3i6n+38NNEH81r/80tG8LNL9v4sVBA6CayiC
-DmK6jd9BrBDJSJx+fD8IGDmqRxR/rbAAGkw4ZZUcYafCDd45HIVKpjO9r+6rA3yhDSu97jX6F3JV
-6P7d7mSAIvD7HyHZ2d//MAS01S52gCHOZ9CEjxXeFj88KeVuwprPnrhcyDTVZb1n785PwefConOU
-I956OIUxOVDHbURdgsQnuRqgcJMRXhfIzAW6frTHPI28Zp35QBQ86u1tS9vVopxbu1crwVbEiXLR
-DnHamjCmbDpCjoYlMasb4G8tpbYN0tltQ3RH0WHOGF0UVMjnswawND2NOZiAKANr2k12k3fSkqw0
-hVtpMgF1CpoX9OoQZAWpiwe3iAHzjPOLeaHMeQ94uNoUyXxRYnoZOkdUa47Nfzr5cn72gcqvD1/U
-7moHjw7JhR7yHvox1khhogC+uHVPyFejkcu6jVcIA5UQ/K/5ijfnj3mAVj9OaXn5bf2KD9wcOzEU
-zwD0VLVqCgk6zk63LumphYFxtREkftwSqBozHwxlwbC+X+92u/Nrs6Jt2bAo5HqYl49Ijs9WtiJH
-d3YqcpofPcXZCrcUpmF3I3jbJVvmM4auN60322p/3E9LCvHoH2DUbu2PYYpjWk31dBxe28YsFA5q
-S/uLGxQ47SYZSjLQMHQ7D1we69bEujkzoFdN2gImvtfoGkHs1ueAovYzPEwssVsBgulItfpPVMgF
-BFIfcajAk3qiSH8E4okIQ0dwhwPxVBx6s3Tswf2z1MoLbOSPoAl1MSLVt+cFsCJ8+Y0dSH5FiKEi
-PRJ1OIjTy3JbJ4Of9QK9y+f+LDuFgPJ/KHdFnM1lyLCGBubXPrm3pC9J3XrEvkquu0yLOAMn9W4L
-j7cloztnb1BrsEKr3Y3cNPWRTx5s0FkUv5NgPvgiXoPyX1VlyCu5ZZOv89DQdqj3Q8TqK2iq9z/D
-AD3o37rK83zAndTQsNDT+23LlhOvjfVorYVsHOno2xfalZ0UEKKVqo9IOsewjFNq/YDa5B7XRj+w
-T3Wm3v7uOA7jZFMsUB7cB8nPkFx8QIPPwiVU91sfH9DvpvJWpmAdwJqGWN39q63uHkQ2Y9FZ9PJQ
-JC42F5tuFOhNjcCRqTLHcai+vDNlsmtcb2VrJPzHQfCLjjzi7Iaiy7d/OxuKtx8+wb9v5EcwlXiI
-ayj+DmiJt3kBYSQfQ6Tz4ViwXnJ8mFcKT3oRNEri81F6dMsuPPLihoGupPdL6K0iFFg0iL443t8A
-KNY4Mw3okG7tEZgacfhtDrM0/E7jE3ZRJ9AvnVECU+Wv2mX+KzU70D0OnC5XwfnZ29MPl6dReYf8
-a34G104bNw72t6wkaX98VOC20VDYJ5MKn2gojqv8o0xXHZ6yjjbNiQGMNkUfQpGVjTD5toDYxhNx
-gSkDsdpM80mELYH3+ZhSuQbXeeAElvfads+wIqxwoHecav8dHwN9RICnr7CJngI1pPHjMZ6O4cdR
-sMXWDgVlfeF/T2/WUzdprI850IR6TdTqaYZ+/1rbLZiyGqLlIULt2BLeHnhLk1gtxxP3VNTHTOj7
-HUCR0S6AnMVVWgqZQeREAT0dtAdt7h5kYjHhlWaTRad7KCWTruONcqo4YiUCHJV2XyVuV1BKD+Lt
-n+Ib1vl4wkpUfLAToBOiFCTlTldVTRYsxhz3aEXb2tdeJ9kLt0BBE5kH5Th4ompqw0TRO2SU5rLU
-BOAH4eDqeb2TTlnfiVecN1npGjz49vTp00D8+/2ODWMQpXl+Ax4XQOx0SM7p9RajrOdkF6mjLs68
-ioAVJwt5BQ+uKSltn1cZZR93dKWFkPb/BgavSc2GpkPD5nJmruANWG7B+zjajvycJXR9C+aPJKpa
-fQsO5paMJBEvghLox2qSJH3OQsA6bPIKTx5hLlEzirwDXk8QzBDf4sYRB9ILdB+p8s+yjUUH5kKA
-Ay7L4eHovCadugFERxcbjefoLEvKulz+mburqI80l/ZaFs1QIl6jTJiJNKjhHGPzmLReTfi9izm9
-kCSfXD1vlIg58+TX9yEPTA1Cls9mBlV4aJZpkstiYswprlkySUoHjGmHcLgzXUdDSfao14FSAMqc
-bMDUCrN9+5VdGRfTj7TDum9G0oUppb3ih7M/cdYozoqienzKM1lCWs41X6i2/gOlr7Ur4A0mvtJc
-jxXT3lUE7sGtKtNXDHBpQ33vAMCha22scrQc6SkK5y4lC5/5dsu9APihIJyRu02KsorTkT7JPkIX
-bmT3nDWi9sDPzsNs1ksZohVM5vu6QBldh0F9sg0LGU0B+rGY6SxE5B6i8c+brHJ0AA/ZRwJPAkkz
-HZkjoCZNdGUZ1h6q0xVoDlsgqK/NMY0tnrc5JdCqr3cx1xl/XTq1xX32C+LoLL54LcIXQ4i1G8fV
-Vhu8nQaQfTLF6LzZDabiBP5mjs2D/uL1sQifD8W3O6BHWwY4OnRHaEasDQhbgby4fjQZ02RMZMPj
-Cvc3NXVxQ43S4LpJ7TZVviei/KVBFD77pMs7nz9u7GAJCmCWyOn+E4WE0LjUOnY7m9KwePJXl86R
-4eNDr6LPZXZ9Pi87hqhiXSs0R7UZb9eOYk7TajXEBw5RZ7ANtKelTUVIo6zNXoCFJW8avwaxAMCo
-aw8Mv+FuKbzXtHB9rK1bo7pG2oLtCPn12TTe6aob1vJ2rzP3KEG+lwFwF7SWd1dAHsHpO/fbHV7+
-8/mHa663bWO2EL2nIt7zJjoL3ztWdXfxuSePtuK8XnPz6U6nedzS1fVfkhoHSi0/4Hyaq/TIbTzC
-cle+QyO3Za9LvKyO9pXRvKXSdYI4GOZbidArofifiqdgNcAvqma4DXxLd++dKCrywis2vjl8PjTn
-GRmQnsCL6MXX+oo66mbObPs+81AHYfBS9zuM/s0BlpR+b/uqFZ/QtI4bV9X4g3HKaxCNLB1qI3N/
-aXy9ZrHAO91qYrKrbK8veA+eyxh8FnM5Yw7eF0SWURe6rtqoRXibfnu8FPvaEAfdJSzbNOAu7fdo
-Vta9us0AxvLIuYuY36BbVq2ObMLLGAbccAzd6kPiiZvOozVsFNBkljfBrulz/11z1y16duamlKA1
-d/9km0sD3Xe7KeyiAecZNCEeVBNfK21rEbx5eTRy9fpQl7O0y7TdVjjPLXah1c+Ux2BSnbhRI2uY
-cxlP3O9YMrXP97t2lDU559JchmhMt6Xrm5z+EDPPJSf43J5npjqiqeY8HbTQzV0jLuYcyflcjWK8
-Nm5EsS5VUbVCGBM8vadLv2SsNibkwbtSAIRhI10i6paBA0eAkuPra7kKybkNQ9DQVN3qlMuqZMq6
-XMdXAC7iNCX1N4lyrncNUon5ZlUVqwKC0kBfcsrlMV01uDVQk0JbxurGoG56DPWdl6QRqSbLnGbk
-5GijtgaIwNa3pdNHI/sOuOZZfbY7GVpukFm1lEVc1nea+DvwCUQ+9Qh00BVX18mP1eLYYBMXscQy
-h4MUpqrs968huvND2x2HuQdWzz2cn6iHzrs+5py4Y0YsHyd39jIz9z6dKd2a67p2tlnNd/YSF1gI
-c00XqUedtuK3+uIgvr6SE+joHDocBLLvniPzC6atJmPf1KLhPHN1QvuKGDynTHa183q3Jg+073dr
-xKF2fF9lWFZpOYdbGlsqao+6U+fUow2cVA5Wat6TyvEL2B+ZyvHgPyaVwydBihRveUjxzjAHOZ23
-M8lFzLnQwRL/Dk7cSGzVJAEnjzea6edY00X5ulgLodN+kec3oxHzz9nMeLI8jjZIukLf3G0+pEbY
-j3NySmeCP8dj3MxlXaWEnhBiiFu8qDwMKuKfB3obawS6lc4aQAfzle8URSjkMenRc1CKRTKd4j1p
-rPO97BnypbcGGnl2I2jbBy+7o+L/y88nnz7/fOEM5G0oGSxHhg5he0MHVOZdUtYmtn2nErczIDrf
-1Wve9K87mYYXkwqfHM//E4xgys382+bxNBLyyYDrfZfxxtxEJrO8mi+40ATm4kDzF814WNgK73ie
-gddSmlq1jCbHZSqWkIwjz3k0pdy2sUrmMZkmeEV3BQa+o+l11TfRYt0AjYmuKe4b016R27JJIn6D
-+5dKjqDnaJyAXgjwX/HfZ0D3kSF8sEsJbQUE/umRcEBs5wILAr9wpR7Sysnr6wX/eNkZSZ1k5g3v
-M/OxSHJ4l3gdAt3aqzjy5fvtVSn46nXRLLfY44M6XFBdoM+d5SKico9iwiwSwjgRktg80JJGmQld
-tliDw+vjP16KL2C89coMTAfcqqFb2s35ULyCN+PRJ3TIY91Ebh2zz8bX7Goo+i5ePyRk5dnBNbh/
-MprwMVSjWEZgLedop9GWPWvS9wzr06ziWeNt/HjrJqg4o3MBo4aqihowsER+XuEhWbrGz/zxAkwn
-3ObJlGvzUULNMHhrLCiQBhjaN3WvjqT61LWRM9LHiCDeYxdPN9YGyGkDULkoSLqb2g4V9hAry5pE
-0MUd42qu3OKCRKlKfvvdN9/uLdX8+V++e/nipdfRTGfLZXnO+ajgn5ipCxp0bBQ6dm6k+vJjlpRE
-SP/o3FntlKY26+AHFf66QF9RA2ye+9uKm4efB2IHgg6S4Xto9SEv36NXT/gOxYUs6EasPKMHW2qq
-9hrH+fgvY6CupKiNrB3/RrTQhdgGRpeVdC49LPlfnnd2bFORzWFkLGfokcOJDTs8DyxkaxpccI28
-rRlrmtly2mIuyra5CwZ2nGqXjBd3xCUPtvrEnJvR/jVeylnIfftHW/Q16BYcdQZ/al7ES6WVGqcY
-+OSLfw0wOmLkFVeryCZ7GHIdiuPdjYhiX5l7QCMX+6af0bH/j+ferWbUhROAhKEJIzNqXNzlgrR9
-fZj/SFb6pr1Hg7Rd7Q3ToAj0sujwtvOY5j3bmCaJ07FH18kH7Hm6lz7X0dAIm20UcZt/f7AZxT0i
-ucpVchfYv9fAGQPnsBxGY+2rQKkrX+qsnAyTd/2qO6fmHqYfWNLjH84/vjk5J4qNLk7e/ufJD3QC
-AGW7kal58CZvlu/zmux75wTdDV9dtt01eI1tx7XrfNRcQ2i9b9W7dkDovlagaxmbQbz7eluH1uns
-didAfPe0G1C3pSs6Ibeykfq6NLdUu3E2sKef8kEu88spgjWPTKWYO1ZjMxqHfOEckGpHnixBdRWZ
-AV7X/+jQtlUbsW3VneHaUTi92zP3dm8p3BjYU4G0fBgPInPaqh9zJtpWlnBqr/mXt8hPwxslzH13
-IMET6Vy9TLcuM6jS/xNfRZVhfBrrP6Y1tH8ug9pxhZOyfwcGSxUnOhxqXenQnp+bLJnKdAsVQLGy
-UjV3CjMqRsnqekBbQftEiat9un5lH1XVtf2Fq6Yzw39LsE62tFdzKq6lZ6MHjWdV6ta+2j6tDpQw
-pYqqfOacdwZ9eQCUrqVbgXRgrpGt4Xgj+k9UX6cz8SQXUVLfq+sgj+6Mg72h1jOxv+1yEfdyDSGe
-b284bdzfoXsccg91Tw9VmRscHJuIJ4q23RoiXhNkLsoTdCOnl7bDGlC91wVfb6+eH9nqGOR4fO3o
-ITr4EDgpsSvHo955AbTTHb/+/lXxx9CeOMR9m0FzlOugcfRw+/ZA6yj1li0EU57LkALvffdusenh
-/VWcoNfE1XLgEc1MhL//MbCzc06O6ynYJ4P2tGsttg0Un4V3QdHh+Taoll4UTwrcamw+d843bfiM
-YvjMnm6kS/XdoqnAkRNy23we4R4mj1rPtNmdLpB5UHdG0fTnBk2e1MsP4s7OCLcaeIme7WaiOfWa
-J7b4FHwXT3f/5w/o3z6DY7sf7koP2VYvOu+PYM8YD25hcXuTS83zCCwPqNKQFPgTEVrZxxvKakK6
-DFVPDhmDAiVyzTGUonQ9edEj7VRYQ9H7X+4V6Ls=
+eJy1fWt320ay4Hf+ih745Ih0KMiPJDujjLJHseVE9yq2ruW58V6NFgEJkEJEAggAWub4eH771qtf
+eFBSktUHW0J3V1d3V1dXVVdVB0FwXJZpnqh1kWxWqarTuJpfqzJurmu1KCrVXGdVsl/GVbOFr/Ob
+eJnWqilUva1DrBWORo//4M/osXp3ndUaBfgt3jTFOm6yebxabVW2LouqSROVbKosX6osz5osXmX/
+ghpFHqrHfxyD0WmuYOSrLK3Uh7SqAW6tioU63zbXRa7GmxLH/DT8On4+map6XmVlAxUqwRlm5Dpu
+RnmaJoAm1NzUMJVZk+7XZTrPFtncVLwtNqtElat4nqpffuGhUdW9vVFdrNPb67RKVQ7IAMwUYJWI
+B/yaVWpeJGmo1PfpPMYO+LudrBFDm+Ka1TiNeaFWRb6EMeXpPK3ruNqq8WzTECBCWSUF4JQBBk22
+Wo1ui+qmnsCS0nrcwicVM3n4g2HygHFi/13KARzf5KN/5NnHKcMG6kFwzTWTTZUuso8qRrDwZ/ox
+nUfybZwtVJItFjAHeTPBKiNGoFarbHZQ0nL8XVbouwPCylBlDH2kiDJX5kJqEY5OGxWvaiDbTYlz
+VBPmL9NZFucwG/kH6A4gwpSO+vpJsrox/dDoVAEAKlzHBnbJulbjdZzlQKw/xXNC++csT4rbekIz
+AKtVq183deOOf9wzAVDbmYDpCBdLr+YmX2U36Wo7AQTeAfZVWm9WDW6IJKvSeVNUWVoTAEBtq9KP
+gPRUxVUqU8iUqfftlOaf5iTLcWFxg+GGx0KckkW23FS0w9QiA8oFqnj15q16efL96fFroTENjPfs
+cg04AxRaaAcn6EAdbOrqYFXAhg5HZ/ifipMEN9kS+we8bIWDO1d6NIaxl2G7jbPgMO2yuNINjLEB
+ZkJ9jajdJ2gyra9hfj7fsd6j0fHQrNDA+bfb6wL2ZB6vU3UdM30hZYz+LnC+C8vm+lughhrhNDBV
+NS4OIpghPJgSd87GRZ6qEkhsleXpZAQzNKO6/ioCKbwu8n1a6xYlAIRqlEOh821CPeYpDLQL61vk
+F7rylkYmVUZmnddFRYwD6D+fEy9axfkN4VgTQfFvs3SZ5TkihLQw2nu0Rx3XNxlQYhKqM6pFfEFX
+UnvMvbgmbokN0BISHdBk+jFel6t0ytsXeetuNkKdpY3Sa71iioOaDbFXWjU71F7aexa+b1Edodlc
+VykA38y8TbcoiqmaAc8mbMp4zduruS2IckY9+4kaIU1QTWiLv8OMHtf1Zp2aQqQV4CxEUKNFsVoV
+tzBlh6ORUo+wkj6UfeKEUiiDfwEu/rtKm/n1aOT0ZAALKER+CBQCgSMhzYWqBQmP2oSU20wmy5lT
+FFWSVtTV/Sb7gBG/Z2Uc6+h10cihxsPFVS7WWYMsaSZHZsYnXr7XMH/8lscNw4CTu6Y501XtPK1x
+eKvyOp6lWiSZpQvcCbJI35plhz5HPX3SWdyoNZ8yUAbTkmZ8gvQzFmQ6iyYlIQBg8OaL86zcrKhS
+jQSmYuhoXRL8dYxHeiHCEpA3H8sjZEh8fM/h/AHc/gXb6PY6g/mZAwTgMMilYPlmWVOhgGD50cg/
+9HV77h8o9XQhZxN3uYizlZzycT46pY8nVUXbd56W2Goqk1HDCPMGRbtlDvOI2zwIgpEIMDCWChjz
+Sv9Z1Po34BiN+X1bj0ZNtT0EMlEahyiabTI8FKMIxQD5ox4xBspBymtm6hl4wD10o9cwg06TRVWs
+sdiM+wIYDfSFLUaP1DlxoJSFZ49Kv8Wpddl9qaviue6QukIeNTp/e/Lq9P3JhTpSl5bdTdu87gr6
+PMljIHk6LYDgWt1aPgc1kSlmyBfVKzj6iWDgrKPWtLXTuNkAXQPq76oNFcMw5l7h6OT18fdnJ9E/
+Lk7eRhen704AQTiD0tEjGjIenRsQJusQNg5QbFKHcvaOOi3ow/fHF+YDwHibkmwM22erPmRVs4mB
+VD4wWd3i5kZUlmmeVkiSKMfOUmBHuE1LODG00oLoQLusKnLcdYfUrErNrE/pA+CVJ3GFx9aMiJ8F
+WzkocIMkWRI3CKx/TumcnV+n8xuRnoirpHA2ArLAL2E5EpDXLlIEQfUiBBTBhse+GxAucEKiF29e
+X7w7fv3uwsxElNXRN1/BpoQv42UKhN9UY1j7qQrW8ccatnEwpaoTXK1OBZBzgslEfaeeqceP1fNn
+BK/cllsAB+KJUxk/RiL5RFm+KIIJVf6VVZ8jZuYi514efnWljo5U8Gv8IQ5GIGvaqrw9fiK2825b
+ptC0gf/GRT3BhUWRtdg0yE615mLECl485n7AHuYxTFUCcsrHhpUM+IZMEYi/YE3rkbqNgWuJZlEx
+zRBMe6qXVTETqYQYOeiwtZE2YoW/r4gmEgBXrjZwWuREEg3tJEKMqMBBLklFkka9E1YV9Ks4kSVF
+pPVyHr/4EYk6wJKQSgKnJPrvk7cXp29eQ43n0HerE03CMTLCfKtu0i0frzfAjWgKZNjxCg6IPCYR
+Co6m2zTNARqIo+mtOv8/73588/r8+N2PU/Xjm59OkEhQu3OPbdhg8WqD1FzQ8VSlt1XWpEL6gLOL
+8sXZG6LOr0bR8cuXtI1fnr6dqujk/cmL6Bz7iU5++CE6fQ2b+h1UrGLQPMfPJ7L0tAQk+OjVd7bn
+Hny8zWmPdYQKnBlolrCaENNWpJWjzV/MfoXaMCsNniMsbrhEAOJ2ulo4awVoRKRHjwBnu1DweZ9X
+sNzOA+jk5wpPcTxi1RxohFa/ydZAg+u4rI1uvgJZetXlI8YsUAgvMqQOo4Xy62KV4FJA4ZqREyYZ
+1U0CQKIFqI9pBeT07uXZ6fcwqy9P3hNBUXGIpR8RTTjJhXf3baRZip3AXKD4lWjWyItLOIiekqGR
+oKxghgHkmDZOIrxQhF40P8CgUBCwczExnJJ24JbOkRR16XoUca/Yv2ZpoyQFfoEbbIywJ8ww4OB/
+m8LBkmuO3CCB0GjG2A4V2nVW46KDVlel63Q9S9kO1NQeTgQO8WoN1BmezJfBDaUOaqXPfTr7kecW
+dWgxpSIRB8ZvLkgamKrTN/TLpNWSBkvCBYzWzoLIgFhqG9jyy4D5VXB1iV1eCSAEUpPMRH+leGjX
+DaAWrXGkBKji6asbPcVU5M4x4RW1xiPN7tOLwKXDrXYBCwwHtDtO3S6rYUPeF5+6cUGwZA0Vw4vo
+9AI4zljwgi08EfjrGDgjgBk/JpKVPqBLXkbSk38tslyXm8Wxpxz2MqYWsMeiaL6K6xorR1GgSKip
+Qma6uB3GUAO4hFNn4tCADAOaTPGfHlziGbXD/ryRUxNdCeTi9TyuU67FA4WGUYQ8NIrGdveQ/Lla
+Cc/ZU7oKagdVNts0JMehtjCrixX+iR1oysetska+iRxK2FbI58LYGRVM17g1X7hEWU18C+SdMai8
+9uyfkFSiBQ0ogilD9ptWOFsWLP48gsN0ZVkmGlHZrsnThLj9B1vxqNukQO0NdLK6BUXO9fOTc/X8
+ybN9NBWsMoCl58Orjtpvlm9S83EBC6SlKMaXW2kpy52Jhd4ph7thrkOzFt3VX+hVBZZWfEgTQBep
+01lYkIWxREHRCllcSocHnousg+gjJUYjLw8ftoI+VgiKXnK92o/Y0p7mNUjybLWmuRaTOrNdYEQf
+soRFcC5skH2mqI5qq8HIWTmPrlDfBLESTwGcqtt0D87wasPWIMIbQaLCldhjOiRwZ6jqXNGvNznI
+AxGfQEeotYwnhlpxMwm9YgW7Bo/UqwxFIhQznUljKGOgWtxP+4A8DB+G+yFlwx0AAi26JluoA0vb
+UWmIbJLFbhHG5FtFG7ZKURn/oLtgAUUmw4FEpaH5oDkDQoLBGe5l2IFQGe4vXQ06dqbEJ7uzkO27
+PoDWLIagd44FGlfS83d5iGfNmcuInHYjFN3fv3/PdFNf0+0FYjbDUVd0VpOQW26nKJjNjb2D70KI
+DlAVAjCbWmhT7V+oomRbByzouexukoOum6Y8PDi4vb0NxXZfVMuDenHw9V+/+eavT5gPJgkREJ4q
+drvIRVZ4QGVoLwr/rvWW7/TStQhS5EVDjgRrnJLNgww9iN8Pmwwk5MP9ieGZSMZW0cV/tTEAWEik
+Ox3xPKPYZlH69Hn/02H4/HMQYhU4AN0W4wnr96KOmZPK19igRVOAsAiK7LzYoKLnSCDqS+huv9wm
+6WyzDAwG3jmo/4AB43YdG1LYf3qFGPgEosmrnpjzHLgFkQeqi+OOHBeTmUE4Bc4ynk4dE/W2n5vp
+OU7uv+894U1mTA+RRQ/cGX6Ve29EU7m7g/BHhEI88xwbkf7xTgR9yuvDPEnEnDDGDUTI4GpM3e3n
+UDfajmBX3YpiWng8Ejg1iP4znm4BR6flHoLcU2SZIJM6L63UgIlq3c9pK7xeBqjh9tM599q04IhB
+SARH6inLziBRHnbKnvDablYrujZpUak3K5OumI4ndgGUOdYAYGtUgSeri4TeFs56YBV80YIEtugQ
+E5Z48t+jtgzTWexdrXmK+0DgGo35wude0AnlI+6hqmE3lWO/5RCJm7ntdrbz5CGa0qsk6kD/5mpz
+j95NtfOAArUNWbCzSOF8VYBEbNgi0ZEt94UGo4b1HmqyA2Ue7Hw4tY5I7vM24J7Uw0uq5QYtF+5t
+h6Op0jxdwz8rz/KRMekZMPfdZf7I/oQ9Z8YrvwzQh1WVHqDHsgEguNIrP/YNRn1dT0xHCNrFaUjw
+6RxOgjDKW7hSxhoCaOZNd8OTmMocZwVU7NCAx0CgOB3kIAQjrGEvyxpooJfEzpCn0C8wBi7B8cEv
+IfozECtA8B+bOi3Vl2SCCiZXXeXU51IeRH/b3e9EEdoQXBwQZE878q1kPqDak0/voom76cKaDk03
+2OnEdhPxTUcHG/yrZ1j3oVSyOrjkEut7Nt6pbDNaQsNbMQGSXJ81fxLXiWiZYPGdoqnHqIXn3FMF
+2MloBxmsj0uULbRx5x5YRb2M/x7jsnakey7qoaiZtDAiYbOHwTgNlyEKiJuyKYpVrfbzurxZYsUJ
+kHBxozalFXNysQauVqyFxmI5o/N27piSxNiMyLVJ3xwEL7iOpRjm7SRp1XuoENljgkgHzViOsTpk
+veDUHY427yv2HNnihykzMe1RQRcnOATyyxBNipX8FV5ibJEwi9UHsdyKbMdLxZdRfM+QkPYDM5jh
+/cIWTqkPeIeW5kK2ZIxgVW4S6gOqLjZ4DWj08x2cqCONGzlth3TniG68Lv3iG7OpliDU7XBYmBMK
+vp9A19ub/rlT9Brqalj66x2MjwxRHkmImrUHSMNBt2v8kWm82IIm9rFnKnvGQ+DGn/5SfZ4YDZVk
+RHI3iUHRJVICgsMruilfXcfoB4cuDdCW/Ct6e2Ea0myqX8rlUQ5M+e8QZrv9BnfxPBw7/2tnwONi
+toeOhEofPSm11XngGXz1egb/zAPZFVR94hyIen2ZP+08nPvuU8ztmX//ZjgU3qhYu8y8KLf69lVk
+Vf86zV43OfCSjE1C82u88jN3QrYVVGD5CH1g0KI51hdWzPkM44qXaFtEF4VJqN6w4c3eBvK9ITNu
+e3coV3x0nQWUSNhPFTtOtq8d0fHNwtwy9wQE5MZLXxvRPWTn7sgwQ7oTwcMeDh9YvTFvRLl12cHk
+JpMu3/QE347tX4spLgPpVPJ7dDxFgNp6LiZ2HHFU9SZFH4GxY4aaKhfqIJJTmRgGQ9NHe2pQrzcX
+sLuUewsHz4iZw+k6rJIJN4IBTLUwK55EIe4btLg/YOfKuligeDcE//ltzKQmWqLgS0I5uqbK3Bae
+vHklv/033q7I78Zw5CxUGcvdhgzirhXTahMsUgK8M6Jb/Gi2bVIE4EhoXCBz4s3s2EzapMWhktTX
+lrULjM80oW/xRzpyacXxUzpq+S35irXvXUOe0WUBmvQMWIDr1uuq247y3PKh6dwfGuxwDVu+o67f
+qJQ6nxw5m2ce9722ZUb629hH4DLQBcGV1rdcXdwBhff8FoxF1Js7awN1JFrdyIK9w57RufWVhb0X
+ClPrDFUfke9Y73FjrLz3XlDXjZYAoqMKWSJth3tkQUb4RU63VujDi7LrDI6SOk27C2JN9cUmT6zc
+alzu4Eubb5qRBuSFF0xcsjZ6uUsufzlyajj7VzrRp77XkTenuqfJyKywgIYF1mC8S9h2X/LZ9dHC
+tuOgqJ+l648BMs2snhd1QDeyfVaFHqr058Zge5bNEKC3ttpkoX/IsqCdzX5PJ3dD9waLF/ZJXN1m
+eUDb2dvJZmn6JHMu82Tzgwu6Czw4Yzeeg1eoKVJQzAEI7GRbKuHI36vlzqoLtz3GQXnbG3xgemS4
+gXcNdHn4/Ko7MdP7gTbzevKxqeIa12/Fy8g7cAjQVXdsxMTIYpJvJf5F4qPwLqwq0IEOzrv35GjG
+Xnu38fbOKepH10dSfXn3hLQwJlJBL560JCI5CHZTYy+efxZu/XO8E7rDJR/WfhdaAHs/2eYoDvUB
+vep8gQbffBX1+NK46H7z1QOno287WnaPjGrcO2CtsBmsJt6FBPr3kkbolJOXSm6pzNQpWRov3bO0
+O/4BNV14HDnoDuvUGix6QKdVM34ytfM5oLF7csIgPKNDDwIbtCOwK+IybdgYVYsLxwdQ7cl9D2Zj
+fx+5ob5D5svx/l3sQdq50Z0p6FMG6ssnSCZ8aT3pDkfE6mPt0bTDmGGkZ3/UHA5moxm8EC9XChnm
+Er3nuX+UH9yDNXg99w1Wjjjd6gl7XD/r4V8PwO5PwGuYOP8EHJ7cC4UHdcTQhINOWodD31Dc46Ct
+7u7g0QOyyg5Jpds1B08stLzBm65Wj3F3Pla3FFvlhyyQJNIDB+lQInRebKqK42xok5dptY/xIWwd
+0SIHRat2wRy8ThvExFSbk+uPE4RY9BFuIM48ZiSBFWX7aee60Ff/YtRBljIO0Gl9wKyJDjHQ6P58
+0ltDbMqyLA4LV/H+MpePz50KmYOwf7qJR6y2nPSPhFSX9v2mq8NRBVHiuiqp7bFXU+sa1nyNq2gp
+huwryEHFBA5pKObzjG44qBwDK3MWDfHbBp3YKdRSIprJbKF1M6MsetcKzoxafFou1v4lnqsfPcB7
+2J91jYy5nTQqtLRJ0g9TcYrO8mIitMDjP9KC5pdaHoLf+BPrtDgj2pMRTUnOQKdkcSPruUwH3Rog
+WJFd+tb+Uk/T74GEJIhV5Stjd6WvwChKKaWQMuQW2Mbx8XqBxQjYRJr5McN1vOCr7yyfrza4lVgs
+xxiQxSafc/BAipdSxkufA8X4CmKxipdqTI3pksu19H6IKxFay6rAhAZqkyUHyyxR6W+beIXGoRQI
+bU4+mVIkt210CaxecqwbW3rrdL6psgbvzeK6EJdWMm04FWdbHujYQ5KdF3lBMFDuUF3gsMmcRBOX
+6OnSZgPfgw8HiRo5NnBCt0L6DuV5EWGvtPmAL7n2FocG6POo3UMhLoIwfumhXZJSkes3S2vuTioe
+Vt5UunusIKkPoYwnaAPhv+nPXuOoGxDRxmU5jOVyN5bLNpbLXiyXPpbL3Vi6WwwX1to+9Vbos3+2
+vfR6AzFd0yX3cxLPr7keJgzAaBYMgiq1Sm3uXChvhmdP4wttAkLHZ2IdqemjDazMOMKnKtiTQEAi
++aNJTdR3nfHEaUxhmtKYh6IF56HgUr/tQRhSfPGMmvOGA04eh97GWK6KGexbg+7UApiqdpypvviJ
+Znz/15YYOOQNqyMo47dPzXAR8fTHoYwfx9Wy7m4n69ZWAj1STT96hJoJwEe9Vrc9trrtTdUeW932
+jAsD/fOSYheQciSWtVAlHKMU72uquVGxe3ut7xI+K9+ZzNl5EqTLvHEky4FZOj4/f3n87pjNgcG/
+A3fL6Mn194eLj65hKnQFabe6mXJsYyUte2K7Y/Im2yEJ3aqjMLQ+PBsyNPg4/n8dJ0woIBGKWfdh
+w3y4Vcnw/k5INjJUETLNR4finZsCZ8P1uVO1IfvOaKhhRYC3yGtjPQarC7d4rTnVdkyEA/RhGmtb
++5IJMH32yNnORJhqw5cmXWcukOe+P/nh9PXZ6fcYa+vISSjvvLk4eKZOfnqvyNMHmTwLDjG6wzcY
+hQLM180ghZG4SbFBO0yyaeR+ulYvz87kDmWNOYQwqQTdbcN3DmEx0NimxQK4+SixJ4iRjk91kjVR
+pAZFqqJut+bwZoqzxsQTlANqloqugWAkCZdO1kXeLCGQOFR2p0KHagscSg/SaA22Ymc60Tt6kJJz
+zAQDrFa9N8nuZbdcTngWTi2i28bCCy8DF9fgKqzLVQbc8dvAUL40w5gISzfy0fjaMV59bMZpDj1L
+RR71IBbof/OteIJI+4kltN82gKElsJcw7jyliABKX4GBTWoPK+2x5z9oAc2eWXpZgxoWDK/gGlxE
+TXRZjdG7ILhcY4gs0OQ1HFAoTAOE1kr4NvVD57xJC7yzD16sk/3/Ev2uZYH/5z97qjfVav9/OPye
+tdOgZzLdyi9BOwjTEO/TJwEjR6GY6r826K4JhzaZI53NTj6H7DQdjdFXRPwxfHZAceISh4D/jVrt
+q7SspH2/ABngFvj0eUwn66fPegKNE5HpYIrjmbTho2ufwQ/v3V3/c/3zSF1cp+gCSH5Xpy/PTkDK
+wlw3uI/48uoE+mQLz4pSURjfP4lusqDQ7RmKKyTmivIuoPtDEnrVeg3JuPGodcdjglaLjLXdVh3L
+bBVntYu2dsXEMp2SJUSKhiXRqxvg37JLTR2cZ7cOzTtuHaaM6LyiGEafNICk6WvM6gPoFZhKR5vF
++S42yxvtG7XK5sBOgfMCX52S5aPG6DcmwCJnw3RROdlDinJbZcvrBvVsaEz+Q1T9p+P3Z6evKbXL
+s+dWQO2h0SkJzVP2YDrC8DC0xcAvbsgX0lUUuaTbKkIYyITgv3YRu0YdcQeddmwLxf/aReyVeuRo
+TTwC8shtbxIUlZ1mfbvHbgbG1eiM+ONGf1nMuk6fOAjtXeWOr0uKpmbrRCGZQxc+4FZlUZpgJGnc
+8mh1f2SIixIvo5Iet1GG2Lu39M8Mmt50Snb5zeqfzi7EjIOAUbe234d2R+9UleE4tDZELKQAykn7
+T1cNcOrNc9zJMIdjt/HEpbF+TizVmQA9m2AHmPq7oKs3Yj8/t16ZHiZmsjsqgW5I2W++qMfsrpRK
++qQNSFJf1MQ/AvWFGo+djTudqMfqmTdK5zy4e5TCvOCM/BE44VttH64oYd8UD6TfWIDkIkIMGemh
+sgogDi8vTIgQ/rC751N/lL2bgCx+uO847QvDmmqYX/rTPWDwJnbrTfZldtV3tKhTTH8yQOPdndF/
+2aNRa5FCpx77Q3r8yJ8eMrr25QPYOWE++Cq+BeZfbpoxr+ROf+5WQrJhqHdDxMAzawgeByhB/zbk
+m24B986GwEJJ77eBu0peGyPRmhOylc1izxSIKDuvQEVraoyncFO8aaHUyAH2yD2yh35gvsoVj/m7
+JxOIYz8xQLlzHyR/w+ni3BScgi+jkGebOUHKEkwSBKcDnKZjDGz/1QS2T0Jjo+h1m7ovEufb820/
+ClRiETjUAfbYD4XW9xpJdvXrraxFwv8cBP8UzSPOb0i7fPHz6VS9eP0W/v0+fQNHJSaIm6r/AbTU
+i6ICNZITC1FaWozVb1g/LDY1ZpEjaGS25wy+KJade9OLVwSSRMDPHmAYocJ4SZTFMW00oGhx5jkg
+v0IrESQSHg9/6zweLblTy4R9sxNIodNLoBMc1N0MB2W9OJAWB06Ty+Ds9MXJ64uTsPmI9Kv/DK6c
+On3u2XzXmRL3x08Vu2ibL/MNfhEojqj8Y7oqeyRl0TZ1sgTUNtUeqCKl0TA5SXFs9Im4ItfLcpsU
+8xBrAu1zhpbmFkTniaNY3nm2ewcrwhpP5I7Jyu/4GeZHBZh4BqvIEKgi9R/PMDGIBGEFA2ftVJGd
+F/57fHObuGZiiT+jAY3aqNlhjv32lttd88wKRENDhNqRmXiT62eVxfV6NncTwrzJlaSVxjRwaPdP
+F/Fm1ag0B82JFHrK7wvc3M3hwtuEV9oEcGzZJLO6jTG7nHH/iWsVYK90bY9BPuRPsAJ9+6f4hnk+
+JpdRG04aCdAJUVKSCqdpvZlf8zZOQ8d20HGIuM3y565niw7yo05ZD57XdrZhoBSiSigt00YmgD+M
+J5dPrQsG2XnnnnvnvBQvTvjt8ePHgfrfdws2jEGIIYUgcQHEXoHkjIoHDmUZk1mkHs9KXRRyGsFL
++HBFZmjzfZOT9XFHU1qI1PyvYfCaWDLUDVpnLlvmKr5y5Rp8cyPnyD/yjMIR0H6UIquV5PtoW9I7
+iWgRmMBeXM+zbI+tELAO22KDSVfQliiEkn4EWs8QzBRL8aqIFWkOIULfUUM2Bh0YCwEO2J+Lu6NU
+VZRwBBCNzreCZ3SaZ43NFPDEvUeUdKmNyQYvBKXiW9wTeiCt2XAy+HhEalcT/t5FnJ5KUswvXbti
+a5xcfBfyQNSwyYrFQqMKH/UyzYu0muvjFNcsm0sEM4PR9RAON6Ys+GRdD0c9KAXoy4FnQGI2syn9
+i1kZF9M3dKe6r3sSj6bGvCzA1p84b3n1haHtn+xMZiIN5epfKCjxNZmvRRTwOlN/Mc4xsIXdDMhu
+zppNLpmN2ZnBpjumaGQYpmGOhiI9RuE84WDgM90O5BzGH1LCGTlJchvpBJAowkXmltlGXQ/HuPix
+4OjgauJZVDswxSkNrhx0OHodbVqdWBZBCGr0R7MUIEvbDncmGjJi1BSP6Wy5Lz74KNs4Qf/k3eOA
+deK2TCxxXykmP7U5uSSQorafdC5Zc2k95Zy91sWkVhz+7GS9dLKf7ZhnNyqO3IvvOw8LMQKFEkPs
+hpd2LEB6ncgzy66L5XMPydPhrivA5GstPTq5CW/wlkMuwpxoIbfrPueygbzKxaI9c3pHlQUO6xlL
+4dAQN18S6YXThshLwxJNxipxjnUYD4L6UudAGdDt9Dx2YoBc3OROSbw6BxQ031eX8ier79T4+VQ9
+a2nR83KLzy4Asl8kaP9pN4OhOKYlPcZ2cmb13ZEaP52qr3dADwc6OHzm9tC2ibQgDAJ53mUbd00j
+JrTFkWBI1d1VtcvuVFCaXLVnuzsrf6dJ+VtrUjjvhXieP31Y3wFnlk2T/S9qnAjBxe7FYTKlbjGt
+nnj10o7gjHJqjz2A9zgZHaUut+zLYWRanzK96CQWctBxNi88lVjKcnmcVQf923pOC5Eb/FqTBQB6
+43Ul9hbLZS5cKb57666zxGp4PdYkSUjCl6i2ot1od+oJD9rBd648XrDbje7ujAeQ+E7nDYeI/3zC
+4TiQoRvyDqJ3hOv4SX68iJue5dwdCePtQBP+Yhdb//SbaD0y6Wv6h/aJA8XuGFBo9KtQpIocou89
+p6QtjA/+Gt9dIl8FPLNXqStYs4GFH9jIKPFKldrHB+pms0DXgg/0jNRxTa6CmLH2q2dPpzrlAgOS
+ATwPn38pry1RM50C0dfDpqLYQ6G0exb+LwdY1vitTVFH56VhHbUeFPA7YzPqJIzMPNhj5e44Hbtm
+scLniexksvplsoG+Aml4BnKwfmcM8zvcxtuwD12XX9i9O8TRHr59ff6HnfbukiGet4vfPZiGpVU/
+x6f3AW5TzuqDz3eAdLopD431VJ8BJOm7zqtEDDe9kX7M//F0bG6C3nFzw12DlhojM2TtkNIZtB9h
+6w5e2g4fd32DZ2tVadSou0NyLH82zN8blzc5LgufilNUN0rErYXjHDgCOu20kxVezRD9CbKaHNfx
+3P0dPe72+XHCHq84Jz7WpYTWcLvcvZv1fZi041Yyd9dXjl6SidjlN0qXyzqizGsR2Uf4DY222qvV
+g1f0CE0a11utJmNqYQChiUYcid1gAVh/YGL80iJ7rjnJYyXpG/pAO07VdZYwr7YPz4Rs2qb2+nKF
+vaKDVYp3FPUGs8PUaSDv8bFLVZ+ntvOajZhd13F9o1HXLabyPBtxPPLj0zHUbFDv+mP9sdyM9s2O
+qQi3MK98YHeOgSgyZUB2T2xaimxqyCnNN+u0ihubVdh3BMlAPbI9UMQ+bibHTGv3cztEx0EsM5qq
+gxRaTM3vX4IK6FtYdmQwmRgOeX8Sden8IclRnJPHKtUfzXMCbkbrhN6MdMVAU81/USSTh490onzi
+r2I95VJJ3c2Pt/E9DgqSDlEC83CjwnxPfcMKWY41aDjfXKbSTdKcyZse/Q8stGmg+8JCS1k1/XdZ
+D426I08OVDazuMsAYnubOBZFdBi+w6LoR0480KLowX+IRZFDkKoV5g1aod3KQU7Mx9rGjbYnimjy
+X6ArctV1jQNKnm2F6JfoWkhm41g2oVP/uihuoojp53ShhV/uR040CQ3RL/vya1zYjk3DtVxIvItn
+6FPA7K9WMiDEED0NkHloVNS/D+Q2NQJ2TUEu0ED/yi/qIRSStaT3AvhslSUJpfg0ib/MlCNdemsg
+yJs0NRmmOueok4t3x2/f/ePc6ci719RYRnoext17RWCZH7PGntHdrOZcT4PoLbNr3hbJe4mGF5P8
+7xxl4S30oL0e/beWMQwO6WTCbueYgkfeAkjzYrO8Zn8nGIsDzV80LaJhLQzQXIDY02iXScormMiT
+RHoiGUcec5TQFYs+lfRnOpqgiF7rCHwR1WvaDg1FoRbdF+jK0q3ZniIuwWv0Oo2gZTTLMJ0f/qv+
+7ynMe6QnPtjFhAYBgYB7qBwQw1RgQOAv7DCKc+UYiWXBJfFYW/k6znUJuztwWDdJzPTaGL1ZWdsE
+euuibhQ/PKzaXj+POEKM/forFNrzQoXkdVTNmUTG0E+IU6w/mFys9IB1Cxw+nvzmQr2Hw1tWZqIb
+4I0hvVGs49vxAcqce59TdNFtG7nbmMVAfmRSoMhLlL4Wycyzh2rwGi+acxi9ZiwRnJZLPKfxLHvS
+nt9TdJM0jOcW36LGd2+AxWmeCxi1WFXYgoGRGssN2s/pIQ39dDdaID4UWcIhIrhDdTf4HCAwkBYY
+ur53H28hN2mdv5P5MSKo88fqMyBNWoCa64p2d5vbIcOeooNjexLEx2i2Wdauj0tW15v0679+9fWj
+db18+re/fvP8G6+hHs7ALZITmBf8G616QWseW/62vff5/v7RS0pbSP7oveDv3U1d0sEfZPicaU8A
+tgNOB3Hz8PNA7EDQQXL8Cmq9LppXqChIgsHztKKc9EXeTjPo/jxqxZHyu/DIK0n7o9OO/0a0UIQY
+AiPeTb1LD0v+t6e9DbuzyMdhqE/OsTcdwiAHJA/0p2wfuF5wu/8EpyMdoclJuTYn76HRrPNuIXnW
+tp9Iknt23Fn0ciBGv1bo6uZkVpYAAcEAWFeF8vgNWUFawbH+daxW+u7IeGjd0Nq3ufruV5LXiaZl
+qsN42i3EDGabyAe3DXYu4XY7b5yZdB0iHHj9lPOE+/kq2Q5F/h6OioSiGb/JrF8BJXFeX+DqDKBo
+MKCmU/v48DL7QF4upZ5UCvOQ46VN70ZSX5faphh8+hx+sg/5MH4cZl5imPmutKYaDDCx251JTXUG
+02SzLscygocnMu2ALVAPpbtoi0lLhfIZH25ucT6zzEFPeYEnihd5YvpAom8pZ3f3P5xF1eZOde2W
+vaOjnjX0+4lHjhLlPOqKyV8dJvGzfjSNyKD7OiylwZulaExiS5H7nqZ9iI28TSgTuzwmTgoIGe/8
+jBoYIY6ZzIHn8POvOhmmVu1j3djGTzJ7pL+NFZOzFRurjGhyYkfFjEdOPjS3ZSs5MWbGqMelXGiJ
+/aPNb9xXbq2jqptT2Pso5lvvm5so0xY4iNmvvOfmt5jpgYQ3GRS9Y4kMxau6K2nAZLgmJyQaLjeB
+9bZKfyoV63JrMnpbWuv3p5CU3B2CMxlUWELlUATM+y/u0s7Dp3WDivUagwVRvCfT4i06YLnPgEq6
+HNIytU1Rmy+dflsnlDUwGpNkj89FOxkIRxJ0tplntDK2pX4mel8fG0uTkzuTSNuu/2DuaFwbziFO
+VtGmm1tOZ5e+DGDkwVVvfmkNiTkkJdjmzEjUTj8Z2y/UZf5TsHh805/D0R0DUWWDed90lmh6LHoY
+2O9Oij1V/5lu29y+Qxz3zn/tPkn8iSb9kG0SeiIP1afPmHKfreSH0AG9pm78pOSLYAB/ym+fbR/k
+u+aHC3RTLtegbvdv+nPkEmLzNe82t/f97v1n/pr6I46cAjclj3d94F8dOLGZTMowb6ZQJtC5XSAy
+dsIdzKzy0dPz1nGY4dObICo5rczsd1rp2wu3trc6nRae76LTyhVKD9tOaU49SgqBhnKoZVNUtMop
+S9Ohk7rGGQvx/sit1s6owbU/i1Rgr31az76TbEo3TjA8ll+ZIugxeszEUxVlKaq7yTd2yc+Ns5cj
+/kZ2LjuhQshX7M4LFTQvAl7h8ibeaC2B/Hex30sCi7lbGMnLQ9V5ZX5fPb2yr+NibgJ3s8gLD735
+l96mSeHvHWPgZ38ODs+mVyHoto/TR9WhTVLGRCbvUmDfzrsU3lmbU7YmueKhB5ZpBgmQNqkUzpWj
+KBSSPvFWR4Q7G/kBeZDuV1WZVbSEfDX1vhFV2m8dgrV3OzQxzuGjd6NlFzcZ5VqnAtedESMDqQiY
+kPMWXOc05IbPrnQ84uCTt/jTfveKGz+9cu2vbsf6sTEfUustKg1kanDpyQbDsNtn4u++O/SzynAY
+1kWTrLLZqwzzJ3ZisX5Km5jPhAVVoPeuWJPtet7q9DKsUqy27o20VTMoIAg9hKAYqPkmK0t9A+De
+qbtJI9nskaRsO6jxPhv2Hq4cvcSCfhehOpGzWusvHNIXN/6TMuj7w3FLImmCkuA+Pw2d8JMxbfVo
+KgZJTJ8y4fwmDd8foZogzJCuGGiLAtcC/VVurfonCrhtWtaUwRyTQbai07z8DDKzU40vK7ARr0k7
+eQfFGOu1ONJt/WI97iMN0S92oMttpfxlMXTUI0FSv43qoGIsHEceVqTFmOru3nVNIt0o57Zcz/iK
+X9alZQLeGdS9H9YsgGocHZlOezY+ATfbHht0LaKCFdft70TnxHSm/oGddTIH2uc0ynTeWgEmD6IL
+OM3jCqa7TST6jrx3ns2cEsLuSncXTYBJk8HXGb2J8ikstMOwA2B4Gvv7zAPT1vBM9A/emDIpS2eL
+9AdHs5MQ7zFp3oTdD7xP09T48nC/Hdj1yKgs/CIscTbh4HTnzY8Z/isrOQ0Lc7JZui04dit0ptJf
+Yr4+r7QDJM6S/sbCEm1qwlBnEW3TiIEBg6Ya2pw7dkv0amQ1+V/l89QUTwnF1zCdp/Jl0nPJ0Dd7
+PXebVCkCQGd4aVY5tNeahw5VTjoWvjtuvLU+JnHPts/2cYufa87X2EJCUjST2Ggyu6E37/Mnz9Q6
+ba4LaFht8tIm2S5vlvRcPLkUj3/5RbJ97q9/+WWqC+nSEXOlTMRDMk/E/9gFERqMp8aPgvN80w0f
+LdiC3R9hATGUc+dpZueTBtU+upxHuvWvrQry0I5NFGeK6AK06iQLknFEXDyUM0ga925JHZHNgEYt
+dun23JmzsTeqqXpsB9Hhaw4oiz3Z7XrZ285B7GRdTt3Qhd/lVQvmoZIiKmW5yDnT/VUY2mhIzn39
+TAfh32EFg/Eudh831k5mZhJjqvSzxUMT6Z1SPt1MQgeAnSkDnm7w6bVED3j7+NnZg4ExAJ+fbfyj
+PQiUgT50Yqk/2ouBM9APMh7pQ5PAQ8BTc9NQlHgd21qTWiMnuWv1olzyrtLjaQx4uAE7jfnirXsN
+S6k145w1hZZODTSuDV3DVulRZ5c83Mb87uXZ6ffR6euXJ+/vtjKzTvOHbcxtFYRy/gDky0BKULPH
+nPPyVaqZON4/1S7rTGVPVKREaj7r+L3hArnjZobtKcDtYfZFIWsjuRETc59sOoxKO5E5jciPDBeW
+HMloY5G/6jlUYVQCL1W539RIzH35k3zL+lDqsAfOg6dxWn9WM2Yn8ErXGY28MFbLhGkxTGolilNy
+/VZwk2ImIe3MesgJSEwuGK3aipvxjOKv941cMkvJr8zKBdi4rIplFa9r8e1iWYXz0OrVE6hoRsNr
+qU0ZmmgZhmxnrCrWlOxor6ar1bB03Ko0T3DIricbBz5fYhzEJI0JIKHnhJGJWs9duyBNWx8mCPby
+6PODQZqmwkjRnq2XRRhcr3lQW+s7t4t6e8rNVFuq6vePMcV35Cro2ZbdSHmxHvYnIuh4XnPlbgqC
+/mDsXiKm4nhWa2YtXwhchNW2NXkMkXvOpqTvdqLc/OplUQO2+klRCSRx3h9D+yof0To8HXRBZiE/
+CT+2yMZJQlkq0GdmZyIyPzjgjgX84ezN98dnRAjR+fGL/zz+gdKMkn+OBPLcO0NDXuwzje17ecc5
+W4OnNyP4vp59mu6xTvMTFg6kTp1ewb/Pzt17125atVa7Ha/hFu9q1HkFor8hDOTu6WhBH4pS6e+h
+c4PYs/c6FD5wk9LtoS9OTh4UdfXCVu7zkXzlRNX6LyfJn/6kM2HdISs8d+98OyENvK1tliwN3OY3
+Ehmnk/tFdzuc274nvIMb9cuxVIZ+8/S4+UDSmonJiE5EhEEIzqPp2iT/yGbV4RA13wGf8y3R+zn6
+tVhgOfOUHYVTtBOg9i+gKGpYxxCSJQKDImIxo0/1qcz12MWxloBLc0WlJ8t/wKY7PlfoSdLVwCzA
+McZHmPGyIlT0kSa50Ez2wC9qdblPb5btI2+9Mn/hiko8488Z5ggE/aFabjiFizi8oIgBlUHNcfP+
+mTadBhT4R9mkQOWwrzsAgz+Amba8poa9iQFuLHvMtmrvi3pPLhAxizXNZM0eiA7yaD5zsNez9UTt
+Dz2l5D4lpNTT4YpJ67UiafGMW9R3tKg3+r0ahz0V1fAbSeo7gswJyVSKaoBW5HhTVstaTJLw64fL
+p4eenwYWO0yKkr4GThzWpaM4uZmfe68MpDn++ukv1eep8cbEaONJu5eroJV2fTi2lY9+8XjDM3og
+/lWnJmRIgVfe7zijW6AXJT4HQy2DURtXQ4GHNDI1/vR5YkbnXP/KEMyXSXfYlsMNgeLrYxcUvRjS
+BdXhmeqLCkPi29+dk2rL+dnHT0xmd3wMznPfCZx9QkKyTyPcQl/C2JG2m9OF9b2aM4q6PVdo06Qs
+P2x3FpW4li/4DB8h7aFbmhiQcvjlsf72T+/RvufGSDd/tuve2tR63idDiB6CSasxsWebSvX3EE4e
+YKVjYuBfqLHZ+/isp51Il6Ds4J5otVR0b4kRJaE/EoHDHBSj/wdFHgcE
 """
 )
 
 # file activate.sh
 ACTIVATE_SH = convert(
     """
-eJytVV1v2kAQfPevWAxKk7QU0cdWRCUKEkgJRJhStU3lHPYSn2rO6O5MQj7+e/dsY2wc6EPDA2Dv
-3N3szuxeHSYBVzDnIcIiVhpmCLFCH+65DsBWUSw9hBkXLeZpvmIabTidy2gBM6aCU6sO6ygGjwkR
-aZCxAK7B5xI9Ha4ty8fNKjg+gScL6BMLhRqac1iu/ciDs5aPq5aIwxA+nR21rQRTB4kGFYU+oFhx
-GYkFCg0rJjmbhagyVA1+QfMRGk/T7vi9+wK/aZ2OpVCgZYzA50ABoPx89EImKS2mgYVhspyi2Xq7
-8eSOLi/c6WA8+da9dK+7kz5tZ9N+X0AHKBK8+ZhIx25U0HaOwIdlJHUCzN+lKVcWJfE5/xeZH5P+
-aNgfXfX2UMrjFWJ5pEovDx0kWUYR1azuiWdUEMWkj4+a1E7sAEz48KiCD3AfcC+AgK0QGP1QyIsW
-CxPWAUlgnJZtRX7zSBGSRkdwRwzIQPRvHknzsGRkyWyp+gjwnVwZxToLay7usm1KQFMgaJgSgxcw
-cYcK7snezDdfazBWpWPJYktijv5GACq/MOU/7zr9ZlLq5+f85U+n7057Y2cwGjZfkyFJsinJxLmh
-S0U7ILDT3qOs065I6rSrWjrtgyJm4Q2RFLKJ9obTbfo1w61t0uuALSLho6I+Mh2MO/Tq4GA4hw2g
-tkOgaUKb1t+c/mLRtEjjXEoMccVKLV0YFuWzLavAtmO7buHRdW0rq0MxJavSbFTJtFGzhwK65brn
-g6E77F71XPdzBiv2cc572xCmYPTGKsl6qFX3NJahtdOmu0dZRrnUnskpxewvBk73/LLnXo9HV9eT
-ijF3jdAxJB2j8FZ0+2Fb0HQbqinUOvCwx5FVeGlTDBWWFxzf0nBAwRYIN6XC39i3J1BanE3DgrNN
-8nW4Yn8QVCzRzIZYsJAzlV0glATX7xSNdYnMXxvCEq0iotCSxevm6GhnJ+p2c21YVvqY31jLNQ0d
-Ac1FhrMbX+3UzW8yB99gBv7n/Puf2ffa3CPN/gKu/HeT
+eJytVdtu2kAQffdXDAbl1lJEH1sRlShIIAWIMKVqq8pa7CFe1azR7pqEXP69s7YxNg70IfEDeD0z
+u2fmnJmtwzTgChY8RFjGSsMcIVbowz3XAdgqiqWHMOeixTzN10yjDRcLGS1hzlRwYdVhE8XgMSEi
+DTIWwDX4XKKnw41l+biNgrNzeLKAnlgo1NBcwGrjRx5ctnxct0QchvD58qRtJT51kGi8otAHFGsu
+I7FEoWHNJGfzEFXmVYPf0HyExtOsO/ngvsAfitOxFAq0jBH4AsgAlJ+PXsgkpcU0sDBMwsmaxduN
+J3d8c+3OBpPp9+6Ne9ud9mk7m/b7CjpAkfibx1g6dqPibece+LCKpE4c829pypWgxL7g/wPzc9of
+j/rjYe8ApNxeAZZbqvBy01GQZS+CmtU90YwKopj48VET24kcgAkfHlXwEe4D7gUQsDUCoz8yedFy
+acw6IAqM0rKtSG8eMULU6AjuCAEJiN4WkTSLFSNJZqHqE8APUmUU68ysubjLtik5mgJBw5QYvICJ
+O1RwT/JmvvnZgJEqHUsSWxFy9LcEUPmFKf9V1+k3k1I/P+cffzl9d9abOIPxqPkaDUmSTUkizgVd
+KtoRgp32AWaddoVSp13l0mkfJTEzb4GkLltrbzTbpV8z2NomvQ7YIhI+Kuoj08G4B68ODoYL2DrU
+9gA0jWnb+tvTXyyaFqmdS4khrlmppQvDony2ZRXQdmzXLSxd17ayOhRTsirNRpVMGzVbFLxbrns1
+GLmj7rDnul8yt2If57h3DWEKRl+sEq3HWvVAYxlYe226f5RlmEvlmZxSzP564HSvbnru7WQ8vJ1W
+hLkvhI4B6RiGd6TbD7uCpttQTaHWgYcDiqy6lzbFUGE54GwXkdb4HEoR2QgsyNlkXIch+4ugYolm
+IMSChZyp7NYg5FyfKprlEpm/MSglWkWPQh8W75iTk72dqMXNXWFZ6TK/plYbmjQCmsvMz258s1MJ
+v8vwe4fB98ah95aB99qwI87+AZNadAs=
 """
 )
 
 # file activate.fish
 ACTIVATE_FISH = convert(
     """
-eJytVm1v2zYQ/q5fcZUdyClqGVuHfQgwDGnjIQYSO3DcAMM6yLREWxxo0iMpty7243ekLImy5RQY
-lg+RJT73fvfwerDImYY14xS2hTawolBomuE/Jjaw1LJQKYUVEyOSGrYnhsZrpvMlvP3CTM4EEFCF
-EBZsv8MAcmN2N6ORfdM55TxO5RauQVOtmRRv46AHdxKENFYQmIGMKZoafoiDYF0ItCIFJCuic7Y+
-JDtichhmEH6UYk+V0WjQGXIHRoKWW2od2YAVgZQIQHVyI9g3GgaAf5oaJ3JU1idqs68PrFB10ID+
-+OFPh1hL5QzhR2UAo/UxP8bx8Ijr0Bb2m5ebfq2kdImKrHymuQQPGNgDLwvW2qUsuHDPs+CS05GF
-0pSNHf4BoyC6iSD6LKITkxmt6mztReOvWKA9U6YgnIo9bGVGgYgMtZtCCWva5BSrqbaEY1gIlWJL
-hYkjZ7WHQJsYyTP/FPZEMbLiVDsUW4Oh2HxDgWlLZg93yctkvvh0+5A83S7uwzrFPddcGrtrg81X
-rGxruUYbuk7zfzKtC6pHP73/GQg3VGFLW12Qo/Mc81TrrGwPygT9Nnm+T17G8+fJbFomKoxDCD+L
-8BqbAobcwPtatir7cPO11D5oV+w8lutalnJNLys6l2wEj71Ty1DoBrvCfie9vy/uZ9P72eM4DM78
-qM9OvakPXvejDXvFG5fzp/ns8WmRzDD388nd2C/6M2rHhqbbnTkAlyl22tINYlK1rUv30nYj4Vx+
-cT2p6FbuESrXsHTgnZKoYVlRWyWr0fNl3A6Fw7n6wPNorIim3lxE+sRGOSLaSEWdM1KxDROEN3Z8
-8+DJdgFSSHCAEg/1PQl6JtFZq67Mt6t1RFdFHU9f2lUMHaXgaITw5heIhBQZflaFJREatYrI18Pq
-7E23z7tDJtPuo4aXLoTrXxgXIP5s1lG6SHvwSdhImVKU0z3xGSoOPE5sxxcE1bB4+YEwSbzXJAmt
-/v+PuP4jYVWennEFklbrsu2XPFXz02VBh3QJbHFX2PfCHyXJh8k0md4+jjETR5E638t+wxJL21P4
-MQ7KJwz/hhMO6XbF46kuPPW1tC+7pt92B5Pjh+G2/HZcEhy65qtv7ciSu8nz7YeH8XF+wuN991Hu
-Dm7k0wKbCRupTQy1bYKUcTqjRxpqTb4/9Gcz3YJ3cgIOHtnTlkN9bYgp9Du33XgyGlHErmN6x8kB
-N7MzUrTmS+FKiU+KT6WTEhcUxXBNQK17fGa/epjJ2m5+7+Avu2vuFN1hip1z/nIgyJY2tv37opms
-I2klzT3hyqiYMGuIrvSVjjrhMMBYklRyjL3cWl65kht1gyt9DVGHMAxweKj1uN0doae24tIyBfOO
-a6FOZy1jZzukdvvqN1kPccDLjbwGdtJ8m72rgeki+xOnXcf/CzFcuJM=
+eJytVl1v2zYUfdevuJUdOCkqGVuLPgQYhrTxEAOJHThugGEYZFqiLQ406ZGUWxf78bukvqhYToFh
+eYgs8dyvw3sPOYBlzjRsGKewK7SBNYVC0wz/MbGFlZaFSimsmRiT1LADMTTeMJ2v4O1XZnImgIAq
+hLBg+x0uITdmfz0e2zedU87jVO7gCjTVmknxNg4GcCtBSGMNgRnImKKp4cc4CDaFwChSQLImOmeb
+Y7InJocog/CzFAeqjMaALpBbMBK03FGbyBasCaREALqTW8G+0zAA/NPUOJPK2ZCo7aFZsEb1Qgv6
+46c/HWIjlQuEH5UBrNbH/BzHUYXr8RYO25frYeOkTImKrHymuQQPGNgFjwUb7RwLrtxTFhw5fSwY
+ZZf1niPl4XUIUVRR0Y2Z0XqjbcDR5BvCD0yZgnAqDrCTGQUiMnRvCiVsbJNT3E61IxzrQqgUOypM
+PHJhBwi0zEie+atwIIqRNafaodgGDMXuiwTylszvb5Pn6WL55eY+ebxZ3oUNxwPXXRrba4vdV6xt
+b7lOi1yr+T+Z1gXV4w/vPwLhhirsaesLckyeIxONzzr2ZZehuGTot+nTXfI8WTxN57MrbAuIuIH3
+jXG98dH2W+n+srtnp8VcNbaUa3re0alla1h1T2NDoR/sdvYH/P6+vJvP7uYPkzA4yaNZe5lNs/B6
+Hl3YK9k4lh8X84fHZTJHthfT24m/60/oHVua7vbmCFym2GorN4pJ3beO7pVtR8K5/OqaUtGdPCBU
+bmDlwHsl0cOqFrfaVmPmq7hbCodT94GX0UQRTb3BGOkXMcoZ0UYq6pKRim2ZILyN44cHz7YPkEKC
+E5R4qB9Z0BOL3r3qY767WxW63tTJ7Lm7i6FTERyNEN78AiMhRYafVWFVhI46m8g3Ub32pj/n/TGT
+af9SK0xnyvWPjDMQfzabKl2lA/gibKVMKcrpgfgSFQeeKHbrC4J6WDx+IEwS7zVJQuv//1Ou/6pY
+daonYoGq1Tlvh6VQNQJ13tAhHYMd8QqHXv3jJPk0nSWzm4cJUlGZNISvhq1MrGxT4cc4KJ8Q/Q0v
+RKQ/FU+o+vDU99I97tqG2x9Njh+iXfnNPxwbwfrerSy5nT7dfLqfVAMUVifeZ7k/uplPC+wm7KSu
+MjSxCWrGyyGtdKgz+v7Unwx1B94rCjh55EA7CQ21IabQ79wFx7PRiCL2RoYtRY54OTtRRRu+NK6d
++Kr4WCYp8Y6iGF4U0OsBn9mvHma6sZe/d/CXvW7uFd0jxS45/3ogyI62sf0Dox2tSrWS9qBw24gj
+YTYwutAXetQLx7mhJkklx9rLe8srZ3Lr7vJCX8Gox9gPUjV556j2al/0HAgNj42NvRSG1F68hi3d
+IfwD5W28AfYKfFe360npk/luL4eu1f8FF1O5LA==
 """
 )
 
 # file activate.csh
 ACTIVATE_CSH = convert(
     """
-eJx9VNtO4zAQffdXDKEiUEFhX8t22bJFWqRyEVuQVkKy3Hi6sZQ44Dit+sK379hJittG5KGqPZdz
-fOZyCLNUlbBQGUJelRbmCFWJElbKphCVRWUShLnS5yKxaiksDpIyjaC/MEUO9Lc/YIfwt6ggEVoX
-FkylQVmQymBis7Wz/jJIcRLma5iIpZIIEwXXmSgVfJf+Qs5//suFygZJkf8YMFaiBY2rTGkcxa8s
-ZkxkSpQgsWUBsUVi27viD9MJf7l9mj2Pp/xxPPsNByO4gKMjoCSol+Dvot6e3/A9cl6VdmB71ksw
-mIoyvYROnKeHu8dZiARvpMebHe0CeccvoLz9sjY5tq3h5v6lgY5eD4b9yGFFutCSrkzlRMAm554y
-we3bWhYJqXcIzx5bGYMZLoW2sBRGiXmG5YAFsdsIvhA7rCDiPDhyHtXl2lOQpGhkZtuVCKKH7+ec
-X9/e8/vx3Q3nw00EfWoBxwFWrRTBeSWiE7Apagb0OXRKz7XIEUbQFcMwK7HLOT6OtwlZQo9PIGao
-pVrULKj64Ysnt3/G19ObtgkCJrXzF74jRz2MaCnJgtcN5B7wLfK2DedOp4vGydPcet5urq2XBEZv
-DcnQpBZVJt0KUBqEa4YzpS0a3x7odFOm0Dlqe9oEkN8qVUlK01/iKfSa3LRRKmqkBc2vBKFpmyCs
-XG4d2yYyEQZBzIvKOgLN+JDveiVoaXyqedVYOkTrmCRqutrfNVHr6xMFBhh9QD/qNQuGLvq72d03
-3Jy2CtGCf0rca/tp+N4BXqsflKquRr0L2sjmuClOu+/8/NKvTQsNZ3l9ZqxeTew//1a6EA==
+eJyNVFFP2zAQfvevOEKlQAVley3rurIiDQkKYgVpEpLlxtfFUuKA7bTqC799ZycpaZtN80NV5+67
+++678x3DPFUWlipDyEvrYIFQWpSwVi6FyBalSRAWSl+IxKmVcDhIbBpBf2mKHOhvf8CO4VdRQiK0
+LhyYUoNyIJXBxGUbb/1ukHASFhuYipWSCFMFV5mwCr7I8EEuvv3OhcoGSZF/HTBm0YHGdaY0juIX
+FjMmMiUsSGxYQKyWcNIb8/vbKX++eZw/TW75w2T+4xQIjHoF/gJR78Bh+BZdQql9igPbJRhMhU0v
+oSv64/3dwzzEh1eq/tWN9sMHj78mCNba5Bk2huvZc5Uwejka9iM4GkGkCy3ROlP6ejE6JdS+BP+P
+ed3IIiERj+Ep0FLGYIYroR2shFFikaEdsJa4u5FCP/YIQ8R568p5VHXtQFLSqFad7TamhR6+XXB+
+dTPjs8ndNefDLYJOqJHviUjpQsVUo0tRM6Djs1N4rkWOMIIuDMPMYpdzfBLvEnKUPT6FmKGWalmx
+gN64XfH05ufk6va6jg4tJpXzP3xHnnob0VCSBa8myxfwOQq2LedOp0+1U6C5U95+rJ1KWsZgbZOh
+B1uUmfSbQGkQfhjOlXZownig102ZQueo3VkNIL91qpKUloDFM+jVsWmxlDRIS3rGEoSmpYKw9rF1
+7GpkIgyCWBSl8wTqd0W+m7Wg3fGh5ri2dIjW8cho6Cp/P0SNbwjUMsDoHfpRr94z9KG/H92f4fa2
+04gm+YfEvWaehm8dySv1W62qulGtiQZZX7fNadZeeL/069JCw3le3RmrdhX7A3FRviE=
 """
 )
 
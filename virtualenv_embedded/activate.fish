@@ -11,14 +11,14 @@ function _bashify_path -d "Converts a fish path to something bash can recognize"
 end
 
 function _fishify_path -d "Converts a bash path to something fish can recognize"
-    echo $argv | tr ':' '\n'
+    string split ":" -- $argv
 end
 
 function deactivate -d 'Exit virtualenv mode and return to the normal environment.'
     # reset old environment variables
     if test -n "$_OLD_VIRTUAL_PATH"
         # https://github.com/fish-shell/fish-shell/issues/436 altered PATH handling
-        if test (echo $FISH_VERSION | tr "." "\n")[1] -lt 3
+        if test (string split "." -- $FISH_VERSION)[1] -lt 3
             set -gx PATH (_fishify_path $_OLD_VIRTUAL_PATH)
         else
             set -gx PATH $_OLD_VIRTUAL_PATH
@@ -59,7 +59,7 @@ deactivate nondestructive
 set -gx VIRTUAL_ENV "__VIRTUAL_ENV__"
 
 # https://github.com/fish-shell/fish-shell/issues/436 altered PATH handling
-if test (echo $FISH_VERSION | tr "." "\n")[1] -lt 3
+if test (string split "." -- $FISH_VERSION)[1] -lt 3
    set -gx _OLD_VIRTUAL_PATH (_bashify_path $PATH)
 else
     set -gx _OLD_VIRTUAL_PATH $PATH
@@ -89,7 +89,7 @@ if test -z "$VIRTUAL_ENV_DISABLE_PROMPT"
         if test -n "__VIRTUAL_PROMPT__"
             printf '%s%s' "__VIRTUAL_PROMPT__" (set_color normal)
         else
-            printf '%s(%s) ' (set_color normal) (basename "$VIRTUAL_ENV")
+            printf '%s(%s) ' (set_color normal) "__VIRTUAL_NAME__"
         end
 
         # Restore the original $status
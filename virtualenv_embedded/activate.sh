@@ -58,7 +58,7 @@ if [ -z "${VIRTUAL_ENV_DISABLE_PROMPT-}" ] ; then
     if [ "x__VIRTUAL_PROMPT__" != x ] ; then
         PS1="__VIRTUAL_PROMPT__${PS1-}"
     else
-        PS1="(`basename \"$VIRTUAL_ENV\"`) ${PS1-}"
+        PS1="(__VIRTUAL_NAME__) ${PS1-}"
     fi
     export PS1
 fi
@@ -63,7 +63,9 @@ ImportError exception, it is silently ignored.
 
 """
 
+import marshal
 import os
+import stat
 import sys
 
 try:
@@ -84,12 +86,63 @@ ENABLE_USER_SITE = None
 USER_SITE = None
 USER_BASE = None
 
+# Replaced by virtualenv with what the generic code below computes for the
+# environment: the real prefix, the standard library paths and the candidate
+# site-packages directories (checked for existence when used). See
+# check_site_constants.
+SITE_CONSTANTS = None
+
 _is_64bit = (getattr(sys, "maxsize", None) or getattr(sys, "maxint")) > 2 ** 32
 _is_pypy = hasattr(sys, "pypy_version_info")
 _is_jython = sys.platform[:4] == "java"
 if _is_jython:
     ModuleType = type(os)
 
+# The outcome of the sys.path computation is cached next to this file, so that
+# warm starts replace the directory probes and .pth parsing with a single read
+# plus one stat per path the computation depended on. See load_site_cache.
+SITE_CACHE = "site.cache"
+SITE_CACHE_VERSION = 3
+# the computations for that many keys are kept, so starts alternating between
+# a few PYTHONPATH, HOME or working directory values do not rewrite the cache
+SITE_CACHE_SLOTS = 4
+_ADD_SITEDIR, _EXEC_PTH, _EGG_INSERT = range(3)
+# The .pth files of the environment's own site directories are compiled into a
+# single code object, stored in the directory itself. See load_pth_code.
+PTH_CACHE = "pth-cache.pyc"
+# Written at creation time, maps the top level standard library modules to the
+# sys.path entry holding them. See install_stdlib_finder.
+STDLIB_INDEX = "stdlib.index"
+# while the path computation is being recorded for the cache holds the fingerprint
+# (probed paths with their modification time) and the replayable events
+_recording = None
+
+
+def _stat(path):
+    """Return the stat of path (None if missing), remembering its modification
+    time for the cache fingerprint while recording"""
+    try:
+        st = os.stat(path)
+    except (OSError, IOError):
+        st = None
+    if _recording is not None:
+        _recording["probes"][path] = None if st is None else st.st_mtime
+    return st
+
+
+def _mtime(path):
+    st = _stat(path)
+    return None if st is None else st.st_mtime
+
+
+def _exists(path):
+    return _stat(path) is not None
+
+
+def _isdir(path):
+    st = _stat(path)
+    return st is not None and stat.S_ISDIR(st.st_mode)
+
 
 def makepath(*paths):
     dir = os.path.join(*paths)
@@ -199,6 +252,8 @@ def addsitedir(sitedir, known_paths=None):
     else:
         reset = 0
     sitedir, sitedircase = makepath(sitedir)
+    if _recording is not None:
+        _recording["events"].append((_ADD_SITEDIR, sitedir, sitedircase))
     if not sitedircase in known_paths:
         sys.path.append(sitedir)  # Add path component
     try:
@@ -206,16 +261,112 @@ def addsitedir(sitedir, known_paths=None):
     except os.error:
         return
     names.sort()
-    for name in names:
-        if name.endswith(os.extsep + "pth"):
+    names = [name for name in names if name.endswith(os.extsep + "pth")]
+    if _is_jython:
+        for name in names:
             addpackage(sitedir, name, known_paths)
+    elif names:
+        code = load_pth_code(sitedir, names)
+        if _recording is not None:
+            _recording["events"].append((_EXEC_PTH, sitedir, code))
+        _exec_pth_code(sitedir, code, known_paths)
+    if _recording is not None:
+        _stat(sitedir)  # after the .pth cache got written into it
     if reset:
         known_paths = None
     return known_paths
 
 
+def _addpath(known_paths, dir, dircase):
+    if not dircase in known_paths:
+        sys.path.append(dir)
+        known_paths.add(dircase)
+
+
+def _addpath_if_exists(known_paths, dir, dircase):
+    if _exists(dir):
+        _addpath(known_paths, dir, dircase)
+
+
+def _exec_pth_code(sitedir, code, known_paths):
+    # .pth import lines (e.g. setuptools -nspkg.pth) look up sitedir in the calling frame
+    exec(code)
+
+
+def compile_pth(sitedir, names):
+    """Compile the .pth files 'names' of 'sitedir' into one code object.
+
+    Import lines are kept as they are, path lines become calls adding the
+    already resolved path if it exists when the code runs (it may have been
+    removed since)."""
+    source = []
+    for name in names:
+        try:
+            f = open(os.path.join(sitedir, name), "r")
+        except IOError:
+            continue
+        try:
+            for line in f:
+                if line.startswith("#"):
+                    continue
+                line = line.rstrip()
+                if line.startswith("import"):
+                    try:
+                        compile(line, name, "exec")
+                    except SyntaxError:
+                        line = "exec({!r})".format(line)  # fail when reached, like a plain exec does
+                    source.append(line)
+                    continue
+                dir, dircase = makepath(sitedir, line)
+                source.append("_addpath_if_exists(known_paths, {!r}, {!r})".format(dir, dircase))
+        finally:
+            f.close()
+    source.append("")
+    return compile("\n".join(source), sitedir, "exec")
+
+
+def load_pth_code(sitedir, names):
+    """Return the compiled .pth files of 'sitedir', reusing the copy cached in
+    the directory while the .pth files did not change and the directory did
+    not move (the paths are resolved against it). Only directories of the
+    environment itself hold a cache, but the .pth files of every directory
+    are probed for the site cache fingerprint."""
+    mtimes = tuple((name, _mtime(os.path.join(sitedir, name))) for name in names)
+    if not os.path.normcase(sitedir).startswith(os.path.normcase(os.path.join(sys.prefix, ""))):
+        return compile_pth(sitedir, names)
+    key = (sys.version, sys.prefix, os.path.normcase(sitedir), mtimes)
+    cache_path = os.path.join(sitedir, PTH_CACHE)
+    try:
+        f = open(cache_path, "rb")
+        try:
+            cached_key, code = marshal.load(f)
+        finally:
+            f.close()
+        if cached_key == key:
+            return code
+    except (IOError, OSError, EOFError, ValueError, TypeError):
+        pass
+    code = compile_pth(sitedir, names)
+    if not sys.dont_write_bytecode:
+        _write_marshal(cache_path, (key, code))
+    return code
+
+
 def addsitepackages(known_paths, sys_prefix=sys.prefix, exec_prefix=sys.exec_prefix):
     """Add site-packages (and possibly site-python) to sys.path"""
+    if SITE_CONSTANTS is not None and sys_prefix == sys.prefix and exec_prefix == sys.exec_prefix:
+        sitedirs = existing_sitedirs(SITE_CONSTANTS["sitedirs"])
+    else:
+        sitedirs = find_sitedirs(sys_prefix, exec_prefix)
+    for sitedir in sitedirs:
+        addsitedir(sitedir, known_paths)
+    return None
+
+
+def find_sitedirs(sys_prefix, exec_prefix, candidates=False):
+    """Return the existing site-packages (and possibly site-python) directories,
+    or with 'candidates' all the ones there may be (see existing_sitedirs)"""
+    found = []
     prefixes = [os.path.join(sys_prefix, "local"), sys_prefix]
     if exec_prefix != sys_prefix:
         prefixes.append(os.path.join(exec_prefix, "local"))
@@ -245,9 +396,9 @@ def addsitepackages(known_paths, sys_prefix=sys.prefix, exec_prefix=sys.exec_pre
                     os.path.join(prefix, "python" + sys.version[:3], "lib-dynload"),
                 ]
                 lib64_dir = os.path.join(prefix, "lib64", "python" + sys.version[:3], "site-packages")
-                if os.path.exists(lib64_dir) and os.path.realpath(lib64_dir) not in [
-                    os.path.realpath(p) for p in sitedirs
-                ]:
+                if candidates or (
+                    _exists(lib64_dir) and os.path.realpath(lib64_dir) not in [os.path.realpath(p) for p in sitedirs]
+                ):
                     if _is_64bit:
                         sitedirs.insert(0, lib64_dir)
                     else:
@@ -276,9 +427,22 @@ def addsitepackages(known_paths, sys_prefix=sys.prefix, exec_prefix=sys.exec_pre
                     if home:
                         sitedirs.append(os.path.join(home, "Library", "Python", sys.version[:3], "site-packages"))
             for sitedir in sitedirs:
-                if os.path.isdir(sitedir):
-                    addsitedir(sitedir, known_paths)
-    return None
+                if candidates or _isdir(sitedir):
+                    found.append(sitedir)
+    return found
+
+
+def existing_sitedirs(candidates):
+    """Return the directories of the 'candidates' of find_sitedirs that exist,
+    but a lib64 one that is another one under a different name"""
+    existing = []
+    for sitedir in candidates:
+        st = _stat(sitedir)
+        if st is not None and stat.S_ISDIR(st.st_mode):
+            existing.append((sitedir, (st.st_dev, st.st_ino)))
+    lib64 = os.sep + "lib64" + os.sep
+    others = set(key for sitedir, key in existing if lib64 not in sitedir)
+    return [sitedir for sitedir, key in existing if lib64 not in sitedir or key not in others]
 
 
 def check_enableusersite():
@@ -342,12 +506,12 @@ def addusersitepackages(known_paths):
             USER_BASE = joinuser("~", ".local")
         USER_SITE = os.path.join(USER_BASE, "lib", "python" + sys.version[:3], "site-packages")
 
-    if ENABLE_USER_SITE and os.path.isdir(USER_SITE):
+    if ENABLE_USER_SITE and _isdir(USER_SITE):
         addsitedir(USER_SITE, known_paths)
     if ENABLE_USER_SITE:
         for dist_libdir in ("lib", "local/lib"):
             user_site = os.path.join(USER_BASE, dist_libdir, "python" + sys.version[:3], "dist-packages")
-            if os.path.isdir(user_site):
+            if _isdir(user_site):
                 addsitedir(user_site, known_paths)
     return known_paths
 
@@ -556,9 +720,24 @@ def execsitecustomize():
 
 
 def virtual_install_main_packages():
-    f = open(os.path.join(os.path.dirname(__file__), "orig-prefix.txt"))
-    sys.real_prefix = f.read().strip()
-    f.close()
+    if SITE_CONSTANTS is not None:
+        sys.real_prefix = SITE_CONSTANTS["real_prefix"]
+        paths = list(SITE_CONSTANTS["main_paths"])
+    else:
+        orig_prefix = os.path.join(os.path.dirname(__file__), "orig-prefix.txt")
+        _stat(orig_prefix)
+        f = open(orig_prefix)
+        # a relative prefix is relative to this directory, for environments moved with their interpreter
+        sys.real_prefix = os.path.normpath(os.path.join(os.path.dirname(__file__), f.read().strip()))
+        f.close()
+        paths = find_main_paths()
+    if _recording is not None:
+        _recording["main_paths"] = paths
+    sys.path.extend(paths)
+
+
+def find_main_paths():
+    """Return the standard library paths of sys.real_prefix"""
     pos = 2
     hardcoded_relative_dirs = []
     if sys.path[0] == "":
@@ -580,7 +759,7 @@ def virtual_install_main_packages():
         # This is hardcoded in the Python executable, but relative to sys.prefix:
         for path in paths[:]:
             plat_path = os.path.join(path, "plat-%s" % sys.platform)
-            if os.path.exists(plat_path):
+            if _exists(plat_path):
                 paths.append(plat_path)
     elif sys.platform == "win32":
         paths = [os.path.join(sys.real_prefix, "Lib"), os.path.join(sys.real_prefix, "DLLs")]
@@ -588,7 +767,7 @@ def virtual_install_main_packages():
         paths = [os.path.join(sys.real_prefix, "lib", "python" + sys.version[:3])]
         hardcoded_relative_dirs = paths[:]  # for the special 'darwin' case below
         lib64_path = os.path.join(sys.real_prefix, "lib64", "python" + sys.version[:3])
-        if os.path.exists(lib64_path):
+        if _exists(lib64_path):
             if _is_64bit:
                 paths.insert(0, lib64_path)
             else:
@@ -604,13 +783,13 @@ def virtual_install_main_packages():
             # This is a non-multiarch aware Python.  Fallback to the old way.
             arch = sys.platform
         plat_path = os.path.join(sys.real_prefix, "lib", "python" + sys.version[:3], "plat-%s" % arch)
-        if os.path.exists(plat_path):
+        if _exists(plat_path):
             paths.append(plat_path)
     # This is hardcoded in the Python executable, but
     # relative to sys.prefix, so we have to fix up:
     for path in list(paths):
         tk_dir = os.path.join(path, "lib-tk")
-        if os.path.exists(tk_dir):
+        if _exists(tk_dir):
             paths.append(tk_dir)
 
     # These are hardcoded in the Apple's Python executable,
@@ -623,10 +802,9 @@ def virtual_install_main_packages():
         ]
 
         for path in hardcoded_paths:
-            if os.path.exists(path):
+            if _exists(path):
                 paths.append(path)
-
-    sys.path.extend(paths)
+    return paths
 
 
 def force_global_eggs_after_local_site_packages():
@@ -638,6 +816,8 @@ def force_global_eggs_after_local_site_packages():
     around.
 
     """
+    if _recording is not None:
+        _recording["events"].append((_EGG_INSERT,))
     egginsert = getattr(sys, "__egginsert", 0)
     for i, path in enumerate(sys.path):
         if i > egginsert and path.startswith(sys.prefix):
@@ -733,6 +913,250 @@ def enablerlcompleter():
     sys.__interactivehook__ = register_readline
 
 
+def check_site_constants():
+    """Fall back to the generic code if the environment, or the interpreter it
+    was created from, moved since the constants were baked in"""
+    global SITE_CONSTANTS
+    if SITE_CONSTANTS is not None and (
+        SITE_CONSTANTS["prefix"] != sys.prefix
+        or SITE_CONSTANTS["version"] != sys.version
+        or not _isdir(SITE_CONSTANTS["real_prefix"])
+    ):
+        SITE_CONSTANTS = None
+
+
+def _write_marshal(path, value):
+    """Atomically replace path with the marshalled value, silently giving up
+    if the location is not writable"""
+    tmp_path = "{}.{}".format(path, os.getpid())
+    try:
+        f = open(tmp_path, "wb")
+        try:
+            marshal.dump(value, f)
+        finally:
+            f.close()
+        try:
+            os.rename(tmp_path, path)
+        except OSError:  # Windows does not replace on rename
+            os.remove(path)
+            os.rename(tmp_path, path)
+    except (IOError, OSError, ValueError):
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def _site_cache_key():
+    """What the path computation depends on besides the probed paths"""
+    # site runs before the script directory is put in front, so all the entries are the search path
+    search_paths = tuple(sys.path)
+    relative = [p for p in search_paths if not os.path.isabs(p)]
+    return (
+        SITE_CACHE_VERSION,
+        sys.version,
+        sys.prefix,
+        sys.exec_prefix,
+        search_paths,
+        os.getcwd() if relative else None,
+        os.environ.get("PYTHONUSERBASE"),
+        os.environ.get("HOME"),
+        os.environ.get("APPDATA"),
+        check_enableusersite(),
+    )
+
+
+def load_site_cache():
+    """Return the cached path computation for the current key if its
+    fingerprint still matches, otherwise return None and start recording the
+    computation"""
+    global _recording
+    if _is_jython:
+        return None
+    key = _site_cache_key()
+    entries = []
+    try:
+        f = open(os.path.join(os.path.dirname(__file__), SITE_CACHE), "rb")
+        try:
+            entries = marshal.load(f)
+        finally:
+            f.close()
+        for cache in entries:
+            if cache["key"] == key:
+                for path, mtime in cache["probes"]:
+                    if _mtime(path) != mtime:
+                        break
+                else:
+                    return cache
+                break
+    except (IOError, OSError, EOFError, ValueError, TypeError, KeyError):
+        entries = []
+    if not sys.dont_write_bytecode:
+        _recording = {"key": key, "probes": {}, "events": [], "main_paths": [], "entries": entries}
+        _stat(__file__)
+    return None
+
+
+def save_site_cache():
+    """Persist the recorded path computation"""
+    global _recording
+    recording, _recording = _recording, None
+    if recording is None:
+        return
+    cache = {
+        "key": recording["key"],
+        "probes": tuple(recording["probes"].items()),
+        "events": tuple(recording["events"]),
+        "main_paths": tuple(recording["main_paths"]),
+        "real_prefix": sys.real_prefix,
+        "user_base": USER_BASE,
+        "user_site": USER_SITE,
+        "enable_user_site": ENABLE_USER_SITE,
+    }
+    # the other keys are kept, the least recently computed ones dropped
+    others = [entry for entry in recording["entries"] if entry["key"] != cache["key"]]
+    _write_marshal(os.path.join(os.path.dirname(__file__), SITE_CACHE), [cache] + others[: SITE_CACHE_SLOTS - 1])
+
+
+def replay_site_cache(cache, known_paths):
+    """Redo the recorded sys.path changes and .pth side effects.
+
+    The events are replayed against the current known paths, so an entry
+    already on sys.path is not added twice."""
+    global USER_BASE, USER_SITE, ENABLE_USER_SITE
+    USER_BASE, USER_SITE, ENABLE_USER_SITE = cache["user_base"], cache["user_site"], cache["enable_user_site"]
+    for event in cache["events"]:
+        kind = event[0]
+        if kind == _ADD_SITEDIR:
+            if event[2] not in known_paths:
+                sys.path.append(event[1])
+        elif kind == _EXEC_PTH:
+            _exec_pth_code(event[1], event[2], known_paths)
+        else:
+            force_global_eggs_after_local_site_packages()
+    return known_paths
+
+
+class StdlibFinder(object):
+    """Meta path finder looking up standard library modules directly in the
+    directory they live in, skipping the environment directories the index
+    says do not hold them. Entries in front of that directory which are not
+    covered by the index (the script directory, PYTHONPATH) are still searched
+    first, so shadowing a standard library module keeps working."""
+
+    def __init__(self, modules, covered, path_finder=None):
+        self.modules = modules
+        self.covered = covered
+        self.path_finder = path_finder
+
+    def search_path(self, fullname):
+        location = self.modules.get(fullname)
+        if location is None:
+            return None
+        search = []
+        for entry in sys.path:
+            if entry == location:
+                search.append(entry)
+                return search
+            if entry not in self.covered:
+                search.append(entry)
+        return None
+
+    def find_spec(self, fullname, path=None, target=None):
+        if path is None:
+            search = self.search_path(fullname)
+            if search is not None:
+                return self.path_finder.find_spec(fullname, search, target)
+        return None
+
+    def find_module(self, fullname, path=None):
+        if path is not None or self.path_finder is not None:
+            return None
+        search = self.search_path(fullname)
+        if search is None:
+            return None
+        for entry in search[:-1]:
+            # entries handled by a path hook (e.g. zip files) are beyond imp.find_module
+            importer = sys.path_importer_cache.get(entry, False)
+            if importer is False or not (importer is None or isinstance(importer, imp.NullImporter)):
+                return None
+        try:
+            return _ImpLoader(fullname, imp.find_module(fullname, search))
+        except ImportError:
+            return None
+
+
+class _ImpLoader(object):
+    """Loads what imp.find_module found. The optional PEP 302 methods runpy and
+    pkgutil need (``python -m``, pkgutil.get_data) are handed to a
+    pkgutil.ImpLoader, imported only when one of them is used."""
+
+    def __init__(self, fullname, found):
+        self.fullname = fullname
+        self.found = found
+        self.loader = None
+
+    def pkgutil_loader(self):
+        if self.loader is None:
+            import pkgutil
+
+            self.loader = pkgutil.ImpLoader(self.fullname, *self.found)
+        return self.loader
+
+    def load_module(self, fullname):
+        if self.loader is not None:
+            return self.loader.load_module(fullname)
+        f, pathname, description = self.found
+        try:
+            return imp.load_module(fullname, f, pathname, description)
+        finally:
+            if f is not None:
+                f.close()
+
+    def is_package(self, fullname):
+        return self.pkgutil_loader().is_package(fullname)
+
+    def get_code(self, fullname=None):
+        return self.pkgutil_loader().get_code(fullname)
+
+    def get_source(self, fullname=None):
+        return self.pkgutil_loader().get_source(fullname)
+
+    def get_filename(self, fullname=None):
+        return self.pkgutil_loader().get_filename(fullname)
+
+    def get_data(self, pathname):
+        return self.pkgutil_loader().get_data(pathname)
+
+
+def install_stdlib_finder():
+    """Put a StdlibFinder in front of sys.meta_path if the environment has an index"""
+    global imp
+    if _is_jython:
+        return
+    try:
+        f = open(os.path.join(os.path.dirname(__file__), STDLIB_INDEX), "rb")
+        try:
+            index = marshal.load(f)
+        finally:
+            f.close()
+        modules, covered = index["modules"], set(index["covered"])
+    except (IOError, OSError, EOFError, ValueError, TypeError, KeyError):
+        return
+    if sys.version_info[0] == 2:
+        import imp
+
+        finder = StdlibFinder(modules, covered)
+    else:
+        for path_finder in sys.meta_path:
+            if getattr(path_finder, "__name__", None) == "PathFinder" and hasattr(path_finder, "find_spec"):
+                break
+        else:
+            return
+        finder = StdlibFinder(modules, covered, path_finder)
+    sys.meta_path.insert(0, finder)
+
+
 if _is_pypy:
 
     def import_builtin_stuff():
@@ -751,7 +1175,13 @@ if _is_pypy:
 
 def main():
     global ENABLE_USER_SITE
-    virtual_install_main_packages()
+    cache = load_site_cache()
+    if cache is None:
+        check_site_constants()
+        virtual_install_main_packages()
+    else:
+        sys.real_prefix = cache["real_prefix"]
+        sys.path.extend(cache["main_paths"])
     if _is_pypy:
         import_builtin_stuff()
     abs__file__()
@@ -760,15 +1190,19 @@ def main():
         addbuilddir()
     if _is_jython:
         fixclasspath()
-    GLOBAL_SITE_PACKAGES = not os.path.exists(os.path.join(os.path.dirname(__file__), "no-global-site-packages.txt"))
-    if not GLOBAL_SITE_PACKAGES:
-        ENABLE_USER_SITE = False
-    if ENABLE_USER_SITE is None:
-        ENABLE_USER_SITE = check_enableusersite()
-    paths_in_sys = addsitepackages(paths_in_sys)
-    paths_in_sys = addusersitepackages(paths_in_sys)
-    if GLOBAL_SITE_PACKAGES:
-        paths_in_sys = virtual_addsitepackages(paths_in_sys)
+    if cache is None:
+        GLOBAL_SITE_PACKAGES = not _exists(os.path.join(os.path.dirname(__file__), "no-global-site-packages.txt"))
+        if not GLOBAL_SITE_PACKAGES:
+            ENABLE_USER_SITE = False
+        if ENABLE_USER_SITE is None:
+            ENABLE_USER_SITE = check_enableusersite()
+        paths_in_sys = addsitepackages(paths_in_sys)
+        paths_in_sys = addusersitepackages(paths_in_sys)
+        if GLOBAL_SITE_PACKAGES:
+            paths_in_sys = virtual_addsitepackages(paths_in_sys)
+        save_site_cache()
+    else:
+        paths_in_sys = replay_site_cache(cache, paths_in_sys)
     if sys.platform == "os2emx":
         setBEGINLIBPATH()
     setquit()
@@ -781,6 +1215,7 @@ def main():
     execsitecustomize()
     if ENABLE_USER_SITE:
         execusercustomize()
+    install_stdlib_finder()
     # Remove sys.setdefaultencoding() so that users cannot change the
     # encoding after initialization.  The test for presence is needed when
     # this module is run as a script, because this code is executed twice.